@@ -0,0 +1,217 @@
+import numpy as np
+
+from employee import Employee
+from payroll import compute_pay
+
+
+class LiveAggregates:
+    """
+    Итоги по списку сотрудников, которые обновляются при каждом изменении.
+
+    Один раз при создании список перебирается целиком, дальше итоги
+    меняются по шагам: объект подписывается на изменения сотрудников
+    (Employee.observers) и на каждое add_hours, смену зарплаты или
+    проекта вычитает прежний вклад сотрудника и прибавляет новый - O(1)
+    на изменение. Изменения сотрудников, которых нет в списке
+    (копии, другие таблицы), не учитываются.
+
+    Итоги по проектам хранятся по номеру проекта (Employee.projects),
+    поэтому итоги одного проекта (project_totals) читаются за O(1).
+    Суммы к выплате хранятся в копейках (целые числа), поэтому итог
+    не накапливает ошибок округления. Максимумы (для масштаба графика)
+    растут сразу; если уменьшился или удален сам максимальный сотрудник,
+    максимум пересчитывается при следующем чтении.
+
+    Добавление и удаление сотрудников в списке отслеживает вызывающий
+    код (add, remove) - так же, как индексы EmployeeRegistry.
+
+    Атрибуты:
+        registry (EmployeeRegistry): Реестр списка сотрудников.
+        count (int): Количество сотрудников.
+        hours (float): Сумма отработанных часов.
+    """
+
+    def __init__(self, registry) -> None:
+        """
+        Параметры:
+            registry (EmployeeRegistry): Реестр над списком сотрудников.
+        """
+        self.registry = registry
+        self.count = 0
+        self.hours = 0.0
+        self._pay_cents = 0
+        self._projects = {}
+        self._max_pay = 0.0
+        self._max_hours = 0.0
+        self._max_stale = False
+        self._pending = None
+        self._add_all(registry.employees)
+        Employee.observers.append(self)
+
+    def close(self) -> None:
+        """Отписывается от изменений сотрудников."""
+        if self in Employee.observers:
+            Employee.observers.remove(self)
+
+    @property
+    def pay(self) -> float:
+        """Сумма к выплате по всему списку."""
+        return self._pay_cents / 100
+
+    @property
+    def max_pay(self) -> float:
+        """Наибольшая выплата одному сотруднику."""
+        self._refresh_max()
+        return self._max_pay
+
+    @property
+    def max_hours(self) -> float:
+        """Наибольшее число часов у одного сотрудника."""
+        self._refresh_max()
+        return self._max_hours
+
+    def totals(self) -> dict:
+        """
+        Возвращает итоги по всему списку (как PayrollEngine.totals).
+
+        Возвращает:
+            dict: Количество сотрудников, сумма часов и сумма к выплате.
+        """
+        return {'Сотрудников': self.count, 'Часы': self.hours, 'К_выплате': self.pay}
+
+    def by_project(self) -> dict:
+        """
+        Возвращает итоги по проектам.
+
+        Возвращает:
+            dict: {проект: {'Сотрудников', 'Часы', 'К_выплате'}} в порядке названий.
+        """
+        titles = Employee.projects
+        return dict(sorted((titles.value(project_id), self._totals(values))
+                           for project_id, values in self._projects.items()))
+
+    def project_totals(self, project: str) -> dict:
+        """
+        Возвращает итоги одного проекта без перебора списка.
+
+        Параметры:
+            project (str): Название проекта.
+
+        Возвращает:
+            dict: 'Сотрудников', 'Часы', 'К_выплате' (нули, если в проекте никого нет).
+        """
+        values = self._projects.get(Employee.projects.find(project), (0, 0.0, 0))
+        return self._totals(values)
+
+    def add(self, emp) -> None:
+        """
+        Учитывает сотрудника, добавленного в список.
+
+        Параметры:
+            emp (Employee): Сотрудник.
+        """
+        hours, cents = self._contribution(emp)
+        self._apply(emp.project_id, 1, hours, cents)
+        self._max_pay = max(self._max_pay, cents / 100)
+        self._max_hours = max(self._max_hours, hours)
+
+    def remove(self, emp) -> None:
+        """
+        Убирает сотрудника, удаленного из списка.
+
+        Параметры:
+            emp (Employee): Удаленный сотрудник (например, результат EmployeeRegistry.remove).
+        """
+        hours, cents = self._contribution(emp)
+        self._apply(emp.project_id, -1, -hours, -cents)
+        if cents / 100 >= self._max_pay or hours >= self._max_hours:
+            self._max_stale = True
+
+    def before_change(self, emp) -> None:
+        """Вычитает вклад сотрудника перед изменением (см. employee.observed)."""
+        if not self._owns(emp):
+            return
+        hours, cents = self._contribution(emp)
+        self._apply(emp.project_id, -1, -hours, -cents)
+        self._pending = (hours, cents)
+
+    def after_change(self, emp) -> None:
+        """Прибавляет вклад сотрудника после изменения."""
+        if self._pending is None or not self._owns(emp):
+            return
+        old_hours, old_cents = self._pending
+        self._pending = None
+        hours, cents = self._contribution(emp)
+        self._apply(emp.project_id, 1, hours, cents)
+        pay = cents / 100
+        if (old_cents / 100 >= self._max_pay > pay) or (old_hours >= self._max_hours > hours):
+            self._max_stale = True
+        self._max_pay = max(self._max_pay, pay)
+        self._max_hours = max(self._max_hours, hours)
+
+    def _add_all(self, employees) -> None:
+        """Начальные итоги: у EmployeeTable - сразу по колонкам."""
+        if not hasattr(employees, 'salaries'):
+            for emp in employees:
+                self.add(emp)
+            return
+        hours = employees.hours
+        cents = np.round(compute_pay(employees.salaries, hours) * 100).astype(np.int64)
+        # Коды проектов таблицы - номера справочника Employee.projects
+        codes = employees.projects.codes
+        counts = np.bincount(codes)
+        project_hours = np.bincount(codes, weights=hours, minlength=len(counts))
+        project_cents = np.bincount(codes, weights=cents, minlength=len(counts))
+        for project_id, (count, total_hours, total_cents) in enumerate(zip(
+                counts.tolist(), project_hours.tolist(), project_cents.tolist())):
+            if count:
+                self._projects[project_id] = [count, total_hours, int(total_cents)]
+        self.count = len(hours)
+        self.hours = float(hours.sum())
+        self._pay_cents = int(cents.sum())
+        self._max_pay = float(cents.max()) / 100 if len(cents) else 0.0
+        self._max_hours = float(hours.max()) if len(hours) else 0.0
+
+    def _owns(self, emp) -> bool:
+        """Проверяет, что изменяемый сотрудник - из этого списка."""
+        employees = self.registry.employees
+        table = getattr(emp, 'table', None)
+        if table is not None:
+            return table is employees
+        return emp.id in self.registry and self.registry.get(emp.id) is emp
+
+    @staticmethod
+    def _contribution(emp) -> tuple:
+        """Часы и выплата сотрудника (в копейках)."""
+        return emp.hours_worked, round(emp.calculate_pay() * 100)
+
+    @staticmethod
+    def _totals(values) -> dict:
+        count, hours, cents = values
+        return {'Сотрудников': count, 'Часы': hours, 'К_выплате': cents / 100}
+
+    def _apply(self, project_id: int, count: int, hours: float, cents: int) -> None:
+        self.count += count
+        self.hours += hours
+        self._pay_cents += cents
+        totals = self._projects.setdefault(project_id, [0, 0.0, 0])
+        totals[0] += count
+        totals[1] += hours
+        totals[2] += cents
+        if not totals[0]:
+            del self._projects[project_id]
+
+    def _refresh_max(self) -> None:
+        """Пересчитывает максимумы, если максимальный сотрудник уменьшился или удален."""
+        if not self._max_stale:
+            return
+        employees = self.registry.employees
+        if hasattr(employees, 'salaries'):
+            pay = compute_pay(employees.salaries, employees.hours)
+            hours = employees.hours
+        else:
+            pay = np.fromiter((emp.calculate_pay() for emp in employees), dtype=np.float64)
+            hours = np.fromiter((emp.hours_worked for emp in employees), dtype=np.float64)
+        self._max_pay = float(pay.max()) if len(pay) else 0.0
+        self._max_hours = float(hours.max()) if len(hours) else 0.0
+        self._max_stale = False
@@ -1,71 +1,278 @@
-import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+from instrument import instrumented
+from payroll import PayrollEngine
+
+
+# Цвета столбцов (повторяются по кругу)
+COLORS = ['lightblue', 'lightgreen', 'lightcoral',
+          'lightsalmon', 'lightseagreen', 'plum', 'gold']
+
+
+class PaymentChart:
+    """
+    График зарплат и часов, который создается один раз и обновляется на месте.
+
+    Фигура строится через matplotlib.figure.Figure (без pyplot), поэтому
+    не попадает в глобальный список фигур pyplot. При изменении данных
+    меняются только высоты столбцов и подписи; столбцы пересоздаются
+    лишь когда меняется количество сотрудников.
+
+    После attach(canvas) столбцы и подписи рисуются поверх сохраненного
+    фона (blitting): refresh() перерисовывает только полосы изменившихся
+    столбцов, а полная перерисовка нужна лишь при смене масштаба осей
+    или числа столбцов.
+
+    Атрибуты:
+        figure (matplotlib.figure.Figure): Фигура с двумя графиками.
+        canvas: Холст matplotlib, подключенный через attach (или None).
+    """
+
+    def __init__(self) -> None:
+        self.figure = Figure(figsize=(12, 6))
+        self.ax_pay, self.ax_hours = self.figure.subplots(1, 2)
+        self.figure.tight_layout(pad=5.0)
+
+        for ax, title, ylabel in ((self.ax_pay, 'Зарплата к выплате', 'Руб.'),
+                                  (self.ax_hours, 'Часы работы', 'Часы')):
+            ax.set_title(title, fontsize=12, fontweight='bold')
+            ax.set_ylabel(ylabel, fontsize=10)
+            ax.set_xticks([])
+            ax.grid(True, alpha=0.3, linestyle='--')
+            # Сетка под столбцами - и при обычной отрисовке, и при blitting
+            ax.set_axisbelow(True)
+
+        self.figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15, wspace=0.3)
+
+        self._payments = np.empty(0)
+        self._hours = np.empty(0)
+        self._bars = ([], [])
+        self._name_labels = ([], [])
+        self._value_labels = ([], [])
+
+        self.canvas = None
+        self._strips = None
+        self._extents = {}
+        self._changed = set()
+        self._needs_full_draw = True
+
+    def attach(self, canvas) -> None:
+        """
+        Подключает холст и включает быструю перерисовку (blitting).
+
+        Параметры:
+            canvas: Холст matplotlib с фигурой self.figure
+                (например, FigureCanvasTkAgg).
+        """
+        self.canvas = canvas
+        for artist in self._artists():
+            artist.set_animated(True)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    @instrumented
+    def refresh(self) -> None:
+        """
+        Выводит изменения после update() на подключенный холст.
+
+        Если у части сотрудников изменились только значения, для каждого
+        из них восстанавливается фон его полосы графика, поверх рисуются
+        столбец и подписи (соседние подписи обрезаются по полосе), и на
+        экран копируется только эта полоса. Иначе запрашивается полная
+        перерисовка через draw_idle.
+        """
+        if self._needs_full_draw or self._strips is None:
+            self._needs_full_draw = False
+            self._changed.clear()
+            self.canvas.draw_idle()
+            return
+
+        renderer = self.canvas.get_renderer()
+        for i in sorted(self._changed):
+            for k in range(2):
+                region, strip = self._strips[k][i]
+                self.canvas.restore_region(region)
+                for artist in self._column_artists(k, i, strip):
+                    clip_box, clip_on = artist.get_clip_box(), artist.get_clip_on()
+                    artist.set_clip_box(strip)
+                    artist.set_clip_on(True)
+                    self.figure.draw_artist(artist)
+                    artist.set_clip_box(clip_box)
+                    artist.set_clip_on(clip_on)
+                for labels in (self._name_labels[k], self._value_labels[k]):
+                    self._extents[labels[i]] = self._x_extent(labels[i], renderer)
+                self.canvas.blit(strip)
+        self._changed.clear()
+
+    def update(self, employees, payroll=None, changed=None, limits=None) -> None:
+        """
+        Обновляет график под текущий список сотрудников.
+
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники.
+            payroll (PayrollEngine, optional): Расчет для этого списка;
+                если передан, выплаты берутся из его кэша.
+            changed (list, optional): Позиции сотрудников, у которых изменились
+                данные. Если указаны и число сотрудников не изменилось,
+                обновляются только их столбцы. По умолчанию - все.
+            limits (tuple, optional): Наибольшие выплата и часы (например,
+                из LiveAggregates); по умолчанию ищутся по всем столбцам.
+        """
+        if changed is not None and len(employees) == len(self._bars[0]):
+            self._changed.update(changed)
+            for i in changed:
+                emp = employees[i]
+                self._payments[i] = emp.calculate_pay()
+                self._hours[i] = emp.hours_worked
+                self._set_bar(i, emp.name)
+        else:
+            frame = (payroll or PayrollEngine(employees)).frame()
+            self._set_values(frame['Имя'].tolist(), frame['К_выплате'], frame['Часы'])
+
+        if self._set_limits(limits):
+            self._needs_full_draw = True
+
+    def set_values(self, names: list, payments, hours) -> None:
+        """
+        Показывает готовые значения без списка сотрудников (например, для экспорта).
+
+        Параметры:
+            names (list): Подписи столбцов.
+            payments: Суммы к выплате.
+            hours: Часы.
+        """
+        self._set_values(names, payments, hours)
+        if self._set_limits():
+            self._needs_full_draw = True
+
+    def _set_values(self, names: list, payments, hours) -> None:
+        self._payments = np.array(payments, dtype=float)
+        self._hours = np.array(hours, dtype=float)
+        if len(names) != len(self._bars[0]):
+            self._create_bars(len(names))
+            self._needs_full_draw = True
+        for i, name in enumerate(names):
+            self._set_bar(i, name)
+
+    def _artists(self) -> list:
+        """Столбцы и подписи обоих графиков."""
+        return [artist for group in self._bars + self._name_labels + self._value_labels
+                for artist in group]
+
+    @instrumented
+    def _on_draw(self, event) -> None:
+        """
+        После полной перерисовки запоминает фон полос и дорисовывает столбцы.
+
+        Полоса - вертикальная область оси шириной в одно деление
+        под одним столбцом.
+        """
+        self._strips = []
+        for ax in (self.ax_pay, self.ax_hours):
+            strips = []
+            for i in range(len(self._bars[0])):
+                x0, x1 = ax.transData.transform([(i - 0.5, 0), (i + 0.5, 0)])[:, 0]
+                strip = Bbox.from_extents(x0, ax.bbox.y0, x1, ax.bbox.y1)
+                strips.append((self.canvas.copy_from_bbox(strip), strip))
+            self._strips.append(strips)
+
+        for artist in self._artists():
+            self.figure.draw_artist(artist)
+        self._extents = {artist: self._x_extent(artist, event.renderer) for artist in self._artists()}
+
+    def _column_artists(self, k: int, i: int, strip: Bbox) -> list:
+        """Столбцы и подписи k-го графика, задевающие полосу i-го столбца."""
+        artists = []
+        for group in (self._bars[k], self._name_labels[k], self._value_labels[k]):
+            for artist in group:
+                x0, x1 = self._extents.get(artist, (0, 0))
+                if artist is group[i] or (x0 < strip.x1 and x1 > strip.x0):
+                    artists.append(artist)
+        return artists
+
+    @staticmethod
+    def _x_extent(artist, renderer) -> tuple:
+        extent = artist.get_window_extent(renderer)
+        return extent.x0, extent.x1
+
+    def _create_bars(self, count: int) -> None:
+        """Пересоздает столбцы и подписи для count сотрудников."""
+        for artists in self._bars + self._name_labels + self._value_labels:
+            for artist in artists:
+                artist.remove()
+
+        x = np.arange(count)
+        colors = [COLORS[i % len(COLORS)] for i in range(count)]
+        bars = []
+        name_labels = []
+        value_labels = []
+        for ax, alpha in ((self.ax_pay, 1.0), (self.ax_hours, 0.7)):
+            ax_bars = list(ax.bar(x, np.zeros(count), color=colors, alpha=alpha, width=0.6))
+            bars.append(ax_bars)
+            # Имена внутри столбцов (вертикально) и значения сверху
+            name_labels.append([ax.text(bar.get_x() + bar.get_width() / 2., 0, "",
+                                        ha='center', va='bottom', fontsize=9, fontweight='bold',
+                                        rotation=90, color='black')
+                                for bar in ax_bars])
+            value_labels.append([ax.text(bar.get_x() + bar.get_width() / 2., 0, "",
+                                         ha='center', va='bottom', fontsize=8, fontweight='bold')
+                                 for bar in ax_bars])
+        self._bars = tuple(bars)
+        self._name_labels = tuple(name_labels)
+        self._value_labels = tuple(value_labels)
+        if self.canvas is not None:
+            for artist in self._artists():
+                artist.set_animated(True)
+        for ax in (self.ax_pay, self.ax_hours):
+            ax.set_xlim(-0.5, max(count, 1) - 0.5)
+
+    def _set_bar(self, i: int, name: str) -> None:
+        """Выставляет высоту и подписи i-го столбца на обоих графиках."""
+        values = (self._payments[i], self._hours[i])
+        texts = (f'{int(values[0]):,}'.replace(',', ' '), str(int(values[1])))
+        for k in range(2):
+            height = values[k]
+            self._bars[k][i].set_height(height)
+            self._name_labels[k][i].set_y(height * 0.1)
+            self._name_labels[k][i].set_text(name)
+            self._value_labels[k][i].set_y(height)
+            self._value_labels[k][i].set_text(texts[k])
+
+    def _set_limits(self, limits=None) -> bool:
+        """
+        Подбирает верхнюю границу осей под самый высокий столбец.
+
+        Параметры:
+            limits (tuple, optional): Наибольшие выплата и часы, если уже известны.
+
+        Возвращает:
+            bool: True если масштаб хотя бы одной оси изменился.
+        """
+        if limits is None:
+            limits = [values.max() if len(values) else 0 for values in (self._payments, self._hours)]
+        changed = False
+        for ax, highest in zip((self.ax_pay, self.ax_hours), limits):
+            top = highest * 1.15 or 1
+            if ax.get_ylim() != (0, top):
+                ax.set_ylim(0, top)
+                changed = True
+        return changed
+
 
 class ChartBuilder:
     @staticmethod
-    def create_payment_chart(employees):
-        """График зарплат"""
-        
+    @instrumented
+    def create_payment_chart(employees, payroll=None):
+        """График зарплат
+
+        payroll - PayrollEngine для этого списка; если передан,
+        выплаты берутся из его кэша, а не считаются заново.
+        Для графика, который обновляется на месте, используйте PaymentChart.
+        """
+
         if not employees:
             raise ValueError("Список сотрудников пуст")
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
-        fig.tight_layout(pad=5.0)
-        
-        names = [e.name for e in employees]
-        payments = [e.calculate_pay() for e in employees]
-        hours = [e.hours_worked for e in employees]
-        
-        colors = ['lightblue', 'lightgreen', 'lightcoral', 
-                  'lightsalmon', 'lightseagreen', 'plum', 'gold']
-        
-        bar_colors = colors[:len(names)]
-
-        # График 1: Зарплата к выплате
-        bars = ax1.bar(names, payments, color=bar_colors, width=0.6)
-        ax1.set_title('Зарплата к выплате', fontsize=12, fontweight='bold')
-        ax1.set_ylabel('Руб.', fontsize=10)
-        ax1.set_xticklabels([])
-        ax1.grid(True, alpha=0.3, linestyle='--')
-        
-        # Имена внутри столбцов (вертикально)
-        for i, (bar, name) in enumerate(zip(bars, names)):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height * 0.1,
-                    name,
-                    ha='center', va='bottom', fontsize=9, fontweight='bold',
-                    rotation=90, color='black')
-            
-            # Значение зарплаты сверху столбца
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{int(height):,}'.replace(',', ' '),
-                    ha='center', va='bottom', fontsize=8, fontweight='bold')
-
-        if payments:
-            ax1.set_ylim(0, max(payments) * 1.15)
-
-        # График 2: Часы работы
-        bars2 = ax2.bar(names, hours, color=bar_colors, alpha=0.7, width=0.6)
-        ax2.set_title('Часы работы', fontsize=12, fontweight='bold')
-        ax2.set_ylabel('Часы', fontsize=10)
-        ax2.set_xticklabels([])
-        ax2.grid(True, alpha=0.3, linestyle='--')
-        
-        for i, (bar, name) in enumerate(zip(bars2, names)):
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height * 0.1,
-                    name,
-                    ha='center', va='bottom', fontsize=9, fontweight='bold',
-                    rotation=90, color='black')
-            
-            # Значение часов сверху столбца
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    str(int(hours[i])),
-                    ha='center', va='bottom', fontsize=8, fontweight='bold')
-
-        if hours:
-            ax2.set_ylim(0, max(hours) * 1.15)
-
-        plt.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15, wspace=0.3)
-        
-        return fig
+
+        chart = PaymentChart()
+        chart.update(employees, payroll)
+        return chart.figure
@@ -0,0 +1,368 @@
+"""
+Замеры скорости: загрузка, сохранение, расчет и графики.
+
+Сравнивает построчную загрузку через iterrows (как было раньше)
+с колоночной загрузкой DataManager.load_employees. Набор замеров
+(suite) сохраняет результаты в JSON как эталон и при следующих
+запусках сообщает о замедлении больше допуска (код выхода 1).
+
+Запуск:
+    python benchmark.py                 # 100 000 и 1 000 000 строк
+    python benchmark.py 10000 50000     # свои размеры
+    python benchmark.py startup         # время импорта gui по пакетам
+    python benchmark.py report 8 200000 # сводный отчет: 8 папок по 200 000 строк
+    python benchmark.py suite --save    # набор замеров, записать эталон
+    python benchmark.py suite           # набор замеров, сравнить с эталоном
+    python benchmark.py server 50 200   # сервер: 50 клиентов по 200 запросов
+    python benchmark.py search 500000   # поиск: время на каждую нажатую букву
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_manager import DataManager
+from employee import Employee
+
+
+POSITIONS = ["Программист", "Дизайнер", "Тестировщик", "Аналитик", "Менеджер"]
+PROJECTS = ["Веб-сайт компании", "Мобильное приложение", "База данных",
+            "Аналитика", "Тестирование", "Администрирование", "Не назначен"]
+
+# Доли должностей и проектов в сгенерированном списке
+POSITION_SHARES = [0.4, 0.1, 0.15, 0.15, 0.2]
+PROJECT_SHARES = [0.25, 0.2, 0.15, 0.1, 0.1, 0.05, 0.15]
+# Средний оклад по должности (разброс - около 20%)
+POSITION_SALARIES = [150000, 110000, 90000, 120000, 140000]
+
+MALE_NAMES = ["Александр", "Алексей", "Андрей", "Дмитрий", "Иван", "Игорь", "Максим",
+              "Михаил", "Николай", "Павел", "Сергей", "Артем", "Владимир", "Евгений"]
+FEMALE_NAMES = ["Анна", "Екатерина", "Елена", "Мария", "Наталья", "Ольга", "Светлана",
+                "Татьяна", "Юлия", "Дарья", "Ирина", "Ксения", "Алина", "Виктория"]
+SURNAMES = ["Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов",
+            "Михайлов", "Новиков", "Федоров", "Морозов", "Волков", "Алексеев", "Лебедев",
+            "Семенов", "Егоров", "Павлов", "Козлов", "Степанов", "Николаев", "Орлов"]
+
+# Сравнение с эталоном: замедление больше TOLERANCE (доля) считается
+# ухудшением, если разница больше MIN_SLOWDOWN секунд (шум коротких замеров)
+BASELINE_FILE = "benchmark_baseline.json"
+TOLERANCE = 0.25
+MIN_SLOWDOWN = 0.005
+SUITE_SIZES = [1_000, 100_000, 1_000_000]
+# График рисует столбец на каждого сотрудника, поэтому замеряется
+# только на небольших списках
+CHART_MAX_ROWS = 1_000
+
+
+def generate_roster(size: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Создает случайный, но воспроизводимый список сотрудников.
+
+    Имена - «Фамилия Имя» (женские фамилии согласованы с именем),
+    должности и проекты распределены по POSITION_SHARES и PROJECT_SHARES,
+    оклад зависит от должности, часы - около 150 в месяц.
+
+    Параметры:
+        size (int): Количество сотрудников.
+        seed (int, optional): Зерно генератора: одинаковое зерно - одинаковый список.
+
+    Возвращает:
+        pandas.DataFrame: Колонки employees.csv (без ID).
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([f"{surname} {name}" for surname in SURNAMES for name in MALE_NAMES]
+                     + [f"{surname}а {name}" for surname in SURNAMES for name in FEMALE_NAMES],
+                     dtype=object)
+    positions = rng.choice(len(POSITIONS), size=size, p=POSITION_SHARES)
+    salaries = np.asarray(POSITION_SALARIES, dtype=float)[positions] * rng.normal(1, 0.2, size)
+    salaries = np.maximum(np.round(salaries, -3), 30000)
+    hours = np.clip(np.round(rng.normal(150, 25, size) * 2) / 2, 0, 220)
+    return pd.DataFrame({
+        'Имя': names[rng.integers(0, len(names), size)],
+        'Должность': np.asarray(POSITIONS, dtype=object)[positions],
+        'Зарплата': salaries,
+        'Часы': hours,
+        'К_выплате': np.round(salaries / 160 * hours, 2),
+        'Проект': np.asarray(PROJECTS, dtype=object)[rng.choice(len(PROJECTS), size=size, p=PROJECT_SHARES)],
+    })
+
+
+def write_roster(path: str, size: int, seed: int = 42) -> None:
+    """Записывает в path CSV со size случайными сотрудниками (см. generate_roster)."""
+    generate_roster(size, seed).to_csv(path, index=False, encoding='utf-8')
+
+
+def load_iterrows(path: str) -> list:
+    """Прежняя построчная загрузка - эталон для сравнения."""
+    df = pd.read_csv(path)
+    employees = []
+    for _, row in df.iterrows():
+        emp = Employee(
+            name=str(row['Имя']),
+            position=str(row['Должность']),
+            salary=float(row['Зарплата'])
+        )
+        emp.hours_worked = float(row['Часы'])
+        if 'Проект' in df.columns:
+            emp.project = str(row['Проект'])
+        employees.append(emp)
+    return employees
+
+
+def measure(func, *args) -> float:
+    """Возвращает время выполнения func(*args) в секундах."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def import_times(statement: str = "import gui") -> dict:
+    """
+    Выполняет statement в новом интерпретаторе с -X importtime.
+
+    Параметры:
+        statement (str): Код для python -c.
+
+    Возвращает:
+        dict: {имя модуля: (собственное время, время с вложенными импортами)}
+            в миллисекундах.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # строка заголовка
+        times[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return times
+
+
+def startup(statement: str = "import gui") -> None:
+    """Печатает время импорта по пакетам верхнего уровня."""
+    times = import_times(statement)
+    packages = {}
+    for name, (own, _) in times.items():
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + own
+    print(f"{statement}: {sum(packages.values()):.1f} мс")
+    for package, total in sorted(packages.items(), key=lambda item: -item[1])[:15]:
+        print(f"{package:>30} {total:>8.1f} мс")
+
+
+def main(sizes: list) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        dm = DataManager(folder)
+        print(f"{'Строк':>10} {'iterrows, с':>12} {'колонки, с':>12} {'ускорение':>10}")
+        for size in sizes:
+            write_roster(dm.employees_file, size)
+            old = measure(load_iterrows, dm.employees_file)
+            new = measure(dm.load_employees)
+            print(f"{size:>10} {old:>12.3f} {new:>12.3f} {old / new:>9.1f}x")
+        os.remove(dm.employees_file)
+
+
+def snapshot_load(sizes: list) -> None:
+    """Сравнивает загрузку таблицы из CSV и из двоичного снимка."""
+    with tempfile.TemporaryDirectory() as folder:
+        csv_data = DataManager(folder)
+        binary_data = DataManager(folder, snapshot_format="binary")
+        print(f"{'Строк':>10} {'CSV, с':>10} {'снимок, с':>10} {'ускорение':>10}")
+        for size in sizes:
+            binary_data.clear()
+            write_roster(csv_data.employees_file, size)
+            binary_data.save_employees(csv_data.load_employees(compact=True))
+            old = measure(csv_data.load_employees, True)
+            new = measure(binary_data.load_employees, True)
+            print(f"{size:>10} {old:>10.3f} {new:>10.4f} {old / new:>9.0f}x")
+
+
+def report_scaling(folders: int, size: int) -> None:
+    """Сравнивает сводный отчет по папкам в одном процессе и в нескольких."""
+    from report import company_report
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = []
+        for i in range(folders):
+            dm = DataManager(os.path.join(root, f"отдел{i}"))
+            write_roster(dm.employees_file, size, seed=i)
+            paths.append(dm.data_folder)
+        print(f"Папок: {folders}, строк в папке: {size}")
+        print(f"{'Процессов':>10} {'время, с':>10} {'ускорение':>10}")
+        base = None
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            elapsed = measure(company_report, paths, "csv", workers)
+            base = base or elapsed
+            print(f"{workers:>10} {elapsed:>10.3f} {base / elapsed:>9.1f}x")
+
+
+def draw_payment_chart(employees) -> None:
+    """Строит график ChartBuilder и рисует его без окна (холст Agg)."""
+    from analysis import ChartBuilder
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    FigureCanvasAgg(ChartBuilder.create_payment_chart(employees)).draw()
+
+
+def run_suite(sizes: list, repeat: int = 3) -> dict:
+    """
+    Выполняет набор замеров на сгенерированных списках.
+
+    Каждый замер повторяется repeat раз, в результат идет лучшее время
+    (меньше всего зависит от фоновой нагрузки).
+
+    Параметры:
+        sizes (list): Размеры списков.
+        repeat (int, optional): Число повторов каждого замера.
+
+    Возвращает:
+        dict: {"замер/размер": секунды}.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        dm = DataManager(folder)
+        for size in sizes:
+            write_roster(dm.employees_file, size)
+            employees = dm.load_employees()
+            cases = {
+                'load_employees': lambda: dm.load_employees(),
+                'load_employees_compact': lambda: dm.load_employees(compact=True),
+                'save_employees': lambda: dm.save_employees(employees),
+                'calculate_pay': lambda: [emp.calculate_pay() for emp in employees],
+                'read_csv_to_df': lambda: dm.read_csv_to_df(dm.employees_file),
+            }
+            if size <= CHART_MAX_ROWS:
+                cases['create_payment_chart'] = lambda: draw_payment_chart(employees)
+            for name, case in cases.items():
+                results[f"{name}/{size}"] = min(measure(case) for _ in range(repeat))
+            dm.clear()
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """
+    Сравнивает результаты с эталоном.
+
+    Параметры:
+        results (dict): Новые результаты run_suite.
+        baseline (dict): Эталон (замеры, которых нет в results, пропускаются).
+        tolerance (float, optional): Допустимое замедление (0.25 - на 25%).
+
+    Возвращает:
+        list: (замер, эталон, новое время) для замедлившихся замеров.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is not None and seconds > base * (1 + tolerance) and seconds - base > MIN_SLOWDOWN:
+            regressions.append((name, base, seconds))
+    return regressions
+
+
+def suite(argv: list) -> int:
+    """Набор замеров из командной строки; возвращает код выхода."""
+    parser = argparse.ArgumentParser(prog="benchmark.py suite",
+                                     description="Набор замеров с эталоном в JSON")
+    parser.add_argument("sizes", nargs="*", type=int, default=SUITE_SIZES, help="размеры списков")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="файл эталона")
+    parser.add_argument("--save", action="store_true", help="записать результаты как эталон")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="допустимое замедление (доля, по умолчанию 0.25)")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"{'Замер':>32} {'эталон, с':>10} {'сейчас, с':>10}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        base_text = f"{base:.4f}" if base is not None else "-"
+        print(f"{name:>32} {base_text:>10} {seconds:>10.4f}")
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Эталон записан в {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for name, base, seconds in regressions:
+        print(f"Замедление: {name} {base:.4f} с -> {seconds:.4f} с ({seconds / base - 1:+.0%})")
+    return 1 if regressions else 0
+
+
+def server_load(clients: int, requests: int) -> None:
+    """Нагружает SyncServer на localhost: запись каждого запроса отдельно и пачками."""
+    import asyncio
+    from server import SyncServer, load_generator
+
+    async def run(max_batch, batch_delay):
+        with tempfile.TemporaryDirectory() as folder:
+            dm = DataManager(folder)
+            write_roster(dm.employees_file, 1000)
+            server = SyncServer(dm, port=0, batch_delay=batch_delay, max_batch=max_batch)
+            await server.start()
+            try:
+                result = await load_generator(server.host, server.port, clients, requests)
+            finally:
+                await server.close()
+            dm.wait_for_compaction()
+            return result, server.commits
+
+    print(f"Клиентов: {clients}, запросов от каждого: {requests}")
+    print(f"{'Пачка':>8} {'окно, мс':>9} {'записей':>8} {'запр./с':>9} {'p50, мс':>8} {'p99, мс':>8}")
+    for max_batch, batch_delay in ((1, 0), (None, 0), (None, 0.002)):
+        result, commits = asyncio.run(run(max_batch, batch_delay))
+        print(f"{max_batch or 'все':>8} {batch_delay * 1000:>9g} {commits:>8} "
+              f"{result['Запросов_в_секунду']:>9.0f} {result['p50_мс']:>8.2f} {result['p99_мс']:>8.2f}")
+
+
+def search_typing(size: int, query: str = "иванова ан") -> None:
+    """Замеряет поиск по мере набора запроса (как в поле поиска) на таблице из size строк."""
+    from employee_table import EmployeeTable
+    from registry import EmployeeRegistry
+
+    df = generate_roster(size)
+    table = EmployeeTable.from_columns(df['Имя'].tolist(), df['Должность'].tolist(),
+                                       df['Зарплата'].to_numpy(), df['Часы'].to_numpy(),
+                                       df['Проект'].tolist())
+    registry = EmployeeRegistry(table)
+    print(f"Строк: {size}, построение индекса: {measure(registry.search, '') * 1000:.0f} мс")
+    print(f"{'Запрос':>14} {'найдено':>9} {'мс':>7}")
+    for end in range(1, len(query) + 1):
+        start = time.perf_counter()
+        found = registry.search(query[:end])
+        print(f"{query[:end]!r:>14} {len(found):>9} {(time.perf_counter() - start) * 1000:>7.2f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["startup"]:
+        startup()
+    elif sys.argv[1:2] == ["suite"]:
+        sys.exit(suite(sys.argv[2:]))
+    elif sys.argv[1:2] == ["server"]:
+        counts = [int(arg) for arg in sys.argv[2:4]]
+        server_load(*(counts + [50, 200][len(counts):]))
+    elif sys.argv[1:2] == ["report"]:
+        counts = [int(arg) for arg in sys.argv[2:4]]
+        report_scaling(*(counts + [8, 200_000][len(counts):]))
+    elif sys.argv[1:2] == ["search"]:
+        search_typing(*[int(arg) for arg in sys.argv[2:3]] or [500_000])
+    elif sys.argv[1:2] == ["snapshot"]:
+        snapshot_load([int(arg) for arg in sys.argv[2:]] or [100_000, 1_000_000])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,330 @@
+import hashlib
+import io
+import os
+import re
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from journal import atomic_write
+
+
+# Версия оформления графиков: входит в ключ кэша, поэтому после
+# изменения render_chart старые файлы кэша не используются
+CHART_VERSION = 1
+
+FORMATS = ('png', 'svg')
+
+
+def chart_data(employees, payroll=None) -> tuple:
+    """
+    Собирает данные графика: подписи, выплаты и часы.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        payroll (PayrollEngine, optional): Расчет для этого списка.
+
+    Возвращает:
+        tuple: Список имен, массив выплат и массив часов.
+    """
+    from payroll import PayrollEngine
+
+    frame = (payroll or PayrollEngine(employees)).frame()
+    return (frame['Имя'].tolist(), frame['К_выплате'].to_numpy(dtype=float),
+            frame['Часы'].to_numpy(dtype=float))
+
+
+def chart_key(names: list, payments, hours, fmt: str, title: str = None, dpi: int = 100) -> str:
+    """
+    Вычисляет ключ кэша: хэш данных и оформления графика.
+
+    Возвращает:
+        str: SHA-256 в шестнадцатеричном виде.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CHART_VERSION}|{fmt}|{dpi}|{title or ''}|{len(names)}|".encode('utf-8'))
+    digest.update("\0".join(names).encode('utf-8'))
+    digest.update(np.ascontiguousarray(payments, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(hours, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def render_chart(names: list, payments, hours, fmt: str = "png", title: str = None, dpi: int = 100) -> bytes:
+    """
+    Рисует график зарплат и часов без окна и возвращает файл в памяти.
+
+    Фигура не связана с pyplot и окном: savefig выбирает холст Agg
+    (PNG) или SVG сам.
+
+    Параметры:
+        names (list): Подписи столбцов.
+        payments: Суммы к выплате.
+        hours: Часы.
+        fmt (str, optional): "png" или "svg".
+        title (str, optional): Заголовок над графиками (например, проект).
+        dpi (int, optional): Разрешение PNG.
+
+    Возвращает:
+        bytes: Содержимое файла.
+    """
+    from analysis import PaymentChart
+
+    chart = PaymentChart()
+    chart.set_values(names, payments, hours)
+    if title:
+        chart.figure.suptitle(title, fontsize=14, fontweight='bold')
+    buffer = io.BytesIO()
+    # Без даты в метаданных одинаковые данные дают одинаковый файл
+    metadata = {'Date': None} if fmt == 'svg' else None
+    chart.figure.savefig(buffer, format=fmt, dpi=dpi, metadata=metadata)
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """
+    Кэш готовых графиков по ключу chart_key: в памяти и в папке на диске.
+
+    Оба уровня ограничены по размеру и вытесняют дольше всего
+    не использованные графики (LRU). На диске порядок использования -
+    время изменения файла, которое обновляется при каждом попадании,
+    поэтому сохраняется между запусками.
+
+    Атрибуты:
+        folder (str | None): Папка кэша на диске (None - только в памяти).
+        max_bytes (int): Наибольший размер кэша на диске.
+        memory_bytes (int): Наибольший размер кэша в памяти.
+        hits (int): Количество попаданий.
+        misses (int): Количество промахов.
+    """
+
+    def __init__(self, folder: str = None, max_bytes: int = 64 << 20, memory_bytes: int = 16 << 20) -> None:
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._files = OrderedDict()
+        self._files_size = 0
+        if folder is not None:
+            os.makedirs(folder, exist_ok=True)
+            entries = []
+            for name in os.listdir(folder):
+                if name.rpartition('.')[2] in FORMATS:
+                    stat = os.stat(os.path.join(folder, name))
+                    entries.append((stat.st_mtime, name, stat.st_size))
+            for _, name, size in sorted(entries):
+                self._files[name] = size
+                self._files_size += size
+
+    def get(self, key: str, fmt: str):
+        """
+        Возвращает график из кэша.
+
+        Возвращает:
+            bytes | None: Содержимое файла или None, если графика нет.
+        """
+        name = f"{key}.{fmt}"
+        data = self._memory.get(name)
+        if data is not None:
+            self._memory.move_to_end(name)
+            self._touch_file(name)
+            self.hits += 1
+            return data
+        if name in self._files:
+            try:
+                with open(os.path.join(self.folder, name), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self._drop_file(name)
+            else:
+                self._touch_file(name)
+                self._remember(name, data)
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def put(self, key: str, fmt: str, data: bytes) -> None:
+        """Сохраняет график в памяти и (если задана папка) на диске."""
+        name = f"{key}.{fmt}"
+        self._remember(name, data)
+        if self.folder is None or len(data) > self.max_bytes:
+            return
+        atomic_write(os.path.join(self.folder, name), data)
+        self._drop_file(name, remove=False)
+        self._files[name] = len(data)
+        self._files_size += len(data)
+        while self._files_size > self.max_bytes:
+            self._drop_file(next(iter(self._files)))
+
+    def _remember(self, name: str, data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(name, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[name] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _touch_file(self, name: str) -> None:
+        """Отмечает файл на диске как недавно использованный."""
+        if name not in self._files:
+            return
+        self._files.move_to_end(name)
+        try:
+            os.utime(os.path.join(self.folder, name))
+        except OSError:
+            self._drop_file(name)
+
+    def _drop_file(self, name: str, remove: bool = True) -> None:
+        size = self._files.pop(name, None)
+        if size is None:
+            return
+        self._files_size -= size
+        if remove:
+            try:
+                os.remove(os.path.join(self.folder, name))
+            except OSError:
+                pass
+
+
+def export_chart(employees, path: str = None, fmt: str = None, title: str = None, dpi: int = 100,
+                 cache: ChartCache = None, payroll=None) -> bytes:
+    """
+    Выгружает график зарплат и часов в файл или в байты.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        path (str, optional): Файл (заменяется атомарно). Без него график
+            только возвращается.
+        fmt (str, optional): "png" или "svg"; по умолчанию - по расширению
+            path, иначе PNG.
+        title (str, optional): Заголовок.
+        dpi (int, optional): Разрешение PNG.
+        cache (ChartCache, optional): Кэш; одинаковые данные не рисуются повторно.
+        payroll (PayrollEngine, optional): Расчет для этого списка.
+
+    Возвращает:
+        bytes: Содержимое файла.
+
+    Исключения:
+        ValueError: Если список пуст или формат неизвестен.
+    """
+    if not len(employees):
+        raise ValueError("Список сотрудников пуст")
+    fmt = _format(path, fmt)
+    names, payments, hours = chart_data(employees, payroll)
+    key = chart_key(names, payments, hours, fmt, title, dpi)
+    data = cache.get(key, fmt) if cache is not None else None
+    if data is None:
+        data = render_chart(names, payments, hours, fmt, title, dpi)
+        if cache is not None:
+            cache.put(key, fmt, data)
+    if path is not None:
+        atomic_write(path, data)
+    return data
+
+
+def export_project_charts(employees, folder: str, fmt: str = "png", dpi: int = 100,
+                          cache: ChartCache = None, workers: int = None) -> dict:
+    """
+    Выгружает отдельный график для каждого проекта.
+
+    Графики, которых нет в кэше, рисуются параллельно в дочерних
+    процессах; процессам передаются только подписи и числа проекта.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        folder (str): Папка для файлов "<проект>.<fmt>" (если имена файлов
+            разных проектов совпадают, к ним добавляется хэш названия, см. _file_names).
+        fmt (str, optional): "png" или "svg".
+        dpi (int, optional): Разрешение PNG.
+        cache (ChartCache, optional): Кэш графиков.
+        workers (int, optional): Число процессов (по умолчанию - по числу ядер;
+            1 - рисовать в этом процессе).
+
+    Возвращает:
+        dict: {проект: путь к файлу}.
+    """
+    from payroll import PayrollEngine
+
+    fmt = _format(None, fmt)
+    os.makedirs(folder, exist_ok=True)
+    frame = PayrollEngine(employees).frame()
+    charts = {}
+    jobs = []
+    for project, group in frame.groupby('Проект', observed=True, sort=True):
+        names = group['Имя'].tolist()
+        payments = group['К_выплате'].to_numpy(dtype=float)
+        hours = group['Часы'].to_numpy(dtype=float)
+        key = chart_key(names, payments, hours, fmt, project, dpi)
+        data = cache.get(key, fmt) if cache is not None else None
+        charts[project] = data
+        if data is None:
+            jobs.append((project, key, (names, payments, hours, fmt, project, dpi)))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render_job, [args for _, _, args in jobs]))
+    else:
+        rendered = [_render_job(args) for _, _, args in jobs]
+    for (project, key, _), data in zip(jobs, rendered):
+        charts[project] = data
+        if cache is not None:
+            cache.put(key, fmt, data)
+
+    paths = {}
+    file_names = _file_names(charts)
+    for project, data in charts.items():
+        path = os.path.join(folder, f"{file_names[project]}.{fmt}")
+        atomic_write(path, data)
+        paths[project] = path
+    return paths
+
+
+def _render_job(args: tuple) -> bytes:
+    """Рисует один график (в дочернем процессе)."""
+    return render_chart(*args)
+
+
+def _format(path: str, fmt: str) -> str:
+    if fmt is None:
+        fmt = os.path.splitext(path)[1][1:].lower() if path else "png"
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат графика: {fmt}")
+    return fmt
+
+
+def _file_name(project: str) -> str:
+    """Название проекта, пригодное для имени файла."""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', project).strip(' .') or "_"
+
+
+def _file_names(projects) -> dict:
+    """
+    Имена файлов проектов без совпадений.
+
+    Разные названия могут дать одно имя файла ("A/B" и "A:B" - "A_B",
+    а без учета регистра файловой системы - и "a_b"). К именам таких
+    проектов добавляется короткий хэш названия, поэтому графики
+    не перезаписывают друг друга.
+
+    Параметры:
+        projects (iterable): Названия проектов.
+
+    Возвращает:
+        dict: {проект: имя файла без расширения}.
+    """
+    names = {project: _file_name(project) for project in projects}
+    counts = Counter(name.lower() for name in names.values())
+    for project, name in names.items():
+        if counts[name.lower()] > 1:
+            names[project] = f"{name}-{hashlib.sha256(project.encode('utf-8')).hexdigest()[:8]}"
+    return names
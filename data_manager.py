@@ -1,21 +1,90 @@
 import pandas as pd
+import hashlib
+import io
+import json
 import os
-import re
+import threading
 
+import numpy as np
 
-class DataManager:
+from employee_table import EmployeeTable
+from instrument import instrumented
+from journal import RESET_HOURS, Journal, apply_record, atomic_write
+from payroll import PayrollEngine
+from registry import EmployeeRegistry
+from storage import PROJECTS_FILE, Storage
+from timelog import attach_timelogs, entry_columns, group_entries
+
+
+# Колонки, которые читаются при загрузке сотрудников, и их типы
+EMPLOYEE_DTYPES = {
+    'ID': 'Int64',
+    'Имя': str,
+    'Должность': str,
+    'Зарплата': 'float64',
+    'Часы': 'float64',
+    'Проект': str,
+}
+
+
+# Отметка записи с лишними полями (см. DataManager.read_csv_chunks)
+_BAD_FIELDS = "\0неверное число полей"
+
+
+def _csv_rows(df: pd.DataFrame, mask: pd.Series, limit: int = 5) -> str:
+    """Возвращает номера строк CSV (с учетом заголовка) для отметок mask."""
+    rows = [str(i + 2) for i in df.index[mask][:limit]]
+    if mask.sum() > limit:
+        rows.append("...")
+    return ", ".join(rows)
+
+
+def _snapshot_token(data: bytes) -> str:
+    """Возвращает отпечаток содержимого снимка для записей checkpoint."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class DataManager(Storage):
     """
     Менеджер данных для работы с CSV файлами и сотрудниками.
 
     Этот класс предоставляет функционал для сохранения, загрузки
-    и обработки данных сотрудников в формате CSV.
+    и обработки данных сотрудников в формате CSV (хранилище "csv",
+    см. storage.open_storage).
+
+    Изменения отдельных сотрудников не переписывают весь CSV:
+    они дописываются в журнал employees.journal рядом с ним
+    (методы log_*). При загрузке журнал применяется поверх CSV,
+    а когда он превышает journal_threshold байт, в фоновом потоке
+    собирается новый снимок CSV и журнал укорачивается.
+
+    Отметки времени сотрудников (Employee.timelog) при сборке снимка CSV
+    пишутся рядом, в time_entries.json, вместе с номером последней
+    учтенной записи журнала: при повторном применении журнала после сбоя
+    уже сохраненные отметки не дублируются. Там же хранится начало
+    расчетного периода, от которого посчитаны часы снимка.
+
+    В формате "binary" (хранилище "binary") снимком служит employees.snap
+    с колонками фиксированной ширины: он отображается в память, и загрузка
+    почти не зависит от числа сотрудников. Если снимка еще нет, данные
+    один раз читаются из employees.csv. CSV в этом режиме остается
+    форматом обмена (export_csv, import_csv) и не обновляется сам.
 
     Атрибуты:
         data_folder (str): Путь к папке для хранения данных.
         employees_file (str): Полный путь к файлу с данными сотрудников.
+        snapshot_file (str): Полный путь к двоичному снимку (employees.snap).
+        entries_file (str): Полный путь к отметкам времени при снимке CSV.
+        snapshot_format (str): Формат снимка: "csv" или "binary".
+        journal (Journal): Журнал изменений.
+        journal_threshold (int): Размер журнала в байтах, после которого
+            запускается сборка снимка.
+        worker (PersistenceWorker | None): Фоновый поток записи; если задан,
+            методы log_* только ставят записи в его очередь.
     """
 
-    def __init__(self, data_folder: str = "data") -> None:
+    def __init__(self, data_folder: str = "data", journal_threshold: int = 1 << 20,
+                 snapshot_format: str = "csv") -> None:
         """
         Инициализирует менеджер данных.
 
@@ -25,25 +94,44 @@ class DataManager:
         Параметры:
             data_folder (str, optional): Название папки для хранения данных.
                 По умолчанию "data".
+            journal_threshold (int, optional): Размер журнала в байтах,
+                после которого журнал переносится в CSV. По умолчанию 1 МБ.
+            snapshot_format (str, optional): Формат снимка: "csv" (employees.csv)
+                или "binary" (employees.snap, см. snapshot.py). По умолчанию "csv".
+
+        Исключения:
+            ValueError: Если формат снимка неизвестен.
 
         Пример:
             >>> dm = DataManager("company_data")
             >>> print(dm.data_folder)
             company_data
         """
-        self.data_folder = data_folder
+        if snapshot_format not in ("csv", "binary"):
+            raise ValueError(f"Неизвестный формат снимка: {snapshot_format}")
+        super().__init__(data_folder)
         os.makedirs(data_folder, exist_ok=True)
         self.employees_file = os.path.join(data_folder, "employees.csv")
+        self.snapshot_file = os.path.join(data_folder, "employees.snap")
+        self.entries_file = os.path.join(data_folder, "time_entries.json")
+        self.projects_file = os.path.join(data_folder, PROJECTS_FILE)
+        self.snapshot_format = snapshot_format
+        self.journal = Journal(os.path.join(data_folder, "employees.journal"))
+        self.journal_threshold = journal_threshold
+        self._snapshot_lock = threading.Lock()
+        self._compaction = None
 
+    @instrumented
     def save_employees(self, employees: list) -> bool:
         """
         Сохраняет список сотрудников в CSV файл.
 
-        Преобразует объекты Employee в словари, создает DataFrame
-        и сохраняет его в CSV файл с указанной кодировкой.
+        Строит таблицу расчета через PayrollEngine (выплаты считаются
+        сразу для всех) и атомарно заменяет CSV файл (через временный файл и fsync).
+        Все записи журнала после этого считаются учтенными.
 
         Параметры:
-            employees (list): Список объектов Employee для сохранения.
+            employees (list | EmployeeTable): Сотрудники для сохранения.
 
         Возвращает:
             bool: True если сохранение прошло успешно.
@@ -57,30 +145,65 @@ class DataManager:
             >>> dm.save_employees(employees)
             True
         """
-        data = []
-        for emp in employees:
-            data.append({
-                'Имя': emp.name,
-                'Должность': emp.position,
-                'Зарплата': emp.salary,
-                'Часы': emp.hours_worked,
-                'К_выплате': emp.calculate_pay(),
-                'Проект': emp.project if hasattr(emp, 'project') else ""
-            })
-
-        df = pd.DataFrame(data)
-        df.to_csv(self.employees_file, index=False, encoding='utf-8')
+        with self._snapshot_lock:
+            self._write_snapshot(employees, None, self.period_start)
         return True
 
-    def load_employees(self) -> list:
+    def _write_snapshot(self, employees: list, upto, period_start) -> None:
+        """
+        Записывает снимок (CSV или двоичный) и отмечает его в журнале.
+
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники.
+            upto (int | None): Номер последней учтенной записи журнала;
+                None - все записанные к этому моменту.
+            period_start (int | None): Начало периода, от которого посчитаны
+                часы сотрудников (см. Storage.load_period_start).
+        """
+        # Справочник - раньше снимка: коды проектов двоичного снимка - его номера
+        projects = self.save_projects(employees)
+        if self.snapshot_format == "binary":
+            from snapshot import encode_snapshot
+
+            # Отпечаток хранится в заголовке, хэшировать файл при загрузке не нужно
+            token = os.urandom(16)
+            content = encode_snapshot(employees, token, period_start, projects)
+            self.journal.checkpoint(upto, token.hex(),
+                                    lambda _: atomic_write(self.snapshot_file, content))
+            return
+
+        df = PayrollEngine(employees).frame()
+        content = df.to_csv(index=False).encode('utf-8')
+        ids, at, hours, projects = entry_columns(employees)
+
+        def replace_snapshot(upto):
+            # Сначала отметки: если сбой случится до замены CSV, журнал применится
+            # заново, но отметки записей до upto уже будут в файле
+            if len(ids) or period_start is not None or os.path.exists(self.entries_file):
+                entries = {"upto": upto, "period_start": period_start, "id": ids.tolist(),
+                           "at": at.tolist(), "hours": hours.tolist(), "project": projects}
+                atomic_write(self.entries_file,
+                             json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+            atomic_write(self.employees_file, content)
+
+        self.journal.checkpoint(upto, _snapshot_token(content), replace_snapshot)
+
+    @instrumented
+    def load_employees(self, compact: bool = False) -> list:
         """
         Загружает сотрудников из CSV файла.
 
-        Читает CSV файл, преобразует строки в объекты Employee
-        и восстанавливает их состояние (часы, проект и т.д.).
+        Читает только нужные колонки с заранее заданными типами,
+        проверяет зарплату и часы сразу для всей колонки и создает
+        объекты Employee одним проходом по колонкам. Затем применяет
+        записи журнала, сделанные после последнего снимка.
+
+        Параметры:
+            compact (bool, optional): Вернуть EmployeeTable вместо списка
+                объектов - занимает намного меньше памяти на больших списках.
 
         Возвращает:
-            list: Список объектов Employee. Если файл не существует
+            list | EmployeeTable: Сотрудники. Если файлов нет
                   или произошла ошибка, возвращает пустой список.
 
         Исключения:
@@ -88,52 +211,424 @@ class DataManager:
             ValueError: Если данные в CSV некорректны.
 
         """
-        from employee import Employee
+        try:
+            return self.read_employees(compact)
+        except Exception as e:
+            print(f"Ошибка загрузки сотрудников: {e}")
+            return []
+
+    def read_employees(self, compact: bool = False) -> list:
+        """
+        То же, что load_employees, но ошибки чтения не скрываются.
+
+        Параметры:
+            compact (bool, optional): Вернуть EmployeeTable вместо списка.
+
+        Возвращает:
+            list | EmployeeTable: Сотрудники (пустые, если файлов нет).
+
+        Исключения:
+            ValueError: Если данные в CSV или журнале некорректны.
+        """
+        with self._snapshot_lock:
+            employees, token, entries_upto, period_start = self._read_snapshot(compact)
+            self.period_start = self._replay(employees, token, entries_upto, period_start)
+        self.finish_close_period()
+        return employees
+
+    def _replay(self, employees, token, entries_upto: int, period_start, upto: int = None):
+        """
+        Применяет к снимку записи журнала, сделанные после него.
+
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники снимка.
+            token (callable): Отпечаток снимка (см. _read_snapshot).
+            entries_upto (int): Номер записи, отметки которой уже загружены.
+            period_start (int | None): Начало периода часов снимка.
+            upto (int, optional): Применять записи только до этого номера.
+
+        Возвращает:
+            int | None: Начало периода после записей (reset_hours его сдвигает).
+        """
+        registry = EmployeeRegistry(employees)
+        for record in self.journal.records(token):
+            if upto is not None and record["seq"] > upto:
+                continue
+            apply_record(registry, record, entries_upto)
+            if record["op"] == RESET_HOURS:
+                period_start = record["at"]
+        return period_start
+
+    def _read_snapshot(self, compact: bool = False) -> tuple:
+        """
+        Читает снимок без учета журнала.
+
+        В формате "binary" читается employees.snap, а если его еще нет -
+        employees.csv (первый запуск после смены формата).
+
+        Параметры:
+            compact (bool, optional): Вернуть EmployeeTable вместо списка.
+
+        Возвращает:
+            tuple: Сотрудники (с отметками времени), функция, возвращающая
+                отпечаток снимка для Journal.records, номер последней записи
+                журнала, отметки которой уже загружены (пустой список или
+                таблица, если файла нет), и начало периода часов снимка.
+                period_start хранилища не меняется: его выставляет read_employees.
+        """
+        self.load_projects()
+        if self.snapshot_format == "binary" and os.path.exists(self.snapshot_file):
+            from employee import Employee
+            from snapshot import read_snapshot
+
+            table, token, period_start = read_snapshot(self.snapshot_file)
+            period_start = self.data_period_start(period_start)
+            table.timelogs.set_start(period_start)
+            if not compact:
+                employees = [
+                    Employee.restore(name, position, salary, hours_worked, project, emp_id)
+                    for emp_id, name, position, salary, hours_worked, project
+                    in zip(table.ids.tolist(), table.names, list(table.positions),
+                           table.salaries.tolist(), table.hours.tolist(), list(table.projects))
+                ]
+                attach_timelogs(employees, table.timelogs)
+                table = employees
+            # Отметки лежат в том же файле, что и снимок, - журнал применяется целиком
+            return table, lambda: token, 0, period_start
 
         if not os.path.exists(self.employees_file):
-            return []
+            employees = EmployeeTable() if compact else []
+            return employees, lambda: _snapshot_token(b""), 0, self.data_period_start()
+        employees, content = self.read_employees_csv(self.employees_file, compact)
+        entries = None
+        if os.path.exists(self.entries_file):
+            with open(self.entries_file, 'rb') as f:
+                entries = json.load(f)
+        # Начало периода - до отметок: часы снимка посчитаны от него
+        period_start = self.data_period_start(entries.get("period_start") if entries else None)
+        if entries is None:
+            return employees, lambda: _snapshot_token(content), 0, period_start
+        attach_timelogs(employees, group_entries(entries["id"], entries["at"], entries["hours"],
+                                                 entries["project"], period_start))
+        return employees, lambda: _snapshot_token(content), entries["upto"], period_start
 
-        try:
-            df = pd.read_csv(self.employees_file)
-            employees = []
+    @staticmethod
+    def read_employees_csv(file_path: str, compact: bool = False) -> tuple:
+        """
+        Читает сотрудников из CSV файла в формате employees.csv.
 
-            for _, row in df.iterrows():
-                emp = Employee(
-                    name=str(row['Имя']),
-                    position=str(row['Должность']),
-                    salary=float(row['Зарплата'])
-                )
-                emp.hours_worked = float(row['Часы'])
+        Параметры:
+            file_path (str): Путь к CSV файлу.
+            compact (bool, optional): Вернуть EmployeeTable вместо списка.
 
-                # Загружаем проект если есть в CSV
-                if 'Проект' in df.columns:
-                    emp.project = str(row['Проект'])
+        Возвращает:
+            tuple: Сотрудники и содержимое файла в байтах.
 
-                employees.append(emp)
+        Исключения:
+            FileNotFoundError: Если файл не существует.
+            ValueError: Если данные в CSV некорректны.
+        """
+        from employee import Employee
+
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        # Проект - категория: каждое название разбирается и переводится
+        # в номер справочника проектов один раз, а не в каждой строке
+        df = pd.read_csv(io.BytesIO(content),
+                         usecols=lambda column: column in EMPLOYEE_DTYPES,
+                         dtype=dict(EMPLOYEE_DTYPES, Проект='category'))
+        ids, names, positions, salaries, hours, projects = DataManager._employee_columns(df)
+
+        if compact:
+            employees = EmployeeTable.from_columns(names.tolist(), positions.tolist(),
+                                                   salaries.to_numpy(), hours.to_numpy(),
+                                                   projects.array, ids.to_numpy())
+            return employees, content
+
+        employees = [
+            Employee.restore(name, position, salary, hours_worked, project, emp_id)
+            for emp_id, name, position, salary, hours_worked, project
+            in zip(ids.tolist(), names.tolist(), positions.tolist(), salaries.tolist(),
+                   hours.tolist(), projects.tolist())
+        ]
+        return employees, content
+
+    def append_records(self, records: list) -> None:
+        """
+        Дописывает записи в журнал одним сбросом на диск.
+
+        Если журнал превысил journal_threshold, запускает сборку снимка.
+
+        Параметры:
+            records (list): Записи журнала (словари с ключом "op").
+        """
+        self.journal.append_many(records)
+        if self.journal.size() >= self.journal_threshold:
+            self.start_compaction()
+
+    def compact(self) -> None:
+        """
+        Переносит журнал в CSV снимок.
 
-            return employees
+        Снимок собирается из текущего CSV и записей журнала, после чего
+        CSV атомарно заменяется, а учтенные записи удаляются из журнала.
+        Записи, добавленные во время сборки, остаются в журнале.
+        """
+        with self._snapshot_lock:
+            upto = self.journal.last_seq
+            employees, token, entries_upto, period_start = self._read_snapshot(compact=True)
+            period_start = self._replay(employees, token, entries_upto, period_start, upto)
+            self._write_snapshot(employees, upto, period_start)
+
+    def start_compaction(self) -> None:
+        """Запускает compact() в фоновом потоке, если он еще не запущен."""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(target=self._compact_in_background, daemon=True)
+        self._compaction.start()
+
+    def wait_for_compaction(self) -> None:
+        """Дожидается завершения фоновой сборки снимка."""
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
         except Exception as e:
-            print(f"Ошибка загрузки сотрудников: {e}")
-            return []
+            print(f"Ошибка сборки снимка: {e}")
 
-    def read_csv_to_df(self, file_path: str) -> pd.DataFrame:
+    def clear(self) -> None:
+        """Удаляет снимки сотрудников (CSV и двоичный), отметки времени, справочник проектов и журнал."""
+        self.wait_for_compaction()
+        with self._snapshot_lock:
+            for path in (self.employees_file, self.snapshot_file, self.entries_file, self.projects_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.journal.clear()
+            self._projects = set()
+
+    @staticmethod
+    def _employee_columns(df: pd.DataFrame) -> tuple:
+        """
+        Проверяет колонки сотрудников и возвращает их в виде списков.
+
+        Зарплата должна быть положительной, часы - неотрицательными,
+        ID - заполненными и без повторов; проверка выполняется сразу
+        для всей колонки. В файлах без колонки ID сотрудники получают
+        номера 1, 2, 3... по порядку строк.
+
+        Параметры:
+            df (pandas.DataFrame): Данные, прочитанные из CSV.
+
+        Возвращает:
+            tuple: Колонки (pandas.Series) ID, имен, должностей, зарплат, часов и проектов.
+
+        Исключения:
+            ValueError: Если в колонке есть некорректные значения.
+        """
+        missing = [c for c in EMPLOYEE_DTYPES if c not in ('ID', 'Проект') and c not in df.columns]
+        if missing:
+            raise ValueError(f"В файле нет колонок: {', '.join(missing)}")
+
+        salary = df['Зарплата']
+        hours = df['Часы'].fillna(0.0)
+
+        bad_salary = ~(salary > 0)
+        if bad_salary.any():
+            raise ValueError(f"Некорректная зарплата в строках: {_csv_rows(df, bad_salary)}")
+
+        bad_hours = ~((hours >= 0) & (hours < float('inf')))
+        if bad_hours.any():
+            raise ValueError(f"Некорректные часы в строках: {_csv_rows(df, bad_hours)}")
+
+        if 'ID' in df.columns:
+            ids = df['ID']
+            bad_ids = ids.isna() | ids.duplicated(keep='first')
+            if bad_ids.any():
+                raise ValueError(f"Пустые или повторяющиеся ID в строках: {_csv_rows(df, bad_ids)}")
+            ids = ids.astype('int64')
+        else:
+            ids = pd.Series(range(1, len(df) + 1), index=df.index, dtype='int64')
+
+        if 'Проект' in df.columns:
+            projects = df['Проект']
+            if isinstance(projects.dtype, pd.CategoricalDtype) and "" not in projects.cat.categories:
+                projects = projects.cat.add_categories("")
+            projects = projects.fillna("")
+        else:
+            projects = pd.Series("Не назначен", index=df.index, dtype=object)
+
+        return (ids,
+                df['Имя'].fillna(""),
+                df['Должность'].fillna(""),
+                salary,
+                hours,
+                projects)
+
+    @instrumented
+    def read_csv_to_df(self, file_path: str, on_bad_row=None, **options) -> pd.DataFrame:
         """
         Читает CSV файл и возвращает DataFrame без пустых строк.
 
-        Универсальный метод для чтения любых CSV файлов.
-        Автоматически удаляет строки с отсутствующими значениями.
+        Универсальный метод для чтения любых CSV файлов: части
+        read_csv_chunks собираются в одну таблицу. Строки с пустыми
+        значениями и ошибочные строки не попадают в результат,
+        о них сообщается через on_bad_row. Для больших файлов лучше
+        обрабатывать части read_csv_chunks по одной.
 
         Параметры:
             file_path (str): Путь к CSV файлу для чтения.
+            on_bad_row (callable, optional): См. read_csv_chunks.
+            **options: Остальные параметры read_csv_chunks (usecols, dtypes, where).
 
         Возвращает:
-            pandas.DataFrame: DataFrame с данными из файла.
-            Если файл не существует или произошла ошибка чтения,
+            pandas.DataFrame: DataFrame с данными из файла (индекс - номер
+            строки данных в файле). Если файл не существует или пуст,
             возвращает пустой DataFrame.
 
+        Исключения:
+            ValueError: Если в файле нет колонок из usecols или он не читается как CSV.
+        """
+        try:
+            chunks = list(self.read_csv_chunks(file_path, on_bad_row=on_bad_row, **options))
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return pd.DataFrame()
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks)
+
+    @staticmethod
+    def read_csv_chunks(file_path: str, chunk_size: int = 100_000, usecols: list = None,
+                        dtypes: dict = None, where=None, on_bad_row=None):
+        """
+        Читает CSV файл по частям (pandas.read_csv с chunksize).
+
+        В памяти одновременно находится только одна часть, поэтому
+        файл любого размера читается с ограниченным расходом памяти.
+        Границы записей определяет парсер pandas, поэтому поле в кавычках
+        может занимать несколько строк файла. Колонки из dtypes приводятся
+        к своим типам (для файлов сотрудников - EMPLOYEE_DTYPES), остальные
+        pandas определяет сам. Числа, которые не удалось разобрать,
+        не останавливают чтение: такая запись пропускается и передается
+        в on_bad_row. Так же пропускаются записи с пустыми значениями.
+
+        Записи с лишними полями передает в on_bad_row парсер pandas
+        на Python (engine='python'): он медленнее, поэтому используется,
+        только если on_bad_row задан. Без него файл читает парсер C,
+        а о таких записях предупреждает сам pandas.
+
+        Параметры:
+            file_path (str): Путь к CSV файлу (.gz - сжатый gzip).
+            chunk_size (int, optional): Записей в одной части.
+            usecols (list, optional): Читать только эти колонки.
+            dtypes (dict, optional): Типы колонок, например EMPLOYEE_DTYPES.
+            where (callable, optional): Отбор строк: получает часть
+                и возвращает маску строк, которые нужно оставить.
+            on_bad_row (callable, optional): Вызывается как on_bad_row(строка, причина)
+                для каждой пропущенной записи (номер записи данных + 2, как в _csv_rows:
+                с учетом заголовка, запись с переводом строки в кавычках - одна строка).
+                По умолчанию первые 5 записей и общее количество выводятся через print.
+
+        Возвращает:
+            iterator: Части файла (pandas.DataFrame); индекс - номер записи
+            данных (с 0, не зависит от chunk_size).
+
+        Исключения:
+            FileNotFoundError: Если файл не существует.
+            ValueError: Если в файле нет колонок из usecols или он не читается как CSV.
         """
+        types = dict(dtypes or {})
+        numeric = {column for column, kind in types.items()
+                   if kind not in (str, object) and pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(kind))}
+        report = on_bad_row
+        bad_rows = [0]
+        if report is None:
+            def report(line, reason):
+                bad_rows[0] += 1
+                if bad_rows[0] <= 5:
+                    print(f"{file_path}, строка {line}: {reason}")
+
+        header = list(pd.read_csv(file_path, nrows=0, encoding='utf-8').columns)
+        if usecols is not None:
+            missing = [column for column in usecols if column not in header]
+            if missing:
+                raise ValueError(f"В файле {file_path} нет колонок: {', '.join(map(str, missing))}")
+        columns = [column for column in header if usecols is None or column in usecols]
+        # Тип числовых колонок pandas определяет сам: ошибочное значение
+        # дает часть со строками, а не исключение, и запись пропускается
+        read_types = {column: kind for column, kind in types.items()
+                      if column in columns and column not in numeric}
+        options = dict(chunksize=chunk_size, encoding='utf-8', dtype=read_types)
+        first = None
+        if on_bad_row is None:
+            options.update(usecols=columns, on_bad_lines='warn')
+        else:
+            first = header[0]
+            # Запись с лишними полями остается на своем месте, отмеченная в первой
+            # колонке, поэтому номера записей не сдвигаются. С usecols парсер
+            # на Python лишние поля не проверяет - колонки отбираются после чтения
+            read_types[first] = str
+            options.update(engine='python', on_bad_lines=lambda fields: [_BAD_FIELDS] + [""] * (len(header) - 1))
+
+        empty = True
         try:
-            df = pd.read_csv(file_path)
-            return df.dropna()
-        except Exception:
-            return pd.DataFrame()
\ No newline at end of file
+            with pd.read_csv(file_path, **options) as reader:
+                for chunk in reader:
+                    chunk = DataManager._typed_chunk(chunk, columns, types, numeric, report, first)
+                    if where is not None:
+                        chunk = chunk[where(chunk)]
+                    empty = False
+                    yield chunk
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Файл {file_path} не читается как CSV: {e}") from None
+        if empty:
+            yield pd.DataFrame(columns=columns)
+        if on_bad_row is None and bad_rows[0] > 5:
+            print(f"{file_path}: пропущено строк - {bad_rows[0]}")
+
+    @staticmethod
+    def _typed_chunk(chunk: pd.DataFrame, columns: list, types: dict, numeric: set,
+                     report, marked: str = None) -> pd.DataFrame:
+        """
+        Приводит колонки части к типам и убирает пустые и ошибочные записи.
+
+        Параметры:
+            chunk (pandas.DataFrame): Часть, прочитанная read_csv (числа из types - без типа).
+            columns (list): Колонки результата.
+            types (dict): Типы колонок.
+            numeric (set): Числовые колонки из types.
+            report (callable): Получает (строка, причина) пропущенной записи.
+            marked (str, optional): Колонка (прочитанная строками), в которой
+                отмечены записи с лишними полями.
+        """
+        reasons = np.full(len(chunk), "", dtype=object)
+        if marked is not None:
+            reasons[(chunk[marked] == _BAD_FIELDS).to_numpy(dtype=bool, na_value=False)] = "неверное число полей"
+            chunk = chunk[columns]
+        for column in numeric & set(columns):
+            text = chunk[column]
+            if pd.api.types.is_numeric_dtype(text.dtype):
+                values = text.astype(np.float64)
+                wrong = pd.Series(False, index=chunk.index)
+            else:
+                values = pd.to_numeric(text, errors='coerce').astype(np.float64)
+                wrong = values.isna() & text.notna()
+            if pd.api.types.is_integer_dtype(types[column]):
+                wrong |= values.notna() & (values % 1 != 0)
+            reasons[wrong.to_numpy() & (reasons == "")] = f"не число в колонке '{column}'"
+            chunk[column] = values
+        reasons[chunk.isna().any(axis=1).to_numpy() & (reasons == "")] = "пустые значения"
+
+        keep = reasons == ""
+        if not keep.all():
+            for position, reason in zip(chunk.index[~keep].tolist(), reasons[~keep].tolist()):
+                report(position + 2, reason)
+            chunk = chunk[keep]
+        if marked in columns and marked not in types:
+            # Колонка читалась строками только ради отметок - тип определяется по значениям
+            try:
+                chunk[marked] = pd.to_numeric(chunk[marked])
+            except (TypeError, ValueError):
+                pass
+        return chunk.astype({column: types[column] for column in numeric & set(columns)})
@@ -1,23 +1,101 @@
+import functools
+import math
+
+from payroll import compute_pay
+from project import UNASSIGNED, ProjectRegistry
+from timelog import TimeLog, now, timestamp
+
+
+def valid_hours(hours):
+    """
+    Проверяет количество добавляемых часов: конечное положительное число.
+
+    Работает и для одного числа, и для массива numpy / колонки pandas
+    (возвращает маску), поэтому add_hours и пакетная загрузка табелей
+    проверяют часы по одному правилу.
+
+    Параметры:
+        hours (float | numpy.ndarray): Количество часов.
+
+    Возвращает:
+        bool | numpy.ndarray: True для допустимых значений (NaN - недопустимо).
+    """
+    return (hours > 0) & (hours < math.inf)
+
+
+def observed(method):
+    """
+    Оборачивает изменение сотрудника уведомлениями подписчиков Employee.observers.
+
+    Перед изменением вызывается observer.before_change(emp), после -
+    observer.after_change(emp): подписчик вычитает прежний вклад сотрудника
+    и прибавляет новый (см. aggregates.LiveAggregates). Без подписчиков
+    метод вызывается напрямую.
+
+    Параметры:
+        method (callable): Метод или сеттер свойства сотрудника.
+
+    Возвращает:
+        callable: Обернутый метод.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        observers = Employee.observers
+        if not observers:
+            return method(self, *args, **kwargs)
+        for observer in observers:
+            observer.before_change(self)
+        result = method(self, *args, **kwargs)
+        for observer in observers:
+            observer.after_change(self)
+        return result
+    return wrapper
+
+
 class Employee:
     """
     Класс, представляющий сотрудника компании.
 
     Атрибуты:
+        id (int): Уникальный номер сотрудника, не меняется и сохраняется в CSV.
         name (str): Полное имя сотрудника.
         position (str): Должность сотрудника.
         salary (float): Месячный оклад сотрудника.
-        hours_worked (float): Общее количество отработанных часов в текущем расчетном периоде.
+        hours_worked (float): Общее количество отработанных часов в текущем расчетном периоде:
+            сумма отметок времени с начала периода (TimeLog.start)
+            и часов без отметок (например, загруженных из старых файлов или табелей).
         project (str): Название проекта, над которым работает сотрудник.
+            Хранится номер проекта в справочнике Employee.projects (project_id).
+        timelog (TimeLog | None): Отметки времени (время, часы, проект);
+            None, пока отметок нет.
 
     Методы:
-        add_hours(hours): Добавляет отработанные часы.
+        add_hours(hours, at): Добавляет отработанные часы отметкой времени.
+        hours_between(start, end, project): Сумма отмеченных часов за промежуток.
         calculate_pay(): Рассчитывает заработную плату на основе отработанных часов.
         assign_project(project_name): Назначает сотрудника на проект.
-        reset_hours(): Обнуляет счетчик отработанных часов (например, после выплаты).
+        reset_hours(at): Начинает новый расчетный период: часы обнуляются (например, после выплаты).
         get_info(): Возвращает базовую информацию о сотруднике.
     """
 
-    def __init__(self, name: str, position: str, salary: float) -> None:
+    # Без __dict__ у каждого экземпляра: заметно меньше памяти на больших списках
+    __slots__ = ('id', '_name', '_position', '_salary', '_hours_worked', '_project', '_timelog')
+
+    # Счетчик изменений имени, зарплаты, часов, должности и проекта у всех
+    # сотрудников. По нему PayrollEngine понимает, что кэш расчета устарел.
+    revision = 0
+
+    # Следующий свободный ID. Загрузка сотрудников сдвигает его за самый
+    # большой загруженный ID, поэтому новые сотрудники не повторяют старые номера.
+    next_id = 1
+
+    # Подписчики на изменения часов, зарплаты и проекта (см. observed)
+    observers = []
+
+    # Справочник проектов: сотрудники и EmployeeTable хранят номера проектов из него
+    projects = ProjectRegistry()
+
+    def __init__(self, name: str, position: str, salary: float, emp_id: int = None) -> None:
         """
         Конструктор для создания экземпляра класса Employee.
 
@@ -27,34 +105,215 @@ class Employee:
             name (str): Полное имя сотрудника.
             position (str): Должность сотрудника.
             salary (float): Месячный оклад сотрудника. Должен быть положительным числом.
+            emp_id (int, optional): ID сотрудника. По умолчанию - следующий свободный.
 
         Исключения:
             ValueError: Если salary <= 0.
         """
-        self.name = name
-        self.position = position
         if salary <= 0:
             raise ValueError("Зарплата должна быть положительным числом.")
+        self.id = Employee.reserve_id(emp_id)
+        self.name = name
+        self.position = position
         self.salary = salary
+        self._timelog = None
         self.hours_worked = 0.0
-        self.project = "Не назначен"
+        self.project = UNASSIGNED
+
+    @staticmethod
+    def reserve_id(emp_id: int = None) -> int:
+        """
+        Выдает новый ID или отмечает уже существующий как занятый.
+
+        Параметры:
+            emp_id (int, optional): Существующий ID (например, из файла).
+                По умолчанию выдается следующий свободный.
 
-    def add_hours(self, hours: float) -> None:
+        Возвращает:
+            int: ID сотрудника.
+        """
+        if emp_id is None:
+            emp_id = Employee.next_id
+        if emp_id >= Employee.next_id:
+            Employee.next_id = emp_id + 1
+        return emp_id
+
+    @classmethod
+    def restore(cls, name: str, position: str, salary: float,
+                hours_worked: float, project: str, emp_id: int = None) -> "Employee":
         """
-        Добавляет отработанные часы к общему счетчику сотрудника.
+        Восстанавливает сотрудника из уже проверенных данных.
+
+        Используется при массовой загрузке: зарплата и часы проверяются
+        сразу для всей колонки, поэтому повторная проверка в конструкторе
+        не выполняется.
+
+        Параметры:
+            name (str): Полное имя сотрудника.
+            position (str): Должность сотрудника.
+            salary (float): Месячный оклад сотрудника.
+            hours_worked (float): Отработанные часы.
+            project (str): Название проекта.
+            emp_id (int, optional): ID сотрудника. По умолчанию - следующий свободный.
+
+        Возвращает:
+            Employee: Восстановленный экземпляр.
+        """
+        emp = cls.__new__(cls)
+        emp.id = Employee.reserve_id(emp_id)
+        emp._name = name
+        emp._position = position
+        emp._salary = salary
+        emp._hours_worked = hours_worked
+        emp._project = Employee.projects.code(project)
+        emp._timelog = None
+        Employee.revision += 1
+        return emp
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+        Employee.revision += 1
+
+    @property
+    def position(self) -> str:
+        return self._position
+
+    @position.setter
+    def position(self, value: str) -> None:
+        self._position = value
+        Employee.revision += 1
+
+    @property
+    def salary(self) -> float:
+        return self._salary
+
+    @salary.setter
+    @observed
+    def salary(self, value: float) -> None:
+        self._salary = value
+        Employee.revision += 1
+
+    @property
+    def hours_worked(self) -> float:
+        if self._timelog is None:
+            return self._hours_worked
+        return self._hours_worked + self._timelog.current()
+
+    @hours_worked.setter
+    @observed
+    def hours_worked(self, value: float) -> None:
+        # Отметки не меняются: разница относится к часам без отметок
+        if self._timelog is not None:
+            value -= self._timelog.current()
+        self._hours_worked = value
+        Employee.revision += 1
+
+    @property
+    def timelog(self):
+        return self._timelog
+
+    def attach_timelog(self, log: TimeLog, current: float = None) -> None:
+        """
+        Привязывает загруженные отметки времени, не меняя hours_worked.
+
+        Параметры:
+            log (TimeLog): Отметки сотрудника; в hours_worked (из снимка) они уже учтены.
+            current (float, optional): Сумма часов журнала в текущем периоде,
+                если уже известна (иначе - log.current()).
+        """
+        hours = self.hours_worked
+        self._timelog = log
+        self._hours_worked = hours - (log.current() if current is None else current)
+        Employee.revision += 1
+
+    @property
+    def project(self) -> str:
+        return Employee.projects.value(self._project)
+
+    @project.setter
+    @observed
+    def project(self, value: str) -> None:
+        self._project = Employee.projects.code(value)
+        Employee.revision += 1
+
+    @property
+    def project_id(self) -> int:
+        """Номер проекта в справочнике Employee.projects."""
+        return self._project
+
+    def add_hours(self, hours: float, at=None) -> None:
+        """
+        Добавляет отработанные часы отметкой времени на текущий проект.
 
         Параметры:
             self: Экземпляр класса Employee.
             hours: Количество часов для добавления. Должно быть положительным.
+            at (optional): Время отметки (секунды, datetime или date). По умолчанию - текущее.
 
         Исключения:
-            ValueError: Если hours <= 0.
+            ValueError: Если hours <= 0 или не является конечным числом.
         """
-        if hours <= 0:
+        if not valid_hours(hours):
             raise ValueError("Количество часов должно быть положительным.")
-        self.hours_worked += hours
+        self.record_hours(hours, at=at)
         print(f"Сотруднику {self.name} добавлено {hours} часов. Всего: {self.hours_worked}")
 
+    @observed
+    def record_hours(self, hours: float, project: str = None, at=None) -> None:
+        """
+        Добавляет отметку времени без проверки и вывода (загрузка, журнал).
+
+        Параметры:
+            hours (float): Часы.
+            project (str, optional): Проект. По умолчанию - текущий проект сотрудника.
+            at (optional): Время отметки. По умолчанию - текущее.
+        """
+        if self._timelog is None:
+            self._timelog = TimeLog()
+        self._timelog.add(hours, self.project if project is None else project, at)
+        Employee.revision += 1
+
+    @observed
+    def reset_hours(self, at=None) -> None:
+        """
+        Начинает новый расчетный период сотрудника: часы обнуляются.
+
+        Обнуляется счетчик часов без отметок, а граница периода журнала
+        (TimeLog.start) переносится на at: отметки до нее сохраняются
+        (hours_between их видит), но в hours_worked больше не входят.
+        Для всего списка сразу - закрытие периода (Storage.close_period).
+
+        Параметры:
+            at (optional): Начало нового периода. По умолчанию - текущее время.
+        """
+        self._hours_worked = 0.0
+        if self._timelog is not None:
+            self._timelog.start = now() if at is None else timestamp(at)
+        Employee.revision += 1
+
+    def hours_between(self, start=None, end=None, project: str = None) -> float:
+        """
+        Возвращает сумму отмеченных часов за промежуток [start, end) за O(log n).
+
+        Часы без отметок времени сюда не входят.
+
+        Параметры:
+            start (optional): Начало промежутка (секунды, datetime или date).
+            end (optional): Конец промежутка, не включается.
+            project (str, optional): Только часы этого проекта.
+
+        Возвращает:
+            float: Сумма часов.
+        """
+        if self.timelog is None:
+            return 0.0
+        return self.timelog.total(start, end, project)
+
     def calculate_pay(self) -> float:
         """
         Рассчитывает заработную плату на основе отработанных часов.
@@ -66,9 +325,8 @@ class Employee:
         Возвращает:
             float: Сумма к выплате.
         """
-        hourly_rate = self.salary / 160
-        pay = hourly_rate * self.hours_worked
-        return round(pay, 2)  # Округляем до копеек
+        # Та же формула, что и в PayrollEngine для всего списка сразу
+        return float(compute_pay(self.salary, self.hours_worked))
 
     def assign_project(self, project_name: str) -> None:
         """
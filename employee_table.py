@@ -0,0 +1,478 @@
+import numpy as np
+import pandas as pd
+
+from employee import Employee, observed
+from payroll import compute_pay
+from timelog import TimeLogs
+
+
+class EmployeeRow(Employee):
+    """
+    Сотрудник, данные которого хранятся в строке EmployeeTable.
+
+    Поддерживает весь интерфейс Employee (add_hours, calculate_pay,
+    assign_project), но читает и пишет атрибуты прямо в колонки таблицы.
+    Колонка часов хранит итог текущего периода: новая отметка сразу
+    прибавляется к ней, а сами отметки лежат в EmployeeTable.timelogs.
+    После удаления строк из таблицы (pop) ранее полученные объекты
+    указывают на сдвинувшиеся строки, поэтому их не следует хранить.
+
+    Атрибуты:
+        table (EmployeeTable): Таблица, которой принадлежит строка.
+        row (int): Номер строки.
+    """
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: "EmployeeTable", row: int) -> None:
+        self.table = table
+        self.row = row
+
+    @property
+    def id(self) -> int:
+        return int(self.table._ids[self.row])
+
+    @property
+    def name(self) -> str:
+        return self.table._names[self.row]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.table._names[self.row] = value
+        self.table.version += 1
+
+    @property
+    def position(self) -> str:
+        return self.table._positions.value(self.table._position_codes[self.row])
+
+    @position.setter
+    def position(self, value: str) -> None:
+        self.table._position_codes[self.row] = self.table._positions.code(value)
+        self.table.version += 1
+
+    @property
+    def salary(self) -> float:
+        return float(self.table._salary[self.row])
+
+    @salary.setter
+    @observed
+    def salary(self, value: float) -> None:
+        self.table._salary[self.row] = value
+        self.table.version += 1
+
+    @property
+    def hours_worked(self) -> float:
+        return float(self.table._hours[self.row])
+
+    @hours_worked.setter
+    @observed
+    def hours_worked(self, value: float) -> None:
+        self.table._hours[self.row] = value
+        self.table.version += 1
+
+    @property
+    def timelog(self):
+        return self.table.timelogs.get(self.id)
+
+    def attach_timelog(self, log, current: float = None) -> None:
+        self.table.timelogs[self.id] = log
+
+    @observed
+    def record_hours(self, hours: float, project: str = None, at=None) -> None:
+        from timelog import TimeLog, now, timestamp
+
+        at = now() if at is None else timestamp(at)
+        log = self.table.timelogs.get(self.id)
+        if log is None:
+            log = self.table.timelogs[self.id] = TimeLog()
+        log.add(hours, self.project if project is None else project, at)
+        if log.start is None or at >= log.start:
+            self.table._hours[self.row] += hours
+        self.table.version += 1
+
+    @observed
+    def reset_hours(self, at=None) -> None:
+        from timelog import now, timestamp
+
+        self.table._hours[self.row] = 0.0
+        log = self.table.timelogs.get(self.id)
+        if log is not None:
+            log.start = now() if at is None else timestamp(at)
+        self.table.version += 1
+
+    @property
+    def project(self) -> str:
+        return self.table._projects.value(self.table._project_codes[self.row])
+
+    @property
+    def project_id(self) -> int:
+        return int(self.table._project_codes[self.row])
+
+    @project.setter
+    @observed
+    def project(self, value: str) -> None:
+        self.table._project_codes[self.row] = self.table._projects.code(value)
+        self.table.version += 1
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EmployeeRow):
+            return NotImplemented
+        return self.table is other.table and self.row == other.row
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.row))
+
+
+class StringPool:
+    """
+    Словарь повторяющихся строк (должностей, проектов).
+
+    Каждая строка хранится один раз и получает целочисленный код.
+
+    Атрибуты:
+        values (list): Строки по коду.
+    """
+
+    def __init__(self, values=()) -> None:
+        self.values = list(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value: str) -> int:
+        """Возвращает код строки, добавляя ее в словарь при необходимости."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def value(self, code: int) -> str:
+        """Возвращает строку по коду."""
+        return self.values[code]
+
+
+class EmployeeTable:
+    """
+    Компактное хранилище большого списка сотрудников.
+
+    ID хранятся в массиве int64, зарплата и часы - в массивах float64,
+    должность - в массиве кодов int32 со словарем строк (StringPool),
+    проект - в массиве int32 номеров справочника Employee.projects, имена - в обычном списке строк (у таблицы из двоичного
+    снимка - в StringColumn, см. snapshot.py). Таблица ведет себя как список сотрудников:
+    поддерживает len, индексацию, перебор, append и pop. При обращении
+    к строке возвращается легкий объект EmployeeRow.
+
+    Атрибуты:
+        version (int): Счетчик изменений, растет при любом изменении данных.
+        timelogs (TimeLogs): Отметки времени {ID сотрудника: TimeLog}
+            (только у сотрудников, у которых они есть).
+    """
+
+    # Массивы-колонки (растут и сдвигаются вместе)
+    _ARRAYS = ('_ids', '_salary', '_hours', '_position_codes', '_project_codes')
+
+    def __init__(self, capacity: int = 16) -> None:
+        """
+        Создает пустую таблицу.
+
+        Параметры:
+            capacity (int, optional): Начальная емкость массивов.
+        """
+        capacity = max(capacity, 1)
+        self._size = 0
+        self._names = []
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._salary = np.empty(capacity, dtype=np.float64)
+        self._hours = np.empty(capacity, dtype=np.float64)
+        self._position_codes = np.empty(capacity, dtype=np.int32)
+        self._project_codes = np.empty(capacity, dtype=np.int32)
+        self._positions = StringPool()
+        # Общий справочник: коды проектов всех таблиц - номера Employee.projects
+        self._projects = Employee.projects
+        self.timelogs = TimeLogs()
+        self.version = 0
+
+    @classmethod
+    def from_columns(cls, names: list, positions: list, salaries, hours, projects: list,
+                     ids=None) -> "EmployeeTable":
+        """
+        Создает таблицу из колонок без создания объектов Employee.
+
+        Данные должны быть уже проверены (см. DataManager.load_employees).
+
+        Параметры:
+            names (list): Имена.
+            positions (list): Должности.
+            salaries: Зарплаты (список или массив).
+            hours: Отработанные часы (список или массив).
+            projects (list | pandas.Categorical): Проекты.
+            ids (optional): ID сотрудников (список или массив).
+                По умолчанию выдаются новые.
+
+        Возвращает:
+            EmployeeTable: Новая таблица.
+        """
+        table = cls(len(names))
+        size = len(names)
+        if ids is None:
+            ids = np.arange(Employee.next_id, Employee.next_id + size)
+        table._ids[:size] = ids
+        if size:
+            Employee.reserve_id(int(table._ids[:size].max()))
+        table._names = list(names)
+        table._salary[:size] = salaries
+        table._hours[:size] = hours
+        position_codes, position_values = pd.factorize(pd.Series(positions, dtype=object))
+        table._position_codes[:size] = position_codes
+        table._project_codes[:size] = Employee.projects.codes(projects)
+        table._positions = StringPool(position_values.tolist())
+        table._size = size
+        return table
+
+    @classmethod
+    def from_arrays(cls, ids: np.ndarray, names, salaries: np.ndarray, hours: np.ndarray,
+                    position_codes: np.ndarray, positions: list,
+                    project_codes: np.ndarray, projects: list,
+                    max_id: int = None) -> "EmployeeTable":
+        """
+        Создает таблицу поверх готовых массивов без копирования.
+
+        Используется при загрузке двоичного снимка (см. snapshot.py):
+        массивы могут быть представлениями отображенного в память файла,
+        тогда данные читаются с диска только при обращении к ним.
+
+        Параметры:
+            ids (numpy.ndarray): ID сотрудников (int64).
+            names: Имена (список или StringColumn).
+            salaries (numpy.ndarray): Зарплаты (float64).
+            hours (numpy.ndarray): Отработанные часы (float64).
+            position_codes (numpy.ndarray): Коды должностей (int32).
+            positions (list): Должности по коду.
+            project_codes (numpy.ndarray): Коды проектов (int32).
+            projects (list): Проекты по коду. Если они совпадают с началом
+                справочника Employee.projects (снимок записан после загрузки
+                projects.json), массив кодов используется как есть, иначе
+                переводится в номера справочника.
+            max_id (int, optional): Наибольший ID; если известен заранее,
+                массив ID не перебирается.
+
+        Возвращает:
+            EmployeeTable: Новая таблица.
+        """
+        table = cls(0)
+        table._size = len(ids)
+        table._ids = ids
+        table._names = names
+        table._salary = salaries
+        table._hours = hours
+        table._position_codes = position_codes
+        mapping = Employee.projects.codes(projects)
+        if not np.array_equal(mapping, np.arange(len(projects))):
+            project_codes = mapping[project_codes]
+        table._project_codes = project_codes
+        table._positions = StringPool(positions)
+        if max_id is None and len(ids):
+            max_id = int(ids.max())
+        if max_id:
+            Employee.reserve_id(max_id)
+        return table
+
+    @classmethod
+    def from_employees(cls, employees) -> "EmployeeTable":
+        """
+        Создает таблицу из списка объектов Employee.
+
+        Параметры:
+            employees (list): Список сотрудников.
+
+        Возвращает:
+            EmployeeTable: Новая таблица.
+        """
+        table = cls.from_columns([e.name for e in employees],
+                                 [e.position for e in employees],
+                                 [e.salary for e in employees],
+                                 [e.hours_worked for e in employees],
+                                 [e.project for e in employees],
+                                 [e.id for e in employees])
+        table.timelogs.update((e.id, e.timelog) for e in employees if e.timelog is not None)
+        return table
+
+    @property
+    def ids(self) -> np.ndarray:
+        """ID всех сотрудников (массив только для чтения)."""
+        return self._readonly(self._ids)
+
+    @property
+    def salaries(self) -> np.ndarray:
+        """Зарплаты всех сотрудников (массив только для чтения)."""
+        return self._readonly(self._salary)
+
+    @property
+    def hours(self) -> np.ndarray:
+        """Отработанные часы всех сотрудников (массив только для чтения)."""
+        return self._readonly(self._hours)
+
+    @property
+    def names(self) -> list:
+        """Имена всех сотрудников."""
+        return list(self._names)
+
+    def name_range(self, start: int, end: int) -> list:
+        """
+        Возвращает имена сотрудников с позиции start до end (не включая).
+
+        В отличие от names, не копирует список имен целиком.
+        """
+        return self._names[start:min(end, self._size)]
+
+    @property
+    def positions(self) -> pd.Categorical:
+        """Должности всех сотрудников в виде категорий."""
+        return pd.Categorical.from_codes(self._position_codes[:self._size],
+                                         categories=self._positions.values)
+
+    @property
+    def projects(self) -> pd.Categorical:
+        """Проекты всех сотрудников в виде категорий."""
+        return pd.Categorical.from_codes(self._project_codes[:self._size],
+                                         categories=self._projects.values)
+
+    def append(self, emp: Employee) -> EmployeeRow:
+        """
+        Добавляет сотрудника в конец таблицы.
+
+        Параметры:
+            emp (Employee): Сотрудник, данные которого копируются в таблицу.
+
+        Возвращает:
+            EmployeeRow: Строка с добавленным сотрудником.
+        """
+        if self._size == len(self._salary):
+            self._grow()
+        row = self._size
+        self._ids[row] = emp.id
+        self._names.append(emp.name)
+        self._salary[row] = emp.salary
+        self._hours[row] = emp.hours_worked
+        self._position_codes[row] = self._positions.code(emp.position)
+        self._project_codes[row] = self._projects.code(emp.project)
+        if emp.timelog is not None:
+            self.timelogs[emp.id] = emp.timelog
+        self._size += 1
+        self.version += 1
+        return EmployeeRow(self, row)
+
+    def pop(self, index: int = -1) -> Employee:
+        """
+        Удаляет сотрудника из таблицы.
+
+        Параметры:
+            index (int, optional): Позиция сотрудника. По умолчанию последний.
+
+        Возвращает:
+            Employee: Отдельная копия удаленного сотрудника.
+
+        Исключения:
+            IndexError: Если позиции нет в таблице.
+        """
+        row = self._row(index)
+        emp = self._copy(row)
+        self.timelogs.pop(emp.id, None)
+        for attr in self._ARRAYS:
+            column = getattr(self, attr)
+            column[row:self._size - 1] = column[row + 1:self._size]
+        del self._names[row]
+        self._size -= 1
+        self.version += 1
+        return emp
+
+    def reset_hours(self, at: int = None) -> None:
+        """
+        Обнуляет часы всех сотрудников одной операцией (закрытие периода).
+
+        Параметры:
+            at (int, optional): Начало нового периода: отметки до него
+                удаляются из журналов (они уже в архиве периода, см. TimeLogs.prune).
+        """
+        self._hours[:self._size] = 0.0
+        if at is not None:
+            self.timelogs.set_start(at)
+            self.timelogs.prune(at)
+        self.version += 1
+
+    def copy(self) -> "EmployeeTable":
+        """
+        Возвращает независимую копию таблицы.
+
+        Возвращает:
+            EmployeeTable: Копия с теми же данными.
+        """
+        table = EmployeeTable(len(self._salary))
+        table._size = self._size
+        table._names = list(self._names)
+        for attr in self._ARRAYS:
+            getattr(table, attr)[:self._size] = getattr(self, attr)[:self._size]
+        table._positions = StringPool(self._positions.values)
+        table.timelogs.update((emp_id, log.copy()) for emp_id, log in self.timelogs.items())
+        return table
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Возвращает данные в виде DataFrame с колонками employees.csv.
+
+        Возвращает:
+            pandas.DataFrame: ID, Имя, Должность, Зарплата, Часы, К_выплате, Проект.
+        """
+        salary = self._salary[:self._size]
+        hours = self._hours[:self._size]
+        return pd.DataFrame({
+            'ID': self._ids[:self._size],
+            'Имя': list(self._names),
+            'Должность': np.asarray(self.positions, dtype=object),
+            'Зарплата': salary,
+            'Часы': hours,
+            'К_выплате': compute_pay(salary, hours),
+            'Проект': np.asarray(self.projects, dtype=object),
+        })
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> EmployeeRow:
+        return EmployeeRow(self, self._row(index))
+
+    def __iter__(self):
+        for row in range(self._size):
+            yield EmployeeRow(self, row)
+
+    def _row(self, index: int) -> int:
+        """Переводит позицию (в том числе отрицательную) в номер строки."""
+        row = index + self._size if index < 0 else index
+        if not 0 <= row < self._size:
+            raise IndexError("Нет сотрудника с такой позицией")
+        return row
+
+    def _copy(self, row: int) -> Employee:
+        """Возвращает отдельный объект Employee с данными строки."""
+        view = EmployeeRow(self, row)
+        emp = Employee.restore(view.name, view.position, view.salary,
+                               view.hours_worked, view.project, view.id)
+        log = self.timelogs.get(emp.id)
+        if log is not None:
+            emp.attach_timelog(log)
+        return emp
+
+    def _grow(self) -> None:
+        """Удваивает емкость массивов."""
+        capacity = max(len(self._salary) * 2, 16)
+        for attr in self._ARRAYS:
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, attr, new)
+
+    def _readonly(self, column: np.ndarray) -> np.ndarray:
+        view = column[:self._size]
+        view.flags.writeable = False
+        return view
+
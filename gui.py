@@ -1,52 +1,139 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from data_manager import DataManager
-from analysis import ChartBuilder
-import os
+from instrument import instrumented
+from project import DEFAULT_PROJECTS
+from widgets import VirtualList
+
+# pandas и matplotlib (data_manager, payroll, analysis) импортируются
+# при первом использовании, уже после того как окно показано
+
 
 class TimeTracker:
-    def __init__(self, root):
+    def __init__(self, root, compact=False, storage="csv", server=None):
         self.root = root
         self.root.title("Учет времени")
         self.root.geometry("1000x950")
         
-        self.data = DataManager()
-        self.employees = self.data.load_employees()
-
-        # Список проектов
-        self.projects = [
-            "Веб-сайт компании",
-            "Мобильное приложение",
-            "База данных",
-            "Аналитика",
-            "Тестирование",
-            "Администрирование"
-        ]
+        # compact - хранить сотрудников в EmployeeTable (для больших списков)
+        self.compact = compact
+        # storage - где хранятся данные: "csv" или "sqlite" (см. storage.open_storage)
+        self.storage = storage
+        # server - адрес SyncServer "хост:порт"; тогда данные общие для всех клиентов
+        self.server = server
+        # Данные загружаются в load_data после первой отрисовки окна
+        self.data = None
+        self.persistence = None
+        self.employees = []
+        self.registry = None
+        self.payroll = None
+        # Найденные сотрудники (SearchResult), пока в поле поиска есть запрос
+        self.filtered = None
+        # Итоги для панели статистики (LiveAggregates), обновляются по шагам
+        self.stats = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Список проектов; после загрузки - из справочника проектов (Employee.projects)
+        self.projects = list(DEFAULT_PROJECTS)
+
+        self.chart = None
+        self.chart_canvas = None
+        self.chart_placeholder = None
+        self.setup_ui()
+
+        self.status_label.config(text="Загрузка данных...")
+        self.after_first_paint(self.load_data)
+
+    def after_first_paint(self, callback):
+        """Вызывает callback после того, как Tk отрисует окно
+
+        Перерисовка виджетов в Tk - это idle-задачи; after_idle ставит
+        callback за ними, а after(0) переносит его на следующий проход
+        цикла событий, когда окно уже на экране.
+        """
+        self.root.after_idle(self.root.after, 0, callback)
+
+    def load_data(self):
+        """Загружает сотрудников (pandas) и заполняет список; график - следующим шагом"""
+        from persistence import PersistenceWorker
+        from storage import open_storage
+
+        if self.server:
+            from remote import RemoteStorage
+            try:
+                self.data = RemoteStorage(self.server)
+                self.data.subscribe()
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Ошибка", f"Не удалось подключиться к серверу {self.server}: {e}")
+                self.root.destroy()
+                return
+        else:
+            self.data = open_storage("data", self.storage)
+        # Запись на диск идет в фоновом потоке, чтобы не блокировать интерфейс
+        self.persistence = PersistenceWorker(self.data)
+        self.data.worker = self.persistence
+        self.use_roster(self.data.load_employees(compact=self.compact))
+        self.update_projects()
 
         if not self.employees:
             self.create_example()
 
-        self.current_selection = 0
-        self.setup_ui()
-
+        self.update_list()
         if self.employees:
-            self.listbox.selection_set(0)
-            self.on_select(None)
+            self.employee_list.select_index(0)
+            self.on_select()
+        self.status_label.config(text="")
+
+        self.root.after(200, self.poll_persistence)
+        # Панель статистики (matplotlib) строится, когда список уже виден
+        self.after_first_paint(self.show_chart)
+
+    def use_roster(self, employees):
+        """Делает employees текущим списком: реестр, расчет и итоги строятся заново"""
+        from aggregates import LiveAggregates
+        from payroll import PayrollEngine
+        from registry import EmployeeRegistry
+
+        if self.stats is not None:
+            self.stats.close()
+        self.employees = employees
+        self.registry = EmployeeRegistry(employees)
+        self.payroll = PayrollEngine(employees)
+        self.stats = LiveAggregates(self.registry)
+
+    def update_projects(self):
+        """Заполняет выбор проекта из справочника проектов (проекты по умолчанию всегда в нем)"""
+        from employee import Employee
+
+        for title in DEFAULT_PROJECTS:
+            Employee.projects.code(title)
+        self.projects = Employee.projects.titles(assigned_only=True)
+        self.project_combo.config(values=self.projects)
+        self.new_project_combo.config(values=self.projects)
 
     def create_example(self):
         from employee import Employee
-        self.employees = [
+        from employee_table import EmployeeTable
+
+        employees = [
             Employee("Иван", "Программист", 100000),
             Employee("Мария", "Дизайнер", 80000),
             Employee("Алексей", "Тестировщик", 70000)
         ]
-        self.employees[0].add_hours(160)
-        self.employees[0].project = "Веб-сайт компании"
-        self.employees[1].add_hours(120)
-        self.employees[1].project = "Мобильное приложение"
-        self.employees[2].add_hours(140)
-        self.employees[2].project = "Тестирование"
+        # Проект назначается до часов: отметки времени списываются на текущий проект
+        employees[0].project = "Веб-сайт компании"
+        employees[0].add_hours(160)
+        employees[1].project = "Мобильное приложение"
+        employees[1].add_hours(120)
+        employees[2].project = "Тестирование"
+        employees[2].add_hours(140)
+
+        if self.compact:
+            employees = EmployeeTable.from_employees(employees)
+        self.use_roster(employees)
+
+        # Пример сразу записывается снимком: журнал применяется поверх
+        # сохраненного списка и не содержит создания этих сотрудников
+        self.persistence.submit_snapshot(self.employees)
 
     def setup_ui(self):
         # Основной контейнер
@@ -60,20 +147,26 @@ class TimeTracker:
         tk.Label(content_frame, text="Учет времени", font=('Arial', 14, 'bold')).pack(pady=10)
 
         # Список сотрудников
-        tk.Label(content_frame, text="Список сотрудников:").pack(anchor='w', padx=15)
+        tk.Label(content_frame, text="Список сотрудников (Ctrl/Shift - выбрать несколько):").pack(anchor='w', padx=15)
+
+        # Поиск по части имени, должности или проекта - список сужается при вводе
+        search_frame = tk.Frame(content_frame)
+        search_frame.pack(fill=tk.X, padx=20)
+        tk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=40)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add('write', lambda *args: self.update_list())
 
         list_frame = tk.Frame(content_frame)
         list_frame.pack(fill=tk.X, padx=20, pady=5)
 
-        self.listbox = tk.Listbox(list_frame, height=6,
-                                 selectbackground='lightblue', selectmode=tk.SINGLE,
-                                 exportselection=False)
-        list_scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.listbox.yview)
-        self.listbox.configure(yscrollcommand=list_scrollbar.set)
-
-        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.listbox.bind('<<ListboxSelect>>', self.on_select)
+        # Отрисовываются только видимые строки; выбор хранится по ID сотрудника
+        self.employee_list = VirtualList(list_frame, format_item=self.format_employee,
+                                         on_select=self.on_select, key=lambda emp: emp.id,
+                                         height=6, multiple=True,
+                                         selectbackground='lightblue')
+        self.employee_list.pack(fill=tk.BOTH, expand=True)
 
         self.update_list()
 
@@ -100,8 +193,6 @@ class TimeTracker:
         tk.Label(form_frame, text="Проект:").grid(row=3, column=0, sticky='w', pady=5)
         self.project_combo = ttk.Combobox(form_frame, values=self.projects, width=27, state='readonly')
         self.project_combo.grid(row=3, column=1, pady=5, padx=5)
-        self.project_combo.bind('<FocusIn>', self.preserve_selection)
-        self.project_combo.bind('<FocusOut>', self.preserve_selection)
 
         # Часы
         tk.Label(form_frame, text="Добавить часов:").grid(row=4, column=0, sticky='w', pady=5)
@@ -124,6 +215,8 @@ class TimeTracker:
         # Кнопка "Очистить все" тоже в том же ряду
         tk.Button(btn_frame, text="Очистить все", command=self.clear_data,
                  bg='darkred', fg='white', width=12).pack(side=tk.LEFT, padx=2)
+        tk.Button(btn_frame, text="Закрыть период", command=self.close_period,
+                 width=12).pack(side=tk.LEFT, padx=2)
 
         # Новый сотрудник
         new_frame = tk.LabelFrame(content_frame, text="Новый сотрудник", padx=15, pady=15)
@@ -154,39 +247,54 @@ class TimeTracker:
         graph_frame = tk.LabelFrame(content_frame, text="Статистика", padx=15, pady=15)
         graph_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
+        # Итоги по всему списку (из LiveAggregates, без пересчета списка)
+        self.stats_label = tk.Label(graph_frame, text="", anchor='w')
+        self.stats_label.pack(fill=tk.X)
+
         self.graph_area = tk.Frame(graph_frame)
         self.graph_area.pack(fill=tk.BOTH, expand=True)
 
-        self.show_chart()
+        # Строка состояния: результат последней записи на диск
+        self.status_label = tk.Label(main_frame, text="", anchor='w', fg='gray')
+        self.status_label.pack(fill=tk.X, padx=20)
 
-    def preserve_selection(self, event=None):
-        selection = self.listbox.curselection()
-        if selection:
-            self.current_selection = selection[0]
+    @staticmethod
+    def format_employee(emp):
+        project_info = f" ({emp.project})" if hasattr(emp, 'project') and emp.project else ""
+        return f"{emp.name} - {emp.position}{project_info}"
 
+    @instrumented
     def update_list(self):
-        self.listbox.delete(0, tk.END)
-        for emp in self.employees:
-            project_info = f" ({emp.project})" if hasattr(emp, 'project') and emp.project else ""
-            self.listbox.insert(tk.END, f"{emp.name} - {emp.position}{project_info}")
-
-    def on_select(self, event):
-        selection = self.listbox.curselection()
-        if not selection:
-            if self.employees and hasattr(self, 'current_selection'):
-                try:
-                    self.listbox.selection_set(self.current_selection)
-                    selection = (self.current_selection,)
-                except:
-                    if self.employees:
-                        self.listbox.selection_set(0)
-                        selection = (0,)
-
-        if not selection:
+        """Полностью перезагружает список (после загрузки, очистки данных или изменения поиска)"""
+        query = self.search_var.get()
+        if query.strip() and self.registry is not None:
+            from search import SearchResult
+
+            self.filtered = SearchResult(self.employees, self.registry.search(query))
+            self.employee_list.set_items(self.filtered)
+        else:
+            self.filtered = None
+            self.employee_list.set_items(self.employees)
+
+    def selected_position(self):
+        """Позиция выбранного сотрудника в self.employees (строки списка при поиске - не позиции)"""
+        index = self.employee_list.selected_index()
+        if index is None or self.filtered is None:
+            return index
+        return self.filtered.position(index)
+
+    def refresh_row(self, position):
+        """Перерисовывает строку сотрудника с позицией position, если она есть в списке"""
+        index = position if self.filtered is None else self.filtered.index(position)
+        if index is not None:
+            self.employee_list.refresh_item(index)
+
+    def on_select(self, index=None):
+        index = self.selected_position()
+        if index is None:
             return
 
-        self.current_selection = selection[0]
-        emp = self.employees[selection[0]]
+        emp = self.employees[index]
 
         self.name_entry.delete(0, tk.END)
         self.name_entry.insert(0, emp.name)
@@ -203,75 +311,118 @@ class TimeTracker:
             self.project_combo.set("")
 
     def save_employee(self):
-        selection = self.listbox.curselection()
-        if not selection:
-            if hasattr(self, 'current_selection') and self.current_selection < len(self.employees):
-                self.listbox.selection_set(self.current_selection)
-                selection = (self.current_selection,)
-
-        if not selection:
+        index = self.selected_position()
+        if index is None:
             messagebox.showwarning("Ошибка", "Выберите сотрудника")
             return
 
-        emp = self.employees[selection[0]]
-
-        emp.name = self.name_entry.get()
-        emp.position = self.position_entry.get()
+        emp = self.employees[index]
 
         try:
-            emp.salary = float(self.salary_entry.get())
+            salary = float(self.salary_entry.get())
         except:
             messagebox.showerror("Ошибка", "Неправильная зарплата")
             return
 
-        emp.project = self.project_combo.get()
+        # Через реестр, чтобы обновились индексы по имени и проекту
+        self.registry.update(emp.id, self.name_entry.get(), self.position_entry.get(), salary)
+        old_project = emp.project
+        self.registry.assign_project(emp.id, self.project_combo.get())
 
-        self.update_list()
-        self.show_chart()
+        self.refresh_row(index)
+        self.show_chart(changed=[index])
         
         try:
-            self.data.save_employees(self.employees)
-            messagebox.showinfo("Успех", "Изменения сохранены и данные записаны в файл")
+            self.data.log_update(emp)
+            if emp.project != old_project:
+                self.data.log_assign_project(emp.id, emp.project)
+            messagebox.showinfo("Успех", "Изменения сохранены")
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {e}")
 
     def add_hours(self):
-        selection = self.listbox.curselection()
-        if not selection:
+        index = self.selected_position()
+        if index is None:
             messagebox.showwarning("Ошибка", "Выберите сотрудника")
             return
 
+        from employee import valid_hours
+        from timelog import now
+
         try:
             hours = float(self.hours_entry.get())
         except:
             messagebox.showerror("Ошибка", "Введите число часов")
             return
 
-        emp = self.employees[selection[0]]
-        emp.add_hours(hours)
+        # То же правило, что в Employee.add_hours и при загрузке табелей
+        if not valid_hours(hours):
+            messagebox.showerror("Ошибка", "Количество часов должно быть положительным")
+            return
 
-        self.update_list()
-        self.show_chart()
+        # Отмечено несколько сотрудников - часы добавляются всем одной операцией
+        ids = [emp_id for emp_id in self.employee_list.selected_keys() if emp_id in self.registry]
+        if len(ids) > 1:
+            self.add_hours_batch(sorted(ids, key=self.registry.position), hours)
+            return
+
+        emp = self.employees[index]
+        at = now()
+        emp.add_hours(hours, at=at)
+
+        try:
+            self.data.log_add_hours(emp.id, hours, at=at, project=emp.project)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {e}")
+
+        self.show_chart(changed=[index])
         messagebox.showinfo("Успех", f"Добавлено {hours} часов")
 
+    def add_hours_batch(self, ids, hours):
+        """Добавляет hours часов каждому из сотрудников ids: одна запись журнала и одна перерисовка"""
+        from timelog import now
+
+        projects = [self.registry.get(emp_id).project for emp_id in ids]
+        at = now()
+        try:
+            batch = self.registry.add_hours_batch(zip(ids, [hours] * len(ids), projects), at=at)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+
+        try:
+            self.data.log_add_hours_batch(ids, [hours] * len(ids), at=at, projects=projects)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {e}")
+
+        self.show_chart(changed=batch.positions)
+        messagebox.showinfo("Успех", f"Добавлено {batch.hours:g} часов сотрудникам: {batch.count}")
+
     def delete_employee(self):
-        selection = self.listbox.curselection()
-        if not selection:
+        index = self.selected_position()
+        if index is None:
             messagebox.showwarning("Ошибка", "Выберите сотрудника")
             return
 
-        emp = self.employees[selection[0]]
+        emp = self.employees[index]
         if messagebox.askyesno("Удалить", f"Удалить сотрудника {emp.name}?"):
-            self.employees.pop(selection[0])
-            self.update_list()
+            emp_id = emp.id
+            self.stats.remove(self.registry.remove(emp_id))
+            if self.filtered is None:
+                self.employee_list.item_removed(index)
+            else:
+                self.update_list()
             self.show_chart()
             
             try:
-                self.data.save_employees(self.employees)
+                self.data.log_delete(emp_id)
             except:
                 pass
 
     def add_employee(self):
+        if self.data is None:
+            return  # данные еще загружаются
+
         name = self.new_name.get().strip()
         position = self.new_position.get().strip()
 
@@ -292,9 +443,13 @@ class TimeTracker:
         if project:
             emp.project = project
 
-        self.employees.append(emp)
+        self.stats.add(self.registry.add(emp))
 
-        self.update_list()
+        if self.filtered is None:
+            self.employee_list.item_added()
+        else:
+            self.update_list()
+        self.show_chart()
         self.new_name.delete(0, tk.END)
         self.new_position.delete(0, tk.END)
         self.new_position.insert(0, "Сотрудник")
@@ -303,34 +458,147 @@ class TimeTracker:
         self.new_project_combo.set("")
         
         try:
-            self.data.save_employees(self.employees)
+            self.data.log_create(emp)
         except:
             pass
 
-    def show_chart(self):
-        """Используем ChartBuilder из analysis.py для создания графиков"""
-        for widget in self.graph_area.winfo_children():
-            widget.destroy()
+    @instrumented
+    def show_chart(self, changed=None):
+        """Обновляет график (PaymentChart из analysis.py) на месте
 
+        Фигура и холст создаются один раз; changed - позиции сотрудников,
+        у которых поменялись только данные (без добавления и удаления).
+        """
+        self.show_stats()
         if not self.employees:
-            tk.Label(self.graph_area, text="Нет данных для отображения графика").pack(pady=50)
+            if self.chart_canvas is not None:
+                self.chart_canvas.get_tk_widget().pack_forget()
+            if self.chart_placeholder is None:
+                self.chart_placeholder = tk.Label(self.graph_area, text="Нет данных для отображения графика")
+                self.chart_placeholder.pack(pady=50)
             return
 
-        # Используем ChartBuilder для создания графика
-        fig = ChartBuilder.create_payment_chart(self.employees)
-        
-        canvas = FigureCanvasTkAgg(fig, self.graph_area)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        if self.chart_placeholder is not None:
+            self.chart_placeholder.destroy()
+            self.chart_placeholder = None
+
+        if self.chart is None:
+            from analysis import PaymentChart
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.chart = PaymentChart()
+            self.chart_canvas = FigureCanvasTkAgg(self.chart.figure, self.graph_area)
+            self.chart.attach(self.chart_canvas)
+
+        self.chart.update(self.employees, self.payroll, changed,
+                          limits=(self.stats.max_pay, self.stats.max_hours))
+
+        widget = self.chart_canvas.get_tk_widget()
+        if not widget.winfo_manager():
+            widget.pack(fill=tk.BOTH, expand=True)
+        self.chart.refresh()
+
+    def show_stats(self):
+        """Выводит итоги по списку и по проектам из LiveAggregates"""
+        totals = self.stats.totals()
+        pay = f"{totals['К_выплате']:,.2f}".replace(',', ' ')
+        projects = ", ".join(f"{project}: {values['Часы']:g} ч"
+                             for project, values in self.stats.by_project().items())
+        self.stats_label.config(text=f"Сотрудников: {totals['Сотрудников']}   "
+                                     f"Часы: {totals['Часы']:g}   К выплате: {pay} руб.\n{projects}",
+                                justify=tk.LEFT)
 
     def clear_data(self):
+        if self.data is None:
+            return  # данные еще загружаются
+
         if messagebox.askyesno("Очистить", "Удалить все данные?"):
-            self.employees = []
+            self.use_roster([])
             self.update_list()
             self.show_chart()
             
+            self.persistence.submit_clear()
+
+    def close_period(self):
+        """Архивирует расчет за период (data/periods) и обнуляет часы всех сотрудников"""
+        if self.data is None:
+            return  # данные еще загружаются
+
+        if not messagebox.askyesno("Закрыть период", "Сохранить расчет за период в архив и обнулить часы?"):
+            return
+        # Архив должен включать все уже добавленные часы
+        self.persistence.flush()
+        try:
+            entry = self.data.close_period(self.registry)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось закрыть период: {e}")
+            return
+        # Часы поменялись у всех сотрудников: итоги строятся заново
+        self.use_roster(self.employees)
+        self.update_list()
+        self.show_chart()
+        pay = f"{entry['К_выплате']:,.2f}".replace(',', ' ')
+        messagebox.showinfo("Успех", f"Период {entry['period']} закрыт: {entry['Часы']:g} ч, "
+                                     f"к выплате {pay} руб.")
+
+    def poll_persistence(self):
+        """Показывает результаты фоновой записи (вызывается через root.after)"""
+        for ok, message in self.persistence.poll():
+            if ok:
+                self.status_label.config(text=f"Данные записаны в файл ({message})")
+            else:
+                self.status_label.config(text="Ошибка записи в файл")
+                messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {message}")
+        if self.server:
+            for event in self.data.poll_events():
+                self.apply_remote(event)
+        self.root.after(200, self.poll_persistence)
+
+    def apply_remote(self, event):
+        """Применяет уведомление сервера об изменениях других клиентов"""
+        from journal import ADD_HOURS_BATCH, CREATE, DELETE, RESET_HOURS, apply_record
+
+        if event["event"] == "disconnected":
+            self.status_label.config(text=f"Нет соединения с сервером {self.server}")
+            return
+        if event["event"] == "records":
+            records = event["records"]
             try:
-                if os.path.exists(self.data.employees_file):
-                    os.remove(self.data.employees_file)
-            except:
-                pass
+                for record in records:
+                    apply_record(self.registry, record)
+            except (KeyError, IndexError):
+                event = {"event": "reload"}  # список разошелся с сервером
+            else:
+                if not any(record["op"] in (CREATE, DELETE, RESET_HOURS) for record in records):
+                    ids = set()
+                    for record in records:
+                        ids.update(record["ids"] if record["op"] == ADD_HOURS_BATCH else [record["id"]])
+                    changed = sorted(self.registry.position(emp_id) for emp_id in ids)
+                    for index in changed:
+                        self.refresh_row(index)
+                    self.show_chart(changed=changed)
+                    return
+                # Сотрудники добавлены или удалены (или закрыт период): индексы и итоги строятся заново
+                self.use_roster(self.employees)
+        if event["event"] == "reload":
+            self.use_roster(self.data.load_employees(compact=self.compact))
+            self.update_projects()
+        self.update_list()
+        self.show_chart()
+
+    def on_close(self):
+        """Дописывает несохраненные изменения и закрывает окно"""
+        if self.persistence is None:
+            self.root.destroy()
+            return
+
+        try:
+            self.persistence.close()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {e}")
+        if self.server:
+            self.data.close()
+        for ok, message in self.persistence.poll():
+            if not ok:
+                messagebox.showerror("Ошибка", f"Не удалось сохранить данные в файл: {message}")
+        self.root.destroy()
@@ -0,0 +1,199 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+import journal
+from employee import valid_hours
+
+
+# Колонки табеля: кто, сколько часов и (необязательно) на каком проекте
+TIMESHEET_COLUMNS = ('Имя', 'Часы', 'Проект')
+
+# Причины, по которым строка табеля не применяется
+REJECT_FORMAT = "формат"
+REJECT_HOURS = "часы"
+REJECT_UNKNOWN = "неизвестный сотрудник"
+REJECT_AMBIGUOUS = "неоднозначное имя"
+
+
+def read_timesheet(path: str, chunk_size: int = 100_000, fmt: str = None):
+    """
+    Читает табель по частям, не загружая файл целиком.
+
+    CSV читается через pandas с chunksize, JSONL - построчно
+    (одна строка - объект с ключами "Имя", "Часы", "Проект").
+
+    Параметры:
+        path (str): Путь к файлу табеля.
+        chunk_size (int, optional): Строк в одной части.
+        fmt (str, optional): "csv" или "jsonl". По умолчанию - по расширению.
+
+    Возвращает:
+        iterator: Пары (DataFrame с колонками TIMESHEET_COLUMNS,
+            число нечитаемых строк JSONL).
+
+    Исключения:
+        ValueError: Если формат неизвестен или в CSV нет колонок Имя и Часы.
+    """
+    fmt = fmt or ("jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson") else "csv")
+    if fmt == "csv":
+        # Часы не приводятся к float при чтении: одна испорченная строка
+        # не должна останавливать загрузку, она отклоняется в apply_chunk
+        reader = pd.read_csv(path, chunksize=chunk_size, encoding='utf-8',
+                             dtype={'Имя': str, 'Проект': str},
+                             usecols=lambda column: column in TIMESHEET_COLUMNS)
+        with reader:
+            for chunk in reader:
+                if 'Имя' not in chunk.columns or 'Часы' not in chunk.columns:
+                    raise ValueError(f"В табеле {path} нет колонок 'Имя' и 'Часы'")
+                yield chunk.reindex(columns=TIMESHEET_COLUMNS), 0
+    elif fmt == "jsonl":
+        with open(path, encoding='utf-8') as f:
+            while True:
+                lines = [line for line, _ in zip(f, range(chunk_size))]
+                if not lines:
+                    return
+                rows = []
+                bad = 0
+                for line in lines:
+                    try:
+                        row = json.loads(line)
+                        rows.append((row['Имя'], row['Часы'], row.get('Проект')))
+                    except (ValueError, KeyError, TypeError):
+                        bad += 1
+                yield pd.DataFrame(rows, columns=TIMESHEET_COLUMNS, dtype=object), bad
+    else:
+        raise ValueError(f"Неизвестный формат табеля: {fmt}")
+
+
+class TimesheetIngest:
+    """
+    Пакетное применение табелей к сохраненным сотрудникам без интерфейса.
+
+    Табель читается частями фиксированного размера, поэтому память
+    не растет с размером файла. Каждая часть проверяется целиком:
+    часы - по тому же правилу, что Employee.add_hours (valid_hours),
+    сотрудник ищется по имени. Часы одного сотрудника внутри части
+    суммируются, и в журнал уходит одна запись add_hours_batch на всю
+    часть (плюс assign_project для сотрудников, у которых в табеле указан
+    другой проект) одним сбросом на диск.
+
+    Журнал не рассчитан на запись из нескольких процессов, поэтому табели
+    не следует загружать, пока открыт графический интерфейс с теми же данными.
+
+    Атрибуты:
+        data (DataManager): Хранилище сотрудников.
+        rows (int): Прочитано строк.
+        applied (int): Применено строк.
+        rejected (dict): Отклонено строк по причинам.
+        seconds (float): Время обработки.
+    """
+
+    def __init__(self, data, report=print) -> None:
+        """
+        Параметры:
+            data (DataManager): Хранилище сотрудников.
+            report (callable, optional): Куда выводить ход загрузки.
+        """
+        self.data = data
+        self.report = report
+        employees = data.load_employees(compact=True)
+        self._ids = employees.ids
+        # Текущий проект каждого сотрудника - чтобы не писать лишние assign_project
+        self._projects = list(employees.projects)
+
+        # Имя -> позиция в списке (-1 если имя есть у нескольких сотрудников)
+        self._index = {}
+        ambiguous = set()
+        for i, name in enumerate(employees.names):
+            if name in self._index:
+                ambiguous.add(name)
+            self._index.setdefault(name, i)
+        for name in ambiguous:
+            self._index[name] = -1
+
+        self.rows = 0
+        self.applied = 0
+        self.rejected = {}
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость обработки в строках в секунду."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def ingest(self, path: str, chunk_size: int = 100_000, fmt: str = None) -> None:
+        """
+        Применяет табель из файла.
+
+        Параметры:
+            path (str): Путь к CSV или JSONL.
+            chunk_size (int, optional): Строк в одной части.
+            fmt (str, optional): "csv" или "jsonl". По умолчанию - по расширению.
+        """
+        start = time.perf_counter()
+        for chunk, bad in read_timesheet(path, chunk_size, fmt):
+            self.rows += bad
+            self._reject(REJECT_FORMAT, bad)
+            self.apply_chunk(chunk)
+            self.seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            self.report(f"{path}: {_number(self.rows)} строк, {_number(self.rows_per_second)} строк/с")
+        self.seconds += time.perf_counter() - start
+
+    def apply_chunk(self, chunk: pd.DataFrame) -> None:
+        """
+        Проверяет и применяет одну часть табеля.
+
+        Параметры:
+            chunk (pd.DataFrame): Строки с колонками TIMESHEET_COLUMNS.
+        """
+        self.rows += len(chunk)
+
+        hours = pd.to_numeric(chunk['Часы'], errors='coerce')
+        ok_hours = valid_hours(hours)
+        self._reject(REJECT_HOURS, int((~ok_hours).sum()))
+
+        index = chunk['Имя'].map(self._index)
+        self._reject(REJECT_UNKNOWN, int((ok_hours & index.isna()).sum()))
+        self._reject(REJECT_AMBIGUOUS, int((ok_hours & (index == -1)).sum()))
+
+        ok = ok_hours & (index >= 0)
+        self.applied += int(ok.sum())
+        if not ok.any():
+            return
+
+        index = index[ok].astype('int64')
+        totals = hours[ok].groupby(index, sort=True).sum()
+        records = [{"op": journal.ADD_HOURS_BATCH,
+                    "ids": self._ids[totals.index].tolist(), "hours": totals.tolist()}]
+
+        projects = chunk['Проект'][ok]
+        named = projects.notna() & (projects != "")
+        for i, project in projects[named].groupby(index[named]).last().items():
+            if self._projects[i] != project:
+                self._projects[i] = project
+                records.append({"op": journal.ASSIGN_PROJECT, "id": int(self._ids[i]),
+                                "project": project})
+
+        self.data.append_records(records)
+
+    def summary(self) -> str:
+        """Возвращает итог загрузки одной строкой."""
+        text = (f"Прочитано {_number(self.rows)}, применено {_number(self.applied)} строк "
+                f"за {self.seconds:.2f} с ({_number(self.rows_per_second)} строк/с)")
+        if self.rejected:
+            text += "; отклонено: " + ", ".join(f"{reason} - {_number(count)}"
+                                                for reason, count in self.rejected.items())
+        return text
+
+    def _reject(self, reason: str, count: int) -> None:
+        if count:
+            self.rejected[reason] = self.rejected.get(reason, 0) + count
+
+
+def _number(value: float) -> str:
+    """Целое число с пробелами между разрядами: 1 234 567."""
+    return f"{value:,.0f}".replace(',', ' ')
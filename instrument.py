@@ -0,0 +1,237 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+
+# Переменные окружения: файл для результатов (включает замеры)
+# и учет выделений памяти (tracemalloc, заметно замедляет работу)
+PROFILE_ENV = "TIMETRACKER_PROFILE"
+MEMORY_ENV = "TIMETRACKER_PROFILE_MEMORY"
+
+# Границы корзин гистограммы времени вызова, мс
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_enabled = False
+_memory = False
+_profiler = None
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class CallStats:
+    """
+    Накопленные замеры одной функции.
+
+    Атрибуты:
+        calls (int): Количество вызовов.
+        total (float): Суммарное время, с.
+        max (float): Самый долгий вызов, с.
+        histogram (list): Количество вызовов по корзинам BUCKETS_MS
+            (последняя - дольше BUCKETS_MS[-1]).
+        alloc_total (int): Сумма пиков выделенной памяти, байт.
+        alloc_max (int): Наибольший пик выделенной памяти за вызов, байт.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.alloc_total = 0
+        self.alloc_max = 0
+
+    def add(self, seconds: float, allocated: int = None) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(BUCKETS_MS) and ms > BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        if allocated is not None:
+            self.alloc_total += allocated
+            self.alloc_max = max(self.alloc_max, allocated)
+
+    def to_dict(self) -> dict:
+        labels = [f"<={edge}" for edge in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        result = {
+            'calls': self.calls,
+            'total_s': round(self.total, 6),
+            'mean_ms': round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'histogram_ms': dict(zip(labels, self.histogram)),
+        }
+        if _memory:
+            result['alloc_peak_bytes'] = {
+                'mean': self.alloc_total // self.calls if self.calls else 0,
+                'max': self.alloc_max,
+            }
+        return result
+
+
+def enabled() -> bool:
+    """Включены ли замеры."""
+    return _enabled
+
+
+def enable(output: str = None, memory: bool = False) -> None:
+    """
+    Включает замеры.
+
+    Функции, помеченные instrumented, замеряются, только если замеры
+    включены до импорта их модулей: при выключенных замерах декоратор
+    возвращает функцию без изменений (без накладных расходов). Поэтому
+    main.py включает замеры сразу после разбора аргументов.
+
+    Параметры:
+        output (str, optional): Файл, куда при выходе записываются
+            результаты: .prof - дамп cProfile (для pstats и snakeviz),
+            иначе - JSON (см. report). None - не записывать.
+        memory (bool, optional): Учитывать пик выделенной памяти за вызов
+            (tracemalloc).
+    """
+    global _enabled, _memory, _profiler
+    _enabled = True
+    if memory and not _memory:
+        import tracemalloc
+
+        _memory = True
+        tracemalloc.start()
+    if output is None:
+        return
+    if output.endswith(".prof"):
+        import cProfile
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+        atexit.register(write_profile, output)
+    else:
+        atexit.register(write_json, output)
+
+
+def disable() -> None:
+    """
+    Выключает замеры для функций, помеченных после этого вызова,
+    и останавливает учет памяти и cProfile. Накопленные замеры сохраняются.
+    """
+    global _enabled, _memory
+    _enabled = False
+    if _memory:
+        import tracemalloc
+
+        _memory = False
+        tracemalloc.stop()
+    if _profiler is not None:
+        _profiler.disable()
+
+
+def instrumented(func=None, *, name: str = None):
+    """
+    Декоратор: считает вызовы, время и (по желанию) память функции.
+
+    Параметры:
+        func (callable): Функция или метод.
+        name (str, optional): Имя в отчете. По умолчанию - Класс.метод.
+
+    Возвращает:
+        callable: Обернутая функция или сама func, если замеры выключены.
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    if not _enabled:
+        return func
+    key = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        track_memory = _memory
+        start_memory = _enter_memory() if track_memory else 0
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = _exit_memory(start_memory) if track_memory else None
+            with _lock:
+                stats = _stats.get(key)
+                if stats is None:
+                    stats = _stats[key] = CallStats()
+                stats.add(elapsed, allocated)
+    return wrapper
+
+
+def report() -> dict:
+    """
+    Возвращает накопленные замеры.
+
+    Возвращает:
+        dict: {имя функции: {'calls', 'total_s', 'mean_ms', 'max_ms',
+            'histogram_ms' и при учете памяти 'alloc_peak_bytes'}}.
+    """
+    with _lock:
+        return {key: stats.to_dict() for key, stats in sorted(_stats.items())}
+
+
+def reset() -> None:
+    """Сбрасывает накопленные замеры."""
+    with _lock:
+        _stats.clear()
+
+
+def write_json(path: str) -> None:
+    """Записывает report() в JSON файл."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report(), f, ensure_ascii=False, indent=2)
+
+
+def write_profile(path: str) -> None:
+    """Записывает дамп cProfile (если профилировщик запущен через enable)."""
+    if _profiler is None:
+        return
+    _profiler.disable()
+    _profiler.dump_stats(path)
+
+
+def _enter_memory() -> int:
+    """
+    Начинает учет памяти вызова.
+
+    tracemalloc хранит один пик на процесс, поэтому перед сбросом пика
+    текущий пик сохраняется для внешнего (объемлющего) вызова: стек
+    хранит для каждого вызова память на входе и наибольший пик, уже
+    потерянный при сбросах во вложенных вызовах. Потоки учитываются
+    приблизительно: пик общий.
+    """
+    import tracemalloc
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    stack.append([current, current])
+    return current
+
+
+def _exit_memory(start: int) -> int:
+    """Заканчивает учет памяти вызова и возвращает пик сверх памяти на входе."""
+    import tracemalloc
+
+    stack = _local.stack
+    _, peak = tracemalloc.get_traced_memory()
+    _, seen = stack.pop()
+    top = max(peak, seen)
+    if stack:
+        stack[-1][1] = max(stack[-1][1], top)
+    return top - start
+
+
+if os.environ.get(PROFILE_ENV):
+    enable(os.environ[PROFILE_ENV], memory=bool(os.environ.get(MEMORY_ENV)))
@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+
+
+# Операции журнала
+CREATE = "create"
+DELETE = "delete"
+ADD_HOURS = "add_hours"
+ADD_HOURS_BATCH = "add_hours_batch"
+ASSIGN_PROJECT = "assign_project"
+UPDATE = "update"
+RESET_HOURS = "reset_hours"
+CHECKPOINT = "checkpoint"
+
+
+def fsync_dir(path: str) -> None:
+    """
+    Сбрасывает на диск запись каталога, чтобы переименование пережило сбой.
+
+    На системах без поддержки fsync для каталогов (Windows) ничего не делает.
+
+    Параметры:
+        path (str): Путь к каталогу.
+    """
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Атомарно заменяет содержимое файла.
+
+    Данные пишутся во временный файл рядом с целевым, сбрасываются
+    на диск через fsync и затем переименовываются поверх path.
+    После сбоя на диске остается либо старая, либо новая версия файла.
+
+    Параметры:
+        path (str): Путь к файлу.
+        data (bytes): Новое содержимое.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(path))
+
+
+def apply_record(registry, record: dict, entries_upto: int = 0) -> None:
+    """
+    Применяет одну запись журнала к списку сотрудников.
+
+    Сотрудник в записи задается полем "id". Записи старого формата
+    с позицией в списке ("index", "indices") тоже поддерживаются.
+    Запись add_hours (или add_hours_batch) со временем ("at") добавляет
+    отметку времени; без времени (старые записи, табели) - только часы.
+    Запись reset_hours (закрытие периода) обнуляет часы всех сотрудников
+    и удаляет отметки до времени закрытия (они в архиве периода).
+
+    Параметры:
+        registry (EmployeeRegistry): Реестр над списком сотрудников;
+            список изменяется на месте, индексы реестра обновляются.
+        record (dict): Запись журнала.
+        entries_upto (int, optional): Номер последней записи, отметки которой
+            уже загружены отдельно (см. DataManager); для таких записей
+            прибавляются только часы.
+
+    Исключения:
+        ValueError: Если операция неизвестна.
+        KeyError: Если сотрудника из записи нет в списке.
+    """
+    from employee import Employee
+
+    op = record["op"]
+    if op == CREATE:
+        registry.add(Employee.restore(record["name"], record["position"],
+                                      record["salary"], record["hours"],
+                                      record["project"], record.get("id")))
+    elif op == DELETE:
+        registry.remove(_record_id(registry, record))
+    elif op == ADD_HOURS:
+        emp = registry.get(_record_id(registry, record))
+        if "at" in record and (not entries_upto or record["seq"] > entries_upto):
+            emp.record_hours(record["hours"], record.get("project"), record["at"])
+        else:
+            emp.hours_worked += record["hours"]
+    elif op == ADD_HOURS_BATCH:
+        if "ids" in record:
+            targets = [registry.get(emp_id) for emp_id in record["ids"]]
+        else:
+            targets = [registry.employees[index] for index in record["indices"]]
+        if "at" in record and (not entries_upto or record["seq"] > entries_upto):
+            for emp, hours, project in zip(targets, record["hours"], record["projects"]):
+                emp.record_hours(hours, project, record["at"])
+        else:
+            for emp, hours in zip(targets, record["hours"]):
+                emp.hours_worked += hours
+    elif op == ASSIGN_PROJECT:
+        registry.assign_project(_record_id(registry, record), record["project"])
+    elif op == UPDATE:
+        registry.update(_record_id(registry, record), record["name"],
+                        record["position"], record["salary"])
+    elif op == RESET_HOURS:
+        registry.reset_hours(record["at"])
+    elif op != CHECKPOINT:
+        raise ValueError(f"Неизвестная операция журнала: {op}")
+
+
+def _record_id(registry, record: dict) -> int:
+    """ID сотрудника из записи (в записях старого формата - по позиции)."""
+    if "id" in record:
+        return record["id"]
+    return registry.employees[record["index"]].id
+
+
+class Journal:
+    """
+    Журнал изменений, в который записи только дописываются.
+
+    Каждая запись - одна JSON строка с порядковым номером seq.
+    После записи файл сбрасывается на диск (fsync), поэтому
+    подтвержденная запись не теряется при сбое.
+
+    Когда изменения переносятся в снимок (файл с полными данными),
+    в журнал добавляется запись checkpoint с номером последней учтенной
+    записи и отпечатком снимка. При чтении записи до checkpoint
+    пропускаются только если снимок на диске совпадает с отпечатком -
+    так сбой между заменой снимка и очисткой журнала не приводит
+    к повторному применению изменений.
+
+    Атрибуты:
+        path (str): Путь к файлу журнала.
+        last_seq (int): Номер последней записанной записи.
+        lock (threading.Lock): Блокировка записи в журнал.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Открывает журнал и определяет номер последней записи.
+
+        Параметры:
+            path (str): Путь к файлу журнала.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        records = self._read(repair=True)
+        self.last_seq = records[-1]["seq"] if records else 0
+
+    def size(self) -> int:
+        """Возвращает размер файла журнала в байтах."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def append(self, op: str, **fields) -> int:
+        """
+        Дописывает одну запись в журнал.
+
+        Параметры:
+            op (str): Операция (CREATE, DELETE, ADD_HOURS, ...).
+            **fields: Данные операции.
+
+        Возвращает:
+            int: Номер записанной записи.
+        """
+        return self.append_many([dict(fields, op=op)])
+
+    def append_many(self, records: list) -> int:
+        """
+        Дописывает несколько записей с одним сбросом на диск.
+
+        Параметры:
+            records (list): Список словарей с ключом "op".
+
+        Возвращает:
+            int: Номер последней записанной записи.
+        """
+        with self.lock:
+            lines = []
+            for record in records:
+                self.last_seq += 1
+                lines.append(json.dumps(dict(record, seq=self.last_seq), ensure_ascii=False))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return self.last_seq
+
+    def records(self, snapshot_token) -> list:
+        """
+        Возвращает записи, которые нужно применить поверх снимка.
+
+        Параметры:
+            snapshot_token (callable): Функция без аргументов, возвращающая
+                отпечаток текущего снимка. Вызывается только если в журнале
+                есть записи checkpoint.
+
+        Возвращает:
+            list: Записи журнала (без checkpoint) в порядке записи.
+        """
+        records = self._read()
+        checkpoints = [r for r in records if r["op"] == CHECKPOINT]
+        skip_upto = 0
+        if checkpoints and len(checkpoints) < len(records):
+            token = snapshot_token()
+            for checkpoint in checkpoints:
+                if checkpoint["base"] == token:
+                    skip_upto = checkpoint["upto"]
+        return [r for r in records if r["op"] != CHECKPOINT and r["seq"] > skip_upto]
+
+    def checkpoint(self, upto: int, token: str, replace_snapshot) -> None:
+        """
+        Переносит записи до upto в снимок и удаляет их из журнала.
+
+        Порядок действий: запись checkpoint в журнал, замена снимка
+        (replace_snapshot), перезапись журнала только с оставшимися
+        записями. Запись в журнал на это время блокируется.
+
+        Параметры:
+            upto (int | None): Номер последней записи, учтенной в снимке;
+                None - все записи, сделанные к этому моменту.
+            token (str): Отпечаток нового снимка.
+            replace_snapshot (callable): Функция, атомарно заменяющая снимок;
+                получает номер последней учтенной записи.
+        """
+        with self.lock:
+            if upto is None:
+                upto = self.last_seq
+            marker = {"op": CHECKPOINT, "upto": upto, "base": token}
+            self.last_seq += 1
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(dict(marker, seq=self.last_seq), ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            replace_snapshot(upto)
+
+            tail = [r for r in self._read() if r["op"] != CHECKPOINT and r["seq"] > upto]
+            lines = [dict(marker, seq=upto)] + tail
+            atomic_write(self.path, "".join(
+                json.dumps(r, ensure_ascii=False) + "\n" for r in lines).encode('utf-8'))
+
+    def clear(self) -> None:
+        """Удаляет файл журнала."""
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.last_seq = 0
+
+    def _read(self, repair: bool = False) -> list:
+        """
+        Читает все целые записи журнала.
+
+        Недописанная последняя строка (сбой во время записи) отбрасывается.
+
+        Параметры:
+            repair (bool, optional): Обрезать файл до последней целой записи,
+                чтобы следующие записи не склеились с оборванной строкой.
+        """
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        valid_end = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_end += len(line)
+            file_end = f.seek(0, os.SEEK_END)
+        if repair and valid_end < file_end:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+                os.fsync(f.fileno())
+        return records
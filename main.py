@@ -1,7 +1,213 @@
-from gui import TimeTracker
-import tkinter as tk
+import argparse
+
+
+def run_ingest(args) -> None:
+    """Применяет табели из файлов без графического интерфейса."""
+    from ingest import TimesheetIngest
+    from storage import open_storage
+
+    data = open_storage(args.data, args.storage)
+    loader = TimesheetIngest(data)
+    for path in args.files:
+        loader.ingest(path, chunk_size=args.chunk_size, fmt=args.format)
+    data.wait_for_compaction()
+    print(loader.summary())
+
+
+def run_transfer(args) -> None:
+    """Выгружает сотрудников в CSV или заменяет их данными из CSV."""
+    from storage import open_storage
+
+    data = open_storage(args.data, args.storage)
+    if args.command == "export":
+        count = data.export_csv(args.file)
+        print(f"Выгружено сотрудников: {count}")
+    else:
+        count = data.import_csv(args.file)
+        print(f"Загружено сотрудников: {count}")
+
+
+def run_report(args) -> None:
+    """Печатает сводный расчет зарплаты по нескольким папкам данных."""
+    from report import company_report, format_report
+
+    try:
+        report = company_report(args.folders, args.storage, args.workers)
+    except FileNotFoundError as e:
+        print(e)
+        return
+    print(format_report(report))
+
+
+def run_charts(args) -> None:
+    """Выгружает графики по проектам (и общий график) в папку."""
+    import os
+
+    from chart_export import ChartCache, export_chart, export_project_charts
+    from storage import open_storage
+
+    employees = open_storage(args.data, args.storage).load_employees(compact=True)
+    if not len(employees):
+        print("Нет сотрудников")
+        return
+    cache = None if args.no_cache else ChartCache(os.path.join(args.data, "chart_cache"))
+    paths = export_project_charts(employees, args.folder, args.format, cache=cache, workers=args.workers)
+    export_chart(employees, os.path.join(args.folder, f"все.{args.format}"), cache=cache)
+    print(f"Графиков: {len(paths) + 1} в папке {args.folder}")
+    if cache is not None:
+        print(f"Из кэша: {cache.hits}, нарисовано: {cache.misses}")
+
+
+def run_periods(args) -> None:
+    """Закрывает расчетный период или печатает итоги закрытых периодов."""
+    from registry import EmployeeRegistry
+    from storage import open_storage
+
+    data = open_storage(args.data, args.storage)
+    if args.command == "close-period":
+        registry = EmployeeRegistry(data.load_employees(compact=True))
+        try:
+            entry = data.close_period(registry, args.period)
+        except ValueError as e:
+            print(e)
+            return
+        data.wait_for_compaction()
+        print(f"Период {entry['period']} закрыт: сотрудников {entry['Сотрудников']}, "
+              f"часов {entry['Часы']:g}, к выплате {entry['К_выплате']:.2f}")
+        return
+    archive = data.periods()
+    if not len(archive):
+        print("Закрытых периодов нет")
+    elif args.project:
+        print(archive.project_totals(args.project).to_string())
+    else:
+        print(archive.totals().to_string())
+
+
+def run_export_report(args) -> None:
+    """Выгружает расчет (из текущих данных или закрытого периода) в файл отчета частями."""
+    import os
+
+    from report_export import csv_chunks, export_report, roster_chunks
+    from storage import open_storage
+
+    data = open_storage(args.data, args.storage)
+    if args.period:
+        archive = data.periods()
+        try:
+            entry = archive.entry(args.period)
+        except KeyError as e:
+            print(e.args[0])
+            return
+        chunks = csv_chunks(os.path.join(archive.folder, entry["file"]), args.chunk_size)
+    else:
+        chunks = roster_chunks(data.load_employees(compact=True), args.chunk_size)
+    group_by = None if args.group_by == "нет" else args.group_by
+    total = export_report(chunks, args.file, args.format, args.project, args.position, group_by)
+    print(f"Выгружено сотрудников: {total.count}, часов {total.hours:g}, "
+          f"к выплате {total.cents / 100:.2f} в файл {args.file}")
+
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = TimeTracker(root)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Учет рабочего времени сотрудников")
+    parser.add_argument("--compact", action="store_true",
+                        help="хранить сотрудников в компактной таблице (для больших списков)")
+    parser.add_argument("--storage", choices=("csv", "binary", "sqlite"), default="csv",
+                        help="хранилище данных: CSV с журналом, двоичный снимок с журналом "
+                             "или база SQLite (при первом запуске данные переносятся из CSV)")
+    parser.add_argument("--server", metavar="ХОСТ:ПОРТ",
+                        help="работать с данными на сервере (python main.py serve) вместо папки data")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="замерять загрузку, сохранение, график и список; при выходе "
+                             "записать замеры в FILE (JSON) или дамп cProfile (FILE.prof)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="вместе с --profile учитывать выделение памяти (медленнее)")
+    commands = parser.add_subparsers(dest="command")
+
+    ingest_parser = commands.add_parser("ingest", help="загрузить табели (CSV или JSONL) без интерфейса")
+    ingest_parser.add_argument("files", nargs="+", help="файлы табелей с колонками Имя, Часы, Проект")
+    ingest_parser.add_argument("--format", choices=("csv", "jsonl"),
+                               help="формат файлов (по умолчанию - по расширению)")
+    ingest_parser.add_argument("--chunk-size", type=int, default=100_000,
+                               help="строк в одной части (память не зависит от размера файла)")
+    ingest_parser.add_argument("--data", default="data", help="папка с данными")
+
+    for name, help_text in (("export", "выгрузить сотрудников в CSV файл"),
+                            ("import", "заменить сотрудников данными из CSV файла")):
+        transfer_parser = commands.add_parser(name, help=help_text)
+        transfer_parser.add_argument("file", help="CSV файл с колонками employees.csv")
+        transfer_parser.add_argument("--data", default="data", help="папка с данными")
+
+    serve_parser = commands.add_parser("serve", help="сервер, через который несколько клиентов "
+                                                     "работают с одной папкой данных")
+    serve_parser.add_argument("--data", default="data", help="папка с данными")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="адрес (по умолчанию - только этот компьютер)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="порт")
+
+    charts_parser = commands.add_parser("charts", help="выгрузить графики по проектам в PNG или SVG")
+    charts_parser.add_argument("folder", help="папка для графиков")
+    charts_parser.add_argument("--data", default="data", help="папка с данными")
+    charts_parser.add_argument("--format", choices=("png", "svg"), default="png", help="формат файлов")
+    charts_parser.add_argument("--workers", type=int,
+                               help="число процессов для рисования (по умолчанию - по числу ядер)")
+    charts_parser.add_argument("--no-cache", action="store_true",
+                               help="не использовать кэш графиков (папка chart_cache в папке данных)")
+
+    report_parser = commands.add_parser("report", help="сводный расчет зарплаты по нескольким папкам данных")
+    report_parser.add_argument("folders", nargs="+", help="папки с данными (например, по отделам)")
+    report_parser.add_argument("--workers", type=int,
+                               help="число процессов (по умолчанию - по числу ядер)")
+    close_parser = commands.add_parser("close-period", help="сохранить расчет за период в архив "
+                                                            "(папка periods) и обнулить часы")
+    close_parser.add_argument("--period", help="название периода (по умолчанию - месяц ГГГГ-ММ)")
+    close_parser.add_argument("--data", default="data", help="папка с данными")
+
+    periods_parser = commands.add_parser("periods", help="итоги закрытых периодов")
+    periods_parser.add_argument("--project", help="итоги одного проекта")
+    periods_parser.add_argument("--data", default="data", help="папка с данными")
+
+    export_report_parser = commands.add_parser("export-report", help="выгрузить расчет с итогами в CSV, "
+                                                                     "JSONL или текст для бухгалтерии")
+    export_report_parser.add_argument("file", help="файл отчета (.csv, .jsonl, .txt; .gz - со сжатием)")
+    export_report_parser.add_argument("--format", choices=("csv", "jsonl", "fixed"),
+                                      help="формат (по умолчанию - по расширению; fixed - колонки "
+                                           "фиксированной ширины)")
+    export_report_parser.add_argument("--project", action="append", help="только этот проект (можно несколько)")
+    export_report_parser.add_argument("--position", action="append",
+                                      help="только эта должность (можно несколько)")
+    export_report_parser.add_argument("--group-by", choices=("Проект", "Должность", "нет"), default="Проект",
+                                      help="итоги по группам (по умолчанию - по проектам)")
+    export_report_parser.add_argument("--period", help="выгрузить закрытый период из архива")
+    export_report_parser.add_argument("--chunk-size", type=int, default=50_000,
+                                      help="строк в одной части (память не зависит от числа сотрудников)")
+    export_report_parser.add_argument("--data", default="data", help="папка с данными")
+    args = parser.parse_args()
+    if args.profile:
+        # До импорта остальных модулей: декоратор instrumented проверяет это при импорте
+        import instrument
+        instrument.enable(args.profile, memory=args.profile_memory)
+
+    if args.command == "ingest":
+        run_ingest(args)
+    elif args.command in ("export", "import"):
+        run_transfer(args)
+    elif args.command == "report":
+        run_report(args)
+    elif args.command == "charts":
+        run_charts(args)
+    elif args.command in ("close-period", "periods"):
+        run_periods(args)
+    elif args.command == "export-report":
+        run_export_report(args)
+    elif args.command == "serve":
+        from server import run_server
+        from storage import open_storage
+
+        run_server(open_storage(args.data, args.storage), args.host, args.port)
+    else:
+        import tkinter as tk
+        from gui import TimeTracker
+
+        root = tk.Tk()
+        app = TimeTracker(root, compact=args.compact, storage=args.storage, server=args.server)
+        root.mainloop()
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+
+# Норма часов в месяц: оклад делится на нее, чтобы получить часовую ставку
+HOURS_PER_MONTH = 160
+
+# Колонки таблицы расчета (совпадают с колонками employees.csv)
+PAYROLL_COLUMNS = ('ID', 'Имя', 'Должность', 'Зарплата', 'Часы', 'К_выплате', 'Проект')
+
+
+def compute_pay(salary, hours):
+    """
+    Рассчитывает сумму к выплате: (оклад / 160) * часы, с округлением до копеек.
+
+    Работает одинаково для отдельных чисел и для массивов numpy / колонок
+    pandas, поэтому Employee.calculate_pay и PayrollEngine считают
+    по одной формуле.
+
+    Параметры:
+        salary (float | numpy.ndarray): Месячный оклад.
+        hours (float | numpy.ndarray): Отработанные часы.
+
+    Возвращает:
+        float | numpy.ndarray: Сумма к выплате.
+    """
+    if isinstance(salary, (int, float)) and isinstance(hours, (int, float)):
+        # Для одного сотрудника numpy медленнее; round(x * 100) / 100
+        # округляет так же, как np.round(x, 2)
+        return round(salary / HOURS_PER_MONTH * hours * 100) / 100
+    return np.round(np.divide(salary, HOURS_PER_MONTH) * hours, 2)
+
+
+class PayrollEngine:
+    """
+    Расчет зарплаты для всего списка сотрудников за один проход.
+
+    Собирает зарплаты и часы в массивы, считает выплаты векторно
+    и строит сводки по проектам и должностям (суммы, средние, процентили).
+    Результаты кэшируются, пока не изменятся данные сотрудников:
+    для списка Employee это отслеживается счетчиком Employee.revision
+    и длиной списка, для EmployeeTable - ее счетчиком version.
+
+    Атрибуты:
+        employees (list | EmployeeTable): Сотрудники для расчета.
+    """
+
+    def __init__(self, employees) -> None:
+        """
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники для расчета.
+        """
+        self.employees = employees
+        self._state = None
+        self._frame = None
+        self._rollups = {}
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Возвращает таблицу расчета с колонками employees.csv.
+
+        Возвращает:
+            pandas.DataFrame: ID, Имя, Должность, Зарплата, Часы, К_выплате, Проект.
+        """
+        self._check_state()
+        if self._frame is None:
+            self._frame = self._build_frame()
+        return self._frame
+
+    def pay(self) -> np.ndarray:
+        """
+        Возвращает суммы к выплате в порядке списка сотрудников.
+
+        Возвращает:
+            numpy.ndarray: Суммы к выплате.
+        """
+        return self.frame()['К_выплате'].to_numpy()
+
+    def totals(self) -> dict:
+        """
+        Возвращает итоги по всему списку.
+
+        Возвращает:
+            dict: Количество сотрудников, сумма часов и сумма к выплате.
+        """
+        df = self.frame()
+        return {
+            'Сотрудников': len(df),
+            'Часы': float(df['Часы'].sum()),
+            'К_выплате': float(df['К_выплате'].sum()),
+        }
+
+    def by_project(self) -> pd.DataFrame:
+        """Сводка по проектам (см. rollup)."""
+        return self.rollup('Проект')
+
+    def by_position(self) -> pd.DataFrame:
+        """Сводка по должностям (см. rollup)."""
+        return self.rollup('Должность')
+
+    def rollup(self, column: str) -> pd.DataFrame:
+        """
+        Группирует расчет по колонке и считает итоги каждой группы.
+
+        Параметры:
+            column (str): 'Проект' или 'Должность'.
+
+        Возвращает:
+            pandas.DataFrame: Индекс - значения колонки; колонки:
+                Сотрудников, Часы, К_выплате, Средняя, Медиана, P90.
+        """
+        df = self.frame()
+        if column not in self._rollups:
+            grouped = df.groupby(column, observed=True, sort=True)
+            pay = grouped['К_выплате']
+            quantiles = pay.quantile([0.5, 0.9]).unstack()
+            self._rollups[column] = pd.DataFrame({
+                'Сотрудников': grouped.size(),
+                'Часы': grouped['Часы'].sum(),
+                'К_выплате': pay.sum().round(2),
+                'Средняя': pay.mean().round(2),
+                'Медиана': quantiles[0.5].round(2),
+                'P90': quantiles[0.9].round(2),
+            })
+        return self._rollups[column]
+
+    def invalidate(self) -> None:
+        """Сбрасывает кэш (например, после замены сотрудника в списке)."""
+        self._state = None
+        self._frame = None
+        self._rollups = {}
+
+    def _check_state(self) -> None:
+        """Сбрасывает кэш, если данные сотрудников изменились."""
+        from employee import Employee
+
+        version = getattr(self.employees, 'version', None)
+        state = (id(self.employees), len(self.employees),
+                 Employee.revision if version is None else version)
+        if state != self._state:
+            self.invalidate()
+            self._state = state
+
+    def _build_frame(self) -> pd.DataFrame:
+        employees = self.employees
+        if hasattr(employees, 'salaries'):
+            ids = employees.ids
+            salaries = employees.salaries
+            hours = employees.hours
+            names, positions, projects = employees.names, employees.positions, employees.projects
+        else:
+            ids = np.fromiter((e.id for e in employees), dtype=np.int64, count=len(employees))
+            salaries = np.fromiter((e.salary for e in employees), dtype=np.float64, count=len(employees))
+            hours = np.fromiter((e.hours_worked for e in employees), dtype=np.float64, count=len(employees))
+            names = [e.name for e in employees]
+            positions = [e.position for e in employees]
+            projects = [e.project for e in employees]
+
+        return pd.DataFrame({
+            'ID': ids,
+            'Имя': names,
+            'Должность': positions,
+            'Зарплата': salaries,
+            'Часы': hours,
+            'К_выплате': compute_pay(salaries, hours),
+            'Проект': projects,
+        }, columns=list(PAYROLL_COLUMNS))
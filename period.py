@@ -0,0 +1,340 @@
+"""
+Закрытие расчетного периода и архив закрытых периодов.
+
+При закрытии периода расчет всех сотрудников (часы и выплаты) один
+раз записывается в отдельный файл периода periods/<период>.csv
+(колонки employees.csv), а часы сотрудников обнуляются. Отметки
+времени до закрытия переносятся в periods/<период>_entries.csv
+и удаляются из текущих данных, поэтому снимок и журналы отметок
+не растут от периода к периоду. Файлы закрытых периодов больше
+не меняются.
+
+Рядом лежит небольшое оглавление periods/manifest.json: итоги каждого
+периода (в целом и по проектам), диапазон ID сотрудников в файле
+и начало текущего периода (Storage.period_start). Итоги за любые
+периоды читаются только из оглавления; файл периода открывается,
+лишь когда нужны строки сотрудников, и только для нужных периодов.
+
+Закрытие идет в три шага: файл периода и отметка pending.json,
+обнуление часов в хранилище, запись в оглавление. Хранилище помнит
+начало периода своих часов, поэтому после сбоя между шагами при
+загрузке видно, дошло ли обнуление до данных: если да, период
+добавляется в оглавление, если нет - закрытие отменяется. Так часы
+не оказываются одновременно в архиве и в текущем периоде.
+
+Запуск:
+    python main.py close-period --period 2026-10
+    python main.py periods
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from journal import atomic_write, fsync_dir
+from payroll import PAYROLL_COLUMNS
+from timelog import TimeLogs, group_entries
+
+
+# Папка архива внутри папки данных и ее оглавление
+PERIODS_FOLDER = "periods"
+MANIFEST_FILE = "manifest.json"
+# Отметка незавершенного закрытия периода (см. PeriodArchive.prepare)
+PENDING_FILE = "pending.json"
+
+# Колонки итогов в оглавлении (как в PayrollEngine.totals)
+TOTAL_COLUMNS = ('Сотрудников', 'Часы', 'К_выплате')
+# Колонки файла отметок закрытого периода
+ENTRY_COLUMNS = ('ID', 'Время', 'Часы', 'Проект')
+
+
+def period_name(at: int) -> str:
+    """
+    Название периода по умолчанию: месяц "ГГГГ-ММ" по местному времени.
+
+    Параметры:
+        at (int): Время внутри периода (секунды, см. timelog.timestamp).
+    """
+    return time.strftime("%Y-%m", time.localtime(at))
+
+
+class PeriodArchive:
+    """
+    Архив закрытых периодов одной папки данных.
+
+    При создании читается только оглавление; файлы периодов
+    открываются при первом запросе их строк (frame, employee_history)
+    и держатся в памяти, пока их не вытеснят более новые запросы.
+
+    Атрибуты:
+        folder (str): Папка архива (data/periods).
+        period_start (int | None): Начало текущего периода - время
+            последнего закрытия (None - периоды еще не закрывались).
+        cache_size (int): Сколько прочитанных периодов держать в памяти.
+        opened (int): Сколько раз файлы периодов читались с диска.
+    """
+
+    def __init__(self, folder: str, cache_size: int = 4) -> None:
+        """
+        Параметры:
+            folder (str): Папка архива.
+            cache_size (int, optional): Сколько прочитанных периодов держать в памяти.
+        """
+        self.folder = folder
+        self.cache_size = cache_size
+        self.opened = 0
+        self.manifest_file = os.path.join(folder, MANIFEST_FILE)
+        self.pending_file = os.path.join(folder, PENDING_FILE)
+        self._frames = OrderedDict()
+        manifest = {}
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'rb') as f:
+                manifest = json.load(f)
+        self.period_start = manifest.get("period_start")
+        self._periods = {entry["period"]: entry for entry in manifest.get("periods", ())}
+
+    def periods(self, start: str = None, end: str = None) -> list:
+        """
+        Возвращает закрытые периоды по порядку.
+
+        Параметры:
+            start (str, optional): Первый период (включительно), например "2026-01".
+            end (str, optional): Последний период (включительно).
+
+        Возвращает:
+            list: Названия периодов.
+        """
+        return [period for period in sorted(self._periods)
+                if (start is None or period >= start) and (end is None or period <= end)]
+
+    def __contains__(self, period: str) -> bool:
+        return period in self._periods
+
+    def __len__(self) -> int:
+        return len(self._periods)
+
+    def entry(self, period: str) -> dict:
+        """
+        Возвращает запись оглавления о периоде.
+
+        Возвращает:
+            dict: 'period', 'file', 'entries' - файл отметок, 'start', 'end',
+                итоги TOTAL_COLUMNS, 'ids' - [наименьший, наибольший] ID
+                и 'projects' - итоги по проектам.
+
+        Исключения:
+            KeyError: Если период не закрыт.
+        """
+        try:
+            return self._periods[period]
+        except KeyError:
+            raise KeyError(f"Период {period} не закрыт") from None
+
+    def totals(self, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Итоги по периодам - из оглавления, без чтения файлов периодов.
+
+        Параметры:
+            start (str, optional): Первый период.
+            end (str, optional): Последний период.
+
+        Возвращает:
+            pandas.DataFrame: Индекс - периоды; колонки TOTAL_COLUMNS.
+        """
+        periods = self.periods(start, end)
+        return pd.DataFrame([[self._periods[p][column] for column in TOTAL_COLUMNS] for p in periods],
+                            index=pd.Index(periods, name='Период'), columns=list(TOTAL_COLUMNS))
+
+    def project_totals(self, project: str, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Итоги одного проекта по периодам - из оглавления.
+
+        Параметры:
+            project (str): Название проекта.
+            start (str, optional): Первый период.
+            end (str, optional): Последний период.
+
+        Возвращает:
+            pandas.DataFrame: Как totals; периоды без проекта - нули.
+        """
+        periods = self.periods(start, end)
+        empty = dict.fromkeys(TOTAL_COLUMNS, 0)
+        rows = [self._periods[p]["projects"].get(project, empty) for p in periods]
+        return pd.DataFrame([[row[column] for column in TOTAL_COLUMNS] for row in rows],
+                            index=pd.Index(periods, name='Период'), columns=list(TOTAL_COLUMNS))
+
+    def frame(self, period: str) -> pd.DataFrame:
+        """
+        Возвращает расчет сотрудников за закрытый период.
+
+        Параметры:
+            period (str): Название периода.
+
+        Возвращает:
+            pandas.DataFrame: Колонки employees.csv на момент закрытия.
+
+        Исключения:
+            KeyError: Если период не закрыт.
+        """
+        frame = self._frames.get(period)
+        if frame is not None:
+            self._frames.move_to_end(period)
+            return frame
+        entry = self.entry(period)
+        frame = pd.read_csv(os.path.join(self.folder, entry["file"]), dtype={'Проект': 'category'})
+        self.opened += 1
+        self._frames[period] = frame
+        while len(self._frames) > self.cache_size:
+            self._frames.popitem(last=False)
+        return frame
+
+    def employee_history(self, emp_id: int, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Часы и выплаты сотрудника по закрытым периодам.
+
+        Читаются только файлы периодов из промежутка, в диапазон ID
+        которых (по оглавлению) попадает сотрудник.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            start (str, optional): Первый период.
+            end (str, optional): Последний период.
+
+        Возвращает:
+            pandas.DataFrame: Индекс - периоды, где сотрудник был в списке;
+                колонки Часы, К_выплате, Проект.
+        """
+        rows = {}
+        for period in self.periods(start, end):
+            low, high = self._periods[period]["ids"]
+            if not low <= emp_id <= high:
+                continue
+            frame = self.frame(period)
+            match = frame.loc[frame['ID'] == emp_id]
+            if len(match):
+                row = match.iloc[0]
+                rows[period] = (float(row['Часы']), float(row['К_выплате']), row['Проект'])
+        return pd.DataFrame(list(rows.values()), index=pd.Index(list(rows), name='Период'),
+                            columns=['Часы', 'К_выплате', 'Проект'])
+
+    def timelogs(self, period: str) -> TimeLogs:
+        """
+        Отметки времени, перенесенные в архив при закрытии периода.
+
+        Параметры:
+            period (str): Название периода.
+
+        Возвращает:
+            TimeLogs: {ID сотрудника: TimeLog}; у периодов, закрытых
+                до переноса отметок в архив, - пустой.
+
+        Исключения:
+            KeyError: Если период не закрыт.
+        """
+        entry = self.entry(period)
+        if "entries" not in entry:
+            return TimeLogs()
+        frame = pd.read_csv(os.path.join(self.folder, entry["entries"]),
+                            dtype={'Проект': str}, keep_default_na=False)
+        self.opened += 1
+        return group_entries(frame['ID'], frame['Время'], frame['Часы'], frame['Проект'].tolist())
+
+    def prepare(self, period: str, payroll, closed_at: int, entries: tuple = None) -> dict:
+        """
+        Записывает файлы закрываемого периода, но еще не добавляет его в оглавление.
+
+        Рядом записывается отметка незавершенного закрытия pending.json
+        с будущей записью оглавления. Период появится в архиве после
+        publish; если до этого произойдет сбой, хранилище при загрузке
+        завершит закрытие или отменит его (см. Storage.finish_close_period).
+
+        Параметры:
+            period (str): Название периода.
+            payroll (PayrollEngine): Расчет сотрудников на момент закрытия.
+            closed_at (int): Время закрытия - начало следующего периода.
+            entries (tuple, optional): Отметки до closed_at колонками
+                (ID, время, часы, проекты; см. timelog.entry_columns) -
+                записываются в <период>_entries.csv.
+
+        Возвращает:
+            dict: Запись оглавления (см. entry).
+
+        Исключения:
+            ValueError: Если период уже закрыт.
+        """
+        if period in self._periods:
+            raise ValueError(f"Период {period} уже закрыт")
+        frame = payroll.frame()
+        totals = payroll.totals()
+        by_project = payroll.by_project()
+        file_name = f"{period}.csv"
+        entries_name = f"{period}_entries.csv"
+        entry = {
+            "period": period,
+            "file": file_name,
+            "entries": entries_name,
+            "start": self.period_start,
+            "end": closed_at,
+            **{column: totals[column] for column in TOTAL_COLUMNS},
+            "ids": [int(frame['ID'].min()), int(frame['ID'].max())] if len(frame) else [0, -1],
+            "projects": {
+                str(project): {'Сотрудников': int(row['Сотрудников']), 'Часы': float(row['Часы']),
+                               'К_выплате': float(row['К_выплате'])}
+                for project, row in by_project.iterrows()
+            },
+        }
+        os.makedirs(self.folder, exist_ok=True)
+        atomic_write(os.path.join(self.folder, file_name),
+                     frame[list(PAYROLL_COLUMNS)].to_csv(index=False).encode('utf-8'))
+        entries = pd.DataFrame(dict(zip(ENTRY_COLUMNS, entries or ((), (), (), ()))),
+                               columns=list(ENTRY_COLUMNS))
+        atomic_write(os.path.join(self.folder, entries_name), entries.to_csv(index=False).encode('utf-8'))
+        atomic_write(self.pending_file, json.dumps(entry, ensure_ascii=False, indent=1).encode('utf-8'))
+        return entry
+
+    def publish(self, entry: dict) -> None:
+        """
+        Добавляет подготовленный период (см. prepare) в оглавление.
+
+        Параметры:
+            entry (dict): Запись оглавления из prepare или pending.
+        """
+        self._periods[entry["period"]] = entry
+        self.period_start = entry["end"]
+        self._write_manifest()
+        self._remove_pending()
+
+    def pending(self):
+        """
+        Возвращает запись незавершенного закрытия (см. prepare).
+
+        Возвращает:
+            dict | None: Запись оглавления или None, если незавершенного закрытия нет.
+        """
+        if not os.path.exists(self.pending_file):
+            return None
+        with open(self.pending_file, 'rb') as f:
+            return json.load(f)
+
+    def discard(self, entry: dict) -> None:
+        """Отменяет незавершенное закрытие: удаляет файлы периода и отметку."""
+        if entry["period"] not in self._periods:
+            for name in filter(None, (entry["file"], entry.get("entries"))):
+                path = os.path.join(self.folder, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        self._remove_pending()
+
+    def _remove_pending(self) -> None:
+        if os.path.exists(self.pending_file):
+            os.remove(self.pending_file)
+            fsync_dir(self.folder)
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "period_start": self.period_start,
+            "periods": [self._periods[period] for period in sorted(self._periods)],
+        }
+        atomic_write(self.manifest_file, json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
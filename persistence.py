@@ -0,0 +1,189 @@
+import queue
+import threading
+import time
+
+from employee import Employee
+from employee_table import EmployeeTable
+
+
+# Виды заданий для PersistenceWorker
+RECORDS = "records"
+SNAPSHOT = "snapshot"
+CLEAR = "clear"
+
+
+def copy_employees(employees):
+    """
+    Возвращает независимую копию списка сотрудников для фоновой записи.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+
+    Возвращает:
+        list | EmployeeTable: Копия того же вида.
+    """
+    if isinstance(employees, EmployeeTable):
+        return employees.copy()
+    copies = []
+    for e in employees:
+        emp = Employee.restore(e.name, e.position, e.salary, e.hours_worked, e.project, e.id)
+        if e.timelog is not None:
+            emp.attach_timelog(e.timelog.copy())
+        copies.append(emp)
+    return copies
+
+
+class PersistenceWorker:
+    """
+    Фоновый поток, который записывает изменения на диск.
+
+    Tk-интерфейс передает в очередь наборы записей журнала или снимки
+    списка сотрудников и сразу продолжает работу. Поток собирает задания,
+    пришедшие за delay секунд, в одну запись: записи журнала дописываются
+    одним вызовом, а из нескольких снимков пишется только последний.
+    Одновременно выполняется не больше одной записи.
+
+    Результаты (успех или ошибка) складываются в очередь и забираются
+    в главном потоке методом poll(), который TimeTracker вызывает через
+    root.after - Tk нельзя трогать из других потоков.
+
+    Атрибуты:
+        data (DataManager): Менеджер данных, через который идет запись.
+        delay (float): Время в секундах, за которое собираются изменения.
+    """
+
+    def __init__(self, data, delay: float = 0.3) -> None:
+        """
+        Параметры:
+            data (DataManager): Менеджер данных.
+            delay (float, optional): Окно объединения изменений в секундах.
+        """
+        self.data = data
+        self.delay = delay
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self._thread.start()
+
+    def submit_records(self, records: list) -> None:
+        """
+        Ставит в очередь записи журнала.
+
+        Параметры:
+            records (list): Записи (словари с ключом "op").
+        """
+        self._submit(RECORDS, list(records))
+
+    def submit_snapshot(self, employees) -> None:
+        """
+        Ставит в очередь полное сохранение списка сотрудников.
+
+        Список копируется сразу, поэтому последующие изменения
+        в интерфейсе не попадут в этот снимок.
+
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники.
+        """
+        self._submit(SNAPSHOT, copy_employees(employees))
+
+    def submit_clear(self) -> None:
+        """Ставит в очередь удаление файлов данных."""
+        self._submit(CLEAR, None)
+
+    def poll(self) -> list:
+        """
+        Забирает накопившиеся результаты записи.
+
+        Возвращает:
+            list: Кортежи (ok, message): ok - True при успехе,
+                message - описание записи или текст ошибки.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def flush(self) -> None:
+        """Ждет, пока все поставленные задания будут записаны."""
+        self._jobs.join()
+
+    def close(self) -> None:
+        """Записывает оставшиеся задания и останавливает поток."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _submit(self, kind: str, payload) -> None:
+        if self._closed:
+            raise RuntimeError("Запись данных уже остановлена")
+        self._jobs.put((kind, payload))
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+
+            batch = [job]
+            deadline = time.monotonic() + self.delay
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._jobs.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+
+            try:
+                self._results.put((True, self._write(batch)))
+            except Exception as e:
+                self._results.put((False, str(e)))
+            finally:
+                for _ in batch:
+                    self._jobs.task_done()
+                if stop:
+                    self._jobs.task_done()
+
+            if stop:
+                return
+
+    def _write(self, batch: list) -> str:
+        """
+        Выполняет пачку заданий одной записью.
+
+        Все, что было до последнего снимка или очистки, уже учтено в нем,
+        поэтому пропускается; записи журнала после него дописываются
+        одним вызовом append_records.
+        """
+        start = 0
+        for i, (kind, _) in enumerate(batch):
+            if kind in (SNAPSHOT, CLEAR):
+                start = i
+
+        done = []
+        kind, payload = batch[start]
+        if kind == SNAPSHOT:
+            self.data.save_employees(payload)
+            done.append("снимок")
+        elif kind == CLEAR:
+            self.data.clear()
+            done.append("очистка")
+
+        records = [record for kind, payload in batch[start:] if kind == RECORDS for record in payload]
+        if records:
+            self.data.append_records(records)
+            done.append(f"изменений: {len(records)}")
+        return ", ".join(done)
@@ -1,12 +1,32 @@
+import json
+import os
+import threading
+
+
+# Проект сотрудника, которого еще никуда не назначили
+UNASSIGNED = "Не назначен"
+
+# Проекты, которые предлагаются в интерфейсе, пока своих проектов нет
+DEFAULT_PROJECTS = [
+    "Веб-сайт компании",
+    "Мобильное приложение",
+    "База данных",
+    "Аналитика",
+    "Тестирование",
+    "Администрирование",
+]
+
+
 class Project:
     """
     Класс, представляющий проект.
 
     Атрибуты:
         title (str): Название проекта.
+        id (int | None): Номер проекта в ProjectRegistry (None - проект не зарегистрирован).
     """
 
-    def __init__(self, title):
+    def __init__(self, title, project_id=None):
         """
         Конструктор для создания экземпляра класса Project.
 
@@ -14,5 +34,186 @@ class Project:
             self: Экземпляр класса Project. (self - это ссылка на создаваемый объект,
                    через которую мы устанавливаем его атрибуты).
             title (str): Название проекта.
+            project_id (int, optional): Номер проекта (выдается ProjectRegistry).
         """
         self.title = title
+        self.id = project_id
+
+    def __repr__(self) -> str:
+        return f"Project({self.title!r}, {self.id})"
+
+
+class ProjectRegistry:
+    """
+    Справочник проектов: каждое название хранится один раз и получает номер.
+
+    Сотрудники хранят не название проекта, а его номер (см. Employee.project_id),
+    поэтому сравнение проектов - сравнение чисел, а колонка проектов
+    EmployeeTable - массив номеров. Номера идут подряд с 0 и не освобождаются,
+    поэтому список названий по номеру подходит как категории pandas.Categorical.
+
+    Справочник общий для процесса, а хранится рядом с сотрудниками
+    в projects.json каждой папки (см. Storage): в файл попадают только
+    проекты этой папки. При загрузке он читается первым, поэтому номера
+    проектов между запусками не меняются, а проекты без сотрудников
+    не теряются.
+
+    Атрибуты:
+        values (list): Названия проектов по номеру.
+    """
+
+    def __init__(self, titles=()) -> None:
+        """
+        Параметры:
+            titles (iterable, optional): Начальные проекты (получают номера по порядку).
+        """
+        self.values = []
+        self._ids = {}
+        # Проекты регистрируются и из фоновой сборки снимка
+        self._lock = threading.Lock()
+        for title in titles:
+            self.code(title)
+
+    def code(self, title: str) -> int:
+        """
+        Возвращает номер проекта, регистрируя новый проект при необходимости.
+
+        Параметры:
+            title (str): Название проекта.
+
+        Возвращает:
+            int: Номер проекта.
+        """
+        project_id = self._ids.get(title)
+        if project_id is None:
+            with self._lock:
+                project_id = self._ids.get(title)
+                if project_id is None:
+                    project_id = len(self.values)
+                    self.values.append(title)
+                    self._ids[title] = project_id
+        return project_id
+
+    def value(self, project_id: int) -> str:
+        """Возвращает название проекта по номеру."""
+        return self.values[project_id]
+
+    def codes(self, titles):
+        """
+        Возвращает номера проектов для колонки названий.
+
+        Каждое различное название ищется в справочнике один раз,
+        а не для каждой строки. Колонка-категория (pandas.Categorical,
+        например прочитанная из CSV с dtype "category") не перебирается:
+        переводятся только ее категории.
+
+        Параметры:
+            titles (list | pandas.Series | pandas.Categorical): Названия проектов.
+
+        Возвращает:
+            numpy.ndarray: Номера (int32).
+        """
+        import numpy as np
+        import pandas as pd
+
+        if isinstance(titles, pd.Series):
+            titles = titles.array
+        if isinstance(titles, pd.Categorical):
+            codes, uniques = titles.codes, titles.categories
+            if (codes < 0).any():
+                # Пустые значения - проект с пустым названием
+                codes = np.where(codes < 0, len(uniques), codes)
+                uniques = list(uniques) + [""]
+        else:
+            codes, uniques = pd.factorize(pd.Series(titles, dtype=object))
+        mapping = np.fromiter((self.code(title) for title in uniques), dtype=np.int32, count=len(uniques))
+        return mapping[codes] if len(codes) else np.empty(0, dtype=np.int32)
+
+    def find(self, title: str):
+        """
+        Возвращает номер проекта по названию.
+
+        Возвращает:
+            int | None: Номер или None, если проекта нет.
+        """
+        return self._ids.get(title)
+
+    def get(self, project_id: int) -> Project:
+        """
+        Возвращает проект по номеру.
+
+        Исключения:
+            KeyError: Если проекта с таким номером нет.
+        """
+        if not 0 <= project_id < len(self.values):
+            raise KeyError(f"Нет проекта с номером {project_id}")
+        return Project(self.values[project_id], project_id)
+
+    def titles(self, assigned_only: bool = False) -> list:
+        """
+        Возвращает названия проектов по номеру.
+
+        Параметры:
+            assigned_only (bool, optional): Без UNASSIGNED и пустого названия
+                (список для выбора проекта в интерфейсе).
+        """
+        if not assigned_only:
+            return list(self.values)
+        return [title for title in self.values if title and title != UNASSIGNED]
+
+    def save(self, path: str, titles: list = None) -> None:
+        """
+        Атомарно записывает справочник в JSON файл.
+
+        Параметры:
+            path (str): Путь к файлу.
+            titles (list, optional): Записать только эти проекты (номера в файле
+                идут подряд с 0 в порядке списка). По умолчанию - весь справочник.
+        """
+        from journal import atomic_write
+
+        titles = self.values if titles is None else titles
+        projects = [{"id": project_id, "title": title} for project_id, title in enumerate(titles)]
+        atomic_write(path, json.dumps({"projects": projects}, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    def load(self, path: str):
+        """
+        Добавляет в справочник проекты из JSON файла.
+
+        Проекты регистрируются в порядке номеров из файла; в новом
+        процессе (пустой справочник) номера совпадают с номерами в файле.
+        Номер из файла, который в справочнике уже занят другим проектом
+        (например, загружена другая папка данных), не принимается:
+        проект находится или регистрируется по названию.
+
+        Параметры:
+            path (str): Путь к файлу (см. save).
+
+        Возвращает:
+            list | None: Названия проектов файла по номеру; None, если файла нет.
+
+        Исключения:
+            ValueError: Если в файле повторяются номера или названия проектов.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            projects = json.load(f)["projects"]
+        ids = [project["id"] for project in projects]
+        titles = [project["title"] for project in projects]
+        if len(set(ids)) != len(ids) or len(set(titles)) != len(titles):
+            raise ValueError(f"В справочнике {path} повторяются номера или названия проектов")
+        titles = [title for _, title in sorted(zip(ids, titles))]
+        for title in titles:
+            self.code(title)
+        return titles
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self._ids
+
+    def __iter__(self):
+        for project_id, title in enumerate(self.values):
+            yield Project(title, project_id)
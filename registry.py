@@ -0,0 +1,367 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# Итог add_hours_batch: позиции измененных сотрудников (по возрастанию),
+# их количество и сумма добавленных часов
+HoursBatch = namedtuple('HoursBatch', ['positions', 'count', 'hours'])
+
+
+class EmployeeRegistry:
+    """
+    Хэш-индексы по списку сотрудников: по ID, по имени и по проекту,
+    и поисковый индекс по части имени, должности или проекта (search).
+
+    Поиск сотрудника по ID, всех сотрудников с данным именем или всех
+    участников проекта выполняется за O(1) вместо перебора списка.
+    Индексы строятся при первом обращении к ним и дальше обновляются
+    по шагам при добавлении, удалении, переименовании и смене проекта.
+    Поэтому эти изменения нужно делать через методы реестра, а не
+    присваиванием атрибутов сотрудника напрямую.
+
+    Индекс ID хранит позицию сотрудника в списке. После удаления позиции
+    следующих сотрудников сдвигаются; они пересчитываются один раз
+    при следующем поиске, начиная с самой ранней удаленной позиции.
+
+    Атрибуты:
+        employees (list | EmployeeTable): Сотрудники, список изменяется на месте.
+    """
+
+    def __init__(self, employees) -> None:
+        """
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники.
+        """
+        self.employees = employees
+        self._positions = None
+        self._stale_from = None
+        self._names = None
+        self._projects = None
+        self._search = None
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def __contains__(self, emp_id: int) -> bool:
+        return emp_id in self._position_index()
+
+    def get(self, emp_id: int):
+        """
+        Возвращает сотрудника по ID.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+
+        Возвращает:
+            Employee: Сотрудник (для EmployeeTable - строка таблицы).
+
+        Исключения:
+            KeyError: Если сотрудника с таким ID нет.
+        """
+        return self.employees[self.position(emp_id)]
+
+    def position(self, emp_id: int) -> int:
+        """
+        Возвращает позицию сотрудника в списке.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+
+        Возвращает:
+            int: Позиция в списке.
+
+        Исключения:
+            KeyError: Если сотрудника с таким ID нет.
+        """
+        try:
+            return self._position_index()[emp_id]
+        except KeyError:
+            raise KeyError(f"Нет сотрудника с ID {emp_id}") from None
+
+    def find_by_name(self, name: str) -> list:
+        """
+        Возвращает сотрудников с данным именем (в порядке списка).
+
+        Параметры:
+            name (str): Полное имя.
+
+        Возвращает:
+            list: Сотрудники; пустой список, если таких нет.
+        """
+        return self._members(self._name_index().get(name, ()))
+
+    def members(self, project: str) -> list:
+        """
+        Возвращает участников проекта (в порядке списка).
+
+        Параметры:
+            project (str): Название проекта.
+
+        Возвращает:
+            list: Сотрудники; пустой список, если таких нет.
+        """
+        return self._members(self._project_index().get(project, ()))
+
+    def member_ids(self, project: str) -> frozenset:
+        """Возвращает ID участников проекта."""
+        return frozenset(self._project_index().get(project, ()))
+
+    def search(self, query: str):
+        """
+        Находит сотрудников по части имени, должности или проекта (см. search.SearchIndex).
+
+        Параметры:
+            query (str): Запрос; регистр не важен, слова ищутся в любом из полей.
+
+        Возвращает:
+            numpy.ndarray: Позиции найденных сотрудников по возрастанию.
+        """
+        return self._search_index().search(query)
+
+    def projects(self) -> dict:
+        """
+        Возвращает число участников каждого проекта.
+
+        Возвращает:
+            dict: {проект: количество сотрудников}.
+        """
+        return {project: len(ids) for project, ids in self._project_index().items()}
+
+    def add(self, emp):
+        """
+        Добавляет сотрудника в конец списка.
+
+        Параметры:
+            emp (Employee): Новый сотрудник.
+
+        Возвращает:
+            Employee: Добавленный сотрудник (для EmployeeTable - строка таблицы).
+
+        Исключения:
+            ValueError: Если сотрудник с таким ID уже есть.
+        """
+        positions = self._position_index()
+        if emp.id in positions:
+            raise ValueError(f"Сотрудник с ID {emp.id} уже есть")
+        self.employees.append(emp)
+        positions[emp.id] = len(self.employees) - 1
+        if self._names is not None:
+            self._names.setdefault(emp.name, set()).add(emp.id)
+        if self._projects is not None:
+            self._projects.setdefault(emp.project, set()).add(emp.id)
+        if self._search is not None:
+            self._search.append(emp.name, emp.position, emp.project)
+        return self.employees[-1]
+
+    def remove(self, emp_id: int):
+        """
+        Удаляет сотрудника из списка.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+
+        Возвращает:
+            Employee: Удаленный сотрудник.
+
+        Исключения:
+            KeyError: Если сотрудника с таким ID нет.
+        """
+        index = self.position(emp_id)
+        emp = self.employees.pop(index)
+        del self._positions[emp_id]
+        if index < len(self.employees):
+            self._stale_from = index if self._stale_from is None else min(self._stale_from, index)
+        self._discard(self._names, emp.name, emp_id)
+        self._discard(self._projects, emp.project, emp_id)
+        if self._search is not None:
+            self._search.remove(index)
+        return emp
+
+    def rename(self, emp_id: int, name: str) -> None:
+        """
+        Меняет имя сотрудника.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            name (str): Новое имя.
+        """
+        emp = self.get(emp_id)
+        if emp.name == name:
+            return
+        self._discard(self._names, emp.name, emp_id)
+        emp.name = name
+        if self._names is not None:
+            self._names.setdefault(name, set()).add(emp_id)
+        self._reindex(emp_id)
+
+    def assign_project(self, emp_id: int, project: str) -> None:
+        """
+        Переводит сотрудника на проект.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            project (str): Название проекта.
+        """
+        emp = self.get(emp_id)
+        if emp.project == project:
+            return
+        self._discard(self._projects, emp.project, emp_id)
+        emp.project = project
+        if self._projects is not None:
+            self._projects.setdefault(project, set()).add(emp_id)
+        self._reindex(emp_id)
+
+    def update(self, emp_id: int, name: str, position: str, salary: float) -> None:
+        """
+        Меняет имя, должность и зарплату сотрудника.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            name (str): Новое имя.
+            position (str): Новая должность.
+            salary (float): Новая зарплата.
+        """
+        self.rename(emp_id, name)
+        emp = self.get(emp_id)
+        emp.position = position
+        emp.salary = salary
+        self._reindex(emp_id)
+
+    def add_hours_batch(self, items, at=None) -> HoursBatch:
+        """
+        Добавляет часы многим сотрудникам одной операцией: всем или никому.
+
+        Сначала проверяются все элементы сразу (часы - одним вызовом
+        valid_hours по массиву, ID - по индексу реестра), и только если
+        ошибок нет, всем добавляются отметки времени. Ничего не выводится
+        (в отличие от Employee.add_hours): итог показывает вызывающий код.
+
+        Параметры:
+            items (iterable): Тройки (ID сотрудника, часы, проект); проект None -
+                текущий проект сотрудника.
+            at (optional): Время отметок (одно на всю операцию). По умолчанию - текущее.
+
+        Возвращает:
+            HoursBatch: Позиции измененных сотрудников по возрастанию,
+            их количество и сумма добавленных часов.
+
+        Исключения:
+            ValueError: Если часы некорректны или сотрудника нет (ничего не меняется).
+        """
+        from employee import valid_hours
+        from timelog import now, timestamp
+
+        items = list(items)
+        if not items:
+            return HoursBatch([], 0, 0.0)
+        try:
+            hours = np.array([item[1] for item in items], dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Количество часов должно быть числом") from None
+        bad_hours = ~valid_hours(hours)
+        if bad_hours.any():
+            ids = [str(items[i][0]) for i in np.flatnonzero(bad_hours)[:5]]
+            raise ValueError(f"Количество часов должно быть положительным (ID: {', '.join(ids)})")
+        index = self._position_index()
+        missing = [str(item[0]) for item in items if item[0] not in index]
+        if missing:
+            raise ValueError(f"Нет сотрудников с ID: {', '.join(missing[:5])}")
+
+        at = now() if at is None else timestamp(at)
+        positions = [index[item[0]] for item in items]
+        for position, item, amount in zip(positions, items, hours.tolist()):
+            self.employees[position].record_hours(amount, item[2], at)
+        positions = sorted(set(positions))
+        return HoursBatch(positions, len(positions), float(hours.sum()))
+
+    def reset_hours(self, at: int) -> None:
+        """
+        Начинает новый расчетный период: часы всех сотрудников обнуляются,
+        отметки до at удаляются из журналов (при закрытии периода они
+        переносятся в архив, см. Storage.close_period).
+
+        Итоги, которые ведутся по шагам (LiveAggregates), нужно после этого
+        построить заново: часы меняются у всех сотрудников сразу.
+
+        Параметры:
+            at (int): Начало нового периода (секунды, см. timelog.timestamp).
+        """
+        if hasattr(self.employees, 'reset_hours'):
+            self.employees.reset_hours(at)
+            return
+        for emp in self.employees:
+            emp.reset_hours(at)
+            if emp.timelog is not None:
+                emp.timelog.prune(at)
+
+    def _position_index(self) -> dict:
+        """Индекс ID -> позиция; строится или досчитывается при необходимости."""
+        if self._positions is None:
+            self._positions = {emp_id: i for i, emp_id in enumerate(self._ids(0))}
+        elif self._stale_from is not None:
+            start = self._stale_from
+            for i, emp_id in enumerate(self._ids(start), start):
+                self._positions[emp_id] = i
+        self._stale_from = None
+        return self._positions
+
+    def _name_index(self) -> dict:
+        if self._names is None:
+            self._names = self._group(self._column('names', 'name'))
+        return self._names
+
+    def _project_index(self) -> dict:
+        if self._projects is None:
+            self._projects = self._group(self._column('projects', 'project'))
+        return self._projects
+
+    def _search_index(self):
+        if self._search is None:
+            from search import FIELDS, SearchIndex
+            employees = self.employees
+            # Колонки EmployeeTable - как есть: категории переводятся один раз
+            self._search = SearchIndex(*(getattr(employees, column) if hasattr(employees, column)
+                                         else [getattr(emp, attr) for emp in employees]
+                                         for column, attr in FIELDS))
+        return self._search
+
+    def _reindex(self, emp_id: int) -> None:
+        """Обновляет поисковый индекс после изменения сотрудника (если индекс уже построен)."""
+        if self._search is not None:
+            emp = self.get(emp_id)
+            self._search.update(self.position(emp_id), emp.name, emp.position, emp.project)
+
+    def _ids(self, start: int) -> list:
+        """ID сотрудников начиная с позиции start."""
+        if hasattr(self.employees, 'ids'):
+            return self.employees.ids[start:].tolist()
+        return [self.employees[i].id for i in range(start, len(self.employees))]
+
+    def _column(self, table_column: str, attr: str) -> list:
+        """Значения атрибута всех сотрудников (у EmployeeTable - колонкой сразу)."""
+        if hasattr(self.employees, table_column):
+            return list(getattr(self.employees, table_column))
+        return [getattr(emp, attr) for emp in self.employees]
+
+    def _group(self, values: list) -> dict:
+        """Строит индекс значение -> множество ID."""
+        index = {}
+        for emp_id, value in zip(self._ids(0), values):
+            index.setdefault(value, set()).add(emp_id)
+        return index
+
+    def _members(self, ids) -> list:
+        positions = sorted(self.position(emp_id) for emp_id in ids)
+        return [self.employees[i] for i in positions]
+
+    @staticmethod
+    def _discard(index, key: str, emp_id: int) -> None:
+        """Убирает ID из группы key индекса (если индекс уже построен)."""
+        if index is None:
+            return
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(emp_id)
+            if not ids:
+                del index[key]
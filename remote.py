@@ -0,0 +1,190 @@
+import json
+import queue
+import socket
+import threading
+
+from storage import Storage
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Разбирает адрес сервера "хост:порт".
+
+    Параметры:
+        address (str): Адрес, например "127.0.0.1:8765".
+
+    Возвращает:
+        tuple: Хост и порт.
+
+    Исключения:
+        ValueError: Если адрес некорректен.
+    """
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Некорректный адрес сервера: {address}")
+    return host or "127.0.0.1", int(port)
+
+
+class RemoteStorage(Storage):
+    """
+    Хранилище на сервере SyncServer (см. server.py).
+
+    Все операции отправляются серверу по одному соединению; ответы
+    и уведомления об изменениях других клиентов читает фоновый поток.
+    Уведомления складываются в очередь и забираются в главном потоке
+    методом poll_events (Tk нельзя трогать из других потоков).
+
+    Атрибуты:
+        data_folder (str): Адрес сервера (для сообщений).
+        timeout (float): Сколько секунд ждать ответа сервера.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0) -> None:
+        """
+        Параметры:
+            address (str): Адрес сервера "хост:порт".
+            timeout (float, optional): Время ожидания ответа в секундах.
+
+        Исключения:
+            OSError: Если сервер недоступен.
+        """
+        super().__init__(address)
+        self.timeout = timeout
+        self._sock = socket.create_connection(parse_address(address), timeout=timeout)
+        self._sock.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+        self._waiting = {}
+        self._events = queue.Queue()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read, name="remote-storage", daemon=True)
+        self._reader.start()
+
+    def load_employees(self, compact: bool = False) -> list:
+        """Загружает текущий список сотрудников с сервера."""
+        from server import restore_rows
+
+        response = self._request("load")
+        self.period_start = response.get("period_start")
+        employees = restore_rows(response["employees"])
+        if compact:
+            from employee_table import EmployeeTable
+            return EmployeeTable.from_employees(employees)
+        return employees
+
+    def save_employees(self, employees) -> bool:
+        """Заменяет всех сотрудников на сервере (другие клиенты перезагружают список)."""
+        from server import employee_rows
+
+        self._request("save", employees=employee_rows(employees))
+        return True
+
+    def append_records(self, records: list) -> None:
+        """
+        Отправляет записи журнала; возвращается, когда сервер их записал.
+
+        Исключения:
+            ValueError: Если сервер отклонил запись (например, сотрудник уже удален).
+        """
+        self._request("apply", records=records)
+
+    def clear(self) -> None:
+        """Удаляет все данные на сервере."""
+        self._request("clear")
+
+    def load_projects(self) -> None:
+        """Справочник проектов хранит сервер; клиент получает проекты вместе с сотрудниками."""
+
+    def save_projects(self, employees=()) -> list:
+        """Справочник проектов хранит сервер."""
+        return []
+
+    def load_period_start(self, data_start: int = None) -> None:
+        """Начало периода приходит от сервера вместе с сотрудниками (см. load_employees)."""
+
+    def finish_close_period(self) -> None:
+        """Незавершенные закрытия периода завершает сервер при загрузке своих данных."""
+
+    def close_period(self, registry, period: str = None, at=None) -> dict:
+        """
+        Закрывает расчетный период на сервере и обнуляет часы в registry.
+
+        Архив периодов хранится на сервере, в его папке данных.
+
+        Исключения:
+            ValueError: Если период уже закрыт.
+        """
+        from timelog import timestamp
+
+        entry = self._request("close_period", period=period, at=timestamp(at))["entry"]
+        registry.reset_hours(entry["end"])
+        self.period_start = entry["end"]
+        return entry
+
+    def subscribe(self) -> None:
+        """Включает уведомления об изменениях других клиентов (см. poll_events)."""
+        self._request("subscribe")
+
+    def poll_events(self) -> list:
+        """
+        Забирает накопившиеся уведомления.
+
+        Возвращает:
+            list: Словари {"event": "records", "records": [...]} или {"event": "reload"}.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self) -> None:
+        """Закрывает соединение с сервером."""
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _request(self, op: str, **fields) -> dict:
+        """Отправляет запрос и ждет ответа с тем же id."""
+        slot = [threading.Event(), None]
+        with self._send_lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self._waiting[request_id] = slot
+            message = dict(fields, op=op, id=request_id)
+            self._sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+        if not slot[0].wait(self.timeout):
+            self._waiting.pop(request_id, None)
+            raise TimeoutError(f"Сервер {self.data_folder} не ответил")
+        response = slot[1]
+        if response is None:
+            raise ConnectionError(f"Соединение с сервером {self.data_folder} закрыто")
+        if not response.get("ok"):
+            raise ValueError(response.get("error", "Ошибка сервера"))
+        return response
+
+    def _read(self) -> None:
+        """Фоновый поток: раздает ответы ожидающим запросам, уведомления - в очередь."""
+        try:
+            for line in self._sock.makefile('rb'):
+                message = json.loads(line)
+                if "event" in message:
+                    self._events.put(message)
+                    continue
+                slot = self._waiting.pop(message.get("id"), None)
+                if slot is not None:
+                    slot[1] = message
+                    slot[0].set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            # Ожидающие запросы получают ошибку соединения
+            for slot in list(self._waiting.values()):
+                slot[0].set()
+            self._waiting.clear()
+            if not self._closed:
+                self._events.put({"event": "disconnected"})
@@ -0,0 +1,143 @@
+"""
+Сводный расчет зарплаты по нескольким папкам данных (отделам, филиалам).
+
+Каждая папка загружается и сворачивается в отдельном процессе
+(ProcessPoolExecutor), родителю возвращаются только итоги папки:
+количество сотрудников, часы и выплаты в целом, по проектам и по
+должностям. Итоги папок складываются в общий отчет. Выплаты
+суммируются в копейках (целые числа), поэтому результат не зависит
+от порядка сложения и числа процессов.
+
+Запуск:
+    python main.py report data/отдел1 data/отдел2 --workers 4
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from payroll import compute_pay
+
+
+# Группировки отчета: колонка расчета -> колонка EmployeeTable
+GROUPS = {'Проект': 'projects', 'Должность': 'positions'}
+
+
+def folder_summary(data_folder: str, backend: str = "csv") -> dict:
+    """
+    Загружает одну папку данных и сворачивает ее в итоги.
+
+    Выполняется в дочернем процессе, поэтому возвращает только
+    небольшой словарь, а не список сотрудников.
+
+    Параметры:
+        data_folder (str): Папка с данными.
+        backend (str, optional): Хранилище (см. storage.open_storage).
+
+    Возвращает:
+        dict: Итоги папки в формате merge_summaries: 'Папок',
+            'Итого' - [сотрудников, часы, копейки] и для каждой
+            группировки {значение: [сотрудников, часы, копейки]}.
+    """
+    from storage import open_storage
+
+    table = open_storage(data_folder, backend).load_employees(compact=True)
+    hours = table.hours
+    cents = np.round(compute_pay(table.salaries, hours) * 100).astype(np.int64)
+    summary = {
+        'Папок': 1,
+        'Итого': [len(hours), float(hours.sum()), int(cents.sum())],
+    }
+    for group, column in GROUPS.items():
+        categories = getattr(table, column)
+        codes = categories.codes
+        size = len(categories.categories)
+        counts = np.bincount(codes, minlength=size)
+        group_hours = np.bincount(codes, weights=hours, minlength=size)
+        # bincount с весами суммирует в float64 - для копеек точно до 2**53
+        group_cents = np.bincount(codes, weights=cents, minlength=size)
+        summary[group] = {value: [count, total_hours, int(total_cents)]
+                          for value, count, total_hours, total_cents in zip(
+                              categories.categories, counts.tolist(),
+                              group_hours.tolist(), group_cents.tolist())
+                          if count}
+    return summary
+
+
+def merge_summaries(summaries) -> dict:
+    """
+    Складывает итоги нескольких папок.
+
+    Параметры:
+        summaries (iterable): Итоги папок (результаты folder_summary).
+
+    Возвращает:
+        dict: Итоги в том же формате.
+    """
+    merged = {'Папок': 0, 'Итого': [0, 0.0, 0]}
+    merged.update({group: {} for group in GROUPS})
+    for summary in summaries:
+        merged['Папок'] += summary['Папок']
+        _add(merged['Итого'], summary['Итого'])
+        for group in GROUPS:
+            target = merged[group]
+            for value, totals in summary[group].items():
+                _add(target.setdefault(value, [0, 0.0, 0]), totals)
+    return merged
+
+
+def company_report(folders: list, backend: str = "csv", workers: int = None) -> dict:
+    """
+    Считает сводный отчет по папкам данных в нескольких процессах.
+
+    Параметры:
+        folders (list): Папки с данными.
+        backend (str, optional): Хранилище всех папок.
+        workers (int, optional): Число процессов. По умолчанию - по числу
+            ядер (но не больше числа папок); 1 - без дочерних процессов.
+
+    Возвращает:
+        dict: Сложенные итоги (см. merge_summaries).
+
+    Исключения:
+        FileNotFoundError: Если какой-то папки нет.
+    """
+    for folder in folders:
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Папка данных не найдена: {folder}")
+    workers = min(workers or os.cpu_count() or 1, len(folders)) or 1
+    backends = [backend] * len(folders)
+    if workers == 1:
+        return merge_summaries(map(folder_summary, folders, backends))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_summaries(pool.map(folder_summary, folders, backends))
+
+
+def format_report(report: dict) -> str:
+    """
+    Оформляет сводный отчет в виде текста.
+
+    Параметры:
+        report (dict): Итоги (см. merge_summaries).
+
+    Возвращает:
+        str: Итоги, выплаты по проектам и часы по должностям.
+    """
+    count, hours, cents = report['Итого']
+    lines = [f"Папок: {report['Папок']}, сотрудников: {count}, "
+             f"часов: {hours:g}, к выплате: {_money(cents)} руб."]
+    for group in GROUPS:
+        lines.append("")
+        lines.append(f"{group:<30} {'Сотрудников':>12} {'Часы':>14} {'К выплате':>18}")
+        for value, (count, hours, cents) in sorted(report[group].items()):
+            lines.append(f"{value:<30} {count:>12} {hours:>14g} {_money(cents):>18}")
+    return "\n".join(lines)
+
+
+def _add(target: list, totals: list) -> None:
+    for i, value in enumerate(totals):
+        target[i] += value
+
+
+def _money(cents: int) -> str:
+    return f"{cents / 100:,.2f}".replace(',', ' ')
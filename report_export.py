@@ -0,0 +1,446 @@
+"""
+Потоковая выгрузка расчета зарплаты в CSV, JSONL или текст с колонками фиксированной ширины.
+
+Отчет собирается из генераторов, каждый из которых обрабатывает
+расчет частями (pandas.DataFrame не больше chunk_size строк):
+
+    источник (roster_chunks, csv_chunks)
+        -> отбор по проектам и должностям (select)
+        -> расчет выплат (with_pay)
+        -> итоги по группам (with_subtotals)
+        -> запись (CsvWriter, JsonlWriter, FixedWidthWriter)
+
+В памяти одновременно находится одна часть и итоги групп (по строке
+на проект или должность), поэтому расход памяти на выгрузку не
+зависит от числа сотрудников. Файл пишется через буфер заданного
+размера во временный файл (при необходимости со сжатием gzip) и
+атомарно заменяет целевой после fsync.
+
+Запуск:
+    python main.py export-report отчет.csv.gz --project Аналитика
+    python main.py export-report отчет.txt --period 2026-09 --group-by Должность
+"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from journal import fsync_dir
+from payroll import PAYROLL_COLUMNS, compute_pay
+
+
+# Строк в одной части и размер буфера записи по умолчанию
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+# Колонки, по которым считаются итоги групп
+GROUP_COLUMNS = ('Проект', 'Должность')
+
+# Колонки источника: расчет без выплат (выплаты считает with_pay)
+SOURCE_COLUMNS = ('ID', 'Имя', 'Должность', 'Зарплата', 'Часы', 'Проект')
+
+# Итоги группы (value - значение колонки column) или всего отчета (value=None).
+# Выплаты - в копейках: сумма не зависит от деления на части
+Subtotal = namedtuple('Subtotal', ['column', 'value', 'count', 'hours', 'cents'])
+
+
+def roster_chunks(employees, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Читает расчет из списка сотрудников в памяти частями.
+
+    Части строятся по мере записи; у EmployeeTable берутся срезы
+    ее колонок (имена - через name_range, без копии всего списка),
+    у списка Employee - по chunk_size объектов.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        chunk_size (int, optional): Строк в одной части.
+
+    Возвращает:
+        iterator: Части с колонками SOURCE_COLUMNS.
+    """
+    if hasattr(employees, 'salaries'):
+        ids, salaries, hours = employees.ids, employees.salaries, employees.hours
+        positions, projects = employees.positions, employees.projects
+        for start in range(0, len(employees), chunk_size):
+            end = start + chunk_size
+            yield pd.DataFrame({
+                'ID': ids[start:end],
+                'Имя': employees.name_range(start, end),
+                'Должность': positions[start:end],
+                'Зарплата': salaries[start:end],
+                'Часы': hours[start:end],
+                'Проект': projects[start:end],
+            }, columns=list(SOURCE_COLUMNS))
+        return
+    iterator = iter(employees)
+    while True:
+        part = list(itertools.islice(iterator, chunk_size))
+        if not part:
+            return
+        yield pd.DataFrame([(e.id, e.name, e.position, e.salary, e.hours_worked, e.project) for e in part],
+                           columns=list(SOURCE_COLUMNS))
+
+
+def csv_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, on_bad_row=None):
+    """
+    Читает расчет из CSV файла с колонками employees.csv частями.
+
+    Подходит для employees.csv, файлов закрытых периодов и выгрузок
+    (в том числе сжатых gzip - по расширению .gz). Файл читает
+    DataManager.read_csv_chunks с типами колонок EMPLOYEE_DTYPES:
+    ошибочные строки пропускаются.
+
+    Параметры:
+        path (str): Путь к файлу.
+        chunk_size (int, optional): Строк в одной части.
+        on_bad_row (callable, optional): См. DataManager.read_csv_chunks.
+
+    Возвращает:
+        iterator: Части с колонками SOURCE_COLUMNS.
+
+    Исключения:
+        FileNotFoundError: Если файл не существует.
+        ValueError: Если в файле нет нужных колонок.
+    """
+    from data_manager import EMPLOYEE_DTYPES, DataManager
+
+    for chunk in DataManager.read_csv_chunks(path, chunk_size=chunk_size, usecols=list(SOURCE_COLUMNS),
+                                             dtypes=EMPLOYEE_DTYPES, on_bad_row=on_bad_row):
+        yield chunk[list(SOURCE_COLUMNS)]
+
+
+def select(chunks, projects=None, positions=None):
+    """
+    Оставляет сотрудников нужных проектов и должностей.
+
+    Параметры:
+        chunks (iterable): Части расчета.
+        projects (iterable, optional): Проекты (None - все).
+        positions (iterable, optional): Должности (None - все).
+
+    Возвращает:
+        iterator: Части без лишних строк (пустые части пропускаются).
+    """
+    projects = None if projects is None else list(projects)
+    positions = None if positions is None else list(positions)
+    for chunk in chunks:
+        if projects is not None:
+            chunk = chunk[chunk['Проект'].isin(projects)]
+        if positions is not None:
+            chunk = chunk[chunk['Должность'].isin(positions)]
+        if len(chunk):
+            yield chunk
+
+
+def with_pay(chunks):
+    """
+    Добавляет к частям колонку К_выплате (см. payroll.compute_pay).
+
+    Возвращает:
+        iterator: Части с колонками PAYROLL_COLUMNS.
+    """
+    for chunk in chunks:
+        chunk = chunk.assign(К_выплате=compute_pay(chunk['Зарплата'].to_numpy(dtype=float),
+                                                   chunk['Часы'].to_numpy(dtype=float)))
+        yield chunk[list(PAYROLL_COLUMNS)]
+
+
+def with_subtotals(chunks, by: str = None):
+    """
+    Пропускает части дальше и считает итоги по ходу.
+
+    После последней части выдаются итоги групп (по возрастанию
+    значения колонки by) и итог всего отчета. Строки не сортируются
+    и не накапливаются: в памяти только суммы по каждому значению.
+
+    Параметры:
+        chunks (iterable): Части расчета с выплатами.
+        by (str, optional): Колонка группировки из GROUP_COLUMNS
+            (None - только общий итог).
+
+    Возвращает:
+        iterator: Части (pandas.DataFrame), затем Subtotal групп и общий Subtotal.
+
+    Исключения:
+        ValueError: Если колонки группировки нет в GROUP_COLUMNS.
+    """
+    if by is not None and by not in GROUP_COLUMNS:
+        raise ValueError(f"Итоги считаются только по колонкам: {', '.join(GROUP_COLUMNS)}")
+    groups = {}
+    total = [0, 0.0, 0]
+    for chunk in chunks:
+        hours = chunk['Часы'].to_numpy(dtype=float)
+        cents = np.round(chunk['К_выплате'].to_numpy(dtype=float) * 100).astype(np.int64)
+        total[0] += len(chunk)
+        total[1] += float(hours.sum())
+        total[2] += int(cents.sum())
+        if by is not None:
+            codes, uniques = pd.factorize(chunk[by], use_na_sentinel=False)
+            counts = np.bincount(codes, minlength=len(uniques))
+            group_hours = np.bincount(codes, weights=hours, minlength=len(uniques))
+            group_cents = np.bincount(codes, weights=cents, minlength=len(uniques))
+            for value, count, value_hours, value_cents in zip(
+                    uniques, counts.tolist(), group_hours.tolist(), group_cents.tolist()):
+                sums = groups.setdefault("" if pd.isna(value) else str(value), [0, 0.0, 0])
+                sums[0] += count
+                sums[1] += value_hours
+                sums[2] += int(value_cents)
+        yield chunk
+    for value in sorted(groups):
+        yield Subtotal(by, value, *groups[value])
+    yield Subtotal(by, None, *total)
+
+
+def _money(cents: int) -> float:
+    return cents / 100
+
+
+def _label(subtotal: Subtotal) -> str:
+    name = "Всего" if subtotal.value is None else f"Итого: {subtotal.value}"
+    return f"{name}, сотрудников {subtotal.count}"
+
+
+@contextmanager
+def open_report(path: str, compress: bool = False, buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Открывает текстовый файл отчета для записи с атомарной заменой.
+
+    Данные пишутся во временный файл рядом с path через буфер
+    buffer_size байт (и сжимаются gzip, если compress). После
+    успешного выхода из блока файл сбрасывается на диск и заменяет
+    path; при исключении временный файл удаляется, а path не меняется.
+
+    Параметры:
+        path (str): Путь к файлу отчета.
+        compress (bool, optional): Сжимать gzip.
+        buffer_size (int, optional): Размер буфера записи в байтах.
+
+    Возвращает:
+        io.TextIOWrapper: Файл для записи текста (UTF-8).
+    """
+    tmp_path = path + ".tmp"
+    raw = open(tmp_path, 'wb', buffering=buffer_size)
+    packed = None
+    try:
+        # Уровень 6 (как у zlib и утилиты gzip) заметно быстрее 9 при почти том же размере;
+        # mtime=0: одинаковые данные дают одинаковый файл
+        packed = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) if compress else None
+        text = io.TextIOWrapper(packed or raw, encoding='utf-8', newline='')
+        yield text
+        text.flush()
+        if packed is not None:
+            packed.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+    except BaseException:
+        if packed is not None:
+            # Хвост gzip не нужен: файл удаляется
+            packed.fileobj = None
+        raw.close()
+        os.remove(tmp_path)
+        raise
+    raw.close()
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(path))
+
+
+class ReportWriter(ABC):
+    """
+    Запись частей отчета и итогов в файл (базовый класс форматов).
+
+    Подклассы задают запись части строк и строки итогов (абстрактные методы)
+    и при необходимости - заголовка.
+
+    Атрибуты:
+        path (str): Путь к файлу отчета.
+        compress (bool): Сжимать ли файл gzip.
+        buffer_size (int): Размер буфера записи в байтах.
+        rows (int): Сколько строк сотрудников записано.
+    """
+
+    def __init__(self, path: str, compress: bool = None, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """
+        Параметры:
+            path (str): Путь к файлу отчета (заменяется атомарно).
+            compress (bool, optional): Сжимать gzip. По умолчанию - если путь оканчивается на .gz.
+            buffer_size (int, optional): Размер буфера записи в байтах.
+        """
+        self.path = path
+        self.compress = path.lower().endswith(".gz") if compress is None else compress
+        self.buffer_size = buffer_size
+        self.rows = 0
+
+    def write(self, items) -> Subtotal:
+        """
+        Записывает отчет: части строк и итоги (см. with_subtotals).
+
+        Параметры:
+            items (iterable): Части (pandas.DataFrame) и итоги (Subtotal).
+
+        Возвращает:
+            Subtotal | None: Последний записанный итог (итог всего отчета).
+        """
+        last = None
+        with open_report(self.path, self.compress, self.buffer_size) as f:
+            self.write_header(f)
+            for item in items:
+                if isinstance(item, Subtotal):
+                    self.write_subtotal(f, item)
+                    last = item
+                else:
+                    self.write_rows(f, item)
+                    self.rows += len(item)
+        return last
+
+    def write_header(self, f) -> None:
+        """Записывает начало файла (по умолчанию ничего)."""
+
+    @abstractmethod
+    def write_rows(self, f, chunk: pd.DataFrame) -> None:
+        """Записывает часть строк сотрудников."""
+
+    @abstractmethod
+    def write_subtotal(self, f, subtotal: Subtotal) -> None:
+        """Записывает строку итогов."""
+
+
+class CsvWriter(ReportWriter):
+    """
+    Отчет в CSV с колонками employees.csv.
+
+    Строки сотрудников совпадают с employees.csv; строки итогов
+    идут в конце: без ID и зарплаты, в колонке Имя - подпись
+    с числом сотрудников, в колонке группировки - ее значение.
+    """
+
+    def write_header(self, f) -> None:
+        f.write(",".join(PAYROLL_COLUMNS) + "\n")
+
+    def write_rows(self, f, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(f, header=False, index=False, lineterminator="\n")
+
+    def write_subtotal(self, f, subtotal: Subtotal) -> None:
+        row = dict.fromkeys(PAYROLL_COLUMNS, "")
+        row.update({'Имя': _label(subtotal), 'Часы': subtotal.hours, 'К_выплате': _money(subtotal.cents)})
+        if subtotal.value is not None:
+            row[subtotal.column] = subtotal.value
+        csv.writer(f, lineterminator="\n").writerow(row.values())
+
+
+class JsonlWriter(ReportWriter):
+    """
+    Отчет в JSONL: строка файла - объект сотрудника с ключами
+    employees.csv или итог с ключами Итого (значение группы, null -
+    весь отчет), Группа, Сотрудников, Часы, К_выплате.
+    """
+
+    def write_rows(self, f, chunk: pd.DataFrame) -> None:
+        text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+        f.write(text if text.endswith("\n") else text + "\n")
+
+    def write_subtotal(self, f, subtotal: Subtotal) -> None:
+        f.write(json.dumps({'Итого': subtotal.value, 'Группа': subtotal.column,
+                            'Сотрудников': subtotal.count, 'Часы': subtotal.hours,
+                            'К_выплате': _money(subtotal.cents)}, ensure_ascii=False) + "\n")
+
+
+class FixedWidthWriter(ReportWriter):
+    """
+    Отчет для бухгалтерии: колонки фиксированной ширины (FIXED_WIDTHS),
+    текст выровнен влево и обрезан по ширине, числа - вправо с двумя
+    знаками после запятой. Итоги - после черты, суммы под своими колонками.
+    """
+
+    # Колонка -> ширина в символах (колонки разделены пробелом)
+    FIXED_WIDTHS = {'ID': 10, 'Имя': 30, 'Должность': 20, 'Проект': 24,
+                    'Зарплата': 14, 'Часы': 10, 'К_выплате': 14}
+    TEXT_COLUMNS = ('Имя', 'Должность', 'Проект')
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._ruled = False
+        # Шаблон строки сотрудника: str.format по колонкам быстрее строковых методов pandas
+        fields = [f"{{:<{width}.{width}}}" if column in self.TEXT_COLUMNS
+                  else f"{{:>{width}}}" if column == 'ID' else f"{{:>{width}.2f}}"
+                  for column, width in self.FIXED_WIDTHS.items()]
+        self._line = (" ".join(fields) + "\n").format
+
+    def write_header(self, f) -> None:
+        f.write(" ".join(column.ljust(width) if column in self.TEXT_COLUMNS else column.rjust(width)
+                         for column, width in self.FIXED_WIDTHS.items()) + "\n")
+
+    def write_rows(self, f, chunk: pd.DataFrame) -> None:
+        columns = [chunk[column].astype(str).tolist() if column in self.TEXT_COLUMNS or column == 'ID'
+                   else chunk[column].to_numpy(dtype=float).tolist()
+                   for column in self.FIXED_WIDTHS]
+        f.write("".join(map(self._line, *columns)))
+
+    def write_subtotal(self, f, subtotal: Subtotal) -> None:
+        widths = self.FIXED_WIDTHS
+        if not self._ruled:
+            f.write("-" * (sum(widths.values()) + len(widths) - 1) + "\n")
+            self._ruled = True
+        # Подпись занимает текстовые колонки, суммы - под Часы и К_выплате
+        label_width = sum(widths[column] + 1 for column in ('ID', 'Имя', 'Должность', 'Проект', 'Зарплата')) - 1
+        f.write(f"{_label(subtotal)[:label_width]:<{label_width}} "
+                f"{subtotal.hours:>{widths['Часы']}.2f} {_money(subtotal.cents):>{widths['К_выплате']}.2f}\n")
+
+
+# Формат -> класс записи
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'fixed': FixedWidthWriter}
+
+
+def report_format(path: str) -> str:
+    """
+    Формат отчета по расширению файла (.gz не учитывается).
+
+    Возвращает:
+        str: "jsonl" для .jsonl и .ndjson, "fixed" для .txt и .prn, иначе "csv".
+    """
+    name = path[:-3] if path.lower().endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension in (".txt", ".prn"):
+        return "fixed"
+    return "csv"
+
+
+def export_report(chunks, path: str, fmt: str = None, projects=None, positions=None,
+                  group_by: str = 'Проект', compress: bool = None,
+                  buffer_size: int = DEFAULT_BUFFER_SIZE) -> Subtotal:
+    """
+    Выгружает расчет в файл отчета, не собирая его в памяти.
+
+    Параметры:
+        chunks (iterable): Части источника (roster_chunks, csv_chunks).
+        path (str): Путь к файлу отчета (заменяется атомарно).
+        fmt (str, optional): "csv", "jsonl" или "fixed". По умолчанию - по расширению.
+        projects (iterable, optional): Только эти проекты.
+        positions (iterable, optional): Только эти должности.
+        group_by (str, optional): Колонка для итогов групп (None - только общий итог).
+        compress (bool, optional): Сжимать gzip. По умолчанию - если путь оканчивается на .gz.
+        buffer_size (int, optional): Размер буфера записи в байтах.
+
+    Возвращает:
+        Subtotal: Итог отчета (сотрудников, часы, копейки).
+
+    Исключения:
+        ValueError: Если формат или колонка группировки неизвестны.
+    """
+    fmt = fmt or report_format(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"Неизвестный формат отчета: {fmt}")
+    if group_by is not None and group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Итоги считаются только по колонкам: {', '.join(GROUP_COLUMNS)}")
+    items = with_subtotals(with_pay(select(chunks, projects, positions)), group_by)
+    return WRITERS[fmt](path, compress, buffer_size).write(items)
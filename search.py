@@ -0,0 +1,285 @@
+"""
+Поиск сотрудников по части имени, должности или проекта.
+
+Индекс хранит каждое различное значение полей один раз (без учета
+регистра, "ё" = "е") и таблицу триграмм: для каждых трех подряд идущих
+букв - номера значений, в которых они встречаются. Таблица - отсортированные
+массивы numpy: поиск триграммы - двоичный поиск, пересечение списков
+значений - searchsorted. У каждого сотрудника хранятся номера трех его
+значений, поэтому отбор сотрудников по найденным значениям - несколько
+векторных операций над массивом, а не перебор списка.
+"""
+import numpy as np
+
+
+# Поля сотрудника в индексе: колонка EmployeeTable и атрибут Employee
+FIELDS = (('names', 'name'), ('positions', 'position'), ('projects', 'project'))
+
+# Биты на одну букву в числовом ключе триграммы (коды Unicode < 2**21)
+_CHAR_BITS = 21
+
+
+def normalize(text: str) -> str:
+    """Приводит текст к виду для поиска: без регистра, "ё" как "е"."""
+    return str(text).casefold().replace('ё', 'е')
+
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+
+
+def _trigram_keys(codes: np.ndarray) -> np.ndarray:
+    """Ключи триграмм, начинающихся в каждой позиции (последние две позиции - без ключа)."""
+    return (codes[:-2] << 2 * _CHAR_BITS) | (codes[1:-1] << _CHAR_BITS) | codes[2:]
+
+
+class SearchIndex:
+    """
+    Индекс подстрок по имени, должности и проекту сотрудников.
+
+    Слово запроса находит значения, в которые оно входит: слово
+    до трех букв - это начало хотя бы одной триграммы (в конце
+    каждого значения добавлены две пустые буквы), поэтому такие
+    значения берутся из диапазона ключей без проверки; более длинное
+    слово - пересечение списков его триграмм с проверкой подстроки.
+    Сотрудник подходит, если каждое слово запроса нашлось в одном
+    из его полей.
+
+    Изменения применяются по шагам (append, remove, update). Новые
+    значения сначала просматриваются перебором, а таблица триграмм
+    перестраивается, когда их накопится больше merge_threshold.
+    Если запрос продолжает предыдущий (набор букв в поле поиска),
+    отбираются только найденные в прошлый раз сотрудники и значения.
+
+    Атрибуты:
+        values (list): Различные значения полей в виде для поиска.
+        merge_threshold (int): Сколько новых значений просматривать перебором
+            до перестройки таблицы триграмм.
+        version (int): Счетчик изменений (сбрасывает продолжение запроса).
+    """
+
+    def __init__(self, names, positions, projects, merge_threshold: int = 4096) -> None:
+        """
+        Параметры:
+            names (iterable): Имена сотрудников по порядку списка.
+            positions (iterable): Должности.
+            projects (iterable): Проекты.
+            merge_threshold (int, optional): См. атрибут merge_threshold.
+        """
+        self.values = []
+        self.merge_threshold = merge_threshold
+        self.version = 0
+        self._ids = {}
+        # Исходная строка -> номер значения (без повторной нормализации)
+        self._raw = {}
+        columns = [self._intern_column(column) for column in (names, positions, projects)]
+        self._size = len(columns[0])
+        # Колонка на поле: выборка по каждой колонке идет подряд по памяти
+        self._codes = np.empty((len(FIELDS), max(self._size, 16)), dtype=np.int32)
+        for field, column in enumerate(columns):
+            self._codes[field, :self._size] = column
+        self._indexed = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int32)
+        self._last = None
+        self._build()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Находит сотрудников, у которых каждое слово запроса входит
+        в имя, должность или проект.
+
+        Параметры:
+            query (str): Запрос; регистр не важен.
+
+        Возвращает:
+            numpy.ndarray: Позиции подходящих сотрудников по возрастанию
+                (пустой запрос - все позиции).
+        """
+        words = normalize(query).split()
+        if not words:
+            return np.arange(self._size)
+        if len(self.values) - self._indexed > self.merge_threshold:
+            self._build()
+
+        rows = None
+        cached = {}
+        last = self._last
+        if last is not None and last[0] == self.version:
+            cached = last[2]
+            if normalize(query).startswith(last[1]) and len(last[3]) * 4 < self._size:
+                # Продолжение запроса: проверяются только уже найденные
+                rows = last[3]
+
+        found = {}
+        for word in words:
+            if word not in found:
+                found[word] = self._match(word, cached)
+        selected = self._codes[:, :self._size] if rows is None else self._codes[:, rows]
+        mask = None
+        for word in found:
+            hit = np.zeros(len(self.values), dtype=bool)
+            hit[found[word]] = True
+            word_mask = hit[selected[0]]
+            for column in selected[1:]:
+                word_mask |= hit[column]
+            mask = word_mask if mask is None else mask & word_mask
+        result = np.flatnonzero(mask) if rows is None else rows[mask]
+        self._last = (self.version, normalize(query), found, result)
+        return result
+
+    def append(self, name: str, position: str, project: str) -> None:
+        """Добавляет сотрудника в конец списка."""
+        if self._size == self._codes.shape[1]:
+            codes = np.empty((len(FIELDS), self._size * 2), dtype=np.int32)
+            codes[:, :self._size] = self._codes[:, :self._size]
+            self._codes = codes
+        self._codes[:, self._size] = [self._value(name), self._value(position), self._value(project)]
+        self._size += 1
+        self.version += 1
+
+    def remove(self, index: int) -> None:
+        """Удаляет сотрудника на позиции index (следующие сдвигаются)."""
+        self._codes[:, index:self._size - 1] = self._codes[:, index + 1:self._size]
+        self._size -= 1
+        self.version += 1
+
+    def update(self, index: int, name: str, position: str, project: str) -> None:
+        """Обновляет поля сотрудника на позиции index."""
+        self._codes[:, index] = [self._value(name), self._value(position), self._value(project)]
+        self.version += 1
+
+    def _match(self, word: str, cached: dict) -> np.ndarray:
+        """Номера значений, в которые входит слово."""
+        if word in cached:
+            return cached[word]
+        # Слово продолжает слово прошлого запроса: проверяются только его значения
+        # (короткое слово быстрее найти по диапазону ключей, если значений много)
+        previous = [matched for cached_word, matched in cached.items() if cached_word in word]
+        if previous:
+            candidates = min(previous, key=len)
+            if len(word) > 3 or len(candidates) <= self.merge_threshold:
+                return self._verify(word, candidates)
+
+        codes = _codepoints(word)
+        if len(codes) <= 3:
+            # Диапазон ключей триграмм, начинающихся со слова
+            low = 0
+            for i, code in enumerate(codes):
+                low |= int(code) << (2 - i) * _CHAR_BITS
+            high = low + (1 << (3 - len(codes)) * _CHAR_BITS)
+            start, end = np.searchsorted(self._keys, [low, high])
+            hit = np.zeros(self._indexed, dtype=bool)
+            hit[self._postings[self._offsets[start]:self._offsets[end]]] = True
+            indexed = np.flatnonzero(hit).astype(np.int32)
+        else:
+            indexed = None
+            for key in np.unique(_trigram_keys(codes)):
+                at = np.searchsorted(self._keys, key)
+                if at == len(self._keys) or self._keys[at] != key:
+                    indexed = np.empty(0, dtype=np.int32)
+                    break
+                postings = self._postings[self._offsets[at]:self._offsets[at + 1]]
+                if indexed is None:
+                    indexed = postings
+                else:
+                    position = np.minimum(np.searchsorted(postings, indexed), len(postings) - 1)
+                    indexed = indexed[postings[position] == indexed]
+                if not len(indexed):
+                    break
+            indexed = self._verify(word, indexed)
+        recent = self._verify(word, range(self._indexed, len(self.values)))
+        return np.concatenate([indexed, recent]) if len(recent) else indexed
+
+    def _verify(self, word: str, candidates) -> np.ndarray:
+        """Оставляет значения, в которые слово действительно входит."""
+        values = self.values
+        if isinstance(candidates, np.ndarray):
+            candidates = candidates.tolist()
+        return np.array([value_id for value_id in candidates if word in values[value_id]], dtype=np.int32)
+
+    def _build(self) -> None:
+        """Перестраивает таблицу триграмм по всем значениям."""
+        # Две пустые буквы после каждого значения: триграммы не переходят
+        # в соседнее значение, и каждая буква начинает хотя бы одну триграмму
+        text = "\0\0".join(self.values) + "\0\0"
+        codes = _codepoints(text)
+        lengths = np.fromiter((len(value) + 2 for value in self.values), dtype=np.int64,
+                              count=len(self.values))
+        owners = np.repeat(np.arange(len(self.values), dtype=np.int32), lengths)[:-2]
+        keys = _trigram_keys(codes)
+        inside = codes[:-2] != 0
+        keys, owners = keys[inside], owners[inside]
+        # Устойчивая сортировка: внутри ключа номера значений остаются по возрастанию
+        order = np.argsort(keys, kind='stable')
+        keys, owners = keys[order], owners[order]
+        unique = np.ones(len(keys), dtype=bool)
+        unique[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[unique], owners[unique]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        self._keys = keys[starts]
+        self._offsets = np.append(starts, len(keys))
+        self._postings = owners
+        self._indexed = len(self.values)
+
+    def _value(self, text: str) -> int:
+        """Номер значения (новое значение добавляется)."""
+        value_id = self._raw.get(text)
+        if value_id is None:
+            normalized = normalize(text).replace("\0", "")
+            value_id = self._ids.get(normalized)
+            if value_id is None:
+                value_id = self._ids[normalized] = len(self.values)
+                self.values.append(normalized)
+            self._raw[text] = value_id
+        return value_id
+
+    def _intern_column(self, column) -> np.ndarray:
+        """Номера значений колонки (у pandas.Categorical - по категориям)."""
+        categories = getattr(column, 'categories', None)
+        if categories is not None:
+            mapping = np.fromiter((self._value(value) for value in categories), dtype=np.int32,
+                                  count=len(categories))
+            return mapping[column.codes]
+        value = self._value
+        return np.fromiter((value(text) for text in column), dtype=np.int32)
+
+
+class SearchResult:
+    """
+    Сотрудники на заданных позициях списка - набор данных для VirtualList.
+
+    Атрибуты:
+        employees (list | EmployeeTable): Весь список.
+        positions (numpy.ndarray): Позиции найденных сотрудников по возрастанию.
+    """
+
+    def __init__(self, employees, positions: np.ndarray) -> None:
+        self.employees = employees
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index: int):
+        return self.employees[int(self.positions[index])]
+
+    def position(self, index: int) -> int:
+        """Позиция в полном списке для строки index результата."""
+        return int(self.positions[index])
+
+    def index(self, position: int):
+        """
+        Строка результата для позиции в полном списке.
+
+        Возвращает:
+            int | None: Номер строки или None, если сотрудник не найден запросом.
+        """
+        index = int(np.searchsorted(self.positions, position))
+        if index < len(self.positions) and self.positions[index] == position:
+            return index
+        return None
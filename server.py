@@ -0,0 +1,520 @@
+import asyncio
+import json
+import math
+import random
+import time
+
+import journal
+from employee import Employee, valid_hours
+from registry import EmployeeRegistry
+
+
+# Наибольшая длина одного сообщения (список сотрудников в load и save)
+MESSAGE_LIMIT = 1 << 28
+
+# Ограничение буфера отправки подписчику: медленный клиент отключается,
+# а не копит уведомления в памяти сервера
+MAX_SUBSCRIBER_BUFFER = 1 << 22
+
+# Записи, которые ссылаются на существующего сотрудника
+_EMPLOYEE_OPS = (journal.DELETE, journal.ADD_HOURS, journal.ASSIGN_PROJECT, journal.UPDATE)
+
+
+def employee_rows(employees) -> list:
+    """Сотрудники для ответа на load: [ID, имя, должность, оклад, часы, проект]."""
+    return [[emp.id, emp.name, emp.position, emp.salary, emp.hours_worked, emp.project]
+            for emp in employees]
+
+
+def _is_number(value) -> bool:
+    """Число из JSON (bool - не число)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_salary(record: dict):
+    """Ошибка зарплаты записи create или update (или None)."""
+    salary = record.get("salary")
+    if not _is_number(salary) or not salary > 0:
+        return "Зарплата должна быть положительным числом."
+    return None
+
+
+def _check_text(record: dict, *fields):
+    """Ошибка, если какое-то из полей записи - не строка (или None)."""
+    for field in fields:
+        if not isinstance(record.get(field), str):
+            return f"Поле '{field}' должно быть строкой"
+    return None
+
+
+def _check_time(record: dict):
+    """Ошибка времени записи с часами (или None); запись без "at" - без отметки."""
+    if "at" in record and not _is_number(record["at"]):
+        return "Время записи должно быть числом"
+    return None
+
+
+def restore_rows(rows: list) -> list:
+    """Восстанавливает сотрудников из строк employee_rows."""
+    return [Employee.restore(name, position, salary, hours, project, emp_id)
+            for emp_id, name, position, salary, hours, project in rows]
+
+
+class SyncServer:
+    """
+    Локальный сервер, через который несколько клиентов работают с одним хранилищем.
+
+    Протокол - JSON по TCP, одно сообщение на строку. Запрос содержит
+    "op" и необязательный "id", который повторяется в ответе
+    ({"id", "ok": true, ...} или {"id", "ok": false, "error"}):
+
+        load - текущий список сотрудников (employee_rows);
+        apply - записи журнала ("records", как у Storage.log_*);
+        save - заменить всех сотрудников ("employees" - строки employee_rows);
+        clear - удалить все данные;
+        close_period - закрыть расчетный период ("period" и "at" необязательны,
+            см. Storage.close_period); ответ "entry" - запись архива, другим
+            клиентам приходит запись reset_hours;
+        subscribe - присылать на это соединение уведомления об изменениях
+            других клиентов: {"event": "records", "records"} или {"event": "reload"}.
+
+    Сервер держит список сотрудников в памяти, проверяет записи
+    в цикле событий, а на диск пишет через хранилище. Запросы
+    apply, пришедшие за время предыдущей записи (и за batch_delay),
+    записываются вместе одним append_records - одним сбросом на диск
+    (group commit), но не больше max_batch запросов за раз. Запрос
+    принимается целиком или отклоняется целиком; к списку в памяти
+    записи применяются и ответ отправляется только после записи.
+
+    Атрибуты:
+        data (Storage): Хранилище (DataManager, SqliteStorage).
+        host (str): Адрес.
+        port (int): Порт (0 - любой свободный; после start - фактический).
+        batch_delay (float): Сколько секунд собирать запросы перед записью.
+        max_batch (int | None): Наибольшее число запросов в одной записи.
+        commits (int): Количество записей на диск.
+        requests (int): Количество выполненных запросов apply.
+    """
+
+    def __init__(self, data, host: str = "127.0.0.1", port: int = 8765,
+                 batch_delay: float = 0.0, max_batch: int = None) -> None:
+        self.data = data
+        self.host = host
+        self.port = port
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.commits = 0
+        self.requests = 0
+        self.employees = data.load_employees(compact=True)
+        self.registry = EmployeeRegistry(self.employees)
+        self._pending = []
+        self._wakeup = None
+        self._subscribers = set()
+        self._connections = {}
+        self._server = None
+        self._committer = None
+        self._closing = False
+
+    async def start(self) -> None:
+        """Начинает принимать соединения."""
+        self._wakeup = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=MESSAGE_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._committer = asyncio.create_task(self._commit_loop())
+
+    async def serve_forever(self) -> None:
+        """Запускает сервер (если еще не запущен) и работает до отмены."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Закрывает соединения; уже принятые записи дописываются."""
+        if self._server is None:
+            return
+        self._server.close()
+        self._closing = True
+        self._wakeup.set()
+        await self._committer
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        self._server = None
+
+    async def _handle(self, reader, writer) -> None:
+        """Обслуживает одно соединение: запросы выполняются по порядку."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = await self._dispatch(request, writer)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {"ok": False, "error": f"Некорректный запрос: {e}"}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(writer)
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _dispatch(self, request: dict, writer) -> dict:
+        op = request["op"]
+        if op == "load":
+            return {"ok": True, "employees": employee_rows(self.employees),
+                    "period_start": self.data.period_start}
+        if op == "subscribe":
+            self._subscribers.add(writer)
+            return {"ok": True}
+        if op == "apply":
+            return await self._submit("records", list(request["records"]), writer)
+        if op == "save":
+            return await self._submit("save", restore_rows(request["employees"]), writer)
+        if op == "clear":
+            return await self._submit("clear", None, writer)
+        if op == "close_period":
+            return await self._submit("close_period", (request.get("period"), request.get("at")), writer)
+        raise ValueError(f"Неизвестная операция: {op}")
+
+    async def _submit(self, kind: str, payload, origin) -> dict:
+        """Ставит изменение в очередь записи и ждет, пока оно будет записано."""
+        if self._closing:
+            return {"ok": False, "error": "Сервер останавливается"}
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((kind, payload, origin, future))
+        self._wakeup.set()
+        return await future
+
+    async def _commit_loop(self) -> None:
+        """Записывает накопившиеся изменения: записи apply - пачкой."""
+        while True:
+            await self._wakeup.wait()
+            if self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            self._wakeup.clear()
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch or len(self._pending):]
+            if self._pending:
+                self._wakeup.set()
+            try:
+                group = []
+                for kind, payload, origin, future in batch:
+                    if kind == "records":
+                        group.append((payload, origin, future))
+                        continue
+                    await self._commit_records(group)
+                    group = []
+                    if kind == "close_period":
+                        await self._close_period(payload, origin, future)
+                    else:
+                        await self._replace(kind, payload, origin, future)
+                await self._commit_records(group)
+            except Exception as e:
+                # Ошибка одного запроса не должна останавливать запись:
+                # неотвеченные запросы пачки получают ошибку, память сверяется с диском
+                self._reload()
+                self._notify({"event": "reload"}, None)
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_result({"ok": False, "error": f"Не удалось выполнить запрос: {e}"})
+            if self._closing and not self._pending:
+                return
+
+    async def _commit_records(self, group: list) -> None:
+        """
+        Проверяет записи запросов, пишет их одним вызовом и только затем применяет.
+
+        Запрос принимается целиком или отклоняется целиком. До записи
+        на диск список в памяти не меняется, поэтому load не видит
+        несохраненных изменений.
+        """
+        if not group:
+            return
+        results = []
+        written = []
+        staged = ({}, set())
+        for records, origin, future in group:
+            accepted, error = self._stage(records, staged)
+            written.extend(accepted)
+            results.append((accepted, origin, future, error))
+        try:
+            if written:
+                await asyncio.get_running_loop().run_in_executor(None, self.data.append_records, written)
+                self.commits += 1
+        except Exception as e:
+            # Записи не сохранены, список в памяти не менялся
+            for _, _, future, _ in results:
+                future.set_result({"ok": False, "error": f"Не удалось сохранить данные: {e}"})
+            return
+        try:
+            for record in written:
+                journal.apply_record(self.registry, record)
+        except Exception:
+            # Записи уже на диске: память сверяется с сохраненным состоянием
+            self._reload()
+            self._notify({"event": "reload"}, None)
+            written = []
+        for accepted, origin, future, error in results:
+            self.requests += 1
+            if accepted and written:
+                self._notify({"event": "records", "records": accepted}, origin)
+            if error is None:
+                future.set_result({"ok": True})
+            else:
+                future.set_result({"ok": False, "error": error})
+
+    async def _replace(self, kind: str, employees, origin, future) -> None:
+        """Полностью заменяет данные (save) или удаляет их (clear)."""
+        loop = asyncio.get_running_loop()
+        try:
+            if kind == "save":
+                await loop.run_in_executor(None, self.data.save_employees, employees)
+            else:
+                await loop.run_in_executor(None, self.data.clear)
+                employees = []
+            self.commits += 1
+        except Exception as e:
+            future.set_result({"ok": False, "error": f"Не удалось сохранить данные: {e}"})
+            return
+        self.employees = employees
+        self.registry = EmployeeRegistry(employees)
+        self._notify({"event": "reload"}, origin)
+        future.set_result({"ok": True})
+
+    async def _close_period(self, request: tuple, origin, future) -> None:
+        """
+        Закрывает расчетный период (архив и обнуление часов).
+
+        Файл периода и запись reset_hours пишутся в потоке
+        (Storage.prepare_close_period), пока цикл событий отвечает на load;
+        часы обнуляются уже в цикле событий, поэтому load не увидит
+        список с частично обнуленными часами.
+        """
+        period, at = request
+        loop = asyncio.get_running_loop()
+        try:
+            archive, entry = await loop.run_in_executor(None, self.data.prepare_close_period,
+                                                        self.registry, period, at)
+        except ValueError as e:
+            # Период уже закрыт: ничего не изменилось
+            future.set_result({"ok": False, "error": str(e)})
+            return
+        except Exception as e:
+            self._reload()
+            self._notify({"event": "reload"}, None)
+            future.set_result({"ok": False, "error": f"Не удалось закрыть период: {e}"})
+            return
+        self.registry.reset_hours(entry["end"])
+        try:
+            await loop.run_in_executor(None, archive.publish, entry)
+        except Exception as e:
+            # Обнуление уже записано: оглавление допишет finish_close_period при загрузке
+            future.set_result({"ok": False, "error": f"Не удалось закрыть период: {e}"})
+            self._notify({"event": "reload"}, None)
+            return
+        self.commits += 1
+        self._notify({"event": "records", "records": [{"op": journal.RESET_HOURS, "at": entry["end"]}]}, origin)
+        future.set_result({"ok": True, "entry": entry})
+
+    def _stage(self, records: list, staged: tuple) -> tuple:
+        """
+        Проверяет записи одного запроса с учетом уже принятых в этой пачке.
+
+        Параметры:
+            records (list): Записи запроса.
+            staged (tuple): Изменения принятых записей пачки: словарь ID -> есть ли
+                сотрудник (созданные и удаленные) и множество ID, занятых в пачке.
+                Обновляется, только если приняты все записи запроса.
+
+        Возвращает:
+            tuple: Принятые записи (все или ни одной) и текст ошибки (или None).
+        """
+        exists, taken = staged
+        request_exists, request_taken = dict(exists), set(taken)
+        for record in records:
+            try:
+                error = self._check(record, request_exists, request_taken)
+            except Exception as e:
+                # Поля неверного типа (часы строкой и т.п.) - ошибка только этого запроса
+                error = f"Некорректная запись: {e}"
+            if error is not None:
+                return [], error
+        exists.update(request_exists)
+        taken.update(request_taken)
+        return list(records), None
+
+    def _check(self, record: dict, exists: dict, taken: set):
+        """
+        Возвращает текст ошибки для записи, которую нельзя применить, иначе None.
+
+        Проверяются поля, которые нужны journal.apply_record: запись,
+        принятая здесь, применяется к списку уже после записи на диск.
+        Созданные и удаленные записями пачки сотрудники отмечаются в exists,
+        ID созданных - в taken.
+        """
+        if not isinstance(record, dict):
+            return "Запись должна быть объектом"
+
+        def found(emp_id):
+            return exists.get(emp_id, emp_id in self.registry)
+
+        op = record.get("op")
+        if op == journal.CREATE:
+            emp_id = record.get("id")
+            if not isinstance(emp_id, int) or isinstance(emp_id, bool) or emp_id < 1:
+                return "ID сотрудника должен быть положительным целым числом"
+            if found(emp_id) or emp_id in taken:
+                return f"Сотрудник с ID {emp_id} уже существует"
+            error = _check_salary(record) or _check_text(record, "name", "position", "project")
+            if error is None and not (_is_number(record.get("hours")) and record["hours"] >= 0):
+                error = "Количество часов не может быть отрицательным"
+            if error is not None:
+                return error
+            exists[emp_id] = True
+            taken.add(emp_id)
+        elif op in _EMPLOYEE_OPS:
+            if not found(record.get("id")):
+                return f"Сотрудник с ID {record.get('id')} не найден"
+            if op == journal.DELETE:
+                exists[record["id"]] = False
+            elif op == journal.ADD_HOURS:
+                if not (_is_number(record.get("hours")) and valid_hours(record["hours"])):
+                    return "Количество часов должно быть положительным"
+                return _check_time(record)
+            elif op == journal.ASSIGN_PROJECT:
+                return _check_text(record, "project")
+            else:
+                return _check_salary(record) or _check_text(record, "name", "position")
+        elif op == journal.ADD_HOURS_BATCH:
+            ids, hours = record.get("ids"), record.get("hours")
+            if not isinstance(ids, list) or not isinstance(hours, list) or len(ids) != len(hours):
+                return "Табель должен содержать списки ID и часов одной длины"
+            if not all(found(emp_id) for emp_id in ids):
+                return "Сотрудник из табеля не найден"
+            if not all(_is_number(value) and valid_hours(value) for value in hours):
+                return "Количество часов должно быть положительным"
+            if "at" in record and not (isinstance(record.get("projects"), list)
+                                       and len(record["projects"]) == len(ids)):
+                return "Табель со временем должен содержать проекты"
+            return _check_time(record)
+        else:
+            return f"Неизвестная операция журнала: {op}"
+        return None
+
+    def _reload(self) -> None:
+        self.employees = self.data.load_employees(compact=True)
+        self.registry = EmployeeRegistry(self.employees)
+
+    def _notify(self, event: dict, origin) -> None:
+        """Отправляет уведомление всем подписчикам, кроме автора изменения."""
+        if not self._subscribers:
+            return
+        line = json.dumps(event, ensure_ascii=False).encode('utf-8') + b"\n"
+        for writer in list(self._subscribers):
+            if writer is origin:
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                self._subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(line)
+
+
+async def load_generator(host: str, port: int, clients: int = 20, requests: int = 100,
+                         seed: int = 1) -> dict:
+    """
+    Нагружает сервер запросами add_hours и замеряет задержку.
+
+    Каждый клиент - отдельное соединение, которое отправляет requests
+    запросов по одному (следующий - после ответа на предыдущий)
+    для случайных сотрудников с сервера.
+
+    Параметры:
+        host (str): Адрес сервера.
+        port (int): Порт.
+        clients (int, optional): Количество одновременных клиентов.
+        requests (int, optional): Запросов от каждого клиента.
+        seed (int, optional): Зерно выбора сотрудников.
+
+    Возвращает:
+        dict: 'Запросов', 'Секунд', 'Запросов_в_секунду', 'p50_мс', 'p99_мс'.
+
+    Исключения:
+        ValueError: Если на сервере нет сотрудников или сервер отклонил запрос.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=MESSAGE_LIMIT)
+    writer.write(b'{"op": "load"}\n')
+    ids = [row[0] for row in json.loads(await reader.readline())["employees"]]
+    writer.close()
+    if not ids:
+        raise ValueError("На сервере нет сотрудников")
+
+    latencies = []
+
+    async def client(number):
+        rng = random.Random(seed * 1000 + number)
+        reader, writer = await asyncio.open_connection(host, port, limit=MESSAGE_LIMIT)
+        try:
+            for _ in range(requests):
+                record = {"op": journal.ADD_HOURS, "id": rng.choice(ids), "hours": 0.5,
+                          "at": int(time.time()), "project": "Нагрузка"}
+                start = time.perf_counter()
+                writer.write(json.dumps({"op": "apply", "records": [record]}).encode('utf-8') + b"\n")
+                await writer.drain()
+                response = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - start)
+                if not response["ok"]:
+                    raise ValueError(response["error"])
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'Запросов': len(latencies),
+        'Секунд': elapsed,
+        'Запросов_в_секунду': len(latencies) / elapsed,
+        'p50_мс': _percentile(latencies, 0.5) * 1000,
+        'p99_мс': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def _percentile(values: list, share: float) -> float:
+    """Процентиль отсортированного списка (ближайшее значение сверху)."""
+    return values[max(math.ceil(share * len(values)) - 1, 0)] if values else 0.0
+
+
+def run_server(data, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Запускает SyncServer над хранилищем и работает до Ctrl+C.
+
+    Параметры:
+        data (Storage): Хранилище.
+        host (str, optional): Адрес (по умолчанию - только этот компьютер).
+        port (int, optional): Порт.
+    """
+    server = SyncServer(data, host, port)
+
+    async def main():
+        await server.start()
+        print(f"Сервер запущен: {server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    data.wait_for_compaction()
@@ -0,0 +1,220 @@
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from employee_table import EmployeeTable
+from timelog import EntryColumns, TimeLogs, entry_columns
+
+
+# Двоичный снимок списка сотрудников (employees.snap).
+#
+# Заголовок (little-endian):
+#     MAGIC (8 байт), версия формата (uint32), число колонок (uint32),
+#     число сотрудников (uint64), наибольший ID (int64), отпечаток снимка (16 байт)
+# Затем каталог колонок - для каждой: имя (16 байт), тип numpy (8 байт),
+# смещение от начала файла и длина в байтах (uint64).
+# Данные колонок выровнены по 8 байт, поэтому читаются прямо из
+# отображенного в память файла без копирования.
+#
+# Строковые колонки (имена, словари должностей и проектов) хранятся
+# парой: <имя>_off - смещения в символах (int64, на одно больше числа строк)
+# и <имя>_utf8 - все строки подряд в UTF-8.
+#
+# Отметки времени (Employee.timelog) - колонки entry_id, entry_at, entry_hours
+# и entry_project (коды словаря entry_dict). В снимке без этих колонок
+# отметок нет.
+#
+# Колонка period_start (int64, одно значение или пусто) - начало расчетного
+# периода, к которому относятся часы снимка (см. Storage.load_period_start).
+# В снимках без нее начало периода берется из архива периодов.
+
+MAGIC = b"TTSNAP\x00\x00"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIIQq16s")
+COLUMN = struct.Struct("<16s8sQQ")
+
+
+class StringColumn:
+    """
+    Колонка строк из снимка, декодируемая при первом обращении.
+
+    Пока к строкам не обращались, файл не читается. При первом чтении
+    все строки декодируются одним вызовом, отдельные значения
+    берутся срезами. При первом изменении (присваивание, append, del)
+    колонка превращается в обычный список.
+    """
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray) -> None:
+        self._offsets = offsets
+        self._blob = blob
+        self._text = None
+        self._list = None
+
+    def __len__(self) -> int:
+        if self._list is not None:
+            return len(self._list)
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if self._list is not None:
+            return self._list[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        text = self._decoded()
+        return text[self._offsets[index]:self._offsets[index + 1]]
+
+    def __iter__(self):
+        if self._list is not None:
+            return iter(self._list)
+        text = self._decoded()
+        bounds = self._offsets.tolist()
+        return (text[start:end] for start, end in zip(bounds, bounds[1:]))
+
+    def __setitem__(self, index: int, value: str) -> None:
+        self._materialize()[index] = value
+
+    def __delitem__(self, index: int) -> None:
+        del self._materialize()[index]
+
+    def append(self, value: str) -> None:
+        self._materialize().append(value)
+
+    def _decoded(self) -> str:
+        if self._text is None:
+            self._text = self._blob.tobytes().decode('utf-8')
+        return self._text
+
+    def _materialize(self) -> list:
+        if self._list is None:
+            self._list = list(self)
+            self._offsets = self._blob = self._text = None
+        return self._list
+
+
+def encode_snapshot(employees, token: bytes, period_start: int = None, projects: list = None) -> bytes:
+    """
+    Собирает содержимое двоичного снимка.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        token (bytes): Отпечаток снимка (16 байт) для записей checkpoint журнала.
+        period_start (int, optional): Начало периода, к которому относятся часы.
+        projects (list, optional): Проекты папки (см. Storage.save_projects);
+            в снимок попадают только они. По умолчанию - весь Employee.projects.
+
+    Возвращает:
+        bytes: Содержимое файла.
+    """
+    table = employees if isinstance(employees, EmployeeTable) else EmployeeTable.from_employees(employees)
+    ids = np.ascontiguousarray(table.ids, dtype='<i8')
+    positions = table.positions
+    folder_projects = projects
+    projects = table.projects
+    if folder_projects is not None and list(projects.categories) != folder_projects:
+        projects = projects.set_categories(folder_projects)
+    columns = [
+        ("id", ids),
+        ("salary", np.ascontiguousarray(table.salaries, dtype='<f8')),
+        ("hours", np.ascontiguousarray(table.hours, dtype='<f8')),
+        ("position", np.ascontiguousarray(positions.codes, dtype='<i4')),
+        ("project", np.ascontiguousarray(projects.codes, dtype='<i4')),
+    ]
+    entry_ids, entry_at, entry_hours, entry_projects = entry_columns(employees)
+    entry_codes, entry_dict = pd.factorize(pd.Series(entry_projects, dtype=object))
+    columns += [
+        ("entry_id", np.ascontiguousarray(entry_ids, dtype='<i8')),
+        ("entry_at", np.ascontiguousarray(entry_at, dtype='<i8')),
+        ("entry_hours", np.ascontiguousarray(entry_hours, dtype='<f8')),
+        ("entry_project", np.ascontiguousarray(entry_codes, dtype='<i4')),
+        ("period_start", np.array([] if period_start is None else [period_start], dtype='<i8')),
+    ]
+    for name, values in (("name", table.names),
+                         ("positions", list(positions.categories)),
+                         ("projects", list(projects.categories)),
+                         ("entry_dict", entry_dict.tolist())):
+        columns.extend(_string_columns(name, values))
+
+    offset = _align(HEADER.size + COLUMN.size * len(columns))
+    directory = []
+    for name, values in columns:
+        directory.append(COLUMN.pack(name.encode('ascii'), values.dtype.str.encode('ascii'),
+                                     offset, values.nbytes))
+        offset = _align(offset + values.nbytes)
+
+    max_id = int(ids.max()) if len(ids) else 0
+    parts = [HEADER.pack(MAGIC, VERSION, len(columns), len(ids), max_id, token)] + directory
+    position = HEADER.size + COLUMN.size * len(columns)
+    for _, values in columns:
+        padding = _align(position) - position
+        parts.append(b"\x00" * padding)
+        parts.append(values.tobytes())
+        position += padding + values.nbytes
+    return b"".join(parts)
+
+
+def read_snapshot(path: str) -> tuple:
+    """
+    Открывает двоичный снимок, отображая файл в память.
+
+    Колонки таблицы - представления отображенного файла в режиме
+    копирования при записи: страницы читаются с диска только при
+    обращении, а изменения таблицы не попадают в файл.
+
+    Параметры:
+        path (str): Путь к файлу снимка.
+
+    Возвращает:
+        tuple: EmployeeTable, отпечаток снимка (hex-строка) и начало периода
+            часов снимка (None, если оно не записано).
+
+    Исключения:
+        ValueError: Если файл не является снимком или версия не поддерживается.
+    """
+    if os.path.getsize(path) < HEADER.size:
+        raise ValueError(f"Файл {path} не является снимком сотрудников")
+    data = np.memmap(path, dtype=np.uint8, mode='c')
+    magic, version, count, size, max_id, token = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Файл {path} не является снимком сотрудников")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+
+    columns = {}
+    for i in range(count):
+        name, dtype, offset, length = COLUMN.unpack_from(data, HEADER.size + COLUMN.size * i)
+        dtype = np.dtype(dtype.rstrip(b"\x00").decode('ascii'))
+        columns[name.rstrip(b"\x00").decode('ascii')] = data[offset:offset + length].view(dtype)
+
+    def strings(name):
+        return StringColumn(columns[name + "_off"], columns[name + "_utf8"])
+
+    table = EmployeeTable.from_arrays(
+        ids=columns["id"], names=strings("name"),
+        salaries=columns["salary"], hours=columns["hours"],
+        position_codes=columns["position"], positions=list(strings("positions")),
+        project_codes=columns["project"], projects=list(strings("projects")),
+        max_id=max_id)
+    period_start = columns.get("period_start")
+    period_start = int(period_start[0]) if period_start is not None and len(period_start) else None
+    if "entry_id" in columns and len(columns["entry_id"]):
+        # Колонки отметок остаются отображенными: журналы строятся при обращении
+        entries = EntryColumns(columns["entry_id"], columns["entry_at"], columns["entry_hours"],
+                               columns["entry_project"], list(strings("entry_dict")))
+        table.timelogs = TimeLogs(entries, period_start)
+    return table, token.hex(), period_start
+
+
+def _string_columns(name: str, values: list) -> list:
+    """Колонки смещений и текста для списка строк."""
+    lengths = np.fromiter((len(value) for value in values), dtype='<i8', count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype='<i8')
+    np.cumsum(lengths, out=offsets[1:])
+    text = np.frombuffer("".join(values).encode('utf-8'), dtype=np.uint8)
+    return [(name + "_off", offsets), (name + "_utf8", text)]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
@@ -0,0 +1,320 @@
+import os
+import sqlite3
+import threading
+
+import journal
+from employee import Employee
+from employee_table import EmployeeTable
+from storage import PROJECTS_FILE, Storage
+from timelog import attach_timelogs, entry_columns, group_entries
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    salary REAL NOT NULL CHECK (salary > 0),
+    hours REAL NOT NULL DEFAULT 0 CHECK (hours >= 0),
+    project TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS employees_project ON employees (project);
+CREATE INDEX IF NOT EXISTS employees_position ON employees (position);
+CREATE TABLE IF NOT EXISTS time_entries (
+    employee_id INTEGER NOT NULL,
+    at INTEGER NOT NULL,
+    hours REAL NOT NULL CHECK (hours > 0),
+    project TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS time_entries_employee ON time_entries (employee_id, at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Запросы - постоянные строки: sqlite3 кэширует их подготовленные выражения
+SELECT_ALL = "SELECT id, name, position, salary, hours, project FROM employees ORDER BY id"
+SELECT_BY_PROJECT = ("SELECT id, name, position, salary, hours, project FROM employees "
+                     "WHERE project = ? ORDER BY id")
+SELECT_BY_POSITION = ("SELECT id, name, position, salary, hours, project FROM employees "
+                      "WHERE position = ? ORDER BY id")
+UPSERT = ("INSERT OR REPLACE INTO employees (id, name, position, salary, hours, project) "
+          "VALUES (?, ?, ?, ?, ?, ?)")
+DELETE = "DELETE FROM employees WHERE id = ?"
+ADD_HOURS = "UPDATE employees SET hours = hours + ? WHERE id = ?"
+ASSIGN_PROJECT = "UPDATE employees SET project = ? WHERE id = ?"
+UPDATE = "UPDATE employees SET name = ?, position = ?, salary = ? WHERE id = ?"
+RESET_HOURS = "UPDATE employees SET hours = 0"
+SELECT_ENTRIES = "SELECT employee_id, at, hours, project FROM time_entries"
+INSERT_ENTRY = "INSERT INTO time_entries (employee_id, at, hours, project) VALUES (?, ?, ?, ?)"
+DELETE_ENTRIES = "DELETE FROM time_entries WHERE employee_id = ?"
+PRUNE_ENTRIES = "DELETE FROM time_entries WHERE at < ?"
+
+# Отметка в таблице meta о том, что данные из CSV уже перенесены
+CSV_MIGRATED = "csv_migrated"
+# Начало расчетного периода, к которому относятся часы в базе
+PERIOD_START = "period_start"
+SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+
+class SqliteStorage(Storage):
+    """
+    Хранилище сотрудников в базе SQLite (employees.db в папке данных).
+
+    База работает в режиме WAL: запись не блокирует чтение, а каждая
+    транзакция сначала попадает в журнал WAL, поэтому отдельный журнал
+    employees.journal не нужен. Записи log_* применяются как UPDATE/INSERT/
+    DELETE по ID одной транзакцией на пачку (append_records).
+    save_employees сравнивает список с последним сохраненным состоянием
+    и пишет только изменившиеся строки. Запросы по проекту и должности
+    выполняются по индексам. Отметки времени сотрудников хранятся
+    в таблице time_entries и привязываются к сотрудникам при загрузке,
+    начало расчетного периода часов - в таблице meta (обнуление часов,
+    удаление отметок закрытого периода и новое начало периода пишутся
+    одной транзакцией).
+
+    При первом открытии, если в папке есть employees.csv (и журнал),
+    данные один раз переносятся в базу (migrate_from_csv).
+
+    Атрибуты:
+        db_file (str): Полный путь к файлу базы.
+    """
+
+    def __init__(self, data_folder: str = "data") -> None:
+        """
+        Открывает (или создает) базу и при необходимости переносит данные из CSV.
+
+        Параметры:
+            data_folder (str, optional): Папка с данными. По умолчанию "data".
+        """
+        super().__init__(data_folder)
+        os.makedirs(data_folder, exist_ok=True)
+        self.db_file = os.path.join(data_folder, "employees.db")
+        # Соединение используется и из фонового потока записи, доступ - под блокировкой
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Подтвержденная транзакция сбрасывается на диск, как и записи employees.journal
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+        # Последнее сохраненное состояние: {ID: строка}; None - неизвестно
+        self._saved = None
+
+        csv_file = os.path.join(data_folder, "employees.csv")
+        if os.path.exists(csv_file) and not self._meta(CSV_MIGRATED):
+            try:
+                self.migrate_from_csv()
+            except Exception as e:
+                # Отметка не ставится - перенос повторится при следующем открытии
+                print(f"Ошибка переноса данных из CSV: {e}")
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self._db.close()
+
+    def load_employees(self, compact: bool = False) -> list:
+        """
+        Загружает сотрудников из базы (в порядке ID).
+
+        Параметры:
+            compact (bool, optional): Вернуть EmployeeTable вместо списка.
+
+        Возвращает:
+            list | EmployeeTable: Сотрудники. При ошибке - пустой список.
+        """
+        self.load_projects()
+        try:
+            period_start = self._meta(PERIOD_START)
+            with self._lock:
+                rows = self._db.execute(SELECT_ALL).fetchall()
+                entries = self._db.execute(SELECT_ENTRIES).fetchall()
+                self._saved = {row[0]: row for row in rows}
+        except sqlite3.Error as e:
+            print(f"Ошибка загрузки сотрудников: {e}")
+            return []
+        self.load_period_start(None if period_start is None else int(period_start))
+        self.finish_close_period()
+
+        if compact:
+            ids, names, positions, salaries, hours, projects = zip(*rows) if rows else ((),) * 6
+            employees = EmployeeTable.from_columns(list(names), list(positions), list(salaries),
+                                                   list(hours), list(projects), list(ids))
+        else:
+            employees = self._employees(rows)
+        if entries:
+            attach_timelogs(employees, group_entries(*zip(*entries), start=self.period_start))
+        return employees
+
+    def save_employees(self, employees: list) -> bool:
+        """
+        Сохраняет список сотрудников, записывая только изменения.
+
+        Строки, которые совпадают с сохраненными, не переписываются;
+        сотрудники, которых нет в списке, удаляются. Отметки времени
+        переписываются только у изменившихся сотрудников.
+
+        Параметры:
+            employees (list | EmployeeTable): Сотрудники.
+
+        Возвращает:
+            bool: True если сохранение прошло успешно.
+
+        Исключения:
+            sqlite3.Error: Если не удалось записать данные.
+        """
+        rows = {emp.id: (emp.id, emp.name, emp.position, float(emp.salary),
+                         float(emp.hours_worked), emp.project) for emp in employees}
+        with self._lock:
+            saved = self._saved
+            if saved is None:
+                saved = {row[0]: row for row in self._db.execute(SELECT_ALL)}
+            changed = [row for emp_id, row in rows.items() if saved.get(emp_id) != row]
+            removed = [(emp_id,) for emp_id in saved if emp_id not in rows]
+            changed_ids = {row[0] for row in changed}
+            entries = self._entry_rows([emp for emp in employees if emp.id in changed_ids])
+            with self._db:
+                self._db.executemany(DELETE, removed)
+                self._db.executemany(DELETE_ENTRIES, removed)
+                self._db.executemany(UPSERT, changed)
+                self._db.executemany(DELETE_ENTRIES, [(emp_id,) for emp_id in changed_ids])
+                self._db.executemany(INSERT_ENTRY, entries)
+                if self.period_start is not None:
+                    self._db.execute(SET_META, (PERIOD_START, str(self.period_start)))
+            self._saved = rows
+        self.save_projects(employees)
+        return True
+
+    def append_records(self, records: list) -> None:
+        """
+        Применяет записи (см. journal.py) одной транзакцией.
+
+        Параметры:
+            records (list): Записи с ключом "op" и ID сотрудника.
+
+        Исключения:
+            ValueError: Если операция неизвестна.
+            sqlite3.Error: Если не удалось записать данные.
+        """
+        with self._lock:
+            # Состояние базы меняется мимо save_employees - сравнивать больше не с чем
+            self._saved = None
+            with self._db:
+                for record in records:
+                    self._apply(record)
+
+    def clear(self) -> None:
+        """Удаляет всех сотрудников из базы и справочник проектов."""
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM employees")
+                self._db.execute("DELETE FROM time_entries")
+                self._db.execute("DELETE FROM meta WHERE key = ?", (PERIOD_START,))
+            self._saved = {}
+        self._projects = set()
+        projects_file = os.path.join(self.data_folder, PROJECTS_FILE)
+        if os.path.exists(projects_file):
+            os.remove(projects_file)
+
+    def compact(self) -> None:
+        """Переносит журнал WAL в основной файл базы и укорачивает его."""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def employees_in_project(self, project: str) -> list:
+        """Сотрудники проекта (запрос по индексу employees_project)."""
+        return self._query(SELECT_BY_PROJECT, project)
+
+    def employees_in_position(self, position: str) -> list:
+        """Сотрудники с данной должностью (запрос по индексу employees_position)."""
+        return self._query(SELECT_BY_POSITION, position)
+
+    def migrate_from_csv(self) -> int:
+        """
+        Переносит сотрудников из employees.csv и его журнала в базу.
+
+        Выполняется одной транзакцией; после успешного переноса в таблице
+        meta ставится отметка, и при следующих открытиях CSV не читается.
+        Сам CSV файл не удаляется.
+
+        Возвращает:
+            int: Количество перенесенных сотрудников.
+
+        Исключения:
+            ValueError: Если данные в CSV некорректны (база не меняется).
+        """
+        from data_manager import DataManager
+
+        source = DataManager(self.data_folder)
+        employees = source.read_employees(compact=True)
+        rows = [(emp_id, name, position, salary, hours, project)
+                for emp_id, name, position, salary, hours, project
+                in zip(employees.ids.tolist(), employees.names, list(employees.positions),
+                       employees.salaries.tolist(), employees.hours.tolist(),
+                       list(employees.projects))]
+        entries = self._entry_rows(employees)
+        with self._lock:
+            with self._db:
+                self._db.executemany(UPSERT, rows)
+                self._db.executemany(INSERT_ENTRY, entries)
+                self._db.execute(SET_META, (CSV_MIGRATED, os.path.join(self.data_folder, "employees.csv")))
+                if source.period_start is not None:
+                    self._db.execute(SET_META, (PERIOD_START, str(source.period_start)))
+            self._saved = None
+        self.period_start = source.period_start
+        print(f"Перенесено сотрудников из CSV в базу: {len(rows)}")
+        return len(rows)
+
+    def _apply(self, record: dict) -> None:
+        """Выполняет одну запись внутри открытой транзакции."""
+        op = record["op"]
+        if op == journal.CREATE:
+            self._db.execute(UPSERT, (record["id"], record["name"], record["position"],
+                                      record["salary"], record["hours"], record["project"]))
+        elif op == journal.DELETE:
+            self._db.execute(DELETE, (record["id"],))
+            self._db.execute(DELETE_ENTRIES, (record["id"],))
+        elif op == journal.ADD_HOURS:
+            self._db.execute(ADD_HOURS, (record["hours"], record["id"]))
+            if "at" in record:
+                self._db.execute(INSERT_ENTRY, (record["id"], record["at"],
+                                                record["hours"], record["project"]))
+        elif op == journal.ADD_HOURS_BATCH:
+            self._db.executemany(ADD_HOURS, zip(record["hours"], record["ids"]))
+            if "at" in record:
+                self._db.executemany(INSERT_ENTRY, ((emp_id, record["at"], hours, project)
+                                                    for emp_id, hours, project in zip(
+                                                        record["ids"], record["hours"], record["projects"])))
+        elif op == journal.RESET_HOURS:
+            self._db.execute(RESET_HOURS)
+            self._db.execute(PRUNE_ENTRIES, (record["at"],))
+            self._db.execute(SET_META, (PERIOD_START, str(record["at"])))
+        elif op == journal.ASSIGN_PROJECT:
+            self._db.execute(ASSIGN_PROJECT, (record["project"], record["id"]))
+        elif op == journal.UPDATE:
+            self._db.execute(UPDATE, (record["name"], record["position"],
+                                      record["salary"], record["id"]))
+        else:
+            raise ValueError(f"Неизвестная операция: {op}")
+
+    def _query(self, sql: str, value: str) -> list:
+        with self._lock:
+            rows = self._db.execute(sql, (value,)).fetchall()
+        return self._employees(rows)
+
+    def _meta(self, key: str):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _entry_rows(employees) -> list:
+        """Отметки времени сотрудников строками таблицы time_entries."""
+        ids, at, hours, projects = entry_columns(employees)
+        return list(zip(ids.tolist(), at.tolist(), hours.tolist(), projects))
+
+    @staticmethod
+    def _employees(rows: list) -> list:
+        return [Employee.restore(name, position, salary, hours, project, emp_id)
+                for emp_id, name, position, salary, hours, project in rows]
@@ -0,0 +1,419 @@
+import os
+from abc import ABC, abstractmethod
+
+import journal
+
+
+# Справочник проектов (см. project.ProjectRegistry) рядом с данными сотрудников
+PROJECTS_FILE = "projects.json"
+
+
+def open_storage(data_folder: str = "data", backend: str = "csv", **options):
+    """
+    Открывает хранилище сотрудников в папке данных.
+
+    Параметры:
+        data_folder (str, optional): Папка с данными.
+        backend (str, optional): "csv" - DataManager (снимок CSV и журнал),
+            "binary" - DataManager с двоичным снимком employees.snap,
+            "sqlite" - SqliteStorage (база employees.db).
+        **options: Дополнительные параметры конструктора хранилища.
+
+    Возвращает:
+        Storage: Хранилище.
+
+    Исключения:
+        ValueError: Если хранилище неизвестно.
+    """
+    if backend == "csv":
+        from data_manager import DataManager
+        return DataManager(data_folder, **options)
+    if backend == "binary":
+        from data_manager import DataManager
+        return DataManager(data_folder, snapshot_format="binary", **options)
+    if backend == "sqlite":
+        from sqlite_storage import SqliteStorage
+        return SqliteStorage(data_folder, **options)
+    raise ValueError(f"Неизвестное хранилище: {backend}")
+
+
+def _used_projects(employees) -> set:
+    """Возвращает проекты сотрудников и их отметок."""
+    if hasattr(employees, 'timelogs'):
+        return set(employees.projects.unique()) | employees.timelogs.projects()
+    titles = {emp.project for emp in employees}
+    for emp in employees:
+        if emp.timelog is not None:
+            titles.update(emp.timelog.projects())
+    return titles
+
+
+class Storage(ABC):
+    """
+    Общая часть хранилищ сотрудников.
+
+    Интерфейс и GUI меняют данные через методы log_*: каждый из них
+    превращается в запись (словарь с ключом "op", см. journal.py),
+    которая передается фоновому потоку записи или сразу в append_records.
+    Конкретное хранилище определяет, как записи, полные сохранения
+    и загрузка выполняются на диске (абстрактные методы):
+
+        load_employees(compact) - загрузить всех сотрудников;
+        save_employees(employees) - сохранить список целиком;
+        append_records(records) - применить записи одной транзакцией;
+        clear() - удалить все данные.
+
+    Архив закрытых периодов (close_period, periods) общий для всех
+    хранилищ и лежит в папке данных (см. period.py).
+
+    Запросы по проекту и должности здесь выполняются перебором
+    загруженного списка; хранилища с индексами их переопределяют.
+
+    Атрибуты:
+        data_folder (str): Путь к папке для хранения данных.
+        worker (PersistenceWorker | None): Фоновый поток записи; если задан,
+            методы log_* только ставят записи в его очередь.
+        period_start (int | None): Начало расчетного периода, от которого
+            посчитаны часы в данных этого хранилища (см. load_period_start).
+    """
+
+    def __init__(self, data_folder: str) -> None:
+        self.data_folder = data_folder
+        self.worker = None
+        self.period_start = None
+        # Проекты этой папки: из ее projects.json и у сохраненных сотрудников
+        self._projects = set()
+
+    @abstractmethod
+    def load_employees(self, compact: bool = False) -> list:
+        """Загружает всех сотрудников (EmployeeTable, если compact)."""
+
+    @abstractmethod
+    def save_employees(self, employees: list) -> bool:
+        """Сохраняет список сотрудников целиком."""
+
+    @abstractmethod
+    def append_records(self, records: list) -> None:
+        """Применяет записи (см. journal.py) одной транзакцией."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удаляет все данные хранилища."""
+
+    def load_projects(self) -> None:
+        """
+        Добавляет проекты из projects.json в справочник Employee.projects.
+
+        Хранилища вызывают его перед чтением сотрудников, чтобы номера
+        проектов совпадали с номерами прошлого запуска.
+
+        Исключения:
+            ValueError: Если справочник в файле поврежден (см. ProjectRegistry.load).
+        """
+        from employee import Employee
+
+        titles = Employee.projects.load(os.path.join(self.data_folder, PROJECTS_FILE))
+        self._projects = set(titles or ())
+
+    def save_projects(self, employees=()) -> list:
+        """
+        Записывает проекты этой папки в projects.json (вместе со снимком сотрудников).
+
+        Справочник Employee.projects общий для процесса, поэтому в нем могут
+        быть проекты других папок. В файл попадают только проекты,
+        прочитанные из этой папки, и проекты сотрудников и их отметок.
+
+        Параметры:
+            employees (list | EmployeeTable, optional): Сохраняемые сотрудники.
+
+        Возвращает:
+            list: Проекты папки в порядке номеров в файле.
+        """
+        from employee import Employee
+
+        used = _used_projects(employees)
+        # Проекты отметок могут еще не быть в справочнике
+        for title in sorted(title for title in used if title not in Employee.projects):
+            Employee.projects.code(title)
+        self._projects = self._projects | used
+        titles = [title for title in Employee.projects.titles() if title in self._projects]
+        Employee.projects.save(os.path.join(self.data_folder, PROJECTS_FILE), titles)
+        return titles
+
+    def periods(self):
+        """
+        Возвращает архив закрытых периодов (см. period.PeriodArchive).
+
+        Читается только оглавление; файлы периодов - по запросу.
+        """
+        from period import PERIODS_FOLDER, PeriodArchive
+
+        return PeriodArchive(os.path.join(self.data_folder, PERIODS_FOLDER))
+
+    def load_period_start(self, data_start: int = None) -> None:
+        """
+        Устанавливает period_start - начало периода часов в данных.
+
+        Хранилища записывают начало периода вместе с часами (снимок,
+        таблица meta) и передают его сюда перед чтением сотрудников:
+        часы снимка посчитаны именно от него, и загруженные журналы
+        отметок получают его как свою границу (TimeLog.start).
+
+        Параметры:
+            data_start (int, optional): Начало периода, записанное с данными.
+        """
+        self.period_start = self.data_period_start(data_start)
+
+    def data_period_start(self, data_start: int = None):
+        """
+        Возвращает начало периода часов в данных, не меняя period_start.
+
+        В данных, где оно не записано (старые снимки, пустая папка),
+        начало берется из архива периодов.
+
+        Параметры:
+            data_start (int, optional): Начало периода, записанное с данными.
+
+        Возвращает:
+            int | None: Начало периода.
+        """
+        return self.periods().period_start if data_start is None else data_start
+
+    def finish_close_period(self) -> None:
+        """
+        Завершает закрытие периода, прерванное сбоем (см. close_period).
+
+        Вызывается после загрузки сотрудников, когда period_start -
+        начало периода часов в данных. Если обнуление часов уже записано,
+        период добавляется в архив; если нет - закрытие отменяется,
+        и часы остаются в текущем периоде.
+        """
+        archive = self.periods()
+        entry = archive.pending()
+        if entry is None:
+            return
+        if self.period_start == entry["end"]:
+            archive.publish(entry)
+        else:
+            archive.discard(entry)
+
+    def close_period(self, registry, period: str = None, at=None) -> dict:
+        """
+        Закрывает расчетный период: архивирует расчет и обнуляет часы.
+
+        Расчет всех сотрудников записывается в файл периода (см. period.py),
+        затем обнуление часов сразу (не через фоновый поток записи)
+        записывается в хранилище записью reset_hours, и только после
+        этого период добавляется в оглавление архива. После сбоя
+        на любом шаге часы не попадут и в архив, и в текущий период
+        (см. finish_close_period). Отметки времени до закрытия переносятся
+        в архив периода (PeriodArchive.timelogs) и удаляются из текущих
+        данных: hours_between сотрудника видит только незакрытые отметки.
+
+        Параметры:
+            registry (EmployeeRegistry): Реестр над текущим списком сотрудников.
+            period (str, optional): Название периода. По умолчанию - месяц
+                начала периода (или месяц закрытия, если периоды не закрывались).
+            at (optional): Время закрытия. По умолчанию - текущее.
+
+        Возвращает:
+            dict: Запись оглавления архива о закрытом периоде.
+
+        Исключения:
+            ValueError: Если период с таким названием уже закрыт.
+        """
+        archive, entry = self.prepare_close_period(registry, period, at)
+        registry.reset_hours(entry["end"])
+        archive.publish(entry)
+        return entry
+
+    def prepare_close_period(self, registry, period: str = None, at=None) -> tuple:
+        """
+        Первая часть close_period: файлы периода (расчет и отметки до at)
+        и запись reset_hours на диске.
+
+        Список сотрудников не изменяется, поэтому шаг можно выполнять
+        в другом потоке, пока список читают (так делает SyncServer).
+        Затем вызывающий код обнуляет часы (registry.reset_hours(entry["end"]))
+        и публикует период (archive.publish(entry)).
+
+        Параметры:
+            registry (EmployeeRegistry): Реестр над текущим списком сотрудников.
+            period (str, optional): Название периода (см. close_period).
+            at (optional): Время закрытия. По умолчанию - текущее.
+
+        Возвращает:
+            tuple: Архив (PeriodArchive) и запись оглавления о закрытом периоде.
+
+        Исключения:
+            ValueError: Если период с таким названием уже закрыт.
+        """
+        from payroll import PayrollEngine
+        from period import period_name
+        from timelog import entry_columns, now, timestamp
+
+        at = now() if at is None else timestamp(at)
+        archive = self.periods()
+        if period is None:
+            period = period_name(at if archive.period_start is None else archive.period_start)
+        ids, times, hours, projects = entry_columns(registry.employees)
+        closed = times < at
+        entries = (ids[closed], times[closed], hours[closed],
+                   [project for project, keep in zip(projects, closed) if keep])
+        entry = archive.prepare(period, PayrollEngine(registry.employees), at, entries)
+        self.append_records([{"op": journal.RESET_HOURS, "at": at}])
+        self.period_start = at
+        return archive, entry
+
+    def compact(self) -> None:
+        """Уплотняет данные на диске (по умолчанию ничего не делает)."""
+
+    def start_compaction(self) -> None:
+        """Запускает уплотнение данных (по умолчанию - сразу, в этом потоке)."""
+        self.compact()
+
+    def wait_for_compaction(self) -> None:
+        """Дожидается завершения фонового уплотнения данных."""
+
+    def export_csv(self, file_path: str) -> int:
+        """
+        Выгружает всех сотрудников в CSV файл с колонками employees.csv.
+
+        Файл пишется частями (см. report_export), без построения всего
+        CSV в памяти; путь с расширением .gz - со сжатием gzip.
+
+        Параметры:
+            file_path (str): Путь к CSV файлу (заменяется атомарно).
+
+        Возвращает:
+            int: Количество выгруженных сотрудников.
+        """
+        from report_export import CsvWriter, roster_chunks, with_pay
+
+        writer = CsvWriter(file_path)
+        writer.write(with_pay(roster_chunks(self.load_employees(compact=True))))
+        return writer.rows
+
+    def import_csv(self, file_path: str) -> int:
+        """
+        Заменяет всех сотрудников данными из CSV файла (формат employees.csv).
+
+        Параметры:
+            file_path (str): Путь к CSV файлу.
+
+        Возвращает:
+            int: Количество загруженных сотрудников.
+
+        Исключения:
+            FileNotFoundError: Если файл не существует.
+            ValueError: Если данные в CSV некорректны (хранилище не меняется).
+        """
+        from data_manager import DataManager
+
+        employees, _ = DataManager.read_employees_csv(file_path, compact=True)
+        self.save_employees(employees)
+        return len(employees)
+
+    def employees_in_project(self, project: str) -> list:
+        """
+        Возвращает сотрудников проекта.
+
+        Параметры:
+            project (str): Название проекта.
+
+        Возвращает:
+            list: Сотрудники (Employee) в порядке хранения.
+        """
+        return [emp for emp in self.load_employees() if emp.project == project]
+
+    def employees_in_position(self, position: str) -> list:
+        """
+        Возвращает сотрудников с данной должностью.
+
+        Параметры:
+            position (str): Должность.
+
+        Возвращает:
+            list: Сотрудники (Employee) в порядке хранения.
+        """
+        return [emp for emp in self.load_employees() if emp.position == position]
+
+    def log_create(self, emp) -> None:
+        """
+        Записывает добавление сотрудника в конец списка.
+
+        Параметры:
+            emp (Employee): Новый сотрудник.
+        """
+        self._log(journal.CREATE, id=emp.id, name=emp.name, position=emp.position,
+                  salary=emp.salary, hours=emp.hours_worked, project=emp.project)
+
+    def log_delete(self, emp_id: int) -> None:
+        """
+        Записывает удаление сотрудника.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+        """
+        self._log(journal.DELETE, id=emp_id)
+
+    def log_add_hours(self, emp_id: int, hours: float, at: int = None, project: str = None) -> None:
+        """
+        Записывает добавление отработанных часов.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            hours (float): Добавленные часы.
+            at (int, optional): Время отметки (секунды, см. Employee.add_hours).
+                Без него часы записываются без отметки времени.
+            project (str, optional): Проект отметки.
+        """
+        if at is None:
+            self._log(journal.ADD_HOURS, id=emp_id, hours=hours)
+        else:
+            self._log(journal.ADD_HOURS, id=emp_id, hours=hours, at=at, project=project)
+
+    def log_add_hours_batch(self, ids: list, hours: list, at: int = None, projects: list = None) -> None:
+        """
+        Записывает добавление часов многим сотрудникам одной записью журнала.
+
+        Параметры:
+            ids (list): ID сотрудников.
+            hours (list): Часы каждого сотрудника.
+            at (int, optional): Время отметок (одно на всю запись).
+                Без него часы записываются без отметок времени.
+            projects (list, optional): Проект каждой отметки (нужен вместе с at).
+        """
+        if at is None:
+            self._log(journal.ADD_HOURS_BATCH, ids=list(ids), hours=list(hours))
+        else:
+            self._log(journal.ADD_HOURS_BATCH, ids=list(ids), hours=list(hours),
+                      at=at, projects=list(projects))
+
+    def log_assign_project(self, emp_id: int, project: str) -> None:
+        """
+        Записывает назначение сотрудника на проект.
+
+        Параметры:
+            emp_id (int): ID сотрудника.
+            project (str): Название проекта.
+        """
+        self._log(journal.ASSIGN_PROJECT, id=emp_id, project=project)
+
+    def log_update(self, emp) -> None:
+        """
+        Записывает изменение имени, должности и зарплаты.
+
+        Параметры:
+            emp (Employee): Сотрудник с новыми данными.
+        """
+        self._log(journal.UPDATE, id=emp.id, name=emp.name,
+                  position=emp.position, salary=emp.salary)
+
+    def _log(self, op: str, **fields) -> None:
+        """Передает запись фоновому потоку записи или сразу в append_records."""
+        record = dict(fields, op=op)
+        if self.worker is not None:
+            self.worker.submit_records([record])
+        else:
+            self.append_records([record])
@@ -0,0 +1,110 @@
+import unittest
+
+from aggregates import LiveAggregates
+from employee import Employee
+from employee_table import EmployeeTable
+from payroll import PayrollEngine
+from registry import EmployeeRegistry
+
+
+def make_roster():
+    roster = []
+    for name, salary, project, hours in [("Иван", 160000, "Аналитика", 80),
+                                         ("Мария", 120000, "Веб-сайт компании", 40),
+                                         ("Алексей", 100000, "Аналитика", 20)]:
+        emp = Employee(name, "Программист", salary)
+        emp.project = project
+        emp.add_hours(hours)
+        roster.append(emp)
+    return roster
+
+
+class TestLiveAggregates(unittest.TestCase):
+    """Тесты для итогов, обновляемых при изменении сотрудников"""
+
+    def make(self, employees):
+        registry = EmployeeRegistry(employees)
+        stats = LiveAggregates(registry)
+        self.addCleanup(stats.close)
+        return registry, stats
+
+    def check(self, stats, employees):
+        """Итоги совпадают с пересчетом по всему списку."""
+        expected = PayrollEngine(employees).totals()
+        totals = stats.totals()
+        self.assertEqual(totals['Сотрудников'], expected['Сотрудников'])
+        self.assertAlmostEqual(totals['Часы'], expected['Часы'])
+        self.assertAlmostEqual(totals['К_выплате'], expected['К_выплате'], places=2)
+        self.assertAlmostEqual(stats.max_pay, max((e.calculate_pay() for e in employees), default=0))
+        self.assertAlmostEqual(stats.max_hours, max((e.hours_worked for e in employees), default=0))
+
+    def test_changes(self):
+        """Тест 1: Часы, зарплата и проект меняют итоги без пересчета списка"""
+        for employees in (make_roster(), EmployeeTable.from_employees(make_roster())):
+            registry, stats = self.make(employees)
+            self.check(stats, employees)
+
+            employees[2].add_hours(10)
+            employees[1].salary = 130000
+            registry.assign_project(employees[1].id, "Аналитика")
+            self.check(stats, employees)
+            self.assertEqual(list(stats.by_project()), ["Аналитика"])
+            self.assertEqual(stats.by_project()["Аналитика"]['Часы'], 150)
+
+    def test_max_decrease(self):
+        """Тест 2: Уменьшение максимального сотрудника пересчитывает максимум"""
+        employees = make_roster()
+        _, stats = self.make(employees)
+        self.assertEqual(stats.max_hours, 80)
+
+        employees[0].hours_worked = 10
+        employees[0].salary = 50000
+        self.check(stats, employees)
+        self.assertEqual(stats.max_hours, 40)
+
+    def test_add_remove(self):
+        """Тест 3: Добавление и удаление учитываются через add и remove"""
+        for employees in (make_roster(), EmployeeTable.from_employees(make_roster())):
+            registry, stats = self.make(employees)
+            new = Employee("Ольга", "Аналитик", 300000)
+            new.add_hours(200)
+            stats.add(registry.add(new))
+            self.check(stats, employees)
+
+            stats.remove(registry.remove(new.id))
+            stats.remove(registry.remove(employees[0].id))
+            self.check(stats, employees)
+            self.assertEqual(stats.count, 2)
+
+    def test_foreign_changes_ignored(self):
+        """Тест 4: Изменения копий и чужих списков не попадают в итоги"""
+        employees = make_roster()
+        _, stats = self.make(employees)
+        before = stats.totals()
+
+        other = Employee("Ольга", "Аналитик", 90000)
+        other.add_hours(5)
+        copy = EmployeeTable.from_employees(employees)
+        copy[0].add_hours(100)
+        self.assertEqual(stats.totals(), before)
+
+        stats.close()
+        employees[0].add_hours(1)
+        self.assertEqual(stats.totals(), before)
+
+    def test_project_totals(self):
+        """Тест 5: Итоги одного проекта без перебора и после перевода на другой проект"""
+        for employees in (make_roster(), EmployeeTable.from_employees(make_roster())):
+            registry, stats = self.make(employees)
+            self.assertEqual(stats.project_totals("Аналитика")['Сотрудников'], 2)
+            self.assertEqual(stats.project_totals("Аналитика")['Часы'], 100)
+
+            registry.assign_project(employees[0].id, "Новый проект")
+            self.assertEqual(stats.project_totals("Аналитика")['Часы'], 20)
+            self.assertEqual(stats.project_totals("Новый проект")['Сотрудников'], 1)
+            self.assertEqual(stats.project_totals("Нет такого")['Сотрудников'], 0)
+            self.assertEqual(list(stats.by_project()), ["Аналитика", "Веб-сайт компании", "Новый проект"])
+
+
+if __name__ == '__main__':
+    unittest.main()
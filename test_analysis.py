@@ -0,0 +1,72 @@
+import unittest
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from analysis import ChartBuilder, PaymentChart
+from employee import Employee
+
+
+def make_roster():
+    roster = []
+    for name, salary, hours in [("Иван", 160000, 100), ("Мария", 80000, 60)]:
+        emp = Employee.restore(name, "Программист", salary, hours, "Аналитика")
+        roster.append(emp)
+    return roster
+
+
+class TestPaymentChart(unittest.TestCase):
+    """Тесты для графика зарплат"""
+
+    def test_create_payment_chart(self):
+        """Тест 1: Фигура строится без pyplot"""
+        import matplotlib.pyplot as plt
+
+        fig = ChartBuilder.create_payment_chart(make_roster())
+
+        self.assertEqual(plt.get_fignums(), [])
+        heights = [bar.get_height() for bar in fig.axes[0].patches]
+        self.assertEqual(heights, [100000, 30000])
+        with self.assertRaises(ValueError):
+            ChartBuilder.create_payment_chart([])
+
+    def test_partial_update(self):
+        """Тест 2: Изменение одного сотрудника обновляет только его столбец"""
+        roster = make_roster()
+        chart = PaymentChart()
+        canvas = FigureCanvasAgg(chart.figure)
+        chart.attach(canvas)
+        chart.update(roster)
+        chart.refresh()
+        canvas.draw()
+
+        roster[1].hours_worked += 8
+        chart.update(roster, changed=[1])
+
+        self.assertFalse(chart._needs_full_draw)
+        self.assertEqual(chart.ax_hours.patches[1].get_height(), 68)
+        self.assertEqual(chart.ax_pay.patches[1].get_height(), 34000)
+        chart.refresh()
+        self.assertEqual(chart._changed, set())
+
+    def test_full_redraw_when_scale_changes(self):
+        """Тест 3: Новый максимум или новый сотрудник требуют полной перерисовки"""
+        roster = make_roster()
+        chart = PaymentChart()
+        chart.update(roster)
+        chart._needs_full_draw = False
+
+        roster[0].hours_worked += 100
+        chart.update(roster, changed=[0])
+        self.assertTrue(chart._needs_full_draw)
+
+        chart._needs_full_draw = False
+        roster.append(Employee("Алексей", "Тестировщик", 70000))
+        chart.update(roster, changed=[2])
+        self.assertTrue(chart._needs_full_draw)
+        self.assertEqual(len(chart.ax_pay.patches), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
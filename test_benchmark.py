@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+
+from benchmark import POSITIONS, PROJECTS, find_regressions, generate_roster, write_roster
+from data_manager import DataManager
+
+
+class TestBenchmark(unittest.TestCase):
+    """Тесты для генератора списков и сравнения с эталоном"""
+
+    def test_generate_roster(self):
+        """Тест 1: Список воспроизводим по зерну и загружается DataManager"""
+        df = generate_roster(500, seed=7)
+        self.assertTrue(df.equals(generate_roster(500, seed=7)))
+        self.assertFalse(df.equals(generate_roster(500, seed=8)))
+        self.assertTrue(set(df['Должность']) <= set(POSITIONS))
+        self.assertTrue(set(df['Проект']) <= set(PROJECTS))
+        self.assertTrue((df['Зарплата'] > 0).all())
+
+        with tempfile.TemporaryDirectory() as folder:
+            dm = DataManager(folder)
+            write_roster(dm.employees_file, 500, seed=7)
+            employees = dm.load_employees()
+        self.assertEqual(len(employees), 500)
+        self.assertEqual(employees[0].name, df['Имя'][0])
+        self.assertEqual(employees[0].calculate_pay(), df['К_выплате'][0])
+
+    def test_find_regressions(self):
+        """Тест 2: Замедление больше допуска находится, шум и новые замеры - нет"""
+        baseline = {'load/1000': 0.1, 'save/1000': 0.001, 'pay/1000': 0.2}
+        results = {'load/1000': 0.2, 'save/1000': 0.003, 'pay/1000': 0.22, 'new/1000': 1.0}
+
+        self.assertEqual(find_regressions(results, baseline), [('load/1000', 0.1, 0.2)])
+        self.assertEqual(find_regressions(results, baseline, tolerance=1.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from chart_export import ChartCache, chart_data, chart_key, export_chart, export_project_charts
+from employee import Employee
+
+
+def make_roster():
+    roster = []
+    for name, project, hours in [("Иван", "Аналитика", 100), ("Мария", "Веб-сайт: компания", 60),
+                                 ("Алексей", "Аналитика", 20)]:
+        roster.append(Employee.restore(name, "Программист", 160000, hours, project))
+    return roster
+
+
+class TestChartExport(unittest.TestCase):
+    """Тесты для выгрузки графиков в файлы"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_and_key(self):
+        """Тест 1: PNG и SVG рисуются без окна, ключ зависит от данных и оформления"""
+        roster = make_roster()
+        path = os.path.join(self.tmp.name, "график.svg")
+
+        png = export_chart(roster)
+        svg = export_chart(roster, path)
+
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertIn(b"<svg", svg)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), svg)
+        data = chart_data(roster)
+        self.assertEqual(chart_key(*data, "png"), chart_key(*chart_data(make_roster()), "png"))
+        self.assertNotEqual(chart_key(*data, "png"), chart_key(*data, "png", title="Аналитика"))
+        roster[0].hours_worked += 1
+        self.assertNotEqual(chart_key(*data, "png"), chart_key(*chart_data(roster), "png"))
+        with self.assertRaises(ValueError):
+            export_chart(roster, fmt="gif")
+
+    def test_cache_lru(self):
+        """Тест 2: Кэш вытесняет давно не использованные графики в памяти и на диске"""
+        folder = os.path.join(self.tmp.name, "cache")
+        cache = ChartCache(folder, max_bytes=250, memory_bytes=250)
+        for key in ("a", "b"):
+            cache.put(key, "png", key.encode() * 100)
+        self.assertEqual(cache.get("a", "png"), b"a" * 100)
+        cache.put("c", "png", b"c" * 100)
+
+        self.assertIsNone(cache.get("b", "png"))
+        self.assertEqual(sorted(os.listdir(folder)), ["a.png", "c.png"])
+        reopened = ChartCache(folder, max_bytes=250)
+        self.assertEqual(reopened.get("c", "png"), b"c" * 100)
+        self.assertEqual((reopened.hits, reopened.misses), (1, 0))
+
+    def test_project_charts(self):
+        """Тест 3: Графики проектов рисуются в процессах и берутся из кэша"""
+        cache = ChartCache(os.path.join(self.tmp.name, "cache"))
+        out = os.path.join(self.tmp.name, "out")
+
+        paths = export_project_charts(make_roster(), out, cache=cache, workers=2)
+
+        self.assertEqual(sorted(paths), ["Аналитика", "Веб-сайт: компания"])
+        self.assertEqual(os.path.basename(paths["Веб-сайт: компания"]), "Веб-сайт_ компания.png")
+        self.assertEqual(cache.misses, 2)
+        export_project_charts(make_roster(), out, cache=ChartCache(cache.folder), workers=2)
+        self.assertEqual(len(os.listdir(cache.folder)), 2)
+
+    def test_project_file_names(self):
+        """Тест 4: Проекты с одинаковым именем файла не перезаписывают друг друга"""
+        out = os.path.join(self.tmp.name, "out")
+        roster = [Employee.restore(name, "Программист", 160000, 10, project)
+                  for name, project in [("Иван", "A/B"), ("Мария", "A:B"),
+                                        ("Алексей", "a_b"), ("Петр", "C?")]]
+
+        paths = export_project_charts(roster, out, workers=1)
+
+        self.assertEqual(len(set(paths.values())), 4)
+        self.assertEqual(len({path.lower() for path in paths.values()}), 4)
+        self.assertEqual(sorted(os.listdir(out)),
+                         sorted(os.path.basename(path) for path in paths.values()))
+        self.assertEqual(os.path.basename(paths["C?"]), "C_.png")
+        self.assertTrue(os.path.basename(paths["A/B"]).startswith("A_B-"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,256 @@
+import os
+import tempfile
+import unittest
+
+import journal
+from data_manager import EMPLOYEE_DTYPES, DataManager
+from employee import Employee
+from employee_table import EmployeeTable
+
+
+class TestDataManager(unittest.TestCase):
+    """Тесты для класса DataManager"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, text):
+        with open(self.dm.employees_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_save_and_load(self):
+        """Тест 1: Сохраненные сотрудники загружаются без изменений"""
+        emp = Employee("Иван Иванов", "Программист", 100000)
+        emp.add_hours(80)
+        emp.assign_project("База данных")
+        self.dm.save_employees([emp, Employee("Мария", "Дизайнер", 80000)])
+
+        loaded = self.dm.load_employees()
+
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[0].name, "Иван Иванов")
+        self.assertEqual(loaded[0].position, "Программист")
+        self.assertEqual(loaded[0].salary, 100000)
+        self.assertEqual(loaded[0].hours_worked, 80)
+        self.assertEqual(loaded[0].project, "База данных")
+        self.assertEqual(loaded[0].calculate_pay(), 50000)
+        self.assertEqual(loaded[1].project, "Не назначен")
+
+    def test_load_without_project_column(self):
+        """Тест 2: Старый формат без колонки Проект"""
+        self.write_csv("Имя,Должность,Зарплата,Часы\nИван,Программист,100000,10\n")
+
+        loaded = self.dm.load_employees()
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].project, "Не назначен")
+        self.assertEqual(loaded[0].id, 1)
+
+    def test_load_invalid_columns(self):
+        """Тест 3: Некорректная зарплата или часы - пустой список"""
+        self.write_csv("Имя,Должность,Зарплата,Часы,Проект\nИван,Программист,0,10,\n")
+        self.assertEqual(self.dm.load_employees(), [])
+
+        self.write_csv("Имя,Должность,Зарплата,Часы,Проект\nИван,Программист,100,-1,\n")
+        self.assertEqual(self.dm.load_employees(), [])
+
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы\n7,Иван,Программист,100,1\n7,Мария,Дизайнер,100,1\n")
+        self.assertEqual(self.dm.load_employees(), [])
+
+    def test_ids_persist(self):
+        """Тест 4: ID сохраняются в CSV, новые сотрудники получают следующие номера"""
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы\n500,Иван,Программист,100,1\n42,Мария,Дизайнер,100,1\n")
+
+        loaded = self.dm.load_employees()
+        self.assertEqual([e.id for e in loaded], [500, 42])
+        self.assertGreater(Employee("Алексей", "Тестировщик", 70000).id, 500)
+
+        self.dm.save_employees(loaded)
+        self.assertEqual([e.id for e in self.dm.load_employees(compact=True)], [500, 42])
+
+    def test_load_missing_file(self):
+        """Тест 5: Файла нет - пустой список"""
+        self.assertFalse(os.path.exists(self.dm.employees_file))
+        self.assertEqual(self.dm.load_employees(), [])
+
+    def test_read_chunks_typed(self):
+        """Тест 6: Части с типами колонок по запросу, отбор колонок и строк"""
+        rows = "".join(f"{i},Сотрудник {i},Программист,{1000 * i},{i},П\n" for i in range(1, 8))
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы,Проект\n" + rows)
+
+        chunks = list(self.dm.read_csv_chunks(self.dm.employees_file, chunk_size=3, dtypes=EMPLOYEE_DTYPES,
+                                              usecols=['ID', 'Часы'], where=lambda c: c['Часы'] > 2))
+
+        self.assertEqual([len(c) for c in chunks], [1, 3, 1])
+        self.assertEqual(list(chunks[0].columns), ['ID', 'Часы'])
+        self.assertEqual(str(chunks[0]['ID'].dtype), 'Int64')
+        self.assertEqual(chunks[0]['Часы'].dtype, float)
+        self.assertEqual([int(i) for c in chunks for i in c['ID']], [3, 4, 5, 6, 7])
+        # Без dtypes типы определяет pandas
+        self.assertEqual(self.dm.read_csv_to_df(self.dm.employees_file)['ID'].dtype, 'int64')
+
+    def test_read_bad_rows(self):
+        """Тест 7: Ошибочные строки пропускаются и передаются в on_bad_row с номером строки"""
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы,Проект\n"
+                       "1,Иван,Программист,100,1,П\n"
+                       "2,Мария,Дизайнер,много,1,П\n"
+                       "3,Петр,Тестировщик,100,1,П,лишнее\n"
+                       "4.5,Ольга,Менеджер,100,1,П\n"
+                       "5,Анна,Аналитик,100,,П\n"
+                       "6,Олег,Программист,200,2,П\n")
+        bad = []
+
+        df = self.dm.read_csv_to_df(self.dm.employees_file, chunk_size=2, dtypes=EMPLOYEE_DTYPES,
+                                    on_bad_row=lambda line, reason: bad.append((line, reason)))
+
+        self.assertEqual(df['Имя'].tolist(), ["Иван", "Олег"])
+        self.assertEqual(df['Зарплата'].tolist(), [100.0, 200.0])
+        self.assertEqual(sorted(line for line, _ in bad), [3, 4, 5, 6])
+        self.assertIn("Зарплата", dict(bad)[3])
+        self.assertIn("ID", dict(bad)[5])
+
+    def test_read_csv_to_df_missing(self):
+        """Тест 8: Файла нет или он пуст - пустой DataFrame"""
+        self.assertTrue(self.dm.read_csv_to_df(self.dm.employees_file).empty)
+        self.write_csv("")
+        self.assertTrue(self.dm.read_csv_to_df(self.dm.employees_file).empty)
+
+    def test_read_multiline_and_stray_quote(self):
+        """Тест 9: Индекс и номера записей не зависят от chunk_size, лишняя кавычка не склеивает части"""
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы,Проект\n"
+                       "1,\"Иван\nИванов\",Программист,100,1,П\n"
+                       "2,Мария,Дизайнер,много,1,П\n"
+                       "\n"
+                       "3,Петр,\"Тестировщик,\nстарший\",100,1,П,лишнее\n"
+                       "4,Ольга,Менеджер,100,1,П\n")
+        results = []
+        for chunk_size in (1, 2, 100):
+            bad = []
+            df = self.dm.read_csv_to_df(self.dm.employees_file, chunk_size=chunk_size, dtypes=EMPLOYEE_DTYPES,
+                                        on_bad_row=lambda line, reason: bad.append(line))
+            results.append((df.index.tolist(), df['Имя'].tolist(), sorted(bad)))
+        self.assertEqual(results[0], ([0, 3], ["Иван\nИванов", "Ольга"], [3, 4]))
+        self.assertEqual(results[1:], [results[0]] * 2)
+
+        rows = "".join(f"{i},Сотрудник {i},Программист,100,1,П\n" for i in range(1, 1000))
+        self.write_csv("ID,Имя,Должность,Зарплата,Часы,Проект\n"
+                       "0,Сотрудник 5\" дюймов,Программист,100,1,П\n" + rows)
+        chunks = list(self.dm.read_csv_chunks(self.dm.employees_file, chunk_size=100))
+        self.assertEqual([len(c) for c in chunks], [100] * 10)
+        self.assertEqual(chunks[0]['Имя'].iloc[0], "Сотрудник 5\" дюймов")
+
+
+class TestJournal(unittest.TestCase):
+    """Тесты журнала изменений DataManager"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(self.tmp.name)
+        roster = [Employee("Иван", "Программист", 160000),
+                  Employee("Мария", "Дизайнер", 80000)]
+        self.ivan, self.maria = [emp.id for emp in roster]
+        self.dm.save_employees(roster)
+
+    def tearDown(self):
+        self.dm.wait_for_compaction()
+        self.tmp.cleanup()
+
+    def test_replay(self):
+        """Тест 1: Изменения из журнала применяются при загрузке"""
+        csv_before = open(self.dm.employees_file, 'rb').read()
+
+        self.dm.log_add_hours(self.ivan, 10)
+        self.dm.log_assign_project(self.ivan, "Аналитика")
+        self.dm.log_create(Employee("Алексей", "Тестировщик", 70000))
+        self.dm.log_delete(self.maria)
+
+        self.assertEqual(open(self.dm.employees_file, 'rb').read(), csv_before)
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual([e.name for e in loaded], ["Иван", "Алексей"])
+        self.assertEqual(loaded[0].hours_worked, 10)
+        self.assertEqual(loaded[0].project, "Аналитика")
+        self.assertEqual(loaded[0].calculate_pay(), 10000)
+
+    def test_replay_compact(self):
+        """Тест 2: Журнал применяется и к компактной таблице"""
+        self.dm.log_add_hours(self.maria, 16)
+        self.dm.log_create(Employee("Алексей", "Тестировщик", 70000))
+
+        loaded = DataManager(self.tmp.name).load_employees(compact=True)
+
+        self.assertIsInstance(loaded, EmployeeTable)
+        self.assertEqual([e.name for e in loaded], ["Иван", "Мария", "Алексей"])
+        self.assertEqual(loaded[1].calculate_pay(), 8000)
+
+    def test_compaction(self):
+        """Тест 3: Сборка снимка укорачивает журнал и сохраняет данные"""
+        for _ in range(20):
+            self.dm.log_add_hours(self.maria, 2)
+        size_before = self.dm.journal.size()
+
+        self.dm.compact()
+
+        self.assertLess(self.dm.journal.size(), size_before)
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual(loaded[1].hours_worked, 40)
+
+    def test_background_compaction(self):
+        """Тест 4: Журнал больше порога собирается в фоне"""
+        dm = DataManager(self.tmp.name, journal_threshold=500)
+        self.dm = dm
+        for _ in range(20):
+            dm.log_add_hours(self.ivan, 1)
+        dm.log_add_hours(self.ivan, 1)
+        dm.wait_for_compaction()
+
+        snapshot = dm._read_snapshot()[0]
+        self.assertGreater(snapshot[0].hours_worked, 0)
+        self.assertEqual(DataManager(self.tmp.name).load_employees()[0].hours_worked, 21)
+
+    def test_crash_after_snapshot_replace(self):
+        """Тест 5: Сбой между заменой CSV и очисткой журнала"""
+        self.dm.log_add_hours(self.ivan, 5)
+        employees = self.dm.load_employees()
+
+        def crash():
+            raise OSError("сбой")
+
+        real_write = journal.atomic_write
+        journal.atomic_write = lambda path, data: crash() if path == self.dm.journal.path \
+            else real_write(path, data)
+        try:
+            with self.assertRaises(OSError):
+                self.dm.save_employees(employees)
+        finally:
+            journal.atomic_write = real_write
+
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual(loaded[0].hours_worked, 5)
+
+    def test_torn_last_record(self):
+        """Тест 6: Оборванная последняя запись отбрасывается"""
+        self.dm.log_add_hours(self.ivan, 3)
+        with open(self.dm.journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "add_hours", "ind')
+
+        dm = DataManager(self.tmp.name)
+        dm.log_add_hours(self.ivan, 4)
+
+        self.assertEqual(dm.load_employees()[0].hours_worked, 7)
+
+    def test_clear(self):
+        """Тест 7: Очистка удаляет CSV и журнал"""
+        self.dm.log_add_hours(self.ivan, 1)
+        self.dm.clear()
+
+        self.assertFalse(os.path.exists(self.dm.employees_file))
+        self.assertFalse(os.path.exists(self.dm.journal.path))
+        self.assertEqual(self.dm.load_employees(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,29 @@ class TestEmployeeQuick(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             Employee("Тест", "Должность", 0)
+
+    def test_invalid_hours(self):
+        """Тест 3: Часы должны быть конечным положительным числом"""
+        emp = Employee("Тест", "Должность", 100000)
+        for hours in (0, float('nan'), float('inf')):
+            with self.assertRaises(ValueError):
+                emp.add_hours(hours)
+        self.assertEqual(emp.hours_worked, 0)
+
+    def test_reset_hours(self):
+        """Тест 4: Обнуление переносит границу периода, а не вычитает часы"""
+        emp = Employee("Тест", "Должность", 100000)
+        emp.add_hours(8, at=1000)
+        emp.hours_worked += 2
+
+        emp.reset_hours(at=2000)
+        self.assertEqual(emp.hours_worked, 0)
+        self.assertEqual(emp._hours_worked, 0)
+        self.assertEqual(emp.timelog.start, 2000)
+        self.assertEqual(emp.hours_between(), 8)
+
+        emp.add_hours(3, at=3000)
+        self.assertEqual(emp.hours_worked, 3)
     
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import unittest
+
+from employee import Employee
+from employee_table import EmployeeTable
+
+
+class TestEmployeeTable(unittest.TestCase):
+    """Тесты для класса EmployeeTable"""
+
+    def setUp(self):
+        self.table = EmployeeTable(capacity=1)
+        for name, position, salary in [("Иван", "Программист", 100000),
+                                       ("Мария", "Дизайнер", 80000),
+                                       ("Алексей", "Программист", 70000)]:
+            self.table.append(Employee(name, position, salary))
+
+    def test_rows_keep_employee_api(self):
+        """Тест 1: Строка таблицы работает как Employee"""
+        emp = self.table[0]
+
+        emp.add_hours(160)
+        emp.assign_project("Веб-сайт компании")
+
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table[0].hours_worked, 160)
+        self.assertEqual(self.table[0].calculate_pay(), 100000)
+        self.assertEqual(self.table[0].project, "Веб-сайт компании")
+        self.assertEqual(self.table[-1].name, "Алексей")
+
+        with self.assertRaises(ValueError):
+            emp.add_hours(-5)
+        self.assertEqual(self.table[0].hours_worked, 160)
+
+    def test_interned_codes(self):
+        """Тест 2: Одинаковые должности и проекты хранятся один раз"""
+        self.assertEqual(list(self.table.positions.categories), ["Программист", "Дизайнер"])
+        # Коды проектов - номера общего справочника Employee.projects
+        self.assertEqual(set(self.table.projects.codes), {Employee.projects.find("Не назначен")})
+        self.assertEqual(list(self.table.positions), ["Программист", "Дизайнер", "Программист"])
+
+    def test_pop(self):
+        """Тест 3: Удаление сдвигает строки"""
+        removed = self.table.pop(0)
+
+        self.assertEqual(removed.name, "Иван")
+        self.assertEqual([e.name for e in self.table], ["Мария", "Алексей"])
+        self.assertEqual(list(self.table.salaries), [80000, 70000])
+        with self.assertRaises(IndexError):
+            self.table[2]
+
+    def test_from_columns_and_frame(self):
+        """Тест 4: Создание из колонок и выгрузка в DataFrame"""
+        table = EmployeeTable.from_columns(["Иван", "Мария"], ["Программист", "Дизайнер"],
+                                           [160000.0, 80000.0], [10.0, 20.0],
+                                           ["Аналитика", "Аналитика"])
+
+        df = table.to_frame()
+
+        self.assertEqual(list(df['К_выплате']), [10000.0, 10000.0])
+        self.assertEqual(list(df['Проект']), ["Аналитика", "Аналитика"])
+        self.assertEqual(table[1].position, "Дизайнер")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+
+from data_manager import DataManager
+from employee import Employee
+from ingest import REJECT_AMBIGUOUS, REJECT_FORMAT, REJECT_HOURS, REJECT_UNKNOWN, TimesheetIngest
+
+
+class TestTimesheetIngest(unittest.TestCase):
+    """Тесты для пакетной загрузки табелей"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(self.tmp.name)
+        roster = [Employee("Иван", "Программист", 160000),
+                  Employee("Мария", "Дизайнер", 80000),
+                  Employee("Петр", "Тестировщик", 70000),
+                  Employee("Петр", "Аналитик", 90000)]
+        roster[0].assign_project("Аналитика")
+        self.dm.save_employees(roster)
+        self.messages = []
+
+    def tearDown(self):
+        self.dm.wait_for_compaction()
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_csv(self):
+        """Тест 1: CSV читается частями, плохие строки отклоняются"""
+        path = self.write("табель.csv",
+                          "Имя,Часы,Проект\n"
+                          "Иван,8,\n"
+                          "Мария,4,База данных\n"
+                          "Иван,2.5,Аналитика\n"
+                          "Мария,-1,\n"
+                          "Мария,много,\n"
+                          "Ольга,8,\n"
+                          "Петр,8,\n"
+                          "Мария,4,\n")
+        loader = TimesheetIngest(self.dm, report=self.messages.append)
+        loader.ingest(path, chunk_size=3)
+
+        self.assertEqual(loader.rows, 8)
+        self.assertEqual(loader.applied, 4)
+        self.assertEqual(loader.rejected, {REJECT_HOURS: 2, REJECT_UNKNOWN: 1, REJECT_AMBIGUOUS: 1})
+        self.assertEqual(len(self.messages), 3)
+
+        employees = self.dm.load_employees()
+        self.assertEqual(employees[0].hours_worked, 10.5)
+        self.assertEqual(employees[0].project, "Аналитика")
+        self.assertEqual(employees[1].hours_worked, 8)
+        self.assertEqual(employees[1].project, "База данных")
+        self.assertEqual(employees[2].hours_worked, 0)
+
+    def test_jsonl(self):
+        """Тест 2: JSONL с нечитаемой строкой"""
+        lines = [json.dumps({"Имя": "Мария", "Часы": 6, "Проект": "Тестирование"}, ensure_ascii=False),
+                 "{испорчено",
+                 json.dumps({"Имя": "Иван", "Часы": 2}, ensure_ascii=False)]
+        path = self.write("табель.jsonl", "\n".join(lines) + "\n")
+
+        loader = TimesheetIngest(self.dm, report=self.messages.append)
+        loader.ingest(path)
+
+        self.assertEqual((loader.rows, loader.applied), (3, 2))
+        self.assertEqual(loader.rejected, {REJECT_FORMAT: 1})
+        self.assertIn("применено 2", loader.summary())
+
+        employees = self.dm.load_employees(compact=True)
+        self.assertEqual(list(employees.hours), [2, 6, 0, 0])
+        self.assertEqual(employees[1].project, "Тестирование")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import instrument
+
+
+class TestInstrument(unittest.TestCase):
+    """Тесты для замеров вызовов"""
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled_is_untouched(self):
+        """Тест 1: При выключенных замерах функция не оборачивается"""
+        def work():
+            return 1
+
+        self.assertIs(instrument.instrumented(work), work)
+
+    def test_counts_and_memory(self):
+        """Тест 2: Считаются вызовы, гистограмма и пик памяти, в том числе вложенных вызовов"""
+        instrument.enable(memory=True)
+
+        @instrument.instrumented(name="inner")
+        def inner():
+            return bytearray(1 << 20)
+
+        @instrument.instrumented
+        def outer():
+            big = bytearray(4 << 20)
+            del big
+            return len(inner())
+
+        for _ in range(3):
+            outer()
+        stats = instrument.report()
+
+        self.assertEqual(stats['inner']['calls'], 3)
+        name = outer.__qualname__
+        self.assertEqual(stats[name]['calls'], 3)
+        self.assertEqual(sum(stats[name]['histogram_ms'].values()), 3)
+        # Пик внешнего вызова не теряется при сбросе пика во вложенном
+        self.assertGreaterEqual(stats[name]['alloc_peak_bytes']['max'], 4 << 20)
+        self.assertGreaterEqual(stats['inner']['alloc_peak_bytes']['max'], 1 << 20)
+        self.assertLess(stats['inner']['alloc_peak_bytes']['max'], 4 << 20)
+
+    def test_environment_outputs(self):
+        """Тест 3: Переменная окружения включает замеры и запись JSON или cProfile при выходе"""
+        code = ("from data_manager import DataManager; import sys;"
+                "DataManager(sys.argv[1]).load_employees()")
+        with tempfile.TemporaryDirectory() as folder:
+            for output in ("stats.json", "stats.prof"):
+                path = os.path.join(folder, output)
+                env = dict(os.environ, TIMETRACKER_PROFILE=path)
+                subprocess.run([sys.executable, "-c", code, folder], env=env, check=True,
+                               cwd=os.path.dirname(os.path.abspath(instrument.__file__)))
+                if output.endswith(".json"):
+                    with open(path, encoding='utf-8') as f:
+                        self.assertEqual(json.load(f)['DataManager.load_employees']['calls'], 1)
+                else:
+                    functions = {func[2] for func in pstats.Stats(path).stats}
+                    self.assertIn('load_employees', functions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from employee import Employee
+from employee_table import EmployeeTable
+from payroll import PayrollEngine
+
+
+def make_roster():
+    roster = []
+    for name, position, salary, hours, project in [
+            ("Иван", "Программист", 160000, 160, "Веб-сайт компании"),
+            ("Мария", "Дизайнер", 80000, 80, "Веб-сайт компании"),
+            ("Алексей", "Программист", 120000, 40, "Аналитика")]:
+        emp = Employee(name, position, salary)
+        emp.add_hours(hours)
+        emp.assign_project(project)
+        roster.append(emp)
+    return roster
+
+
+class TestPayrollEngine(unittest.TestCase):
+    """Тесты для класса PayrollEngine"""
+
+    def test_pay_matches_calculate_pay(self):
+        """Тест 1: Векторный расчет совпадает с calculate_pay"""
+        roster = make_roster()
+        engine = PayrollEngine(roster)
+
+        self.assertEqual(list(engine.pay()), [e.calculate_pay() for e in roster])
+        self.assertEqual(engine.totals(), {'Сотрудников': 3, 'Часы': 280.0, 'К_выплате': 230000.0})
+
+    def test_rollups(self):
+        """Тест 2: Сводки по проектам и должностям"""
+        engine = PayrollEngine(make_roster())
+
+        by_project = engine.by_project()
+        self.assertEqual(by_project.loc["Веб-сайт компании", 'Сотрудников'], 2)
+        self.assertEqual(by_project.loc["Веб-сайт компании", 'К_выплате'], 200000)
+        self.assertEqual(by_project.loc["Веб-сайт компании", 'Средняя'], 100000)
+        self.assertEqual(by_project.loc["Аналитика", 'Часы'], 40)
+
+        by_position = engine.by_position()
+        self.assertEqual(by_position.loc["Программист", 'Медиана'], 95000)
+
+    def test_cache_invalidation(self):
+        """Тест 3: Кэш сбрасывается при изменении часов, зарплаты, имени и списка"""
+        roster = make_roster()
+        engine = PayrollEngine(roster)
+        first = engine.frame()
+
+        self.assertIs(engine.frame(), first)
+
+        roster[2].add_hours(40)
+        self.assertEqual(engine.pay()[2], 60000)
+
+        roster[1].salary = 160000
+        self.assertEqual(engine.pay()[1], 80000)
+
+        roster[1].name = "Мария Иванова"
+        self.assertEqual(engine.frame()['Имя'].iloc[1], "Мария Иванова")
+
+        roster.pop(0)
+        self.assertEqual(engine.totals()['Сотрудников'], 2)
+
+    def test_table(self):
+        """Тест 4: Расчет по EmployeeTable и сброс кэша по version"""
+        table = EmployeeTable.from_employees(make_roster())
+        engine = PayrollEngine(table)
+
+        self.assertEqual(engine.totals()['К_выплате'], 230000)
+
+        table[0].add_hours(16)
+        self.assertEqual(engine.pay()[0], 176000)
+        self.assertEqual(engine.by_project().loc["Аналитика", 'К_выплате'], 30000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from employee import Employee
+from payroll import PayrollEngine
+from period import PeriodArchive
+from registry import EmployeeRegistry
+from remote import RemoteStorage
+from server import SyncServer
+from storage import open_storage
+from timelog import entry_columns, timestamp, total_hours
+
+
+SEPTEMBER = timestamp(datetime(2026, 9, 10))
+OCTOBER = timestamp(datetime(2026, 10, 1))
+NOVEMBER = timestamp(datetime(2026, 11, 1))
+
+
+def make_roster():
+    roster = []
+    for name, project, hours in [("Иван", "Аналитика", 80), ("Мария", "Веб-сайт компании", 40)]:
+        emp = Employee(name, "Программист", 160000)
+        emp.project = project
+        emp.add_hours(hours, at=SEPTEMBER)
+        roster.append(emp)
+    return roster
+
+
+class TestPeriodClose(unittest.TestCase):
+    """Тесты для закрытия расчетного периода"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_close_and_reload(self):
+        """Тест 1: Расчет уходит в архив, часы обнуляются и остаются нулевыми после загрузки"""
+        for backend in ("csv", "binary", "sqlite"):
+            folder = os.path.join(self.tmp.name, backend)
+            data = open_storage(folder, backend)
+            roster = make_roster()
+            data.save_employees(roster)
+
+            entry = data.close_period(EmployeeRegistry(roster), "2026-09", at=OCTOBER)
+            self.assertEqual((entry['Сотрудников'], entry['Часы'], entry['К_выплате']), (2, 120, 120000))
+            self.assertEqual(entry['projects']['Аналитика']['Часы'], 80)
+            self.assertEqual([emp.hours_worked for emp in roster], [0, 0])
+            with self.assertRaises(ValueError):
+                data.close_period(EmployeeRegistry(roster), "2026-09")
+
+            for compact in (False, True):
+                reopened = open_storage(folder, backend)
+                loaded = reopened.load_employees(compact=compact)
+                self.assertEqual(reopened.period_start, OCTOBER)
+                self.assertEqual([emp.hours_worked for emp in loaded], [0, 0])
+                # Отметки прошлого периода - только в архиве
+                self.assertEqual(loaded[0].hours_between(SEPTEMBER, OCTOBER), 0)
+                closed = reopened.periods().timelogs("2026-09")
+                self.assertEqual(closed[loaded[0].id].total(SEPTEMBER, OCTOBER), 80)
+                loaded[0].add_hours(5, at=OCTOBER + 3600)
+                self.assertEqual(loaded[0].hours_worked, 5)
+            if backend == "sqlite":
+                data.close()
+
+    def test_lazy_history(self):
+        """Тест 2: Итоги читаются из оглавления, строки - только из нужных файлов периодов"""
+        data = open_storage(self.tmp.name)
+        roster = make_roster()
+        registry = EmployeeRegistry(roster)
+        data.close_period(registry, "2026-09", at=OCTOBER)
+        roster[0].add_hours(10, at=OCTOBER + 3600)
+        registry.add(Employee("Алексей", "Дизайнер", 80000)).add_hours(20, at=OCTOBER + 3600)
+        entry = data.close_period(registry, at=NOVEMBER)
+        self.assertEqual(entry['period'], "2026-10")
+
+        archive = PeriodArchive(os.path.join(self.tmp.name, "periods"), cache_size=1)
+        self.assertEqual(archive.periods(), ["2026-09", "2026-10"])
+        self.assertEqual(archive.totals()['Часы'].tolist(), [120, 30])
+        self.assertEqual(archive.project_totals("Веб-сайт компании")['Часы'].tolist(), [40, 0])
+        self.assertEqual(archive.opened, 0)
+
+        history = archive.employee_history(roster[0].id)
+        self.assertEqual(history['Часы'].tolist(), [80, 10])
+        self.assertEqual(archive.opened, 2)
+        # Новый сотрудник вне диапазона ID сентября: читается только октябрь
+        history = archive.employee_history(registry.employees[-1].id, start="2026-09")
+        self.assertEqual(history.index.tolist(), ["2026-10"])
+        self.assertEqual(archive.opened, 2)
+        self.assertEqual(archive.frame("2026-09")['Часы'].sum(), 120)
+        self.assertEqual(archive.opened, 3)
+
+    def test_remote_close(self):
+        """Тест 3: Период закрывается на сервере, другие клиенты получают обнуление"""
+        data = open_storage(self.tmp.name)
+        data.save_employees(make_roster())
+        loop = asyncio.new_event_loop()
+        server = SyncServer(data, port=0)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            address = f"{server.host}:{server.port}"
+            first, second = RemoteStorage(address), RemoteStorage(address)
+            second.subscribe()
+            employees = first.load_employees()
+            entry = first.close_period(EmployeeRegistry(employees), "2026-09", at=OCTOBER)
+            self.assertEqual(entry['Часы'], 120)
+            self.assertEqual([emp.hours_worked for emp in employees], [0, 0])
+            with self.assertRaises(ValueError):
+                first.close_period(EmployeeRegistry(employees), "2026-09")
+
+            deadline = time.time() + 5
+            events = []
+            while not events and time.time() < deadline:
+                events = second.poll_events()
+                time.sleep(0.01)
+            self.assertEqual(events[0]["records"], [{"op": "reset_hours", "at": OCTOBER}])
+            self.assertEqual([emp.hours_worked for emp in second.load_employees()], [0, 0])
+            first.close()
+            second.close()
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+        data.wait_for_compaction()
+        self.assertIn("2026-09", data.periods())
+
+    def test_crash_during_close(self):
+        """Тест 4: После сбоя посреди закрытия часы оказываются либо в архиве, либо в текущем периоде"""
+        for backend in ("csv", "binary", "sqlite"):
+            for failing in ("publish", "append_records"):
+                folder = os.path.join(self.tmp.name, backend + failing)
+                data = open_storage(folder, backend)
+                roster = make_roster()
+                # Часы без отметки времени обнуляются только записью reset_hours
+                roster[0].add_hours(10)
+                data.save_employees(roster)
+
+                target = PeriodArchive if failing == "publish" else type(data)
+                with mock.patch.object(target, failing, side_effect=OSError("сбой")):
+                    with self.assertRaises(OSError):
+                        data.close_period(EmployeeRegistry(roster), "2026-09", at=OCTOBER)
+                # Журнал мог успеть перейти в снимок
+                data.compact()
+
+                reopened = open_storage(folder, backend)
+                loaded = reopened.load_employees()
+                archive = reopened.periods()
+                self.assertIsNone(archive.pending())
+                if failing == "publish":
+                    # Обнуление записано: закрытие завершается при загрузке
+                    self.assertEqual(archive.periods(), ["2026-09"])
+                    self.assertEqual(archive.entry("2026-09")['Часы'], 130)
+                    self.assertEqual(reopened.period_start, OCTOBER)
+                    self.assertEqual([emp.hours_worked for emp in loaded], [0, 0])
+                else:
+                    # Обнуление не записано: период не закрыт, часы на месте
+                    self.assertEqual(archive.periods(), [])
+                    self.assertFalse(os.path.exists(os.path.join(archive.folder, "2026-09.csv")))
+                    self.assertEqual([emp.hours_worked for emp in loaded], [90, 40])
+                    entry = reopened.close_period(EmployeeRegistry(loaded), "2026-09", at=OCTOBER)
+                    self.assertEqual(entry['Часы'], 130)
+                if backend == "sqlite":
+                    data.close()
+                    reopened.close()
+
+    def test_period_per_folder(self):
+        """Тест 5: Начало периода у каждой папки свое, загрузка другой папки не меняет часы"""
+        closed = open_storage(os.path.join(self.tmp.name, "closed"), "binary")
+        roster = make_roster()
+        closed.save_employees(roster)
+        closed.close_period(EmployeeRegistry(roster), "2026-09", at=OCTOBER)
+        other = open_storage(os.path.join(self.tmp.name, "other"), "binary")
+        other.save_employees(make_roster())
+
+        loaded = other.load_employees()
+        engine = PayrollEngine(loaded)
+        self.assertEqual(engine.totals()['Часы'], 120)
+        reopened = open_storage(closed.data_folder, "binary")
+        self.assertEqual([emp.hours_worked for emp in reopened.load_employees()], [0, 0])
+
+        self.assertEqual((other.period_start, reopened.period_start), (None, OCTOBER))
+        self.assertEqual([emp.hours_worked for emp in loaded], [80, 40])
+        self.assertEqual(engine.totals()['Часы'], 120)
+
+    def test_prune_entries(self):
+        """Тест 6: Отметки закрытого периода удаляются из данных хранилища и остаются в архиве"""
+        for backend in ("csv", "binary", "sqlite"):
+            for compact in (False, True):
+                folder = os.path.join(self.tmp.name, f"{backend}{compact}")
+                data = open_storage(folder, backend)
+                data.save_employees(make_roster())
+                employees = data.load_employees(compact=compact)
+                registry = EmployeeRegistry(employees)
+                data.close_period(registry, "2026-09", at=OCTOBER)
+                employees[1].add_hours(8, at=OCTOBER + 3600)
+                data.save_employees(employees)
+                data.compact()
+
+                ids, at, hours, projects = entry_columns(open_storage(folder, backend).load_employees())
+                self.assertEqual((ids.tolist(), at.tolist(), hours.tolist()),
+                                 ([employees[1].id], [OCTOBER + 3600], [8]))
+                self.assertEqual(total_hours(employees, SEPTEMBER, OCTOBER), 0)
+                closed = data.periods().timelogs("2026-09")
+                self.assertEqual(sorted(closed), sorted(emp.id for emp in employees))
+                self.assertEqual(sum(log.total() for log in closed.values()), 120)
+                self.assertEqual(closed[employees[1].id].by_project(), {"Веб-сайт компании": 40})
+                if backend == "sqlite":
+                    data.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+
+from data_manager import DataManager
+from employee import Employee
+from employee_table import EmployeeTable
+from persistence import PersistenceWorker, copy_employees
+
+
+class RecordingDataManager(DataManager):
+    """DataManager, который запоминает вызовы записи"""
+
+    def __init__(self, data_folder):
+        super().__init__(data_folder)
+        self.calls = []
+
+    def save_employees(self, employees):
+        self.calls.append(("snapshot", len(employees)))
+        return super().save_employees(employees)
+
+    def append_records(self, records):
+        self.calls.append(("records", len(records)))
+        super().append_records(records)
+
+
+class TestPersistenceWorker(unittest.TestCase):
+    """Тесты для фонового потока записи"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = RecordingDataManager(self.tmp.name)
+        self.worker = PersistenceWorker(self.dm, delay=0.2)
+        self.dm.worker = self.worker
+
+    def tearDown(self):
+        self.worker.close()
+        self.dm.wait_for_compaction()
+        self.tmp.cleanup()
+
+    def test_records_are_coalesced(self):
+        """Тест 1: Изменения за окно delay дописываются одним вызовом"""
+        emp = Employee("Иван", "Программист", 100000)
+        self.worker.submit_snapshot([emp])
+        self.worker.flush()
+        for hours in (8, 4, 2):
+            self.dm.log_add_hours(emp.id, hours)
+        self.worker.flush()
+
+        self.assertEqual(self.dm.calls, [("snapshot", 1), ("records", 3)])
+        self.assertEqual(self.dm.load_employees()[0].hours_worked, 14)
+        self.assertEqual([ok for ok, _ in self.worker.poll()], [True, True])
+
+    def test_snapshot_supersedes_earlier_jobs(self):
+        """Тест 2: Из пачки пишется последний снимок и записи после него"""
+        roster = [Employee("Иван", "Программист", 100000)]
+        self.worker.submit_snapshot(roster)
+        self.dm.log_add_hours(roster[0].id, 8)
+        roster[0].add_hours(8)
+        self.worker.submit_snapshot(roster)
+        roster[0].add_hours(100)
+        self.dm.log_add_hours(roster[0].id, 2)
+        self.worker.flush()
+
+        self.assertEqual(self.dm.calls, [("snapshot", 1), ("records", 1)])
+        self.assertEqual(self.dm.load_employees()[0].hours_worked, 10)
+
+    def test_errors_reported_by_poll(self):
+        """Тест 3: Ошибка записи возвращается через poll, поток продолжает работу"""
+        def fail(employees):
+            raise OSError("диск заполнен")
+        self.dm.save_employees = fail
+
+        self.worker.submit_snapshot([])
+        self.worker.flush()
+        self.assertEqual(self.worker.poll(), [(False, "диск заполнен")])
+
+        self.dm.log_create(Employee("Мария", "Дизайнер", 80000))
+        self.worker.close()
+        self.assertTrue(self.worker.poll()[0][0])
+        self.assertEqual(len(self.dm.load_employees()), 1)
+        with self.assertRaises(RuntimeError):
+            self.worker.submit_clear()
+
+    def test_copy_employees(self):
+        """Тест 4: Снимок не зависит от последующих изменений"""
+        roster = [Employee("Иван", "Программист", 100000)]
+        table = EmployeeTable.from_employees(roster)
+
+        for employees in (roster, table):
+            copy = copy_employees(employees)
+            employees[0].add_hours(8)
+            self.assertEqual(copy[0].hours_worked, 0)
+            self.assertEqual(copy[0].name, "Иван")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from employee import Employee
+from employee_table import EmployeeTable
+from project import UNASSIGNED, ProjectRegistry
+from storage import open_storage
+
+
+class TestProjectRegistry(unittest.TestCase):
+    """Тесты для справочника проектов"""
+
+    def test_codes(self):
+        """Тест 1: Номера выдаются подряд и не повторяются, колонка переводится по категориям"""
+        projects = ProjectRegistry(["Аналитика", "Тестирование"])
+
+        self.assertEqual(projects.code("Тестирование"), 1)
+        self.assertEqual(projects.code("База данных"), 2)
+        self.assertEqual(projects.find("Нет такого"), None)
+        self.assertEqual(projects.get(2).title, "База данных")
+        with self.assertRaises(KeyError):
+            projects.get(3)
+
+        column = pd.Categorical(["База данных", None, "Новый", "База данных"])
+        self.assertEqual(projects.codes(column).tolist(), [2, 4, 3, 2])
+        self.assertEqual(projects.value(4), "")
+        self.assertEqual(projects.codes(["Аналитика", "Новый"]).tolist(), [0, 3])
+        self.assertEqual(projects.titles(assigned_only=True),
+                         ["Аналитика", "Тестирование", "База данных", "Новый"])
+
+    def test_employees_reference_ids(self):
+        """Тест 2: Сотрудники и таблица хранят номер проекта из Employee.projects"""
+        emp = Employee("Иван", "Программист", 100000)
+        self.assertEqual(emp.project, UNASSIGNED)
+        emp.project = "Аналитика"
+        table = EmployeeTable.from_employees([emp, Employee("Мария", "Дизайнер", 80000)])
+
+        self.assertEqual(emp.project_id, Employee.projects.find("Аналитика"))
+        self.assertEqual(table[0].project_id, emp.project_id)
+        self.assertEqual(table.copy()[1].project_id, Employee.projects.find(UNASSIGNED))
+
+
+class TestProjectStorage(unittest.TestCase):
+    """Тесты для сохранения справочника проектов"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Тест 3: projects.json сохраняется со снимком, проекты без сотрудников не теряются"""
+        emp = Employee("Иван", "Программист", 100000)
+
+        for backend in ("csv", "binary", "sqlite"):
+            folder = os.path.join(self.tmp.name, backend)
+            data = open_storage(folder, backend)
+            emp.project = "Проект без сотрудников"
+            data.save_employees([emp])
+            emp.project = "Аналитика"
+            data.save_employees([emp])
+            path = os.path.join(folder, "projects.json")
+
+            # Как при новом запуске: пустой справочник получает те же номера
+            projects = ProjectRegistry()
+            self.assertEqual(projects.load(path), [title for title in Employee.projects.titles()
+                                                   if title in ("Аналитика", "Проект без сотрудников")])
+
+            loaded = open_storage(folder, backend).load_employees(compact=True)
+            self.assertEqual(loaded[0].project_id, emp.project_id)
+            self.assertEqual(loaded[0].project, "Аналитика")
+
+            data.clear()
+            self.assertFalse(os.path.exists(path))
+            if backend == "sqlite":
+                data.close()
+
+    def test_folders_do_not_share_projects(self):
+        """Тест 4: В projects.json попадают только проекты своей папки, поврежденный файл не читается"""
+        for backend in ("csv", "binary", "sqlite"):
+            first = open_storage(os.path.join(self.tmp.name, backend, "A"), backend)
+            second = open_storage(os.path.join(self.tmp.name, backend, "B"), backend)
+            alpha = Employee("Иван", "Программист", 100000)
+            alpha.project = "Альфа"
+            alpha.record_hours(3, at=1000)
+            beta = Employee("Мария", "Дизайнер", 80000)
+            beta.project = "Бета"
+            beta.record_hours(2, project="Гамма", at=1000)
+            first.save_employees([alpha])
+            second.load_employees()
+            second.save_employees([beta])
+
+            projects = ProjectRegistry()
+            self.assertEqual(projects.load(os.path.join(second.data_folder, "projects.json")), ["Бета", "Гамма"])
+            self.assertEqual(second.load_employees()[0].project, "Бета")
+            self.assertEqual(ProjectRegistry().load(os.path.join(first.data_folder, "projects.json")),
+                             ["Альфа"])
+            if backend == "sqlite":
+                first.close()
+                second.close()
+
+        path = os.path.join(self.tmp.name, "projects.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"projects": [{"id": 0, "title": "Альфа"}, {"id": 0, "title": "Бета"}]}')
+        with self.assertRaises(ValueError):
+            ProjectRegistry().load(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from employee import Employee
+from employee_table import EmployeeTable
+from registry import EmployeeRegistry
+
+
+def make_roster():
+    roster = []
+    for name, position, project in [("Иван", "Программист", "Аналитика"),
+                                    ("Мария", "Дизайнер", "Веб-сайт компании"),
+                                    ("Алексей", "Программист", "Аналитика"),
+                                    ("Иван", "Тестировщик", "Тестирование")]:
+        emp = Employee(name, position, 100000)
+        emp.project = project
+        roster.append(emp)
+    return roster
+
+
+class TestEmployeeRegistry(unittest.TestCase):
+    """Тесты для класса EmployeeRegistry"""
+
+    def check_registry(self, employees):
+        ivan, maria, alexey, ivan2 = [emp.id for emp in employees]
+        registry = EmployeeRegistry(employees)
+
+        self.assertEqual(registry.get(maria).name, "Мария")
+        self.assertEqual([e.id for e in registry.find_by_name("Иван")], [ivan, ivan2])
+        self.assertEqual(registry.member_ids("Аналитика"), {ivan, alexey})
+
+        registry.remove(ivan)
+        self.assertEqual(registry.position(ivan2), 2)
+        self.assertNotIn(ivan, registry)
+        self.assertEqual([e.id for e in registry.find_by_name("Иван")], [ivan2])
+        self.assertEqual([e.name for e in registry.members("Аналитика")], ["Алексей"])
+
+        registry.rename(maria, "Мария Петрова")
+        registry.assign_project(alexey, "Веб-сайт компании")
+        self.assertEqual(registry.find_by_name("Мария"), [])
+        self.assertEqual(registry.get(maria).name, "Мария Петрова")
+        self.assertEqual(registry.members("Аналитика"), [])
+        self.assertEqual(registry.projects(), {"Веб-сайт компании": 2, "Тестирование": 1})
+
+        new = registry.add(Employee("Ольга", "Аналитик", 90000))
+        self.assertEqual(registry.position(new.id), 3)
+        self.assertEqual(registry.member_ids("Не назначен"), {new.id})
+        with self.assertRaises(ValueError):
+            registry.add(Employee.restore("Копия", "Аналитик", 90000, 0, "", new.id))
+        with self.assertRaises(KeyError):
+            registry.get(ivan)
+
+    def test_list(self):
+        """Тест 1: Поиск и изменения в списке объектов Employee"""
+        self.check_registry(make_roster())
+
+    def test_table(self):
+        """Тест 2: То же для EmployeeTable"""
+        self.check_registry(EmployeeTable.from_employees(make_roster()))
+
+    def test_unique_ids(self):
+        """Тест 3: ID уникальны и сохраняются при копировании в таблицу"""
+        roster = make_roster()
+        table = EmployeeTable.from_employees(roster)
+
+        self.assertEqual(len({emp.id for emp in roster}), len(roster))
+        self.assertEqual(list(table.ids), [emp.id for emp in roster])
+        self.assertEqual(table.pop(0).id, roster[0].id)
+        self.assertEqual(list(table.to_frame()['ID']), [emp.id for emp in roster[1:]])
+
+    def test_add_hours_batch(self):
+        """Тест 4: Часы многим сотрудникам - всем или никому, итог без вывода"""
+        for employees in (make_roster(), EmployeeTable.from_employees(make_roster())):
+            ivan, maria, alexey, ivan2 = [emp.id for emp in employees]
+            registry = EmployeeRegistry(employees)
+
+            with self.assertRaises(ValueError):
+                registry.add_hours_batch([(ivan, 8, None), (maria, -1, None)])
+            with self.assertRaises(ValueError):
+                registry.add_hours_batch([(ivan, 8, None), (10 ** 9, 8, None)])
+            self.assertEqual([emp.hours_worked for emp in employees], [0, 0, 0, 0])
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                batch = registry.add_hours_batch([(ivan2, 4, "Аналитика"), (ivan, 8, None), (ivan2, 2, None)])
+
+            self.assertEqual(batch, ([0, 3], 2, 14.0))
+            self.assertEqual(output.getvalue(), "")
+            self.assertEqual([emp.hours_worked for emp in employees], [8, 0, 0, 6])
+            self.assertEqual(registry.get(ivan2).timelog.by_project(), {"Аналитика": 4, "Тестирование": 2})
+            self.assertEqual(registry.get(ivan2).project, "Тестирование")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from employee import Employee
+from payroll import PayrollEngine
+from report import company_report, folder_summary, format_report, merge_summaries
+from storage import open_storage
+
+
+def make_roster(salary):
+    roster = []
+    for name, position, project, hours in [("Иван", "Программист", "Аналитика", 100),
+                                           ("Мария", "Дизайнер", "Веб-сайт компании", 33.3),
+                                           ("Алексей", "Программист", "Аналитика", 12.5)]:
+        emp = Employee(name, position, salary)
+        emp.project = project
+        emp.add_hours(hours)
+        roster.append(emp)
+    return roster
+
+
+class TestReport(unittest.TestCase):
+    """Тесты для сводного отчета по папкам данных"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folders = []
+        self.rosters = []
+        for i in range(3):
+            folder = os.path.join(self.tmp.name, f"отдел{i}")
+            roster = make_roster(100000 + 12345 * i)
+            open_storage(folder).save_employees(roster)
+            self.folders.append(folder)
+            self.rosters.append(roster)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_folder_summary(self):
+        """Тест 1: Итоги папки совпадают с PayrollEngine"""
+        summary = folder_summary(self.folders[0])
+        engine = PayrollEngine(self.rosters[0])
+        totals = engine.totals()
+
+        self.assertEqual(summary['Итого'][0], totals['Сотрудников'])
+        self.assertAlmostEqual(summary['Итого'][1], totals['Часы'])
+        self.assertEqual(summary['Итого'][2], round(totals['К_выплате'] * 100))
+        by_position = engine.by_position()
+        self.assertEqual(summary['Должность']['Программист'][0], by_position.loc['Программист', 'Сотрудников'])
+        self.assertAlmostEqual(summary['Должность']['Программист'][1], by_position.loc['Программист', 'Часы'])
+
+    def test_processes_match_single(self):
+        """Тест 2: Отчет в нескольких процессах совпадает с отчетом в одном"""
+        single = company_report(self.folders, workers=1)
+        pooled = company_report(self.folders, workers=2)
+
+        self.assertEqual(pooled, single)
+        self.assertEqual(single['Папок'], 3)
+        everyone = [emp for roster in self.rosters for emp in roster]
+        self.assertEqual(single['Итого'][2], round(PayrollEngine(everyone).totals()['К_выплате'] * 100))
+        self.assertEqual(single['Проект']['Аналитика'][0], 6)
+        self.assertIn("Веб-сайт компании", format_report(single))
+
+    def test_merge_and_missing(self):
+        """Тест 3: Пустой отчет и отсутствующая папка"""
+        self.assertEqual(merge_summaries([])['Итого'], [0, 0.0, 0])
+        with self.assertRaises(FileNotFoundError):
+            company_report(self.folders + [os.path.join(self.tmp.name, "нет")])
+
+
+if __name__ == '__main__':
+    unittest.main()
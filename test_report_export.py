@@ -0,0 +1,132 @@
+import gzip
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import pandas as pd
+
+from employee import Employee
+from employee_table import EmployeeTable
+from payroll import PayrollEngine
+from report_export import CsvWriter, ReportWriter, csv_chunks, export_report, roster_chunks, with_pay
+from storage import open_storage
+
+
+def make_roster():
+    roster = []
+    for name, position, project, hours in [("Иван", "Программист", "Аналитика", 80),
+                                           ("Мария", "Дизайнер", "Веб-сайт, компании", 40),
+                                           ("Петр", "Программист", "База данных", 12.5),
+                                           ("Анна", "Аналитик", "Аналитика", 33)]:
+        emp = Employee(name, position, 160000)
+        emp.project = project
+        emp.hours_worked = hours
+        roster.append(emp)
+    return roster
+
+
+def write_roster_csv(path, size):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("ID,Имя,Должность,Зарплата,Часы,К_выплате,Проект\n")
+        for i in range(size):
+            f.write(f"{i},Сотрудник {i},Должность {i % 7},{100000 + i % 50},{i % 160},0,Проект {i % 13}\n")
+
+
+class TestReportExport(unittest.TestCase):
+    """Тесты для потоковой выгрузки отчетов"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_formats_and_subtotals(self):
+        """Тест 1: Строки и итоги во всех форматах совпадают с PayrollEngine при любом делении на части"""
+        roster = make_roster()
+        rollup = PayrollEngine(roster).by_project()
+        for employees in (roster, EmployeeTable.from_employees(roster)):
+            for chunk_size in (1, 3, 100):
+                total = export_report(roster_chunks(employees, chunk_size), self.path("отчет.csv"))
+                self.assertEqual((total.count, total.hours, total.cents), (4, 165.5, 16550000))
+                frame = pd.read_csv(self.path("отчет.csv"))
+                self.assertEqual(frame['ID'].iloc[:4].tolist(), [emp.id for emp in roster])
+                subtotals = frame.iloc[4:-1].set_index('Проект')
+                self.assertEqual(subtotals.index.tolist(), rollup.index.tolist())
+                self.assertEqual(subtotals['К_выплате'].tolist(), rollup['К_выплате'].tolist())
+                self.assertEqual(frame['Имя'].iloc[-1], "Всего, сотрудников 4")
+
+        export_report(roster_chunks(roster, 2), self.path("отчет.jsonl"), positions=["Программист"],
+                      group_by='Должность')
+        with open(self.path("отчет.jsonl"), encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line.get('Имя') for line in lines[:2]], ["Иван", "Петр"])
+        self.assertEqual(lines[2], {'Итого': "Программист", 'Группа': 'Должность', 'Сотрудников': 2,
+                                    'Часы': 92.5, 'К_выплате': 92500.0})
+
+        export_report(roster_chunks(roster), self.path("отчет.txt"), projects=["Аналитика"])
+        with open(self.path("отчет.txt"), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len({len(line) for line in lines[:3]}), 1)
+        self.assertEqual(lines[1].split()[:3], [str(roster[0].id), "Иван", "Программист"])
+        self.assertTrue(lines[-1].startswith("Всего, сотрудников 2"))
+        self.assertEqual(lines[-1].split()[-2:], ["113.00", "113000.00"])
+        with self.assertRaises(ValueError):
+            export_report(roster_chunks(roster), self.path("отчет.csv"), group_by='Имя')
+        with self.assertRaises(TypeError):
+            ReportWriter(self.path("отчет.csv"))
+
+        # Таблица из двоичного снимка: имена берутся срезами, без копии всего списка
+        open_storage(self.path("снимок"), "binary").save_employees(roster)
+        table = open_storage(self.path("снимок"), "binary").load_employees(compact=True)
+        self.assertEqual(table.name_range(1, 10), ["Мария", "Петр", "Анна"])
+        self.assertEqual(export_report(roster_chunks(table, 3), self.path("отчет.csv")).cents, 16550000)
+
+    def test_gzip_and_atomic_replace(self):
+        """Тест 2: Сжатый файл читается обратно, export_csv пишет то же, сбой не портит старый файл"""
+        roster = make_roster()
+        data = open_storage(self.tmp.name)
+        data.save_employees(roster)
+        self.assertEqual(data.export_csv(self.path("все.csv.gz")), 4)
+        with gzip.open(self.path("все.csv.gz"), 'rt', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), PayrollEngine(roster).frame().to_csv(index=False))
+
+        # Повторная выгрузка из сжатого файла дает те же итоги
+        total = export_report(csv_chunks(self.path("все.csv.gz"), chunk_size=2), self.path("копия.jsonl.gz"))
+        self.assertEqual(total.cents, 16550000)
+        with gzip.open(self.path("копия.jsonl.gz"), 'rt', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 4 + 3 + 1)
+
+        def failing():
+            yield from roster_chunks(roster, 2)
+            raise OSError("диск заполнен")
+
+        with self.assertRaises(OSError):
+            CsvWriter(self.path("все.csv.gz")).write(with_pay(failing()))
+        with gzip.open(self.path("все.csv.gz"), 'rt', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 5)
+        self.assertFalse(os.path.exists(self.path("все.csv.gz.tmp")))
+
+    def test_memory_does_not_grow_with_roster(self):
+        """Тест 3: Пик памяти при выгрузке из CSV не зависит от числа сотрудников"""
+        peaks = []
+        for size in (5_000, 40_000):
+            source = self.path(f"{size}.csv")
+            write_roster_csv(source, size)
+            tracemalloc.start()
+            try:
+                total = export_report(csv_chunks(source, chunk_size=1_000), self.path("отчет.txt.gz"))
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(total.count, size)
+        self.assertLess(peaks[1], peaks[0] * 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
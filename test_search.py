@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from employee import Employee
+from employee_table import EmployeeTable
+from registry import EmployeeRegistry
+from search import SearchIndex, SearchResult, normalize
+
+
+def make_roster():
+    roster = []
+    for name, position, project in [("Иванов Иван", "Программист", "Аналитика"),
+                                     ("Семёнова Мария", "Дизайнер", "Веб-сайт компании"),
+                                     ("Петров Алексей", "Программист", "База данных"),
+                                     ("Ivanova Anna", "Аналитик", "Аналитика")]:
+        emp = Employee(name, position, 100000)
+        emp.project = project
+        roster.append(emp)
+    return roster
+
+
+def naive_search(employees, query):
+    """Поиск перебором - эталон для индекса."""
+    words = normalize(query).split()
+    return [i for i, emp in enumerate(employees)
+            if all(any(word in normalize(value) for value in (emp.name, emp.position, emp.project))
+                   for word in words)]
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Тесты для поиска сотрудников"""
+
+    def test_queries(self):
+        """Тест 1: Регистр и "ё" не важны, слова ищутся в любом поле, короткие запросы тоже"""
+        for employees in (make_roster(), EmployeeTable.from_employees(make_roster())):
+            registry = EmployeeRegistry(employees)
+            self.assertEqual(registry.search("ИВАН").tolist(), [0])
+            self.assertEqual(registry.search("семен").tolist(), [1])
+            self.assertEqual(registry.search("ан").tolist(), [0, 1, 2, 3])
+            self.assertEqual(registry.search("программист аналит").tolist(), [0])
+            self.assertEqual(registry.search("ivan").tolist(), [3])
+            self.assertEqual(registry.search("  ").tolist(), [0, 1, 2, 3])
+            self.assertEqual(registry.search("нет такого").tolist(), [])
+
+    def test_incremental_updates(self):
+        """Тест 2: Индекс следует за добавлением, переименованием, переводом и удалением"""
+        roster = make_roster()
+        registry = EmployeeRegistry(roster)
+        self.assertEqual(registry.search("иван").tolist(), [0])
+
+        registry.add(Employee("Иваненко Олег", "Менеджер", 90000))
+        self.assertEqual(registry.search("иван").tolist(), [0, 4])
+        registry.rename(roster[0].id, "Сидоров Иван")
+        self.assertEqual(registry.search("иванов").tolist(), [])
+        registry.assign_project(roster[2].id, "Иван-проект")
+        self.assertEqual(registry.search("иван").tolist(), [0, 2, 4])
+        registry.update(roster[1].id, "Семёнова Мария", "Иванолог", 100000)
+        self.assertEqual(registry.search("иван").tolist(), [0, 1, 2, 4])
+
+        registry.remove(roster[0].id)
+        found = registry.search("иван")
+        self.assertEqual([registry.employees[i].name for i in found],
+                         ["Семёнова Мария", "Петров Алексей", "Иваненко Олег"])
+
+        result = SearchResult(registry.employees, found)
+        self.assertEqual(result[2].name, "Иваненко Олег")
+        self.assertEqual(result.position(2), 3)
+        self.assertEqual(result.index(3), 2)
+        self.assertIsNone(result.index(2))
+
+    def test_typing_matches_naive_search(self):
+        """Тест 3: Набор запроса по буквам и изменения между буквами дают то же, что перебор"""
+        rng = random.Random(7)
+        syllables = ["ан", "ов", "ив", "ма", "ри", "ё", "ер", "ко", "на", "ли"]
+
+        def word():
+            return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+
+        roster = [Employee(f"{word()} {word()}", word(), 100000) for _ in range(300)]
+        registry = EmployeeRegistry(roster)
+        # Маленький порог: новые значения несколько раз переносятся в таблицу триграмм
+        registry._search = SearchIndex([e.name for e in roster], [e.position for e in roster],
+                                       [e.project for e in roster], merge_threshold=5)
+        for step in range(60):
+            query = f"{word().lower()} {word()[:2]}"
+            for end in range(1, len(query) + 1):
+                self.assertEqual(registry.search(query[:end]).tolist(), naive_search(roster, query[:end]),
+                                 query[:end])
+            emp = roster[rng.randrange(len(roster))]
+            if step % 3 == 0:
+                registry.rename(emp.id, f"{word()} {word()}")
+            elif step % 3 == 1:
+                registry.assign_project(emp.id, word())
+            else:
+                registry.remove(emp.id)
+                registry.add(Employee(f"{word()} {word()}", word(), 100000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+
+from data_manager import DataManager
+from employee import Employee
+from remote import RemoteStorage, parse_address
+from server import SyncServer, load_generator
+
+
+def make_roster():
+    roster = [Employee("Иван", "Программист", 160000), Employee("Мария", "Дизайнер", 80000)]
+    roster[0].project = "Аналитика"
+    return roster
+
+
+async def request(host, port, message):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps(message).encode('utf-8') + b"\n")
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+class TestSyncServer(unittest.TestCase):
+    """Тесты для сервера, общего для нескольких клиентов"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = DataManager(self.tmp.name)
+        self.roster = make_roster()
+        self.data.save_employees(self.roster)
+
+    def tearDown(self):
+        self.data.wait_for_compaction()
+        self.tmp.cleanup()
+
+    def test_group_commit(self):
+        """Тест 1: Одновременные запросы записываются пачками и сохраняются на диск"""
+        async def scenario():
+            server = SyncServer(self.data, port=0)
+            await server.start()
+            try:
+                result = await load_generator(server.host, server.port, clients=10, requests=20)
+            finally:
+                await server.close()
+            return server, result
+
+        server, result = asyncio.run(scenario())
+
+        self.assertEqual(result['Запросов'], 200)
+        self.assertGreater(result['Запросов_в_секунду'], 0)
+        self.assertLessEqual(result['p50_мс'], result['p99_мс'])
+        self.assertEqual(server.requests, 200)
+        self.assertLess(server.commits, 200)
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual(sum(emp.hours_worked for emp in loaded), 100)
+        self.assertEqual(sum(len(emp.timelog or ()) for emp in loaded), 200)
+
+    def test_notifications_and_errors(self):
+        """Тест 2: Подписчики получают чужие изменения, запросы с ошибкой отклоняются целиком"""
+        ivan, maria = self.roster
+
+        async def scenario():
+            server = SyncServer(self.data, port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b'{"op": "subscribe", "id": 1}\n')
+            self.assertEqual(json.loads(await reader.readline()), {"ok": True, "id": 1})
+
+            record = {"op": "add_hours", "id": ivan.id, "hours": 8}
+            ok = await request(server.host, server.port, {"op": "apply", "records": [record], "id": 7})
+            event = json.loads(await reader.readline())
+            missing = await request(server.host, server.port, {"op": "apply", "records": [
+                {"op": "assign_project", "id": maria.id, "project": "Тестирование"},
+                {"op": "add_hours", "id": 999999, "hours": 1}]})
+            duplicate = await request(server.host, server.port, {"op": "apply", "records": [
+                {"op": "create", "id": ivan.id, "name": "Иван", "position": "Программист",
+                 "salary": 1, "hours": 0, "project": "Не назначен"}]})
+            broken = await request(server.host, server.port, {"records": []})
+            writer.close()
+            await server.close()
+            return server, ok, event, missing, duplicate, broken
+
+        server, ok, event, missing, duplicate, broken = asyncio.run(scenario())
+
+        self.assertEqual(ok, {"ok": True, "id": 7})
+        self.assertEqual(event, {"event": "records", "records": [{"op": "add_hours", "id": ivan.id, "hours": 8}]})
+        self.assertFalse(missing["ok"])
+        self.assertFalse(duplicate["ok"])
+        self.assertFalse(broken["ok"])
+        # Запрос с ошибкой не применяется целиком
+        self.assertEqual(server.registry.get(maria.id).project, "Не назначен")
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual([(e.hours_worked, e.project) for e in loaded], [(8, "Аналитика"), (0, "Не назначен")])
+
+    def test_remote_storage(self):
+        """Тест 3: RemoteStorage работает с сервером как обычное хранилище"""
+        loop = asyncio.new_event_loop()
+        server = SyncServer(self.data, port=0)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            address = f"{server.host}:{server.port}"
+            first, second = RemoteStorage(address), RemoteStorage(address)
+            second.subscribe()
+            employees = first.load_employees(compact=True)
+            self.assertEqual([e.name for e in employees], ["Иван", "Мария"])
+
+            first.log_add_hours(employees[1].id, 4, at=1_700_000_000, project="Дизайн")
+            with self.assertRaises(ValueError):
+                first.log_delete(123456789)
+            deadline = time.time() + 5
+            events = []
+            while not events and time.time() < deadline:
+                events = second.poll_events()
+                time.sleep(0.01)
+            self.assertEqual(events[0]["records"][0]["hours"], 4)
+
+            first.save_employees([employees[0]])
+            self.assertEqual(len(second.load_employees()), 1)
+            first.close()
+            second.close()
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+        self.assertEqual(parse_address(":8765"), ("127.0.0.1", 8765))
+        with self.assertRaises(ValueError):
+            parse_address("localhost")
+
+    def test_malformed_records(self):
+        """Тест 4: Запись с полями неверного типа отклоняется, следующие запросы выполняются"""
+        ivan, _ = self.roster
+
+        async def scenario():
+            server = SyncServer(self.data, port=0)
+            await server.start()
+            try:
+                responses = []
+                for records in ([{"op": "add_hours", "id": ivan.id, "hours": "x"}],
+                                [{"op": "create", "id": 999999, "name": "Петр", "position": "Тестировщик",
+                                  "salary": "много", "hours": 0, "project": "Не назначен"}],
+                                ["не запись"],
+                                [{"op": "add_hours_batch", "ids": [ivan.id], "hours": [None]}],
+                                [{"op": "add_hours", "id": ivan.id, "hours": 3}]):
+                    responses.append(await asyncio.wait_for(
+                        request(server.host, server.port, {"op": "apply", "records": records}), 5))
+                self.assertFalse(server._committer.done())
+            finally:
+                await asyncio.wait_for(server.close(), 5)
+            return responses
+
+        responses = asyncio.run(scenario())
+
+        self.assertEqual([response["ok"] for response in responses], [False, False, False, False, True])
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual([e.hours_worked for e in loaded], [3, 0])
+
+
+    def test_commit_before_apply(self):
+        """Тест 5: Записи применяются к памяти только после записи на диск, update проверяется"""
+        ivan, maria = self.roster
+        written = threading.Event()
+        release = threading.Event()
+        append_records = self.data.append_records
+
+        def slow_append(records):
+            written.set()
+            release.wait(5)
+            append_records(records)
+
+        async def scenario():
+            server = SyncServer(self.data, port=0)
+            await server.start()
+            try:
+                bad_update = await request(server.host, server.port, {"op": "apply", "records": [
+                    {"op": "update", "id": ivan.id, "name": "Иван", "position": "Программист", "salary": -5}]})
+                self.data.append_records = slow_append
+                pending = asyncio.ensure_future(request(server.host, server.port, {"op": "apply", "records": [
+                    {"op": "create", "id": 999999, "name": "Петр", "position": "Тестировщик",
+                     "salary": 1000, "hours": 0, "project": "Не назначен"},
+                    {"op": "add_hours", "id": 999999, "hours": 5}]}))
+                await asyncio.get_running_loop().run_in_executor(None, written.wait, 5)
+                during = await request(server.host, server.port, {"op": "load"})
+                release.set()
+                created = await pending
+                after = await request(server.host, server.port, {"op": "load"})
+            finally:
+                release.set()
+                await server.close()
+            return bad_update, during, created, after
+
+        bad_update, during, created, after = asyncio.run(scenario())
+
+        self.assertFalse(bad_update["ok"])
+        self.assertEqual(len(during["employees"]), 2)
+        self.assertTrue(created["ok"])
+        self.assertEqual(after["employees"][-1][1:5], ["Петр", "Тестировщик", 1000, 5])
+        loaded = DataManager(self.tmp.name).load_employees()
+        self.assertEqual([e.salary for e in loaded[:2]], [160000, 80000])
+        self.assertEqual(loaded[2].hours_worked, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data_manager import DataManager
+from employee import Employee
+from employee_table import EmployeeTable
+from snapshot import encode_snapshot, read_snapshot
+from storage import open_storage
+
+
+def make_roster():
+    roster = []
+    for name, position, project in [("Иван", "Программист", "Аналитика"),
+                                    ("Мария", "Дизайнер", "Веб-сайт компании"),
+                                    ("Алексей", "Программист", "Аналитика")]:
+        emp = Employee(name, position, 100000)
+        emp.project = project
+        roster.append(emp)
+    roster[1].add_hours(12.5)
+    return roster
+
+
+class TestSnapshot(unittest.TestCase):
+    """Тесты для двоичного снимка employees.snap"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "employees.snap")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, employees, token=b"0123456789abcdef"):
+        with open(self.path, 'wb') as f:
+            f.write(encode_snapshot(employees, token))
+
+    def test_round_trip(self):
+        """Тест 1: Снимок читается в таблицу с теми же данными и отпечатком"""
+        roster = make_roster()
+        self.write(roster)
+
+        table, token, _ = read_snapshot(self.path)
+
+        self.assertIsInstance(table, EmployeeTable)
+        self.assertEqual(token, b"0123456789abcdef".hex())
+        self.assertEqual(table.ids.tolist(), [e.id for e in roster])
+        self.assertEqual(table.names, ["Иван", "Мария", "Алексей"])
+        self.assertEqual(list(table.projects), [e.project for e in roster])
+        self.assertEqual(table[1].hours_worked, 12.5)
+        self.assertIsInstance(table.salaries.base, np.memmap)
+
+    def test_changes_stay_in_memory(self):
+        """Тест 2: Изменения таблицы не попадают в файл снимка"""
+        self.write(make_roster())
+        table, _, _ = read_snapshot(self.path)
+
+        table[0].add_hours(8)
+        table[0].name = "Иван Петров"
+        table.pop(2)
+        new = table.append(Employee("Ольга", "Аналитик", 90000))
+
+        self.assertEqual(table.names, ["Иван Петров", "Мария", "Ольга"])
+        self.assertEqual(new.position, "Аналитик")
+        reread, _, _ = read_snapshot(self.path)
+        self.assertEqual(reread.names, ["Иван", "Мария", "Алексей"])
+        self.assertEqual(reread[0].hours_worked, 0)
+
+    def test_empty_and_invalid(self):
+        """Тест 3: Пустой снимок читается, чужой файл отклоняется"""
+        self.write([])
+        table, _, _ = read_snapshot(self.path)
+        self.assertEqual(len(table), 0)
+        table.append(Employee("Ольга", "Аналитик", 90000))
+        self.assertEqual(len(table), 1)
+
+        with open(self.path, 'wb') as f:
+            f.write("Имя,Должность\n".encode("utf-8") * 10)
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path)
+
+
+class TestBinaryStorage(unittest.TestCase):
+    """Тесты для хранилища с двоичным снимком"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv_import_and_journal(self):
+        """Тест 4: Данные CSV подхватываются, журнал применяется поверх снимка"""
+        roster = make_roster()
+        DataManager(self.tmp.name).save_employees(roster)
+
+        data = open_storage(self.tmp.name, "binary")
+        self.assertEqual([e.name for e in data.load_employees()], ["Иван", "Мария", "Алексей"])
+
+        data.save_employees(data.load_employees(compact=True))
+        self.assertTrue(os.path.exists(data.snapshot_file))
+        data.log_add_hours(roster[0].id, 6)
+        data.log_delete(roster[2].id)
+
+        loaded = open_storage(self.tmp.name, "binary").load_employees()
+        self.assertEqual([e.id for e in loaded], [roster[0].id, roster[1].id])
+        self.assertEqual(loaded[0].hours_worked, 6)
+
+        data.compact()
+        table = open_storage(self.tmp.name, "binary").load_employees(compact=True)
+        self.assertEqual(list(table.hours), [6, 12.5])
+
+    def test_export_import(self):
+        """Тест 5: Экспорт и импорт CSV сохраняют ID и данные"""
+        roster = make_roster()
+        data = open_storage(self.tmp.name, "binary")
+        data.save_employees(roster)
+        export = os.path.join(self.tmp.name, "export.csv")
+
+        self.assertEqual(data.export_csv(export), 3)
+
+        other = tempfile.TemporaryDirectory()
+        self.addCleanup(other.cleanup)
+        target = open_storage(other.name, "binary")
+        self.assertEqual(target.import_csv(export), 3)
+        loaded = target.load_employees()
+        self.assertEqual([e.id for e in loaded], [e.id for e in roster])
+        self.assertEqual(loaded[1].hours_worked, 12.5)
+        self.assertFalse(os.path.exists(target.employees_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
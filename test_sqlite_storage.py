@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+
+from data_manager import DataManager
+from employee import Employee
+from employee_table import EmployeeTable
+from sqlite_storage import SqliteStorage
+from storage import Storage, open_storage
+
+
+def make_roster():
+    roster = []
+    for name, position, project in [("Иван", "Программист", "Аналитика"),
+                                    ("Мария", "Дизайнер", "Веб-сайт компании"),
+                                    ("Алексей", "Программист", "Аналитика")]:
+        emp = Employee(name, position, 100000)
+        emp.project = project
+        roster.append(emp)
+    return roster
+
+
+class TestSqliteStorage(unittest.TestCase):
+    """Тесты для хранилища SQLite"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = open_storage(self.tmp.name, "sqlite")
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_save_writes_only_changes(self):
+        """Тест 1: Повторное сохранение пишет только изменившиеся строки"""
+        roster = make_roster()
+        self.storage.save_employees(roster)
+
+        roster[1].add_hours(8)
+        removed = roster.pop(2)
+        changes_before = self.storage._db.total_changes
+        self.storage.save_employees(roster)
+
+        # Строка Марии, ее новая отметка времени и удаление Алексея
+        self.assertEqual(self.storage._db.total_changes - changes_before, 3)
+        loaded = SqliteStorage(self.tmp.name).load_employees()
+        self.assertEqual([e.id for e in loaded], [roster[0].id, roster[1].id])
+        self.assertEqual(loaded[1].hours_worked, 8)
+        self.assertNotIn(removed.id, [e.id for e in loaded])
+
+    def test_records_and_queries(self):
+        """Тест 2: Записи log_* применяются по ID, запросы идут по индексам"""
+        roster = make_roster()
+        self.storage.save_employees(roster)
+
+        self.storage.log_add_hours(roster[0].id, 16)
+        self.storage.log_assign_project(roster[1].id, "Аналитика")
+        self.storage.log_delete(roster[2].id)
+        new = Employee("Ольга", "Аналитик", 90000)
+        self.storage.log_create(new)
+        self.storage.append_records([{"op": "add_hours_batch", "ids": [roster[0].id, new.id],
+                                      "hours": [4, 2]}])
+
+        self.assertEqual([e.name for e in self.storage.employees_in_project("Аналитика")],
+                         ["Иван", "Мария"])
+        self.assertEqual([e.name for e in self.storage.employees_in_position("Программист")],
+                         ["Иван"])
+        table = self.storage.load_employees(compact=True)
+        self.assertIsInstance(table, EmployeeTable)
+        self.assertEqual(list(table.hours), [20, 0, 2])
+
+        plan = self.storage._db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM employees WHERE project = ?", ("Аналитика",)).fetchall()
+        self.assertIn("employees_project", str(plan))
+
+    def test_migration_from_csv(self):
+        """Тест 3: Данные CSV и журнала переносятся в базу один раз"""
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        dm = DataManager(folder.name)
+        roster = make_roster()
+        dm.save_employees(roster)
+        dm.log_add_hours(roster[0].id, 10)
+
+        storage = SqliteStorage(folder.name)
+        self.addCleanup(storage.close)
+        loaded = storage.load_employees()
+        self.assertEqual([e.id for e in loaded], [e.id for e in roster])
+        self.assertEqual(loaded[0].hours_worked, 10)
+
+        storage.clear()
+        again = SqliteStorage(folder.name)
+        self.addCleanup(again.close)
+        self.assertEqual(again.load_employees(), [])
+
+    def test_storage_is_abstract(self):
+        """Тест 4: Хранилище без одного из основных методов не создается"""
+        class Partial(Storage):
+            def load_employees(self, compact=False):
+                return []
+
+            def save_employees(self, employees):
+                return True
+
+            def append_records(self, records):
+                pass
+
+        with self.assertRaises(TypeError):
+            Storage(self.tmp.name)
+        with self.assertRaises(TypeError):
+            Partial(self.tmp.name)
+        self.assertIsInstance(self.storage, Storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
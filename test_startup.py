@@ -0,0 +1,30 @@
+import unittest
+
+from benchmark import import_times
+
+
+# Пакеты, которые не должны загружаться до показа окна
+HEAVY_PACKAGES = ('pandas', 'matplotlib', 'numpy')
+
+
+class TestStartup(unittest.TestCase):
+    """Тесты времени запуска"""
+
+    def test_gui_import_is_light(self):
+        """Тест 1: Импорт gui не тянет pandas, numpy и matplotlib"""
+        times = import_times("import gui")
+
+        self.assertIn('gui', times)
+        heavy = sorted({name.split('.')[0] for name in times} & set(HEAVY_PACKAGES))
+        self.assertEqual(heavy, [])
+
+    def test_main_import_is_light(self):
+        """Тест 2: То же для точки входа main.py"""
+        times = import_times("import main")
+
+        self.assertIn('main', times)
+        self.assertFalse({name.split('.')[0] for name in times} & set(HEAVY_PACKAGES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from employee import Employee
+from employee_table import EmployeeTable
+from storage import open_storage
+from timelog import TimeLog, attach_timelogs, group_entries, timestamp, total_hours
+
+
+DAY = 24 * 3600
+START = timestamp(datetime(2024, 3, 1))
+
+
+class TestTimeLog(unittest.TestCase):
+    """Тесты для журнала отметок времени"""
+
+    def test_range_totals(self):
+        """Тест 1: Суммы за промежуток и по проекту считаются по префиксным суммам"""
+        log = TimeLog()
+        log.add(8, "Аналитика", START)
+        log.add(6, "Веб-сайт", START + DAY)
+        log.add(4, "Аналитика", START + 2 * DAY)
+        log.add(2, "Аналитика", START + DAY // 2)  # задним числом
+
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.total(), 20)
+        self.assertEqual(log.total(START, START + DAY), 10)
+        self.assertEqual(log.total(START + DAY, None, "Аналитика"), 4)
+        self.assertEqual(log.total(project="Нет такого"), 0)
+        self.assertEqual(log.by_project(START + DAY), {"Веб-сайт": 6, "Аналитика": 4})
+
+        at, hours, projects = log.columns()
+        self.assertEqual(at.tolist(), sorted(at.tolist()))
+        self.assertEqual(hours.tolist(), [8, 2, 6, 4])
+        self.assertEqual(TimeLog.from_columns(at, hours, projects).total(START, START + DAY), 10)
+
+    def test_employee_hours_from_entries(self):
+        """Тест 2: hours_worked и выплата считаются по отметкам текущего периода"""
+        emp = Employee("Иван", "Программист", 160000)
+        emp.project = "Аналитика"
+        emp.add_hours(10, at=START)
+        emp.add_hours(5, at=datetime(2024, 3, 20))
+        emp.hours_worked += 1  # часы без отметки времени
+
+        self.assertEqual(emp.hours_worked, 16)
+        self.assertEqual(emp.hours_between(datetime(2024, 3, 10), None, "Аналитика"), 5)
+        emp.timelog.start = timestamp(datetime(2024, 3, 15))
+        self.assertEqual(emp.hours_worked, 6)
+        self.assertEqual(emp.calculate_pay(), 6000)
+
+    def test_table_rows(self):
+        """Тест 3: Строки EmployeeTable ведут отметки и итог в колонке часов"""
+        emp = Employee("Иван", "Программист", 100000)
+        emp.add_hours(8, at=START)
+        table = EmployeeTable.from_employees([emp, Employee("Мария", "Дизайнер", 80000)])
+
+        table[1].add_hours(4, at=START + DAY)
+        table[0].add_hours(2, at=START + DAY)
+
+        self.assertEqual(table.hours.tolist(), [10, 4])
+        self.assertEqual(total_hours(table, START + DAY), 6)
+        removed = table.pop(0)
+        self.assertEqual(removed.hours_between(START, START + DAY), 8)
+        self.assertEqual(list(table.timelogs), [table[0].id])
+
+    def test_lazy_logs(self):
+        """Тест 4: Журналы из общих колонок строятся только при обращении"""
+        # Отметки сотрудника 2 не подряд - колонки сортируются по ID
+        logs = group_entries([2, 1, 2, 3], [START + DAY, START, START, START],
+                             [4, 8, 2, 1], ["Аналитика", "Аналитика", "Веб-сайт", "Аналитика"], START + DAY)
+        self.assertEqual((len(logs), sorted(logs), 4 in logs), (3, [1, 2, 3], False))
+        emps = [Employee.restore(f"Сотрудник {i}", "Программист", 100000, 10, "Аналитика", i) for i in (1, 2, 3)]
+        attach_timelogs(emps, logs)
+
+        self.assertEqual([emp.hours_worked for emp in emps], [10, 10, 10])
+        self.assertEqual([emp.timelog.current() for emp in emps], [0, 4, 0])
+        self.assertIsNotNone(emps[1].timelog._source)
+        self.assertEqual(emps[1].hours_between(project="Веб-сайт"), 2)
+        self.assertIsNone(emps[1].timelog._source)
+
+        del logs[1]
+        logs[4] = TimeLog()
+        logs[4].add(5, "Дизайн", START)
+        ids, at, hours, projects = logs.columns()
+        self.assertEqual(sorted(zip(ids.tolist(), hours.tolist(), projects)),
+                         [(2, 2, "Веб-сайт"), (2, 4, "Аналитика"), (3, 1, "Аналитика"), (4, 5, "Дизайн")])
+        self.assertEqual(logs.projects(), {"Аналитика", "Веб-сайт", "Дизайн"})
+        self.assertEqual(len(logs), 3)
+
+    def test_prune(self):
+        """Тест 5: Отметки до закрытия периода удаляются из построенных и еще не построенных журналов"""
+        logs = group_entries([1, 1, 2, 3], [START, START + DAY, START, START + 2 * DAY],
+                             [8, 4, 2, 1], ["Аналитика", "Веб-сайт", "Аналитика", "Аналитика"])
+        built = logs[1]
+        built.add(3, "Аналитика", START + 2 * DAY)
+
+        logs.prune(START + DAY)
+
+        self.assertEqual(sorted(logs), [1, 3])
+        self.assertEqual(built.by_project(), {"Веб-сайт": 4, "Аналитика": 3})
+        self.assertEqual(logs[3].total(), 1)
+        log = TimeLog()
+        log.add(2, "Аналитика", START)
+        log.prune(START + DAY)
+        log.add(5, "Дизайн", START + DAY)
+        self.assertEqual((len(log), log.projects()), (1, ["Дизайн"]))
+
+
+class TestTimeLogStorage(unittest.TestCase):
+    """Тесты для сохранения отметок времени в хранилищах"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def roster(self):
+        emp = Employee("Иван", "Программист", 100000)
+        emp.project = "Аналитика"
+        emp.add_hours(8, at=START)
+        return [emp, Employee("Мария", "Дизайнер", 80000)]
+
+    def check_round_trip(self, backend):
+        roster = self.roster()
+        data = open_storage(self.tmp.name, backend)
+        data.save_employees(roster)
+        data.log_add_hours(roster[0].id, 3, at=START + DAY, project="Веб-сайт")
+        data.log_add_hours(roster[1].id, 5)  # без отметки (табель)
+
+        for compact in (False, True):
+            loaded = open_storage(self.tmp.name, backend).load_employees(compact)
+            self.assertEqual([e.hours_worked for e in loaded], [11, 5])
+            self.assertEqual(loaded[0].hours_between(START, START + 2 * DAY, "Веб-сайт"), 3)
+            self.assertIsNone(loaded[1].timelog)
+
+        data.compact()
+        loaded = open_storage(self.tmp.name, backend).load_employees()
+        self.assertEqual(loaded[0].timelog.by_project(), {"Аналитика": 8, "Веб-сайт": 3})
+        self.assertEqual(loaded[0].hours_worked, 11)
+        return data
+
+    def test_csv_and_binary(self):
+        """Тест 4: Отметки переживают журнал и сборку снимка CSV и двоичного"""
+        data = self.check_round_trip("csv")
+        self.assertTrue(os.path.exists(data.entries_file))
+        self.tearDown()
+        self.setUp()
+        self.check_round_trip("binary")
+
+    def test_sqlite(self):
+        """Тест 5: Отметки хранятся в таблице time_entries"""
+        data = self.check_round_trip("sqlite")
+        count = data._db.execute("SELECT COUNT(*) FROM time_entries").fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_replay_after_crash(self):
+        """Тест 6: Сбой до замены CSV не дублирует уже сохраненные отметки"""
+        roster = self.roster()
+        data = open_storage(self.tmp.name, "csv")
+        data.save_employees(roster)
+        data.log_add_hours(roster[0].id, 3, at=START + DAY, project="Аналитика")
+        old = {}
+        for path in (data.employees_file, data.journal.path):
+            with open(path, 'rb') as f:
+                old[path] = f.read()
+
+        data.compact()
+        # Как будто сбой случился после записи отметок, но до замены CSV и журнала
+        for path, content in old.items():
+            with open(path, 'wb') as f:
+                f.write(content)
+
+        loaded = open_storage(self.tmp.name, "csv").load_employees()
+        self.assertEqual(loaded[0].hours_worked, 11)
+        self.assertEqual(len(loaded[0].timelog), 2)
+
+    def test_batch_round_trip(self):
+        """Тест 7: Запись add_hours_batch с отметками сохраняется во всех хранилищах"""
+        for backend in ("csv", "binary", "sqlite"):
+            folder = os.path.join(self.tmp.name, backend)
+            roster = self.roster()
+            data = open_storage(folder, backend)
+            data.save_employees(roster)
+            data.log_add_hours_batch([roster[0].id, roster[1].id], [1, 2], at=START + 2 * DAY,
+                                     projects=["Аналитика", "Веб-сайт"])
+
+            for compact in (False, True):
+                loaded = open_storage(folder, backend).load_employees(compact)
+                self.assertEqual([e.hours_worked for e in loaded], [9, 2])
+                self.assertEqual(loaded[1].timelog.by_project(), {"Веб-сайт": 2})
+
+            data.compact()
+            loaded = open_storage(folder, backend).load_employees()
+            self.assertEqual(loaded[0].timelog.by_project(), {"Аналитика": 9})
+            self.assertEqual(loaded[1].hours_between(START + 2 * DAY, None, "Веб-сайт"), 2)
+            if backend == "sqlite":
+                data.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,629 @@
+import time
+from collections.abc import MutableMapping
+from datetime import date, datetime
+
+import numpy as np
+
+
+def now() -> int:
+    """Текущее время в секундах от начала эпохи (UTC) - время отметки по умолчанию."""
+    return int(time.time())
+
+
+def timestamp(value):
+    """
+    Переводит время в секунды от начала эпохи.
+
+    Параметры:
+        value (int | float | datetime | date | None): Время; дата означает
+            начало дня по местному времени.
+
+    Возвращает:
+        int | None: Секунды или None, если время не задано.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day).timestamp())
+    return int(value)
+
+
+class _Series:
+    """
+    Отметки, отсортированные по времени, с префиксными суммами часов.
+
+    sums[i] - сумма часов первых i отметок, поэтому сумма за любой
+    промежуток времени - разность двух префиксных сумм, а границы
+    промежутка находятся двоичным поиском.
+    """
+
+    __slots__ = ('at', 'sums', 'size')
+
+    def __init__(self, at=None, hours=None) -> None:
+        if at is None:
+            self.at = np.empty(4, dtype=np.int64)
+            self.sums = np.zeros(5, dtype=np.float64)
+            self.size = 0
+            return
+        self.size = len(at)
+        self.at = np.array(at, dtype=np.int64)
+        self.sums = np.zeros(self.size + 1, dtype=np.float64)
+        np.cumsum(hours, out=self.sums[1:])
+
+    def add(self, at: int, hours: float) -> None:
+        if self.size == len(self.at):
+            self._grow()
+        size = self.size
+        if size == 0 or at >= self.at[size - 1]:
+            pos = size
+        else:
+            # Отметка задним числом: сдвигаем более поздние (редкий случай)
+            pos = int(np.searchsorted(self.at[:size], at, side='right'))
+            self.at[pos + 1:size + 1] = self.at[pos:size]
+            self.sums[pos + 2:size + 2] = self.sums[pos + 1:size + 1] + hours
+        self.at[pos] = at
+        self.sums[pos + 1] = self.sums[pos] + hours
+        self.size += 1
+
+    def total(self, start, end) -> float:
+        at = self.at[:self.size]
+        lo = 0 if start is None else int(np.searchsorted(at, start, side='left'))
+        hi = self.size if end is None else int(np.searchsorted(at, end, side='left'))
+        return float(self.sums[hi] - self.sums[lo]) if hi > lo else 0.0
+
+    def hours(self) -> np.ndarray:
+        return np.diff(self.sums[:self.size + 1])
+
+    def _grow(self) -> None:
+        capacity = max(len(self.at) * 2, 4)
+        at = np.empty(capacity, dtype=np.int64)
+        sums = np.zeros(capacity + 1, dtype=np.float64)
+        at[:self.size] = self.at[:self.size]
+        sums[:self.size + 1] = self.sums[:self.size + 1]
+        self.at, self.sums = at, sums
+
+
+class TimeLog:
+    """
+    Отметки рабочего времени одного сотрудника: (время, часы, проект).
+
+    Отметки хранятся в массивах numpy, отсортированных по времени,
+    вместе с префиксными суммами часов - общими и отдельно по каждому
+    проекту. Сумма часов за любой промежуток (и по любому проекту)
+    считается за O(log n) без перебора отметок. Добавление отметки
+    в конец - O(1) в среднем; отметка задним числом сдвигает более поздние.
+
+    Время - целые секунды от начала эпохи (см. timestamp).
+
+    Журнал, загруженный из общих колонок (EntryColumns), строит свои
+    массивы только при первом обращении к отметкам; число отметок
+    и сумма часов текущего периода считаются прямо по колонкам.
+
+    Атрибуты:
+        start (int | None): Начало текущего расчетного периода сотрудника:
+            в current() входят только отметки не раньше него; None - все.
+            Граница хранится в журнале, а не в общем для процесса значении,
+            поэтому списки из разных папок данных не влияют друг на друга.
+    """
+
+    __slots__ = ('_all', '_projects', 'start', '_source')
+
+    def __init__(self, start: int = None) -> None:
+        self._all = _Series()
+        self._projects = {}
+        self.start = start
+        self._source = None
+
+    @classmethod
+    def _lazy(cls, entries: "EntryColumns", lo: int, hi: int, start: int = None) -> "TimeLog":
+        """Журнал из участка [lo, hi) общих колонок; массивы строятся при обращении."""
+        log = cls.__new__(cls)
+        log._all = None
+        log._projects = None
+        log.start = start
+        log._source = (entries, lo, hi)
+        return log
+
+    def _load(self) -> None:
+        """Строит массивы журнала из его участка общих колонок."""
+        entries, lo, hi = self._source
+        built = TimeLog.from_columns(*entries.slice(lo, hi))
+        self._all, self._projects = built._all, built._projects
+        self._source = None
+
+    @classmethod
+    def from_columns(cls, at, hours, projects, start: int = None) -> "TimeLog":
+        """
+        Создает журнал из колонок отметок (в любом порядке).
+
+        Параметры:
+            at: Время отметок (секунды).
+            hours: Часы.
+            projects: Проекты.
+            start (int, optional): Начало текущего периода (см. TimeLog.start).
+
+        Возвращает:
+            TimeLog: Новый журнал.
+        """
+        at = np.asarray(at, dtype=np.int64)
+        order = np.argsort(at, kind='stable')
+        at = at[order]
+        hours = np.asarray(hours, dtype=np.float64)[order]
+        projects = np.asarray(projects, dtype=object)[order]
+        log = cls(start)
+        log._all = _Series(at, hours)
+        for project in dict.fromkeys(projects.tolist()):
+            mask = projects == project
+            log._projects[project] = _Series(at[mask], hours[mask])
+        return log
+
+    def __len__(self) -> int:
+        if self._source is not None:
+            return self._source[2] - self._source[1]
+        return self._all.size
+
+    def add(self, hours: float, project: str, at: int = None) -> None:
+        """
+        Добавляет отметку.
+
+        Параметры:
+            hours (float): Часы (уже проверенные).
+            project (str): Проект, на который списаны часы.
+            at (int, optional): Время отметки. По умолчанию - текущее.
+        """
+        if self._source is not None:
+            self._load()
+        at = now() if at is None else timestamp(at)
+        self._all.add(at, hours)
+        series = self._projects.get(project)
+        if series is None:
+            series = self._projects[project] = _Series()
+        series.add(at, hours)
+
+    def total(self, start=None, end=None, project: str = None) -> float:
+        """
+        Возвращает сумму часов за промежуток [start, end).
+
+        Параметры:
+            start (optional): Начало промежутка; None - с первой отметки.
+            end (optional): Конец промежутка (не включается); None - до последней.
+            project (str, optional): Только часы этого проекта.
+
+        Возвращает:
+            float: Сумма часов.
+        """
+        if self._source is not None:
+            self._load()
+        series = self._all if project is None else self._projects.get(project)
+        if series is None:
+            return 0.0
+        return series.total(timestamp(start), timestamp(end))
+
+    def current(self) -> float:
+        """Возвращает сумму часов текущего периода (отметки не раньше start)."""
+        if self._source is not None:
+            entries, lo, hi = self._source
+            return entries.total(lo, hi, self.start)
+        return self._all.total(self.start, None)
+
+    def by_project(self, start=None, end=None) -> dict:
+        """
+        Возвращает суммы часов по проектам за промежуток [start, end).
+
+        Возвращает:
+            dict: {проект: часы} для проектов с ненулевой суммой.
+        """
+        if self._source is not None:
+            self._load()
+        start, end = timestamp(start), timestamp(end)
+        totals = {project: series.total(start, end) for project, series in self._projects.items()}
+        return {project: hours for project, hours in totals.items() if hours}
+
+    def projects(self) -> list:
+        """Возвращает проекты, на которые есть отметки."""
+        if self._source is not None:
+            entries, lo, hi = self._source
+            return entries.projects(np.arange(lo, hi))
+        return list(self._projects)
+
+    def columns(self) -> tuple:
+        """
+        Возвращает все отметки колонками в порядке времени.
+
+        Возвращает:
+            tuple: Массив времени, массив часов и список проектов.
+        """
+        if self._source is not None:
+            at, hours, projects = self._source[0].slice(*self._source[1:])
+            order = np.argsort(at, kind='stable')
+            return at[order], hours[order], projects[order].tolist()
+        if not self._projects:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), []
+        names = list(self._projects)
+        series = [self._projects[name] for name in names]
+        at = np.concatenate([s.at[:s.size] for s in series])
+        hours = np.concatenate([s.hours() for s in series])
+        projects = np.repeat(np.array(names, dtype=object), [s.size for s in series])
+        order = np.argsort(at, kind='stable')
+        return at[order], hours[order], projects[order].tolist()
+
+    def prune(self, before: int) -> None:
+        """
+        Удаляет отметки раньше before (закрытый период ушел в архив).
+
+        Параметры:
+            before (int): Время закрытия периода (секунды).
+        """
+        if self._source is not None:
+            entries, lo, hi = self._source
+            if not (entries.at[lo:hi] < before).any():
+                return
+            self._load()
+        elif not self._all.size or self._all.at[0] >= before:
+            return
+        at, hours, projects = self.columns()
+        keep = at >= before
+        built = TimeLog.from_columns(at[keep], hours[keep], np.array(projects, dtype=object)[keep])
+        self._all, self._projects = built._all, built._projects
+
+    def copy(self) -> "TimeLog":
+        """Возвращает независимую копию журнала."""
+        return TimeLog.from_columns(*self.columns(), start=self.start)
+
+
+class EntryColumns:
+    """
+    Отметки многих сотрудников в общих колонках: ID, время, часы и код проекта.
+
+    Колонки не копируются (у двоичного снимка это отображенный в память
+    файл): по колонке ID один раз находятся участки сотрудников, а журнал
+    сотрудника (TimeLog) строится из своего участка при первом обращении.
+    Отметки одного сотрудника должны идти подряд; если это не так,
+    колонки один раз сортируются по ID.
+    """
+
+    def __init__(self, ids, at, hours, codes, names) -> None:
+        """
+        Параметры:
+            ids: ID сотрудников.
+            at: Время отметок.
+            hours: Часы.
+            codes: Номера проектов в names.
+            names (list): Названия проектов.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        at = np.asarray(at, dtype=np.int64)
+        hours = np.asarray(hours, dtype=np.float64)
+        codes = np.asarray(codes)
+        run_ids, lo, hi = self._runs(ids)
+        order = np.argsort(run_ids, kind='stable')
+        if len(order) > 1 and not (np.diff(run_ids[order]) > 0).all():
+            # Отметки сотрудника не подряд: сортируем колонки по ID
+            order = np.argsort(ids, kind='stable')
+            ids, at, hours, codes = ids[order], at[order], hours[order], codes[order]
+            run_ids, lo, hi = self._runs(ids)
+            order = np.arange(len(run_ids))
+        self.at, self.hours, self.codes = at, hours, codes
+        self.names = np.array(names, dtype=object)
+        self.ids, self.lo, self.hi = run_ids[order], lo[order], hi[order]
+
+    @classmethod
+    def from_entries(cls, ids, at, hours, projects) -> "EntryColumns":
+        """Колонки из отметок с названиями проектов (а не номерами)."""
+        names = {}
+        codes = [names.setdefault(project, len(names)) for project in projects]
+        return cls(ids, at, hours, codes, list(names))
+
+    @staticmethod
+    def _runs(ids: np.ndarray) -> tuple:
+        """ID, начала и концы участков подряд идущих одинаковых ID."""
+        bounds = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+        lo = np.concatenate(([0], bounds)) if len(ids) else np.empty(0, dtype=np.int64)
+        hi = np.concatenate((bounds, [len(ids)])) if len(ids) else np.empty(0, dtype=np.int64)
+        return ids[lo], lo, hi
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, ids) -> np.ndarray:
+        """Номера участков сотрудников (-1, если отметок нет)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        runs = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return np.where(self.ids[runs] == ids, runs, -1)
+
+    def log(self, run: int, start: int = None) -> TimeLog:
+        """Журнал участка run (массивы строятся при первом обращении)."""
+        return TimeLog._lazy(self, int(self.lo[run]), int(self.hi[run]), start)
+
+    def slice(self, lo: int, hi: int) -> tuple:
+        """Время, часы и проекты отметок [lo, hi)."""
+        return self.at[lo:hi], self.hours[lo:hi], self.names[self.codes[lo:hi]]
+
+    def total(self, lo: int, hi: int, start: int = None) -> float:
+        """Сумма часов отметок [lo, hi) не раньше start."""
+        hours = self.hours[lo:hi]
+        if start is not None:
+            hours = hours[self.at[lo:hi] >= start]
+        return float(hours.sum())
+
+    def totals(self, start: int = None) -> np.ndarray:
+        """Суммы часов не раньше start по всем участкам (одним проходом)."""
+        hours = self.hours if start is None else np.where(self.at >= start, self.hours, 0.0)
+        sums = np.concatenate(([0.0], np.cumsum(hours)))
+        return sums[self.hi] - sums[self.lo]
+
+    def rows(self, runs: np.ndarray) -> np.ndarray:
+        """Номера отметок участков runs подряд."""
+        lo, hi = self.lo[runs], self.hi[runs]
+        sizes = hi - lo
+        shift = np.repeat(lo - np.concatenate(([0], np.cumsum(sizes)[:-1])), sizes)
+        return shift + np.arange(int(sizes.sum()))
+
+    def projects(self, rows: np.ndarray) -> list:
+        """Названия проектов отметок rows (без повторов)."""
+        return self.names[np.unique(self.codes[rows])].tolist()
+
+
+class TimeLogs(MutableMapping):
+    """
+    Журналы отметок {ID сотрудника: TimeLog} над общими колонками EntryColumns.
+
+    Журнал сотрудника создается при первом обращении к нему, поэтому
+    загрузка не зависит от числа отметок. Замененные и удаленные
+    журналы хранятся в обычном словаре, участки колонок для них
+    больше не используются.
+    """
+
+    def __init__(self, entries: EntryColumns = None, start: int = None) -> None:
+        """
+        Параметры:
+            entries (EntryColumns, optional): Загруженные отметки.
+            start (int, optional): Начало текущего периода журналов (TimeLog.start).
+        """
+        self._entries = entries
+        self._start = start
+        self._logs = {}
+        # ID, участки которых уже не действуют (журнал построен, заменен или удален)
+        self._done = set()
+        self._size = len(entries) if entries is not None else 0
+
+    def _run(self, emp_id) -> int:
+        if self._entries is None or emp_id in self._done:
+            return -1
+        return int(self._entries.find([emp_id])[0])
+
+    def __getitem__(self, emp_id) -> TimeLog:
+        log = self._logs.get(emp_id)
+        if log is not None:
+            return log
+        run = self._run(emp_id)
+        if run < 0:
+            raise KeyError(emp_id)
+        log = self._logs[emp_id] = self._entries.log(run, self._start)
+        self._done.add(emp_id)
+        return log
+
+    def __contains__(self, emp_id) -> bool:
+        return emp_id in self._logs or self._run(emp_id) >= 0
+
+    def __setitem__(self, emp_id, log: TimeLog) -> None:
+        if emp_id not in self:
+            self._size += 1
+        self._logs[emp_id] = log
+        self._done.add(emp_id)
+
+    def __delitem__(self, emp_id) -> None:
+        if emp_id not in self:
+            raise KeyError(emp_id)
+        self._logs.pop(emp_id, None)
+        self._done.add(emp_id)
+        self._size -= 1
+
+    def __iter__(self):
+        yield from list(self._logs)
+        for run in self._pending().tolist():
+            yield int(self._entries.ids[run])
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _pending(self) -> np.ndarray:
+        """Номера участков, журналы которых еще не построены."""
+        if self._entries is None:
+            return np.empty(0, dtype=np.int64)
+        if not self._done:
+            return np.arange(len(self._entries))
+        done = np.fromiter(self._done, dtype=np.int64, count=len(self._done))
+        return np.flatnonzero(~np.isin(self._entries.ids, done))
+
+    def set_start(self, start: int) -> None:
+        """Задает начало текущего периода всем журналам (и еще не построенным)."""
+        self._start = start
+        for log in self._logs.values():
+            log.start = start
+
+    def prune(self, before: int) -> None:
+        """
+        Удаляет отметки раньше before из всех журналов (закрытие периода).
+
+        Еще не построенные журналы отбираются из общих колонок одним
+        проходом; журналы, в которых не осталось отметок, удаляются.
+
+        Параметры:
+            before (int): Время закрытия периода (секунды).
+        """
+        for emp_id, log in list(self._logs.items()):
+            log.prune(before)
+            if not len(log):
+                del self[emp_id]
+        entries = self._entries
+        if entries is None or not (entries.at < before).any():
+            return
+        pending = self._pending()
+        rows = entries.rows(pending)
+        ids = np.asarray(entries.ids)[np.repeat(pending, entries.hi[pending] - entries.lo[pending])]
+        keep = entries.at[rows] >= before
+        rows = rows[keep]
+        self._entries = EntryColumns(ids[keep], entries.at[rows], entries.hours[rows],
+                                     entries.codes[rows], entries.names)
+        # Построенные журналы в новых колонках не участвуют
+        self._done = set()
+        self._size = len(self._logs) + len(self._entries)
+
+    def matching(self, employees):
+        """
+        Находит журналы сотрудников списка без построения массивов.
+
+        Возвращает:
+            iterator: (сотрудник, журнал, сумма часов текущего периода).
+        """
+        employees = list(employees)
+        ids = np.fromiter((emp.id for emp in employees), dtype=np.int64, count=len(employees))
+        for emp in employees:
+            log = self._logs.get(emp.id)
+            if log is not None:
+                yield emp, log, log.current()
+        pending = self._pending()
+        if not len(pending):
+            return
+        entries = self._entries
+        runs = entries.find(ids)
+        waiting = np.zeros(len(entries), dtype=bool)
+        waiting[pending] = True
+        positions = np.flatnonzero((runs >= 0) & waiting[np.maximum(runs, 0)])
+        runs = runs[positions]
+        totals = entries.totals(self._start)[runs]
+        for position, lo, hi, current in zip(positions.tolist(), entries.lo[runs].tolist(),
+                                             entries.hi[runs].tolist(), totals.tolist()):
+            emp = employees[position]
+            log = self._logs[emp.id] = TimeLog._lazy(entries, lo, hi, self._start)
+            self._done.add(emp.id)
+            yield emp, log, current
+
+    def projects(self) -> set:
+        """Проекты всех отметок."""
+        titles = set()
+        for log in self._logs.values():
+            titles.update(log.projects())
+        pending = self._pending()
+        if len(pending):
+            titles.update(self._entries.projects(self._entries.rows(pending)))
+        return titles
+
+    def columns(self) -> tuple:
+        """
+        Все отметки колонками (см. entry_columns): еще не построенные
+        журналы копируются из общих колонок одним проходом.
+        """
+        ids, at, hours, projects = [], [], [], []
+        for emp_id, log in self._logs.items():
+            log_at, log_hours, log_projects = log.columns()
+            ids.append(np.full(len(log_at), emp_id, dtype=np.int64))
+            at.append(log_at)
+            hours.append(log_hours)
+            projects.extend(log_projects)
+        pending = self._pending()
+        if len(pending):
+            entries = self._entries
+            rows = entries.rows(pending)
+            ids.append(np.asarray(entries.ids)[np.repeat(pending, entries.hi[pending] - entries.lo[pending])])
+            at.append(entries.at[rows])
+            hours.append(entries.hours[rows])
+            projects.extend(entries.names[entries.codes[rows]].tolist())
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), []
+        return np.concatenate(ids), np.concatenate(at), np.concatenate(hours), projects
+
+
+def group_entries(ids, at, hours, projects, start: int = None) -> "TimeLogs":
+    """
+    Раскладывает отметки нескольких сотрудников по журналам.
+
+    Журналы создаются лениво (см. TimeLogs): загрузка не строит
+    массивы отметок каждого сотрудника.
+
+    Параметры:
+        ids: ID сотрудников.
+        at: Время отметок.
+        hours: Часы.
+        projects: Проекты.
+        start (int, optional): Начало текущего периода журналов (см. TimeLog.start).
+
+    Возвращает:
+        TimeLogs: {ID сотрудника: TimeLog}.
+    """
+    return TimeLogs(EntryColumns.from_entries(ids, at, hours, projects), start)
+
+
+def entry_columns(employees) -> tuple:
+    """
+    Собирает отметки всех сотрудников в колонки для сохранения.
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+
+    Возвращает:
+        tuple: Массивы ID и времени, массив часов и список проектов.
+    """
+    if hasattr(employees, 'timelogs'):
+        return employees.timelogs.columns()
+    ids, at, hours, projects = [], [], [], []
+    for emp in employees:
+        if emp.timelog is None:
+            continue
+        log_at, log_hours, log_projects = emp.timelog.columns()
+        ids.append(np.full(len(log_at), emp.id, dtype=np.int64))
+        at.append(log_at)
+        hours.append(log_hours)
+        projects.extend(log_projects)
+    if not ids:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), []
+    return np.concatenate(ids), np.concatenate(at), np.concatenate(hours), projects
+
+
+def attach_timelogs(employees, logs) -> None:
+    """
+    Привязывает загруженные журналы отметок к сотрудникам.
+
+    Общие часы сотрудников при этом не меняются (см. Employee.attach_timelog).
+    Массивы журналов не строятся: сумма часов текущего периода
+    считается сразу по всем колонкам (см. TimeLogs.matching).
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        logs (TimeLogs): {ID сотрудника: TimeLog}.
+    """
+    if not logs:
+        return
+    if hasattr(employees, 'timelogs'):
+        if not employees.timelogs:
+            employees.timelogs = logs
+        else:
+            employees.timelogs.update(logs)
+        return
+    for emp, log, current in logs.matching(employees):
+        emp.attach_timelog(log, current)
+
+
+def total_hours(employees, start=None, end=None, project: str = None) -> float:
+    """
+    Возвращает сумму отмеченных часов всех сотрудников за промежуток [start, end).
+
+    Параметры:
+        employees (list | EmployeeTable): Сотрудники.
+        start (optional): Начало промежутка.
+        end (optional): Конец промежутка (не включается).
+        project (str, optional): Только часы этого проекта.
+
+    Возвращает:
+        float: Сумма часов.
+    """
+    if hasattr(employees, 'timelogs'):
+        logs = employees.timelogs.values()
+    else:
+        logs = (emp.timelog for emp in employees if emp.timelog is not None)
+    return sum(log.total(start, end, project) for log in logs)
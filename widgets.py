@@ -0,0 +1,294 @@
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class VirtualList(tk.Frame):
+    """
+    Список, который показывает только видимые строки большого набора данных.
+
+    В tk.Listbox всегда лежат лишь строки текущего окна прокрутки, поэтому
+    отрисовка не зависит от размера набора. Данные (items) - любая
+    последовательность с len() и индексацией, например список сотрудников
+    или EmployeeTable. Изменения отдельных элементов применяются точечно
+    (refresh_item, item_added, item_removed) без перестройки всего списка.
+
+    Выбранный элемент запоминается по ключу key(item), а не по номеру строки
+    Listbox, поэтому выбор не теряется при прокрутке, добавлении
+    и удалении других элементов. В режиме multiple можно отметить несколько
+    элементов (Ctrl и Shift + щелчок); выбранным остается последний
+    отмеченный, отметки тоже хранятся по ключам.
+
+    Атрибуты:
+        listbox (tk.Listbox): Виджет со строками видимого окна.
+        scrollbar (tk.Scrollbar): Полоса прокрутки по всему набору.
+    """
+
+    def __init__(self, master, format_item, on_select=None, key=None, height=6, multiple=False,
+                 **listbox_options) -> None:
+        """
+        Параметры:
+            master: Родительский виджет.
+            format_item (callable): Превращает элемент в строку списка.
+            on_select (callable, optional): Вызывается с позицией элемента
+                после выбора мышью или клавиатурой.
+            key (callable, optional): Ключ элемента для запоминания выбора.
+                По умолчанию сам элемент.
+            height (int, optional): Начальное число видимых строк.
+            multiple (bool, optional): Разрешить отмечать несколько элементов.
+            **listbox_options: Дополнительные параметры tk.Listbox.
+        """
+        super().__init__(master)
+        self.format_item = format_item
+        self.on_select = on_select
+        self.key = key or (lambda item: item)
+
+        self._items = []
+        self._top = 0
+        self._rows = height
+        self._selected_key = None
+        self._selected_hint = None
+        self.multiple = multiple
+        # Ключи отмеченных элементов (в режиме multiple)
+        self._marked = set()
+
+        self.listbox = tk.Listbox(self, height=height, selectmode=tk.EXTENDED if multiple else tk.SINGLE,
+                                  exportselection=False, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self.listbox.bind('<Configure>', self._on_configure)
+        self.listbox.bind('<MouseWheel>', self._on_mousewheel)
+        self.listbox.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.listbox.bind('<Button-5>', lambda e: self._scroll_by(3))
+        self.listbox.bind('<Up>', lambda e: self._move_selection(-1))
+        self.listbox.bind('<Down>', lambda e: self._move_selection(1))
+        self.listbox.bind('<Prior>', lambda e: self._move_selection(-self._rows))
+        self.listbox.bind('<Next>', lambda e: self._move_selection(self._rows))
+        if multiple:
+            # Простой щелчок снимает и отметки за пределами видимого окна;
+            # щелчок с Ctrl или Shift (более точная привязка) их сохраняет
+            self.listbox.bind('<Button-1>', lambda e: self._marked.clear())
+            self.listbox.bind('<Control-Button-1>', lambda e: None)
+            self.listbox.bind('<Shift-Button-1>', lambda e: None)
+
+    @property
+    def items(self):
+        """Текущий набор данных."""
+        return self._items
+
+    def set_items(self, items) -> None:
+        """
+        Заменяет набор данных и перерисовывает видимое окно.
+
+        Выбранный элемент сохраняется, если он есть в новом наборе.
+
+        Параметры:
+            items: Последовательность элементов.
+        """
+        self._items = items
+        self._selected_hint = None
+        if self.selected_index() is None:
+            self._selected_key = None
+        if self.multiple:
+            self._marked = set() if self._selected_key is None else {self._selected_key}
+        self._top = self._clamp_top(self._top)
+        self._render()
+
+    def refresh_item(self, index: int) -> None:
+        """
+        Перерисовывает строку одного элемента, если она видна.
+
+        Параметры:
+            index (int): Позиция элемента в наборе.
+        """
+        if self._top <= index < self._top + self._rows:
+            row = index - self._top
+            self.listbox.delete(row)
+            self.listbox.insert(row, self.format_item(self._items[index]))
+            if index == self._selected_hint or self.key(self._items[index]) in self._marked:
+                self.listbox.selection_set(row)
+
+    def item_added(self, index: int = None) -> None:
+        """
+        Сообщает, что в набор добавлен элемент.
+
+        Параметры:
+            index (int, optional): Позиция нового элемента.
+                По умолчанию - в конце набора.
+        """
+        if index is None:
+            index = len(self._items) - 1
+        if self._selected_hint is not None and index <= self._selected_hint:
+            self._selected_hint += 1
+        if index < self._top + self._rows:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def item_removed(self, index: int) -> None:
+        """
+        Сообщает, что элемент удален из набора.
+
+        Если удален выбранный элемент, выбор снимается.
+
+        Параметры:
+            index (int): Позиция, которую занимал элемент.
+        """
+        if self._selected_hint is not None:
+            if index == self._selected_hint:
+                self._selected_key = None
+                self._selected_hint = None
+            elif index < self._selected_hint:
+                self._selected_hint -= 1
+        self._top = self._clamp_top(self._top)
+        if index < self._top + self._rows:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def select_index(self, index: int) -> None:
+        """
+        Выбирает элемент и прокручивает список к нему.
+
+        Параметры:
+            index (int): Позиция элемента в наборе.
+        """
+        self._selected_key = self.key(self._items[index])
+        self._selected_hint = index
+        if self.multiple:
+            self._marked = {self._selected_key}
+        self.see(index)
+        self._render()
+
+    def selected_index(self):
+        """
+        Возвращает позицию выбранного элемента.
+
+        Возвращает:
+            int | None: Позиция или None, если ничего не выбрано.
+        """
+        if self._selected_key is None:
+            return None
+        hint = self._selected_hint
+        if hint is not None and hint < len(self._items) \
+                and self.key(self._items[hint]) == self._selected_key:
+            return hint
+        for i, item in enumerate(self._items):
+            if self.key(item) == self._selected_key:
+                self._selected_hint = i
+                return i
+        return None
+
+    def selected_keys(self) -> set:
+        """
+        Возвращает ключи отмеченных элементов (без режима multiple - выбранного).
+
+        Удаленные из набора элементы могут остаться среди отметок до следующего
+        выбора, поэтому вызывающий код проверяет, что элементы еще есть.
+
+        Возвращает:
+            set: Ключи.
+        """
+        if self.multiple:
+            return set(self._marked)
+        return set() if self._selected_key is None else {self._selected_key}
+
+    def selected_item(self):
+        """Возвращает выбранный элемент или None."""
+        index = self.selected_index()
+        return None if index is None else self._items[index]
+
+    def see(self, index: int) -> None:
+        """Прокручивает список так, чтобы элемент index был виден."""
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._rows:
+            self._top = index - self._rows + 1
+        self._top = self._clamp_top(self._top)
+
+    def _render(self) -> None:
+        """Заполняет Listbox строками видимого окна."""
+        end = min(self._top + self._rows, len(self._items))
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *[self.format_item(self._items[i]) for i in range(self._top, end)])
+        selected = self.selected_index()
+        if selected is not None and self._top <= selected < end:
+            self.listbox.selection_set(selected - self._top)
+        if self._marked:
+            for i in range(self._top, end):
+                if self.key(self._items[i]) in self._marked:
+                    self.listbox.selection_set(i - self._top)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        count = len(self._items)
+        if count == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self._top / count, min(1.0, (self._top + self._rows) / count))
+
+    def _clamp_top(self, top: int) -> int:
+        return max(0, min(top, len(self._items) - self._rows))
+
+    def _yview(self, *args) -> None:
+        """Обработчик полосы прокрутки (те же аргументы, что у Listbox.yview)."""
+        if args[0] == 'moveto':
+            top = int(float(args[1]) * len(self._items))
+        elif args[2] == 'pages':
+            top = self._top + int(args[1]) * self._rows
+        else:
+            top = self._top + int(args[1])
+        self._scroll_to(top)
+
+    def _scroll_by(self, delta: int) -> str:
+        self._scroll_to(self._top + delta)
+        return "break"
+
+    def _scroll_to(self, top: int) -> None:
+        top = self._clamp_top(top)
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def _on_mousewheel(self, event) -> str:
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_configure(self, event) -> None:
+        """Пересчитывает число видимых строк при изменении размера."""
+        linespace = tkfont.Font(font=self.listbox.cget('font')).metrics('linespace') + 1
+        rows = max(1, event.height // linespace)
+        if rows != self._rows:
+            self._rows = rows
+            self._top = self._clamp_top(self._top)
+            self._render()
+
+    def _on_listbox_select(self, event) -> None:
+        selection = self.listbox.curselection()
+        if self.multiple:
+            end = min(self._top + self._rows, len(self._items))
+            self._marked.difference_update(self.key(self._items[i]) for i in range(self._top, end))
+            self._marked.update(self.key(self._items[self._top + row]) for row in selection)
+            if self._selected_key not in self._marked:
+                self._selected_key = None
+                self._selected_hint = None
+        if not selection:
+            return
+        # Выбранным становится строка, по которой щелкнули (если она отмечена)
+        active = self.listbox.index(tk.ACTIVE)
+        index = self._top + (active if active in selection else selection[0])
+        self._selected_key = self.key(self._items[index])
+        self._selected_hint = index
+        if self.on_select:
+            self.on_select(index)
+
+    def _move_selection(self, delta: int) -> str:
+        if not self._items:
+            return "break"
+        current = self.selected_index()
+        index = 0 if current is None else max(0, min(len(self._items) - 1, current + delta))
+        self.select_index(index)
+        if self.on_select:
+            self.on_select(index)
+        return "break"